@@ -214,6 +214,231 @@ class Settings(BaseSettings):
         description="Delay between retry attempts in seconds",
     )
 
+    # Background proposal pre-analysis
+    prefetch_enabled: bool = Field(
+        default=False,
+        alias="PREFETCH_ENABLED",
+        description="Pre-analyze new proposals in the background while idle",
+    )
+    prefetch_interval_seconds: int = Field(
+        default=120,
+        gt=0,
+        alias="PREFETCH_INTERVAL_SECONDS",
+        description="Seconds between background polls for new proposals",
+    )
+    prefetch_max_ai_calls_per_hour: int = Field(
+        default=20,
+        ge=0,
+        alias="PREFETCH_MAX_AI_CALLS_PER_HOUR",
+        description="Maximum AI model calls the background worker may make per hour",
+    )
+    prefetch_cpu_share: float = Field(
+        default=0.25,
+        gt=0.0,
+        le=1.0,
+        alias="PREFETCH_CPU_SHARE",
+        description="Maximum fraction of wall-clock time spent on background analysis",
+    )
+
+    # Autonomous run scheduling
+    scheduler_enabled: bool = Field(
+        default=False,
+        alias="SCHEDULER_ENABLED",
+        description="Schedule agent runs in-process ahead of proposal deadlines",
+    )
+    scheduler_dry_run: bool = Field(
+        default=False,
+        alias="SCHEDULER_DRY_RUN",
+        description="Run scheduled agent runs in dry run mode",
+    )
+
+    # Vote submission
+    vote_max_concurrency: int = Field(
+        default=4,
+        gt=0,
+        alias="VOTE_MAX_CONCURRENCY",
+        description="Maximum votes submitted to the Snapshot hub at once",
+    )
+    snapshot_hub_rate_limit: float = Field(
+        default=2.0,
+        gt=0.0,
+        alias="SNAPSHOT_HUB_RATE_LIMIT",
+        description="Vote submissions per second sent to the Snapshot hub",
+    )
+    vote_max_attempts: int = Field(
+        default=3,
+        gt=0,
+        alias="VOTE_MAX_ATTEMPTS",
+        description="Attempts per vote when the hub answers 429, 5xx or is unreachable",
+    )
+    vote_retry_backoff_seconds: float = Field(
+        default=1.0,
+        ge=0.0,
+        alias="VOTE_RETRY_BACKOFF_SECONDS",
+        description="Delay before the first vote retry; doubles per attempt",
+    )
+
+    # Attestation queue
+    attestation_max_concurrency: int = Field(
+        default=2,
+        gt=0,
+        alias="ATTESTATION_MAX_CONCURRENCY",
+        description="Maximum attestations the background worker submits at once",
+    )
+    attestation_batch_size: int = Field(
+        default=1,
+        gt=0,
+        alias="ATTESTATION_BATCH_SIZE",
+        description="Attestations combined into one Safe MultiSend transaction (1 disables batching)",
+    )
+    multisend_address: Optional[str] = Field(
+        default=None,
+        alias="MULTISEND_ADDRESS",
+        description="MultiSendCallOnly contract used for batched attestations (defaults to the canonical v1.3.0 deployment)",
+    )
+
+    # State persistence
+    state_executor_max_workers: int = Field(
+        default=2,
+        gt=0,
+        alias="STATE_EXECUTOR_MAX_WORKERS",
+        description="Threads available for reading and writing state files",
+    )
+    state_storage_engine: str = Field(
+        default="json",
+        alias="STATE_STORAGE_ENGINE",
+        description="Where state is stored: json (one file per state) or sqlite (one WAL-mode database)",
+    )
+    state_write_coalesce_ms: float = Field(
+        default=500.0,
+        ge=0.0,
+        alias="STATE_WRITE_COALESCE_MS",
+        description="Window in which coalesced saves of one state are merged into a single write (0 writes every save)",
+    )
+    state_durability: str = Field(
+        default='{"agent_state_transitions": "coalesced", "agent_run_service": "coalesced", "decision_cache": "coalesced"}',
+        alias="STATE_DURABILITY",
+        description="JSON map of state name prefix to durability: immediate (written before save returns) or coalesced; unlisted states are immediate",
+    )
+
+    # Chain I/O
+    chain_executor_max_workers: int = Field(
+        default=4,
+        gt=0,
+        alias="CHAIN_EXECUTOR_MAX_WORKERS",
+        description="Threads available for blocking web3 and Safe calls",
+    )
+    crypto_executor_kind: str = Field(
+        default="thread",
+        alias="CRYPTO_EXECUTOR_KIND",
+        description="Worker pool for signing and ABI encoding: thread or process",
+    )
+    crypto_executor_max_workers: int = Field(
+        default=2,
+        gt=0,
+        alias="CRYPTO_EXECUTOR_MAX_WORKERS",
+        description="Workers available for signing and ABI encoding",
+    )
+    chain_client_warmup: bool = Field(
+        default=True,
+        alias="CHAIN_CLIENT_WARMUP",
+        description="Connect Web3, Safe and Safe Transaction Service clients at startup",
+    )
+    chain_block_cache_ttl_seconds: float = Field(
+        default=2.0,
+        ge=0.0,
+        alias="CHAIN_BLOCK_CACHE_TTL_SECONDS",
+        description="Seconds a fetched latest block is reused when building transactions",
+    )
+    gas_price_cache_ttl_seconds: float = Field(
+        default=30.0,
+        ge=0.0,
+        alias="GAS_PRICE_CACHE_TTL_SECONDS",
+        description="Seconds a sampled gas price is reused when choosing a chain",
+    )
+    gas_token_usd_prices: str = Field(
+        default="{}",
+        alias="GAS_TOKEN_USD_PRICES",
+        description="JSON map of chain to approximate USD price of its gas token, used to compare transaction costs; without prices the static chain priority is used",
+    )
+    receipt_tracking_enabled: bool = Field(
+        default=True,
+        alias="RECEIPT_TRACKING_ENABLED",
+        description="Return after broadcasting attestations and withdrawals and confirm receipts in the background",
+    )
+    receipt_poll_interval_seconds: float = Field(
+        default=2.0,
+        gt=0.0,
+        alias="RECEIPT_POLL_INTERVAL_SECONDS",
+        description="Seconds between batched receipt polls for pending transactions",
+    )
+    receipt_timeout_seconds: float = Field(
+        default=600.0,
+        gt=0.0,
+        alias="RECEIPT_TIMEOUT_SECONDS",
+        description="Seconds without a receipt before a tracked transaction is marked failed",
+    )
+    rpc_rate_limits: str = Field(
+        default='{"mainnet.base.org": 1.0}',
+        alias="RPC_RATE_LIMITS",
+        description="JSON map of RPC URL substring to requests per second; other URLs are not limited",
+    )
+    rpc_rate_limit_burst: int = Field(
+        default=2,
+        ge=1,
+        alias="RPC_RATE_LIMIT_BURST",
+        description="Requests an RPC endpoint may receive back to back before throttling",
+    )
+    rpc_rate_limit_backoff_seconds: float = Field(
+        default=5.0,
+        gt=0.0,
+        alias="RPC_RATE_LIMIT_BACKOFF_SECONDS",
+        description="First pause after an HTTP 429 without Retry-After; doubles per repeat",
+    )
+    rpc_fallback_urls: str = Field(
+        default="{}",
+        alias="RPC_FALLBACK_URLS",
+        description="JSON map of chain to extra RPC URLs used for failover and hedged reads",
+    )
+    rpc_hedge_delay_ms: float = Field(
+        default=250.0,
+        ge=0.0,
+        alias="RPC_HEDGE_DELAY_MS",
+        description="Wait before a slow read is also sent to the next RPC endpoint; 0 disables hedging",
+    )
+    rpc_endpoint_cooldown_seconds: float = Field(
+        default=30.0,
+        gt=0.0,
+        alias="RPC_ENDPOINT_COOLDOWN_SECONDS",
+        description="First cooldown of a failing RPC endpoint; doubles per repeat",
+    )
+    loop_stall_threshold_ms: float = Field(
+        default=100.0,
+        gt=0.0,
+        alias="LOOP_STALL_THRESHOLD_MS",
+        description="Event-loop lag above which a stall is recorded and logged",
+    )
+
+    # Vote ledger
+    vote_ledger_reconcile: bool = Field(
+        default=True,
+        alias="VOTE_LEDGER_RECONCILE",
+        description="Reconcile the vote ledger with Snapshot's vote index once per run",
+    )
+
+    # Snapshot webhooks
+    snapshot_webhook_secret: Optional[str] = Field(
+        default=None,
+        alias="SNAPSHOT_WEBHOOK_SECRET",
+        description="Shared secret for verifying Snapshot webhook requests",
+    )
+    webhook_debounce_seconds: float = Field(
+        default=5.0,
+        ge=0.0,
+        alias="WEBHOOK_DEBOUNCE_SECONDS",
+        description="Quiet period that collapses bursts of webhook events per space",
+    )
+
     # File output configuration
     decision_output_dir: str = Field(
         default="decisions",
@@ -1,12 +1,13 @@
 """Main FastAPI application for Quorum AI backend."""
 
 import hashlib
+import json
 import os
 import time
 from contextlib import asynccontextmanager
 from typing import List, Optional, Any
 
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse, FileResponse
 from fastapi.staticfiles import StaticFiles
@@ -15,6 +16,19 @@ from logging_config import setup_pearl_logger, log_span
 
 from config import settings
 from utils.attestation_tracker_helpers import get_multisig_info
+from utils.chain_client_registry import get_chain_client_registry
+from utils.chain_executor import run_in_chain_executor, shutdown_chain_executor
+from utils.chain_metadata import get_chain_metadata_cache
+from utils.crypto_executor import (
+    get_crypto_executor_metrics,
+    shutdown_crypto_executor,
+)
+from utils.gas_oracle import get_gas_oracle
+from utils.rpc_batch import get_rpc_batch_metrics
+from utils.rpc_endpoint_pool import get_rpc_endpoint_metrics
+from utils.rpc_rate_limiter import get_rpc_rate_limiter
+from utils.safe_nonce_manager import get_safe_nonce_manager
+from utils.state_executor import shutdown_state_executor
 from models import (
     AgentRunRequest,
     AgentRunResponse,
@@ -29,6 +43,7 @@ from models import (
     VoteType,
     SummarizeRequest,
     SummarizeResponse,
+    SnapshotWebhookEvent,
     UserPreferences,
 )
 from services.ai_service import AIService
@@ -43,6 +58,14 @@ from services.signal_handler import SignalHandler, ShutdownCoordinator
 from services.withdrawal_service import WithdrawalService
 from services.state_transition_tracker import StateTransitionTracker
 from services.health_status_service import HealthStatusService
+from services.event_loop_monitor import EventLoopMonitor
+from services.proposal_prefetcher import ProposalPrefetcher
+from services.receipt_reconciler import ReceiptReconciler
+from services.run_scheduler import RunScheduler
+from services.snapshot_webhook_service import (
+    SnapshotWebhookService,
+    verify_webhook_request,
+)
 
 # Initialize Pearl-compliant logger
 logger = setup_pearl_logger(__name__)
@@ -61,6 +84,11 @@ shutdown_coordinator: ShutdownCoordinator
 withdrawal_service: WithdrawalService
 state_transition_tracker: Optional[StateTransitionTracker] = None
 health_status_service: Optional[HealthStatusService] = None
+proposal_prefetcher: Optional[ProposalPrefetcher] = None
+run_scheduler: Optional[RunScheduler] = None
+snapshot_webhook_service: Optional[SnapshotWebhookService] = None
+receipt_reconciler: Optional[ReceiptReconciler] = None
+event_loop_monitor: Optional[EventLoopMonitor] = None
 
 
 @asynccontextmanager
@@ -80,7 +108,12 @@ async def lifespan(_app: FastAPI):
         shutdown_coordinator, \
         withdrawal_service, \
         state_transition_tracker, \
-        health_status_service
+        health_status_service, \
+        event_loop_monitor
+
+    # Measure event-loop stalls for the lifetime of the app
+    event_loop_monitor = EventLoopMonitor()
+    event_loop_monitor.start()
 
     # Initialize state manager
     state_manager = StateManager()
@@ -126,6 +159,15 @@ async def lifespan(_app: FastAPI):
     # Initialize async components
     await agent_run_service.initialize()
 
+    # Open chain connections before the first request or agent run needs them
+    if settings.chain_client_warmup:
+        await safe_service.warm_up_clients()
+
+    # Confirm broadcast attestations and withdrawals in the background, picking
+    # up transactions still pending from the previous run
+    if settings.receipt_tracking_enabled:
+        await _start_receipt_reconciler()
+
     # Register services with shutdown coordinator
     shutdown_coordinator.register_service("agent", agent_run_service)
     shutdown_coordinator.register_service("voting", voting_service)
@@ -158,24 +200,89 @@ async def lifespan(_app: FastAPI):
     else:
         # Normal operation mode - run agent if configured
         logger.info("Normal operation mode - agent runs will proceed as configured")
+        _start_background_workers()
 
     yield
 
     # Shutdown
     logger.info("Application shutdown initiated")
 
+    # Stop background work before services are torn down
+    await _stop_background_workers()
+
     # Execute graceful shutdown
     try:
         await shutdown_coordinator.shutdown()
     except Exception as e:
         logger.error(f"Error during graceful shutdown: {e}")
 
-    # Cleanup state manager
+    # Cleanup state manager and let pending state writes finish
     await state_manager.cleanup()
+    shutdown_state_executor()
+
+    await event_loop_monitor.stop()
+    shutdown_chain_executor(wait=False)
+    shutdown_crypto_executor(wait=False)
+    get_chain_client_registry().clear()
 
     logger.info("Application shutdown completed")
 
 
+async def _start_receipt_reconciler() -> None:
+    """Start confirming Safe transaction receipts for withdrawals and attestations."""
+    global receipt_reconciler
+
+    receipt_reconciler = ReceiptReconciler(
+        safe_service=safe_service, state_manager=state_manager
+    )
+    await receipt_reconciler.load()
+    withdrawal_service.use_receipt_reconciler(receipt_reconciler)
+    if agent_run_service.attestation_queue:
+        agent_run_service.attestation_queue.use_receipt_reconciler(receipt_reconciler)
+    receipt_reconciler.start()
+
+
+def _start_background_workers() -> None:
+    """Start the workers that run the agent and submit attestations."""
+    global proposal_prefetcher, run_scheduler, snapshot_webhook_service
+
+    if agent_run_service.attestation_queue:
+        agent_run_service.attestation_queue.start()
+
+    if settings.prefetch_enabled:
+        proposal_prefetcher = ProposalPrefetcher(
+            agent_run_service=agent_run_service,
+            decision_cache=agent_run_service.decision_cache,
+        )
+        proposal_prefetcher.start()
+
+    if settings.scheduler_enabled:
+        run_scheduler = RunScheduler(
+            agent_run_service=agent_run_service,
+            dry_run=settings.scheduler_dry_run,
+        )
+        run_scheduler.start()
+
+    if settings.snapshot_webhook_secret:
+        snapshot_webhook_service = SnapshotWebhookService(
+            agent_run_service=agent_run_service, run_scheduler=run_scheduler
+        )
+
+
+async def _stop_background_workers() -> None:
+    """Stop the background workers, newest first, so none feeds a stopped one."""
+    if snapshot_webhook_service:
+        await snapshot_webhook_service.stop()
+    if run_scheduler:
+        await run_scheduler.stop()
+    if proposal_prefetcher:
+        await proposal_prefetcher.stop()
+    if agent_run_service.attestation_queue:
+        await agent_run_service.attestation_queue.stop()
+    if receipt_reconciler:
+        await receipt_reconciler.stop()
+
+
 # Create FastAPI app
 app = FastAPI(
     title="Quorum AI",
@@ -402,7 +509,9 @@ async def healthcheck():
             }
 
             if settings.attestation_tracker_address and settings.base_safe_address:
-                count, is_active = get_multisig_info(settings.base_safe_address)
+                count, is_active = await run_in_chain_executor(
+                    get_multisig_info, settings.base_safe_address
+                )
                 attestation_tracker_data["attestation_count"] = count
                 attestation_tracker_data["multisig_active"] = is_active
 
@@ -645,8 +754,9 @@ async def agent_run(request: AgentRunRequest):
         with log_span(
             logger, "agent_run", space_id=request.space_id, dry_run=request.dry_run
         ):
-            # Execute the agent run using the service
-            response = await agent_run_service.execute_agent_run(request)
+            # Execute the agent run using the service, after any run in progress
+            async with agent_run_service.run_lock:
+                response = await agent_run_service.execute_agent_run(request)
 
             logger.info(
                 f"Agent run completed space_id={request.space_id} "
@@ -780,6 +890,129 @@ async def get_agent_run_statistics():
         )
 
 
+@app.get("/agent-run/scheduler")
+async def get_agent_run_scheduler_metrics():
+    """Get metrics for the in-process run scheduler.
+
+    Returns queue depth, time until the next due proposal, and the lag
+    between when runs were due and when they were dispatched.
+    """
+    if run_scheduler is None:
+        return {"enabled": False}
+    return {"enabled": True, **run_scheduler.get_metrics()}
+
+
+@app.get("/agent-run/attestations")
+async def get_attestation_queue_metrics():
+    """Get metrics for the attestation queue.
+
+    Returns queue depth, the age of the oldest pending attestation, and
+    counters for submitted, failed and dropped attestations.
+    """
+    if agent_run_service.attestation_queue is None:
+        return {"enabled": False}
+    return {"enabled": True, **agent_run_service.attestation_queue.get_metrics()}
+
+
+@app.get("/metrics/receipts")
+async def get_receipt_metrics():
+    """Get metrics for background receipt tracking.
+
+    Returns how many broadcast transactions are waiting for a receipt, the
+    age of the oldest one, and counters for confirmed, failed and timed-out
+    transactions and for batched receipt polls.
+    """
+    if receipt_reconciler is None:
+        return {"enabled": False}
+    return {"enabled": True, **receipt_reconciler.get_metrics()}
+
+
+@app.get("/metrics/event-loop")
+async def get_event_loop_metrics():
+    """Get event-loop lag and stall metrics.
+
+    A stall is a lag sample above LOOP_STALL_THRESHOLD_MS, usually caused by
+    blocking I/O running on the event loop.
+    """
+    if event_loop_monitor is None:
+        return {"enabled": False}
+    return {"enabled": True, **event_loop_monitor.get_metrics()}
+
+
+@app.get("/metrics/crypto")
+async def get_crypto_metrics():
+    """Get metrics for the signing and ABI encoding worker pool.
+
+    Returns the pool kind and size and, per offloaded function, how many
+    calls ran, how long they waited for a worker and how long they ran.
+    """
+    return get_crypto_executor_metrics()
+
+
+@app.get("/metrics/state")
+async def get_state_metrics():
+    """Get metrics for state persistence.
+
+    Returns how many parsed state files are cached in memory and how many
+    loads were served from the cache or read from disk, plus how many files
+    were written and how many saves were merged into a later write.
+    """
+    return {
+        "cache": state_manager.get_cache_metrics(),
+        "writes": state_manager.get_write_metrics(),
+    }
+
+
+@app.get("/metrics/rpc")
+async def get_rpc_rate_limit_metrics():
+    """Get per-endpoint RPC rate limiter and chain client metrics.
+
+    Returns the configured rate, current 429 pause, and how often and for
+    how long calls to each RPC URL were throttled, plus how many chain
+    clients and metadata entries are cached and how often they were reused,
+    the locally tracked nonce and in-flight transactions of each Safe, how
+    many JSON-RPC batches were sent and how many calls they carried, and the
+    latency score, error rate and hedged reads of each failover endpoint,
+    and the gas prices last sampled for chain selection.
+    """
+    return {
+        "endpoints": get_rpc_rate_limiter().get_metrics(),
+        "clients": get_chain_client_registry().get_metrics(),
+        "metadata": get_chain_metadata_cache().get_metrics(),
+        "safe_nonces": get_safe_nonce_manager().get_metrics(),
+        "batches": get_rpc_batch_metrics(),
+        "failover": get_rpc_endpoint_metrics(),
+        "gas": get_gas_oracle().get_metrics(),
+    }
+
+
+@app.post("/webhooks/snapshot")
+async def snapshot_webhook(request: Request):
+    """Receive Snapshot hub webhook events and schedule targeted agent work.
+
+    Requests are authenticated with SNAPSHOT_WEBHOOK_SECRET, either as an
+    HMAC-SHA256 body signature in X-Signature or as the shared secret in the
+    Authentication header.
+    """
+    if snapshot_webhook_service is None:
+        raise HTTPException(status_code=503, detail="Snapshot webhooks not enabled")
+
+    body = await request.body()
+    if not verify_webhook_request(
+        body, request.headers, settings.snapshot_webhook_secret
+    ):
+        logger.warning("Rejected Snapshot webhook with invalid authentication")
+        raise HTTPException(status_code=401, detail="Invalid webhook authentication")
+
+    try:
+        event = SnapshotWebhookEvent(**json.loads(body))
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Invalid webhook payload: {e}")
+
+    accepted = await snapshot_webhook_service.handle_event(event)
+    return {"accepted": accepted}
+
+
 # Private helper functions for top voters endpoint
 def _validate_proposal_id(proposal_id: str) -> None:
     """Validate proposal ID parameter."""
@@ -877,7 +1110,23 @@ async def _fetch_proposals_for_summarization(proposal_ids: List[str]) -> List[Pr
 async def _generate_proposal_summaries(proposals: List[Proposal]) -> List:
     """Generate AI summaries for proposals."""
     with log_span(logger, "generate_proposal_summaries"):
-        summaries = await ai_service.summarize_multiple_proposals(proposals)
+        decision_cache = agent_run_service.decision_cache
+        cached = {}
+        for proposal in proposals:
+            summary = decision_cache.get_summary(proposal)
+            if summary is not None:
+                cached[proposal.id] = summary
+
+        uncached = [p for p in proposals if p.id not in cached]
+        generated = (
+            await ai_service.summarize_multiple_proposals(uncached) if uncached else []
+        )
+        generated_by_id = {s.proposal_id: s for s in generated}
+        summaries = [
+            cached.get(p.id) or generated_by_id[p.id]
+            for p in proposals
+            if p.id in cached or p.id in generated_by_id
+        ]
 
         logger.info(f"Generated proposal summaries count={len(summaries)}")
         return summaries
@@ -1109,6 +1358,7 @@ async def serve_frontend_routes(full_path: str):
             "agent-run",
             "user-preferences",
             "config",
+            "webhooks",
             "_app/",
             "favicon.png",
         )
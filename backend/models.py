@@ -3,7 +3,7 @@
 from datetime import datetime, timezone
 from decimal import Decimal
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
 
 from pydantic import BaseModel, Field, field_validator, model_validator
 
@@ -627,6 +627,10 @@ class AgentRunRequest(BaseModel):
 
     space_id: str = Field(..., description="Snapshot space ID to monitor")
     dry_run: bool = Field(default=False, description="If true, simulate without voting")
+    proposal_ids: Optional[List[str]] = Field(
+        default=None,
+        description="Only consider these proposals instead of all active ones in the space",
+    )
 
     @field_validator("space_id")
     @classmethod
@@ -675,6 +679,11 @@ class AgentRunResponse(BaseModel):
     errors: List[str] = Field(
         default_factory=list, description="List of errors encountered"
     )
+    processed_proposal_ids: List[str] = Field(
+        default_factory=list,
+        description="Fetched proposals the run is done with: voted on, or dropped "
+        "as already voted or filtered out",
+    )
     next_check_time: Optional[datetime] = Field(
         None, description="Next scheduled check time"
     )
@@ -881,7 +890,14 @@ class Vote(BaseModel):
 
     id: str = Field(..., description="Unique vote identifier")
     voter: str = Field(..., description="Voter's blockchain address")
-    choice: int = Field(..., description="Vote choice")
+    choice: Union[int, List[int], Dict[str, float]] = Field(
+        ...,
+        description=(
+            "Vote choice: a choice index for single-choice and basic votes, a "
+            "list of indexes for approval and ranked-choice votes, or a map of "
+            "choice index to weight for weighted and quadratic votes"
+        ),
+    )
     created: int = Field(..., ge=0, description="Creation timestamp")
     vp: float = Field(..., ge=0, description="Total voting power")
     vp_by_strategy: List[float] = Field(
@@ -1073,6 +1089,22 @@ class AgentRunStatistics(BaseModel):
     )
 
 
+class SnapshotWebhookEvent(BaseModel):
+    """Event payload delivered by a Snapshot hub webhook."""
+
+    id: str = Field(..., description="Event subject, e.g. 'proposal/0xabc...'")
+    event: str = Field(..., description="Event type, e.g. 'proposal/created'")
+    space: str = Field(..., description="Snapshot space ID the event belongs to")
+    expire: Optional[int] = Field(
+        None, description="Proposal end timestamp, when provided by the hub"
+    )
+
+    @property
+    def proposal_id(self) -> str:
+        """Proposal ID extracted from the event subject."""
+        return self.id.split("/", 1)[-1]
+
+
 class VotingDecisionFile(BaseModel):
     """Model for file-based voting decision output."""
 
@@ -1,14 +1,12 @@
 """Agent Run Service for executing autonomous voting decisions."""
 
-import glob
+import asyncio
 import json
-import os
-import re
 import time
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import List, Optional, Set, Tuple
 
-from datetime import datetime, timezone
+from datetime import datetime
 from logging_config import setup_pearl_logger, log_span
 from config import settings
 
@@ -19,7 +17,6 @@ from models import (
     VoteDecision,
     VoteType,
     UserPreferences,
-    EASAttestationData,
 )
 from services.snapshot_service import SnapshotService
 from services.ai_service import AIService
@@ -28,11 +25,23 @@ from services.safe_service import SafeService
 from services.user_preferences_service import UserPreferencesService
 from services.proposal_filter import ProposalFilter
 from services.agent_run_logger import AgentRunLogger
+from services.attestation_queue import AttestationQueue
+from services.decision_cache import DecisionCache
+from services.run_journal import (
+    EVENT_RUN_ABANDONED,
+    EVENT_RUN_COMPLETED,
+    JOURNAL_DIR_NAME,
+    STEP_ATTESTED,
+    STEP_DECIDED,
+    STEP_FETCHED,
+    STEP_SUBMITTED,
+    JournalState,
+    RunJournal,
+)
+from services.vote_dispatcher import VoteDispatcher, VoteOutcome, VoteRequest
+from services.vote_ledger import VoteLedger
 from services.state_transition_tracker import StateTransitionTracker, AgentState
-
-
-# Constants
-MAX_ATTESTATION_RETRIES = 3
+from utils.state_executor import run_in_state_executor
 
 
 # Custom exceptions for better error handling
@@ -63,6 +72,8 @@ class VoteExecutionError(AgentRunServiceError):
 # Constants for better code clarity
 DEFAULT_MAX_PROPOSALS_PER_RUN = 3
 VOTE_CHOICE_MAPPING = {VoteType.FOR: 1, VoteType.AGAINST: 2, VoteType.ABSTAIN: 3}
+CHECKPOINT_STATE_PREFIX = "agent_checkpoint_"
+DEFAULT_ATTESTATION_CONFIDENCE = 80
 
 
 class AgentRunService:
@@ -75,20 +86,50 @@ class AgentRunService:
     4. Execute votes (or simulate in dry run mode)
     """
 
-    def __init__(self, state_manager=None, ai_service=None) -> None:
+    def __init__(
+        self,
+        state_manager=None,
+        ai_service=None,
+        decision_cache: Optional[DecisionCache] = None,
+        vote_ledger: Optional[VoteLedger] = None,
+    ) -> None:
         """Initialize AgentRunService with required dependencies.
 
         Args:
             state_manager: Optional StateManager instance for state persistence
             ai_service: Optional AIService instance for shared configuration
+            decision_cache: Optional DecisionCache holding pre-computed decisions
+            vote_ledger: Optional VoteLedger of votes that were already cast
         """
         self.snapshot_service = SnapshotService()
         self.ai_service = ai_service or AIService()
         self.voting_service = VotingService()
+        self.vote_dispatcher = VoteDispatcher(self.voting_service)
         self.safe_service = SafeService()
         self.user_preferences_service = UserPreferencesService()
         self.logger = AgentRunLogger(store_path=settings.store_path)
         self.state_manager = state_manager
+        self.decision_cache = decision_cache or DecisionCache(state_manager)
+        self.vote_ledger = vote_ledger or VoteLedger(state_manager)
+
+        # Per-run journal for resuming interrupted runs and the attestation
+        # queue, both stored next to the state
+        store_path = getattr(state_manager, "store_path", None)
+        has_store = isinstance(store_path, (str, Path))
+        self.run_journal = (
+            RunJournal(Path(store_path) / JOURNAL_DIR_NAME) if has_store else None
+        )
+        self.attestation_queue = (
+            AttestationQueue(
+                Path(store_path),
+                self.safe_service,
+                max_concurrency=settings.attestation_max_concurrency,
+                batch_size=settings.attestation_batch_size,
+            )
+            if has_store
+            else None
+        )
+        self._migrated_attestation_spaces: Set[str] = set()
 
         # Initialize state transition tracker with StateManager for persistence
         self.state_tracker = StateTransitionTracker(
@@ -101,6 +142,10 @@ class AgentRunService:
         self._active_run = False
         self._current_run_data = None
 
+        # Held for the duration of every run, so that runs started by the API,
+        # the scheduler and webhooks never overlap
+        self.run_lock = asyncio.Lock()
+
         # Initialize Pearl-compliant logger
         self.pearl_logger = setup_pearl_logger(name="agent_run_service")
         self.pearl_logger.info("AgentRunService initialized with all dependencies")
@@ -112,6 +157,8 @@ class AgentRunService:
             self.pearl_logger.info(
                 "State tracker initialized with StateManager persistence"
             )
+        await self.decision_cache.load()
+        await self.vote_ledger.load()
 
     async def execute_agent_run(self, request: AgentRunRequest) -> AgentRunResponse:
         """Execute a complete agent run for the given space.
@@ -133,6 +180,14 @@ class AgentRunService:
         user_preferences_applied = False
         run_id = f"run_{request.space_id}_{int(start_time)}"
 
+        # Resume an interrupted run for this space instead of starting over
+        resumed = await self._resume_or_start_journal(request, run_id)
+        if resumed:
+            run_id = resumed.run_id
+        # Terminal journal event; left unset when the run is cancelled so that
+        # the next run resumes it
+        journal_outcome: Optional[str] = None
+
         # Track state transition from IDLE to STARTING
         self.state_tracker.transition(
             AgentState.STARTING, {"run_id": run_id, "spaces": [request.space_id]}
@@ -154,8 +209,8 @@ class AgentRunService:
             dry_run=request.dry_run,
         ):
             try:
-                # Process any pending attestations from previous runs
-                await self._process_pending_attestations(request.space_id)
+                # Move attestations queued by older versions into the queue
+                await self._migrate_pending_attestations(request.space_id)
                 # Step 1: Load user preferences
                 self.state_tracker.transition(
                     AgentState.LOADING_PREFERENCES, {"run_id": run_id}
@@ -174,14 +229,30 @@ class AgentRunService:
                     AgentState.FETCHING_PROPOSALS,
                     {"run_id": run_id, "spaces": [request.space_id]},
                 )
-                (
-                    proposals,
-                    filtered_proposals,
-                    fetch_errors,
-                ) = await self._fetch_and_process_proposals(
-                    request.space_id, user_preferences
-                )
-                errors.extend(fetch_errors)
+                resumed_proposals = resumed.get_proposals() if resumed else []
+                if resumed_proposals:
+                    # Replay the proposals selected by the interrupted run
+                    proposals = filtered_proposals = resumed_proposals
+                    self.pearl_logger.info(
+                        f"Replaying journaled proposals (run_id={run_id}, "
+                        f"proposal_count={len(resumed_proposals)})"
+                    )
+                else:
+                    (
+                        proposals,
+                        filtered_proposals,
+                        fetch_errors,
+                    ) = await self._fetch_and_process_proposals(
+                        request.space_id, user_preferences, request.proposal_ids
+                    )
+                    errors.extend(fetch_errors)
+                    for proposal in filtered_proposals:
+                        await self._record_journal_step(
+                            run_id,
+                            STEP_FETCHED,
+                            proposal.id,
+                            proposal=proposal.model_dump(mode="json"),
+                        )
 
                 # Track filtering state
                 self.state_tracker.transition(
@@ -209,6 +280,7 @@ class AgentRunService:
                     request.space_id,
                     request.dry_run,
                     run_id,
+                    resumed,
                 )
                 errors.extend(voting_errors)
 
@@ -216,6 +288,7 @@ class AgentRunService:
                 execution_time = time.time() - start_time
                 response = self._create_agent_response(
                     request.space_id,
+                    proposals,
                     filtered_proposals,
                     final_decisions,
                     user_preferences_applied,
@@ -230,6 +303,8 @@ class AgentRunService:
                 # Log completion summary
                 self.logger.log_agent_completion(response)
 
+                journal_outcome = EVENT_RUN_COMPLETED
+
                 # Track completion
                 self.state_tracker.transition(
                     AgentState.COMPLETED,
@@ -251,6 +326,8 @@ class AgentRunService:
                 return response
 
             except Exception as e:
+                journal_outcome = EVENT_RUN_ABANDONED
+
                 # Track error state
                 self.state_tracker.transition(
                     AgentState.ERROR,
@@ -269,6 +346,10 @@ class AgentRunService:
                     e, request.space_id, start_time, user_preferences_applied
                 )
 
+            finally:
+                if journal_outcome:
+                    await self._finish_journal(run_id, journal_outcome)
+
     async def _load_user_preferences(
         self, request: AgentRunRequest
     ) -> Tuple[UserPreferences, Optional[str]]:
@@ -293,13 +374,17 @@ class AgentRunService:
             return user_preferences, error_msg
 
     async def _fetch_and_process_proposals(
-        self, space_id: str, user_preferences: UserPreferences
+        self,
+        space_id: str,
+        user_preferences: UserPreferences,
+        proposal_ids: Optional[List[str]] = None,
     ) -> Tuple[List[Proposal], List[Proposal], List[str]]:
         """Fetch and process proposals with filtering and ranking.
 
         Args:
             space_id: The space ID to fetch proposals for
             user_preferences: User preferences for filtering and ranking
+            proposal_ids: Only fetch these proposals, if given
 
         Returns:
             Tuple of (all_proposals, filtered_proposals, errors)
@@ -310,20 +395,26 @@ class AgentRunService:
 
         # Fetch active proposals
         try:
-            proposals = await self._fetch_active_proposals(
-                space_id, user_preferences.max_proposals_per_run
-            )
+            if proposal_ids:
+                proposals = await self._fetch_proposals_by_id(space_id, proposal_ids)
+            else:
+                proposals = await self._fetch_active_proposals(
+                    space_id, user_preferences.max_proposals_per_run
+                )
         except Exception as e:
             error_msg = f"Failed to fetch active proposals: {str(e)}"
             errors.append(error_msg)
             self.logger.log_error("fetch_proposals", e, space_id=space_id)
             return proposals, filtered_proposals, errors
 
+        # Drop proposals we already voted on before spending any work on them
+        unvoted_proposals = await self._drop_voted_proposals(space_id, proposals)
+
         # Filter and rank proposals if any were fetched
-        if proposals:
+        if unvoted_proposals:
             try:
                 filtered_proposals = await self._filter_and_rank_proposals(
-                    proposals, user_preferences
+                    unvoted_proposals, user_preferences
                 )
                 self.logger.log_proposals_fetched(proposals, len(filtered_proposals))
             except Exception as e:
@@ -331,10 +422,90 @@ class AgentRunService:
                 errors.append(error_msg)
                 self.logger.log_error("filter_proposals", e, space_id=space_id)
                 # Fall back to original proposals if filtering fails
-                filtered_proposals = proposals
+                filtered_proposals = unvoted_proposals
 
         return proposals, filtered_proposals, errors
 
+    async def fetch_votable_proposals(
+        self, space_id: str, user_preferences: UserPreferences
+    ) -> List[Proposal]:
+        """Return the proposals a run for the space would make decisions on.
+
+        Active proposals are fetched, those already voted on are dropped, and
+        the rest are filtered and ranked by the user preferences, exactly as
+        in ``execute_agent_run``.
+
+        Args:
+            space_id: The space ID to fetch proposals for
+            user_preferences: User preferences for filtering and ranking
+
+        Returns:
+            Filtered and ranked proposals, empty if they could not be fetched
+        """
+        _, filtered_proposals, errors = await self._fetch_and_process_proposals(
+            space_id, user_preferences
+        )
+        for error in errors:
+            self.pearl_logger.warning(
+                f"Votable proposals incomplete (space_id={space_id}, error={error})"
+            )
+        return filtered_proposals
+
+    def _get_voter_address(self) -> Optional[str]:
+        """Return the address votes are cast from, or None if no key is loaded."""
+        try:
+            address = self.voting_service.account.address
+        except Exception as e:
+            self.pearl_logger.debug(f"Voter address unavailable (error={str(e)})")
+            return None
+        return address if isinstance(address, str) else None
+
+    async def _drop_voted_proposals(
+        self, space_id: str, proposals: List[Proposal]
+    ) -> List[Proposal]:
+        """Remove proposals the agent's voter already has a vote on.
+
+        The vote ledger is first reconciled with Snapshot in a single bulk query
+        for the proposals it does not know about, so votes cast outside this
+        agent (or lost with local state) are also honored.
+
+        Args:
+            space_id: The space the proposals belong to
+            proposals: Fetched proposals
+
+        Returns:
+            Proposals that have not been voted on yet
+        """
+        voter = self._get_voter_address()
+        if not voter or not proposals:
+            return proposals
+
+        unknown_ids = [
+            p.id
+            for p in proposals
+            if not self.vote_ledger.has_voted(space_id, p.id, voter)
+        ]
+        if settings.vote_ledger_reconcile and unknown_ids:
+            try:
+                votes = await self.snapshot_service.get_voter_votes(
+                    voter, space_id, unknown_ids
+                )
+                await self.vote_ledger.reconcile(space_id, voter, votes)
+            except Exception as e:
+                self.pearl_logger.warning(
+                    f"Vote ledger reconciliation failed (space_id={space_id}, "
+                    f"error={str(e)})"
+                )
+
+        voted_ids = self.vote_ledger.voted_proposal_ids(space_id, voter)
+        unvoted = [p for p in proposals if p.id not in voted_ids]
+        if len(unvoted) < len(proposals):
+            self.pearl_logger.info(
+                f"Skipping already voted proposals (space_id={space_id}, "
+                f"skipped={len(proposals) - len(unvoted)}, remaining={len(unvoted)})"
+            )
+        return unvoted
+
     async def _process_voting_decisions(
         self,
         proposals: List[Proposal],
@@ -342,6 +513,7 @@ class AgentRunService:
         space_id: str,
         dry_run: bool,
         run_id: str,
+        resumed: Optional[JournalState] = None,
     ) -> Tuple[List[VoteDecision], List[VoteDecision], List[str]]:
         """Make voting decisions and execute them.
 
@@ -350,6 +522,8 @@ class AgentRunService:
             user_preferences: User preferences for voting
             space_id: The space ID for the proposals
             dry_run: Whether to actually execute votes
+            run_id: The current run ID
+            resumed: Journal state of the interrupted run being resumed, if any
 
         Returns:
             Tuple of (vote_decisions, final_decisions, errors)
@@ -362,7 +536,7 @@ class AgentRunService:
         if proposals:
             try:
                 vote_decisions = await self._make_voting_decisions(
-                    proposals, user_preferences, space_id
+                    proposals, user_preferences, space_id, run_id, resumed
                 )
                 # Log individual proposal analysis
                 for proposal, decision in zip(proposals, vote_decisions):
@@ -400,7 +574,7 @@ class AgentRunService:
         if vote_decisions:
             try:
                 final_decisions = await self._execute_votes(
-                    vote_decisions, space_id, dry_run, run_id
+                    vote_decisions, space_id, dry_run, run_id, resumed
                 )
             except Exception as e:
                 error_msg = f"Failed to execute votes: {str(e)}"
@@ -412,6 +586,7 @@ class AgentRunService:
     def _create_agent_response(
         self,
         space_id: str,
+        proposals: List[Proposal],
         filtered_proposals: List[Proposal],
         vote_decisions: List[VoteDecision],
         user_preferences_applied: bool,
@@ -422,6 +597,7 @@ class AgentRunService:
 
         Args:
             space_id: The space ID
+            proposals: Proposals that were fetched
             filtered_proposals: Proposals that were analyzed
             vote_decisions: Voting decisions made
             user_preferences_applied: Whether user preferences were applied
@@ -431,6 +607,9 @@ class AgentRunService:
         Returns:
             AgentRunResponse with all results
         """
+        # Analyzed proposals without an executed vote still need another run
+        voted_ids = {decision.proposal_id for decision in vote_decisions}
+        unfinished_ids = {p.id for p in filtered_proposals} - voted_ids
         return AgentRunResponse(
             space_id=space_id,
             proposals_analyzed=len(filtered_proposals),
@@ -438,6 +617,9 @@ class AgentRunService:
             user_preferences_applied=user_preferences_applied,
             execution_time=execution_time,
             errors=errors,
+            processed_proposal_ids=[
+                p.id for p in proposals if p.id not in unfinished_ids
+            ],
             next_check_time=None,  # Could be implemented for scheduling
         )
 
@@ -531,6 +713,46 @@ class AgentRunService:
                     f"Failed to fetch active proposals from {space_id}: {str(e)}"
                 ) from e
 
+    async def _fetch_proposals_by_id(
+        self, space_id: str, proposal_ids: List[str]
+    ) -> List[Proposal]:
+        """Fetch the given proposals, keeping those that are active in the space.
+
+        Args:
+            space_id: Snapshot space the proposals must belong to
+            proposal_ids: Proposal identifiers
+
+        Returns:
+            Active Proposal objects, in the order of ``proposal_ids``
+
+        Raises:
+            ProposalFetchError: When fetching proposals fails
+        """
+        try:
+            fetched = await asyncio.gather(
+                *(self.snapshot_service.get_proposal(pid) for pid in proposal_ids)
+            )
+        except Exception as e:
+            raise ProposalFetchError(
+                f"Failed to fetch proposals {proposal_ids} from {space_id}: {str(e)}"
+            ) from e
+
+        proposals = []
+        for proposal_id, proposal in zip(proposal_ids, fetched):
+            if proposal is None or proposal.space_id not in (None, space_id):
+                self.pearl_logger.warning(
+                    f"Requested proposal not found in space (proposal_id={proposal_id}, "
+                    f"space_id={space_id})"
+                )
+            elif proposal.state != "active":
+                self.pearl_logger.info(
+                    f"Skipping requested proposal that is not active "
+                    f"(proposal_id={proposal_id}, state={proposal.state})"
+                )
+            else:
+                proposals.append(proposal)
+        return proposals
+
     async def _filter_and_rank_proposals(
         self, proposals: List[Proposal], preferences: UserPreferences
     ) -> List[Proposal]:
@@ -641,7 +863,12 @@ class AgentRunService:
                 ) from e
 
     async def _make_voting_decisions(
-        self, proposals: List[Proposal], preferences: UserPreferences, space_id: str
+        self,
+        proposals: List[Proposal],
+        preferences: UserPreferences,
+        space_id: str,
+        run_id: Optional[str] = None,
+        resumed: Optional[JournalState] = None,
     ) -> List[VoteDecision]:
         """Make voting decisions for the given proposals using AI and user preferences.
 
@@ -649,6 +876,8 @@ class AgentRunService:
             proposals: List of Proposal objects to analyze
             preferences: User preferences for voting strategy and filters
             space_id: The space identifier for the proposals
+            run_id: The current run ID, used to journal decisions
+            resumed: Journal state of the interrupted run being resumed, if any
 
         Returns:
             List of VoteDecision objects that meet confidence threshold
@@ -683,12 +912,40 @@ class AgentRunService:
                 vote_decisions = []
 
                 for proposal in proposals:
-                    # Make voting decision using AI
-                    decision = await self.ai_service.decide_vote(
-                        proposal=proposal,
-                        strategy=preferences.voting_strategy,
-                        space_id=space_id,
-                    )
+                    # Replay the decision of an interrupted run
+                    decision = resumed.get_decision(proposal.id) if resumed else None
+                    if decision is not None:
+                        self.pearl_logger.info(
+                            f"Replaying journaled vote decision (proposal_id={proposal.id})"
+                        )
+                    else:
+                        # Use the pre-computed decision when available
+                        decision = self.decision_cache.get_decision(
+                            proposal, preferences, self.ai_service.model_name
+                        )
+                        if decision is not None:
+                            self.pearl_logger.info(
+                                f"Using cached vote decision (proposal_id={proposal.id})"
+                            )
+                        else:
+                            # Make voting decision using AI
+                            decision = await self.ai_service.decide_vote(
+                                proposal=proposal,
+                                strategy=preferences.voting_strategy,
+                                space_id=space_id,
+                            )
+                            await self.decision_cache.put_decision(
+                                proposal,
+                                decision,
+                                preferences,
+                                self.ai_service.model_name,
+                            )
+                        await self._record_journal_step(
+                            run_id,
+                            STEP_DECIDED,
+                            proposal.id,
+                            decision=decision.model_dump(mode="json"),
+                        )
 
                     # Filter by confidence threshold
                     if decision.confidence >= preferences.confidence_threshold:
@@ -731,7 +988,12 @@ class AgentRunService:
                 ) from e
 
     async def _execute_votes(
-        self, decisions: List[VoteDecision], space_id: str, dry_run: bool, run_id: str
+        self,
+        decisions: List[VoteDecision],
+        space_id: str,
+        dry_run: bool,
+        run_id: str,
+        resumed: Optional[JournalState] = None,
     ) -> List[VoteDecision]:
         """Execute votes for the given decisions.
 
@@ -739,6 +1001,8 @@ class AgentRunService:
             decisions: List of VoteDecision objects to execute
             space_id: The space ID where votes will be cast
             dry_run: If True, simulate voting without actual execution
+            run_id: The current run ID
+            resumed: Journal state of the interrupted run being resumed, if any
 
         Returns:
             List of VoteDecision objects (same as input for now)
@@ -781,57 +1045,22 @@ class AgentRunService:
                     return decisions
 
                 # Execute actual votes
-                executed_decisions = []
-
-                for decision in decisions:
-                    try:
-                        # Track vote submission state
-                        self.state_tracker.transition(
-                            AgentState.SUBMITTING_VOTE,
-                            {
-                                "run_id": run_id,
-                                "proposal_id": decision.proposal_id,
-                                "vote_type": decision.vote.value,
-                            },
-                        )
-
-                        # Convert VoteType to Snapshot choice format
-                        vote_choice = VOTE_CHOICE_MAPPING[decision.vote]
-
-                        # Execute vote through voting service
-                        vote_result = await self.voting_service.vote_on_proposal(
-                            space=space_id,
-                            proposal=decision.proposal_id,
-                            choice=vote_choice,
-                        )
-
-                        if vote_result.get("success"):
-                            executed_decisions.append(decision)
-                            self.logger.log_vote_execution(decision, True)
-
-                            # Track successful vote cast activity
-                            pass
-
-                            # Extract vote ID from the Snapshot response
-                            vote_id = None
-                            submission_result = vote_result.get("submission_result", {})
-                            if submission_result.get("success"):
-                                response = submission_result.get("response", {})
-                                vote_id = response.get("id")
-
-                            # Queue attestation for successful vote with vote ID
-                            await self._queue_attestation(
-                                decision, space_id, run_id, vote_id
-                            )
-                        else:
-                            self.logger.log_vote_execution(
-                                decision, False, vote_result.get("error")
-                            )
+                executed_positions: Set[int] = set()
+                voter = self._get_voter_address()
+                pending = await self._select_votes_to_submit(
+                    decisions, space_id, run_id, resumed, voter, executed_positions
+                )
+                if pending:
+                    await self._dispatch_votes(
+                        pending, space_id, run_id, voter, executed_positions
+                    )
 
-                    except Exception as e:
-                        self.logger.log_vote_execution(decision, False, str(e))
-                        # Continue with other votes
-                        continue
+                # Keep the decisions in their original order
+                executed_decisions = [
+                    decision
+                    for position, decision in enumerate(decisions)
+                    if position in executed_positions
+                ]
 
                 self.pearl_logger.info(
                     f"Vote execution completed (total_decisions={len(decisions)}, "
@@ -855,10 +1084,149 @@ class AgentRunService:
                 )
                 raise VoteExecutionError(f"Failed to execute votes: {str(e)}") from e
 
+    async def _select_votes_to_submit(
+        self,
+        decisions: List[VoteDecision],
+        space_id: str,
+        run_id: str,
+        resumed: Optional[JournalState],
+        voter: Optional[str],
+        executed_positions: Set[int],
+    ) -> List[Tuple[int, VoteDecision]]:
+        """Skip votes that were already cast and return the ones to submit.
+
+        Votes the interrupted run already submitted count as executed and only
+        get their missing attestation queued. Votes found in the vote ledger
+        are skipped.
+
+        Args:
+            decisions: Decisions to execute, in order
+            space_id: The space ID where votes will be cast
+            run_id: The current run ID
+            resumed: Journal state of the interrupted run being resumed, if any
+            voter: Address votes are cast from, if known
+            executed_positions: Positions of executed decisions; updated in place
+
+        Returns:
+            (position, decision) pairs of the votes to submit
+        """
+        pending: List[Tuple[int, VoteDecision]] = []
+        for position, decision in enumerate(decisions):
+            proposal_id = decision.proposal_id
+            if resumed and resumed.has_step(proposal_id, STEP_SUBMITTED):
+                # Vote already accepted by the hub in the interrupted run
+                executed_positions.add(position)
+                if not resumed.has_step(proposal_id, STEP_ATTESTED) and (
+                    await self._queue_attestation(
+                        decision, space_id, run_id, resumed.vote_ids.get(proposal_id)
+                    )
+                ):
+                    await self._record_journal_step(run_id, STEP_ATTESTED, proposal_id)
+                continue
+
+            if voter and self.vote_ledger.has_voted(space_id, proposal_id, voter):
+                self.pearl_logger.info(
+                    f"Vote already recorded in ledger, not resubmitting "
+                    f"(proposal_id={proposal_id})"
+                )
+                continue
+
+            pending.append((position, decision))
+        return pending
+
+    async def _dispatch_votes(
+        self,
+        pending: List[Tuple[int, VoteDecision]],
+        space_id: str,
+        run_id: str,
+        voter: Optional[str],
+        executed_positions: Set[int],
+    ) -> None:
+        """Submit votes through the dispatcher and record each accepted vote.
+
+        Args:
+            pending: (position, decision) pairs of the votes to submit
+            space_id: The space ID where votes will be cast
+            run_id: The current run ID
+            voter: Address votes are cast from, if known
+            executed_positions: Positions of executed decisions; updated in place
+        """
+
+        async def record_outcome(index: int, outcome: VoteOutcome) -> None:
+            position, decision = pending[index]
+            if outcome.success:
+                executed_positions.add(position)
+            try:
+                await self._record_vote_outcome(
+                    decision, outcome, space_id, run_id, voter
+                )
+            except Exception as e:
+                self.logger.log_vote_execution(decision, False, str(e))
+
+        # Track vote submission state
+        self.state_tracker.transition(
+            AgentState.SUBMITTING_VOTE,
+            {
+                "run_id": run_id,
+                "proposal_ids": [d.proposal_id for _, d in pending],
+            },
+        )
+        await self.vote_dispatcher.dispatch(
+            [
+                VoteRequest(
+                    space=space_id,
+                    proposal=decision.proposal_id,
+                    choice=VOTE_CHOICE_MAPPING[decision.vote],
+                )
+                for _, decision in pending
+            ],
+            on_outcome=record_outcome,
+        )
+
+    async def _record_vote_outcome(
+        self,
+        decision: VoteDecision,
+        outcome: VoteOutcome,
+        space_id: str,
+        run_id: str,
+        voter: Optional[str],
+    ) -> None:
+        """Log a vote outcome and, if accepted, record it and queue its attestation."""
+        self.state_tracker.transition(
+            AgentState.SUBMITTING_VOTE,
+            {
+                "run_id": run_id,
+                "proposal_id": decision.proposal_id,
+                "vote_type": decision.vote.value,
+                "accepted": outcome.success,
+                "attempts": outcome.attempts,
+            },
+        )
+        if not outcome.success:
+            self.logger.log_vote_execution(decision, False, outcome.error)
+            return
+
+        self.logger.log_vote_execution(decision, True)
+
+        vote_id = outcome.vote_id
+        if voter:
+            await self.vote_ledger.record_submission(
+                space_id, decision.proposal_id, voter, vote_id
+            )
+        await self._record_journal_step(
+            run_id, STEP_SUBMITTED, decision.proposal_id, vote_id=vote_id
+        )
+
+        # Queue attestation for successful vote with vote ID
+        if await self._queue_attestation(decision, space_id, run_id, vote_id):
+            await self._record_journal_step(run_id, STEP_ATTESTED, decision.proposal_id)
+
     async def close(self) -> None:
         """Close service resources."""
         if hasattr(self.snapshot_service, "close"):
             await self.snapshot_service.close()
+        if hasattr(self.voting_service, "close"):
+            await self.voting_service.close()
 
         self.pearl_logger.info("AgentRunService resources closed")
 
@@ -910,128 +1278,59 @@ class AgentRunService:
         self._active_run = False
         await self.save_state()
 
-    async def _process_pending_attestations(self, space_id: str) -> None:
-        """Process any pending attestations from previous runs.
+    async def _migrate_pending_attestations(self, space_id: str) -> None:
+        """Move attestations pending in the space checkpoint into the queue.
+
+        Older versions kept pending attestations in ``agent_checkpoint_{space}``.
+        They are moved once per space and process so they are not lost.
 
         Args:
-            space_id: The space ID to process attestations for
+            space_id: The space ID to migrate attestations for
         """
-        print(f"DEBUG: _process_pending_attestations called for space_id={space_id}")
-
-        if not self.state_manager:
-            print("DEBUG: No state_manager, returning early")
+        if not self.state_manager or not self.attestation_queue:
             return
+        if space_id in self._migrated_attestation_spaces:
+            return
+        self._migrated_attestation_spaces.add(space_id)
 
         try:
-            # Load checkpoint with any pending attestations
             checkpoint_name = f"agent_checkpoint_{space_id}"
-            print(f"DEBUG: Loading checkpoint '{checkpoint_name}'")
             checkpoint = await self.state_manager.load_checkpoint(checkpoint_name)
-
-            if not checkpoint:
-                print(f"DEBUG: No checkpoint found for '{checkpoint_name}'")
-                return
-
-            if "pending_attestations" not in checkpoint:
-                print("DEBUG: No 'pending_attestations' key in checkpoint")
-                return
-
-            print(
-                f"DEBUG: Checkpoint loaded successfully with keys: {list(checkpoint.keys())}"
-            )
-            print(
-                f"DEBUG: Found {len(checkpoint['pending_attestations'])} pending attestations"
-            )
-
-            pending_attestations = checkpoint["pending_attestations"]
+            pending_attestations = (checkpoint or {}).get("pending_attestations")
             if not pending_attestations:
-                print("DEBUG: No pending attestations to process")
                 return
 
-            print(
-                f"DEBUG: Starting to process {len(pending_attestations)} pending attestations"
-            )
-
-            self.pearl_logger.info(
-                f"Processing {len(pending_attestations)} pending attestations for space {space_id}"
-            )
-
-            processed_attestations = []
-            remaining_attestations = []
-
             for attestation in pending_attestations:
-                # Check retry count
-                retry_count = attestation.get("retry_count", 0)
-                if retry_count >= MAX_ATTESTATION_RETRIES:
-                    self.pearl_logger.warning(
-                        f"Attestation for proposal {attestation['proposal_id']} exceeded max retries, dropping"
-                    )
-                    continue
-
-                try:
-                    # Create EAS attestation data
-                    eas_data = EASAttestationData(
-                        agent=attestation["voter_address"],
-                        space_id=space_id,
-                        proposal_id=attestation["proposal_id"],
-                        vote_choice=attestation["vote_choice"],
-                        snapshot_sig=attestation["vote_tx_hash"],
-                        timestamp=int(
-                            datetime.fromisoformat(attestation["timestamp"]).timestamp()
-                        )
-                        if isinstance(attestation["timestamp"], str)
-                        else int(attestation["timestamp"]),
-                        run_id=attestation.get(
+                timestamp = attestation["timestamp"]
+                await self.attestation_queue.enqueue(
+                    {
+                        **attestation,
+                        "space_id": space_id,
+                        "timestamp": datetime.fromisoformat(timestamp).timestamp()
+                        if isinstance(timestamp, str)
+                        else timestamp,
+                        "run_id": attestation.get(
                             "run_id", f"{space_id}_{int(time.time())}"
                         ),
-                        confidence=int(attestation.get("confidence", 80)),
-                        retry_count=attestation.get("retry_count", 0),
-                    )
-
-                    # Submit attestation
-                    self.pearl_logger.info(
-                        f"Submitting EAS attestation for proposal {attestation['proposal_id']} "
-                        f"(attempt {retry_count + 1}/{MAX_ATTESTATION_RETRIES})"
-                    )
-                    result = await self.safe_service.create_eas_attestation(eas_data)
-
-                    if result.get("success"):
-                        self.pearl_logger.info(
-                            f"Successfully created attestation for proposal {attestation['proposal_id']}: "
-                            f"tx_hash={result.get('safe_tx_hash')}, success={result.get('success')}"
-                        )
-                    else:
-                        self.pearl_logger.error(
-                            f"Failed to create attestation for proposal {attestation['proposal_id']}: "
-                            f"error={result.get('error')}"
-                        )
-                        raise Exception(f"Attestation failed: {result.get('error')}")
-
-                    processed_attestations.append(attestation["proposal_id"])
-
-                except Exception as e:
-                    self.pearl_logger.exception(
-                        f"Failed to process attestation for proposal {attestation['proposal_id']}: {str(e)}"
-                    )
-
-                    # Increment retry count and keep in queue
-                    attestation["retry_count"] = retry_count + 1
-                    remaining_attestations.append(attestation)
+                        "confidence": int(
+                            attestation.get(
+                                "confidence", DEFAULT_ATTESTATION_CONFIDENCE
+                            )
+                        ),
+                    }
+                )
 
-            # Update checkpoint with remaining attestations
-            checkpoint["pending_attestations"] = remaining_attestations
-            await self.state_manager.save_checkpoint(
-                f"agent_checkpoint_{space_id}", checkpoint
+            del checkpoint["pending_attestations"]
+            await self.state_manager.save_checkpoint(checkpoint_name, checkpoint)
+            self.pearl_logger.info(
+                f"Migrated pending attestations to queue (space_id={space_id}, "
+                f"count={len(pending_attestations)})"
             )
 
-            if processed_attestations:
-                self.pearl_logger.info(
-                    f"Processed {len(processed_attestations)} attestations successfully"
-                )
-
         except Exception as e:
             self.pearl_logger.error(
-                f"Error processing pending attestations for space {space_id}: {str(e)}"
+                f"Error migrating pending attestations (space_id={space_id}, "
+                f"error={str(e)})"
             )
 
     async def _queue_attestation(
@@ -1040,7 +1339,7 @@ class AgentRunService:
         space_id: str,
         run_id: str,
         vote_tx_hash: Optional[str] = None,
-    ) -> None:
+    ) -> bool:
         """Queue an attestation for a successful vote.
 
         Args:
@@ -1048,63 +1347,120 @@ class AgentRunService:
             space_id: The space ID where the vote was cast
             run_id: The current agent run ID
             vote_tx_hash: The vote transaction hash/ID from Snapshot (optional)
+
+        Returns:
+            True if the attestation was queued
         """
-        if not self.state_manager:
-            self.pearl_logger.warning("No state manager, skipping attestation queue")
-            return
+        if not self.attestation_queue:
+            self.pearl_logger.warning("No state store, skipping attestation queue")
+            return False
 
         try:
-            # Load current checkpoint
-            checkpoint = await self.state_manager.load_checkpoint(
-                f"agent_checkpoint_{space_id}"
-            )
-            if checkpoint is None:
-                checkpoint = {}
-
-            # Initialize pending_attestations if not present
-            if "pending_attestations" not in checkpoint:
-                checkpoint["pending_attestations"] = []
-
             # Get voter address from voting service account
             voter_address = self.voting_service.account.address
 
-            # For now, use the same address as delegate (can be configured later)
-            delegate_address = voter_address
-
-            # Create attestation data
             # Use provided vote_tx_hash or create a valid placeholder
             tx_hash = vote_tx_hash if vote_tx_hash else "0x" + "0" * 64
 
-            attestation_data = {
-                "proposal_id": decision.proposal_id,
-                "vote_choice": VOTE_CHOICE_MAPPING[
-                    decision.vote
-                ],  # Convert VoteType to choice number
-                "voter_address": voter_address,
-                "delegate_address": delegate_address,
-                "vote_tx_hash": tx_hash,
-                "reasoning": decision.reasoning,
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-                "retry_count": 0,
-            }
-
-            # Add to pending attestations
-            checkpoint["pending_attestations"].append(attestation_data)
+            queued = await self.attestation_queue.enqueue(
+                {
+                    "space_id": space_id,
+                    "proposal_id": decision.proposal_id,
+                    "vote_choice": VOTE_CHOICE_MAPPING[decision.vote],
+                    "voter_address": voter_address,
+                    # For now, use the same address as delegate
+                    "delegate_address": voter_address,
+                    "vote_tx_hash": tx_hash,
+                    "reasoning": decision.reasoning,
+                    "timestamp": time.time(),
+                    "run_id": run_id,
+                    "confidence": DEFAULT_ATTESTATION_CONFIDENCE,
+                }
+            )
+            if queued:
+                self.pearl_logger.info(
+                    f"Queued attestation (proposal_id={decision.proposal_id}, "
+                    f"queue_depth={self.attestation_queue.depth})"
+                )
+            return queued
 
-            # Save updated checkpoint
-            await self.state_manager.save_checkpoint(
-                f"agent_checkpoint_{space_id}", checkpoint
+        except Exception as e:
+            self.pearl_logger.error(
+                f"Failed to queue attestation for proposal {decision.proposal_id}: {str(e)}"
             )
+            # Don't raise - attestation failures should not block voting
+            return False
+
+    async def _resume_or_start_journal(
+        self, request: AgentRunRequest, run_id: str
+    ) -> Optional[JournalState]:
+        """Find an interrupted run to resume, or start a journal for a new run.
+
+        Args:
+            request: The agent run request
+            run_id: Run ID to use when starting a new journal
 
+        Returns:
+            JournalState of the resumed run, or None for a fresh run
+        """
+        if not self.run_journal:
+            return None
+
+        # Runs for specific proposals do not pick up a run for the whole space
+        resumed = (
+            None
+            if request.proposal_ids
+            else await run_in_state_executor(
+                self.run_journal.find_incomplete, request.space_id, request.dry_run
+            )
+        )
+        if resumed:
             self.pearl_logger.info(
-                f"Queued attestation for vote on proposal {decision.proposal_id} - checkpoint key: agent_checkpoint_{space_id}"
+                f"Resuming interrupted agent run (run_id={resumed.run_id}, "
+                f"space_id={request.space_id}, journaled_proposals={len(resumed.proposals)}, "
+                f"journaled_decisions={len(resumed.decisions)})"
             )
+            return resumed
+
+        await run_in_state_executor(
+            self.run_journal.start_run, run_id, request.space_id, request.dry_run
+        )
+        return None
 
+    async def _record_journal_step(
+        self, run_id: Optional[str], step: str, proposal_id: str, **data
+    ) -> None:
+        """Record a proposal step in a run's journal, if enabled.
+
+        The journal fsyncs every record, so the write runs in the state I/O
+        thread pool.
+        """
+        if self.run_journal and run_id:
+            await run_in_state_executor(
+                self.run_journal.record, run_id, step, proposal_id, **data
+            )
+
+    async def _finish_journal(self, run_id: str, outcome: str) -> None:
+        """Mark a run's journal completed or abandoned so it is not resumed.
+
+        Args:
+            run_id: Run to finish
+            outcome: EVENT_RUN_COMPLETED or EVENT_RUN_ABANDONED
+        """
+        if not self.run_journal:
+            return
+        finish = (
+            self.run_journal.complete_run
+            if outcome == EVENT_RUN_COMPLETED
+            else self.run_journal.abandon_run
+        )
+        try:
+            await run_in_state_executor(finish, run_id)
         except Exception as e:
-            self.pearl_logger.error(
-                f"Failed to queue attestation for proposal {decision.proposal_id}: {str(e)}"
+            self.pearl_logger.warning(
+                f"Failed to finish run journal (run_id={run_id}, outcome={outcome}, "
+                f"error={str(e)})"
             )
-            # Don't raise - attestation failures should not block voting
 
     async def _save_checkpoint_state(self, response: AgentRunResponse) -> None:
         """Save checkpoint state during agent run.
@@ -1135,6 +1491,8 @@ class AgentRunService:
         await self.state_manager.save_state(
             f"agent_checkpoint_{response.space_id}", checkpoint_data, sensitive=False
         )
+        # Make saves coalesced during the run durable with the checkpoint
+        await self.state_manager.flush()
 
         self.pearl_logger.info(f"Saved checkpoint state for space {response.space_id}")
 
@@ -1155,14 +1513,6 @@ class AgentRunService:
 
         self.pearl_logger.info("Saved shutdown state for recovery")
 
-    def _get_checkpoint_pattern(self) -> str:
-        """Get the file pattern for checkpoint files.
-
-        Returns:
-            Glob pattern for checkpoint files
-        """
-        return os.path.join(self.state_manager.store_path, "agent_checkpoint_*.json")
-
     async def get_latest_checkpoint(self) -> Optional[dict]:
         """Get the most recent checkpoint across all spaces.
 
@@ -1175,13 +1525,8 @@ class AgentRunService:
         latest_checkpoint = None
         latest_timestamp = None
 
-        # Find all checkpoint files
-        checkpoint_files = glob.glob(self._get_checkpoint_pattern())
-
-        for file_path in checkpoint_files:
-            checkpoint_name = os.path.basename(file_path).replace(".json", "")
-            checkpoint_data = await self.state_manager.load_state(checkpoint_name)
-
+        checkpoints = await self.state_manager.load_states(CHECKPOINT_STATE_PREFIX)
+        for checkpoint_name, checkpoint_data in checkpoints.items():
             if checkpoint_data and "timestamp" in checkpoint_data:
                 # Parse timestamp
                 try:
@@ -1213,7 +1558,11 @@ class AgentRunService:
         Returns:
             True if agent is active, False otherwise
         """
-        return self._active_run or self.state_tracker.current_state != AgentState.IDLE
+        return (
+            self.run_lock.locked()
+            or self._active_run
+            or self.state_tracker.current_state != AgentState.IDLE
+        )
 
     async def get_all_checkpoint_data(self) -> List[dict]:
         """Get data from all checkpoint files.
@@ -1224,19 +1573,8 @@ class AgentRunService:
         if not self.state_manager:
             return []
 
-        checkpoints = []
-
-        # Find all checkpoint files
-        checkpoint_files = glob.glob(self._get_checkpoint_pattern())
-
-        for file_path in checkpoint_files:
-            checkpoint_name = os.path.basename(file_path).replace(".json", "")
-            checkpoint_data = await self.state_manager.load_state(checkpoint_name)
-
-            if checkpoint_data:
-                checkpoints.append(checkpoint_data)
-
-        return checkpoints
+        checkpoints = await self.state_manager.load_states(CHECKPOINT_STATE_PREFIX)
+        return [data for data in checkpoints.values() if data]
 
     async def get_recent_decisions(
         self, limit: int = 5
@@ -1342,10 +1680,10 @@ class AgentRunService:
         total_runtime_seconds = 0.0
 
         try:
-            # Check if list_files method exists
-            if not hasattr(self.state_manager, "list_files"):
+            # Check if load_states method exists
+            if not hasattr(self.state_manager, "load_states"):
                 self.pearl_logger.warning(
-                    "StateManager missing list_files method, returning empty statistics"
+                    "StateManager missing load_states method, returning empty statistics"
                 )
                 return {
                     "total_runs": 0,
@@ -1356,24 +1694,12 @@ class AgentRunService:
                     "average_runtime_seconds": 0.0,
                 }
 
-            # List all checkpoint files
-            checkpoint_files = await self.state_manager.list_files()
-            checkpoint_pattern = re.compile(r"^agent_checkpoint_.*\.json$")
-
-            # Filter for checkpoint files
-            checkpoint_files = [
-                f for f in checkpoint_files if checkpoint_pattern.match(f)
-            ]
+            # Load all checkpoints in one pass over the store
+            checkpoints = await self.state_manager.load_states(CHECKPOINT_STATE_PREFIX)
 
-            # Load and aggregate data from each checkpoint
-            for checkpoint_file in checkpoint_files:
+            # Aggregate data from each checkpoint
+            for checkpoint_key, checkpoint_data in checkpoints.items():
                 try:
-                    # Remove .json extension to get the key name
-                    checkpoint_key = checkpoint_file.replace(".json", "")
-                    checkpoint_data = await self.state_manager.load_state(
-                        checkpoint_key, allow_recovery=True
-                    )
-
                     if checkpoint_data:
                         total_runs += 1
 
@@ -1405,7 +1731,7 @@ class AgentRunService:
 
                 except Exception as e:
                     self.pearl_logger.warning(
-                        f"Error loading checkpoint {checkpoint_file}: {e}"
+                        f"Error loading checkpoint {checkpoint_key}: {e}"
                     )
                     continue
 
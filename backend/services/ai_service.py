@@ -681,6 +681,11 @@ class AIService:
         # Try to initialize if API key is available
         self._initialize_if_key_available()
 
+    @property
+    def model_name(self) -> str:
+        """Identifier of the model that summarizes and decides on proposals."""
+        return str(getattr(self.model, "model_name", None) or self.model)
+
     def _initialize_if_key_available(self) -> None:
         """Try to initialize with available API key."""
         key = self._get_effective_key()
@@ -0,0 +1,645 @@
+"""Persistent attestation queue with a concurrent background worker.
+
+Attestations for accepted votes are appended to their own JSON Lines log in
+the store directory, so queueing one is a single fsync'd append instead of a
+checkpoint rewrite. A background worker submits due items through SafeService
+with bounded concurrency, independently of agent runs, optionally combining
+several into one Safe MultiSend transaction. A failed item is
+rescheduled with exponential backoff and dropped after ``max_attempts``.
+
+With a ReceiptReconciler attached, the worker does not wait for receipts: an
+item stays in the queue, awaiting its receipt, until the reconciler reports
+the transaction as mined or failed. An item whose transaction was broadcast is
+never submitted again on its own: if the reconciler no longer tracks the
+transaction after a restart, it is handed back to it so that the receipt
+decides whether the attestation landed.
+
+The log holds five kinds of records:
+
+- ``enqueued``: a new item (the item is stored inline)
+- ``submitted``: the transaction was broadcast; carries the tracking handle,
+  chain, transaction hash and the items batched into the transaction
+- ``failed``: an attempt failed; carries the attempt count and next attempt time
+- ``completed``: the attestation was submitted
+- ``dropped``: the item ran out of attempts
+
+Replaying the log rebuilds the pending items. Once enough items have finished
+the log is compacted down to the pending ones. Writes run in the state I/O
+thread pool, one at a time so records land in the order they were made.
+"""
+
+import asyncio
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from logging_config import setup_pearl_logger
+from models import EASAttestationData
+from services.receipt_reconciler import (
+    KIND_ATTESTATION,
+    STATUS_CONFIRMED,
+    STATUS_FAILED,
+)
+from utils.state_executor import run_in_state_executor
+
+# Constants
+ATTESTATION_QUEUE_FILE = "attestation_queue.jsonl"
+MAX_ATTESTATION_ATTEMPTS = 6
+DEFAULT_MAX_CONCURRENCY = 2
+BASE_BACKOFF_SECONDS = 30.0
+MAX_BACKOFF_SECONDS = 3600.0
+COMPACT_AFTER_FINISHED = 200
+IDLE_POLL_SECONDS = 60.0
+STOP_GRACE_SECONDS = 10.0
+
+EVENT_ENQUEUED = "enqueued"
+EVENT_SUBMITTED = "submitted"
+EVENT_FAILED = "failed"
+EVENT_COMPLETED = "completed"
+EVENT_DROPPED = "dropped"
+
+SUBMISSION_FIELDS = ("tracking_id", "chain", "tx_hash", "batch")
+
+
+def build_attestation_data(item: Dict[str, Any]) -> EASAttestationData:
+    """Build the EAS attestation payload for a queued item."""
+    return EASAttestationData(
+        agent=item["voter_address"],
+        space_id=item["space_id"],
+        proposal_id=item["proposal_id"],
+        vote_choice=item["vote_choice"],
+        snapshot_sig=item["vote_tx_hash"],
+        timestamp=int(item["timestamp"]),
+        run_id=item["run_id"],
+        confidence=item["confidence"],
+        retry_count=item.get("attempts", 0),
+    )
+
+
+class AttestationQueue:
+    """Append-only attestation queue drained by a background worker."""
+
+    def __init__(
+        self,
+        store_dir: Path,
+        safe_service,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        max_attempts: int = MAX_ATTESTATION_ATTEMPTS,
+        base_backoff: float = BASE_BACKOFF_SECONDS,
+        max_backoff: float = MAX_BACKOFF_SECONDS,
+        batch_size: int = 1,
+    ) -> None:
+        """Initialize the queue and replay its log.
+
+        Args:
+            store_dir: Directory holding the queue log
+            safe_service: SafeService used to submit attestations
+            max_concurrency: Maximum attestations submitted at the same time
+            max_attempts: Attempts before an item is dropped
+            base_backoff: Delay in seconds after the first failed attempt
+            max_backoff: Upper bound for the retry delay in seconds
+            batch_size: Attestations combined into one Safe MultiSend transaction
+        """
+        assert max_concurrency > 0, "max_concurrency must be positive"
+        assert batch_size > 0, "batch_size must be positive"
+        assert max_attempts > 0, "max_attempts must be positive"
+
+        self.path = Path(store_dir) / ATTESTATION_QUEUE_FILE
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.safe_service = safe_service
+        self.max_concurrency = max_concurrency
+        self.max_attempts = max_attempts
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.batch_size = batch_size
+
+        self._items: Dict[str, Dict[str, Any]] = {}
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self._finished_records = 0
+        self._log_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self.receipt_reconciler = None
+
+        # Metrics
+        self.completed = 0
+        self.failed_attempts = 0
+        self.dropped = 0
+
+        self.logger = setup_pearl_logger(__name__)
+        self._load()
+
+    @staticmethod
+    def item_id(space_id: str, proposal_id: str, voter_address: str) -> str:
+        """Build the queue key of an attestation; one per vote."""
+        return f"{space_id}:{proposal_id}:{voter_address.lower()}"
+
+    @property
+    def depth(self) -> int:
+        """Number of attestations waiting to be submitted."""
+        return len(self._items)
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the worker task is running."""
+        return self._task is not None and not self._task.done()
+
+    def use_receipt_reconciler(self, reconciler) -> None:
+        """Submit without waiting for receipts and let ``reconciler`` confirm them.
+
+        Args:
+            reconciler: ReceiptReconciler that tracks the broadcast transactions
+        """
+        self.receipt_reconciler = reconciler
+        reconciler.register_handler(KIND_ATTESTATION, self._on_receipt)
+
+    @staticmethod
+    def _awaiting_receipt(item: Dict[str, Any]) -> bool:
+        """Whether an item's transaction was broadcast and is not settled yet."""
+        return item.get("tracking_id") is not None
+
+    async def _recover_submitted(self) -> None:
+        """Hand broadcast transactions the reconciler lost track of back to it.
+
+        After a restart the reconciler may no longer know a transaction the
+        log recorded as broadcast, for example because its state was pruned
+        or not persisted. Resubmitting those items could attest a vote twice,
+        so the transaction is tracked again and its receipt decides the
+        outcome. A transaction the reconciler already settled as failed is
+        retried right away.
+        """
+        if self.receipt_reconciler is None:
+            return
+
+        orphaned: Dict[str, List[str]] = {}
+        for item_id, item in self._items.items():
+            tracking_id = item.get("tracking_id")
+            if tracking_id is None or self.receipt_reconciler.is_pending(tracking_id):
+                continue
+            orphaned.setdefault(tracking_id, []).append(item_id)
+
+        for tracking_id, item_ids in orphaned.items():
+            record = self.receipt_reconciler.get_status(tracking_id)
+            if record is not None and record["status"] == STATUS_FAILED:
+                await self._on_receipt(record, [])
+                continue
+
+            item = self._items[item_ids[0]]
+            chain, _, tx_hash = tracking_id.partition(":")
+            batch = [i for i in item.get("batch", item_ids) if i in self._items]
+            self.logger.warning(
+                f"Re-tracking broadcast attestation transaction instead of "
+                f"resubmitting (tx_hash={item.get('tx_hash', tx_hash)}, "
+                f"item_count={len(batch)})"
+            )
+            await self.receipt_reconciler.track(
+                {
+                    "chain": item.get("chain", chain),
+                    "tx_hash": item.get("tx_hash", tx_hash),
+                },
+                KIND_ATTESTATION,
+                {"item_ids": batch},
+            )
+
+    def _write_line(self, line: str) -> None:
+        """Durably append a serialized record to the queue log."""
+        with open(self.path, "a") as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+
+    async def _append(self, record: Dict[str, Any]) -> None:
+        """Durably append a record to the queue log without blocking the loop."""
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+        async with self._log_lock:
+            await run_in_state_executor(self._write_line, line)
+
+    async def _safe_append(self, record: Dict[str, Any]) -> None:
+        """Append a status record, logging instead of raising on failure."""
+        try:
+            await self._append(record)
+        except OSError as e:
+            # The in-memory state is still correct; a stale log only causes a retry
+            self.logger.warning(
+                f"Failed to write attestation queue log (event={record['event']}, "
+                f"item_id={record['item_id']}, error={str(e)})"
+            )
+
+    def _load(self) -> None:
+        """Rebuild pending items from the log, ignoring a torn trailing line."""
+        if not self.path.exists():
+            return
+
+        with open(self.path) as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    break
+                self._apply(record)
+
+        self.logger.info(
+            f"Attestation queue loaded (pending={len(self._items)}, "
+            f"finished={self._finished_records})"
+        )
+        if self._finished_records:
+            try:
+                self._rewrite_log(self._pending_records())
+                self._finished_records = 0
+            except OSError as e:
+                self.logger.warning(
+                    f"Failed to compact attestation queue (error={str(e)})"
+                )
+
+    def _apply(self, record: Dict[str, Any]) -> None:
+        """Apply a single log record to the in-memory state."""
+        event = record.get("event")
+        item_id = record.get("item_id")
+        if event == EVENT_ENQUEUED:
+            self._items[item_id] = record["item"]
+        elif event == EVENT_SUBMITTED and item_id in self._items:
+            self._items[item_id].update(
+                (key, record[key]) for key in SUBMISSION_FIELDS if key in record
+            )
+        elif event == EVENT_FAILED and item_id in self._items:
+            self._clear_submission(self._items[item_id])
+            self._items[item_id].update(
+                attempts=record["attempts"],
+                next_attempt_at=record["next_attempt_at"],
+                last_error=record.get("error"),
+            )
+        elif event in (EVENT_COMPLETED, EVENT_DROPPED):
+            self._items.pop(item_id, None)
+            self._finished_records += 1
+
+    @staticmethod
+    def _clear_submission(item: Dict[str, Any]) -> None:
+        """Forget the broadcast transaction of an item that will be retried."""
+        for key in SUBMISSION_FIELDS:
+            item.pop(key, None)
+
+    def _pending_records(self) -> str:
+        """Serialize the pending items as a log of enqueued records."""
+        return "".join(
+            json.dumps(
+                {"event": EVENT_ENQUEUED, "item_id": item_id, "item": item},
+                separators=(",", ":"),
+            )
+            + "\n"
+            for item_id, item in self._items.items()
+        )
+
+    def _rewrite_log(self, data: str) -> None:
+        """Atomically replace the queue log with ``data``."""
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    async def _compact(self) -> None:
+        """Rewrite the log so it only holds the pending items."""
+        async with self._log_lock:
+            # Snapshot under the lock so no record is appended to the old log
+            finished = self._finished_records
+            data = self._pending_records()
+            try:
+                await run_in_state_executor(self._rewrite_log, data)
+                self._finished_records -= finished
+            except OSError as e:
+                self.logger.warning(
+                    f"Failed to compact attestation queue (error={str(e)})"
+                )
+
+    async def enqueue(self, item: Dict[str, Any]) -> bool:
+        """Durably add an attestation to the queue.
+
+        Args:
+            item: Attestation fields; see build_attestation_data for the keys used
+
+        Returns:
+            True if the item is in the queue (including when it already was),
+            False if the log could not be written
+        """
+        item_id = self.item_id(
+            item["space_id"], item["proposal_id"], item["voter_address"]
+        )
+        if item_id in self._items:
+            return True
+
+        now = time.time()
+        item = {**item, "attempts": 0, "next_attempt_at": now, "enqueued_at": now}
+        line = (
+            json.dumps(
+                {"event": EVENT_ENQUEUED, "item_id": item_id, "item": item},
+                separators=(",", ":"),
+            )
+            + "\n"
+        )
+        async with self._log_lock:
+            # Checked again, the same vote may have been queued while waiting
+            if item_id in self._items:
+                return True
+            try:
+                await run_in_state_executor(self._write_line, line)
+            except OSError as e:
+                self.logger.error(
+                    f"Failed to enqueue attestation (item_id={item_id}, error={str(e)})"
+                )
+                return False
+            self._items[item_id] = item
+
+        self._wakeup.set()
+        return True
+
+    def start(self) -> None:
+        """Start the worker if it is not already running."""
+        if self.is_running:
+            return
+        self._stopping = False
+        self._task = asyncio.create_task(self._run_loop())
+        self.logger.info(
+            f"Attestation worker started (pending={self.depth}, "
+            f"max_concurrency={self.max_concurrency})"
+        )
+
+    async def stop(self) -> None:
+        """Stop the worker, giving in-flight submissions a grace period."""
+        self._stopping = True
+        self._wakeup.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        in_flight = list(self._in_flight.values())
+        if in_flight:
+            _, pending = await asyncio.wait(in_flight, timeout=STOP_GRACE_SECONDS)
+            for task in pending:
+                task.cancel()
+        self.logger.info(f"Attestation worker stopped (pending={self.depth})")
+
+    async def run_once(self) -> int:
+        """Submit every item that is currently due and wait for the results.
+
+        Returns:
+            Number of submission attempts made
+        """
+        await self._recover_submitted()
+        attempts = 0
+        while True:
+            tasks = self._dispatch_due()
+            if not tasks:
+                return attempts
+            await asyncio.gather(*tasks)
+            attempts += len(tasks)
+
+    async def _run_loop(self) -> None:
+        """Dispatch due items and sleep until the next one is due."""
+        while not self._stopping:
+            self._wakeup.clear()
+            try:
+                await self._recover_submitted()
+            except Exception as e:
+                self.logger.warning(
+                    f"Failed to recover broadcast attestations (error={str(e)})"
+                )
+            self._dispatch_due()
+            try:
+                await asyncio.wait_for(
+                    self._wakeup.wait(), timeout=self._next_wakeup_in()
+                )
+            except asyncio.TimeoutError:
+                pass
+
+    def _dispatch_due(self) -> List[asyncio.Task]:
+        """Start submissions for due items, up to the concurrency limit.
+
+        Items on their first attempt are grouped into batches of ``batch_size``.
+        Items that already failed are submitted on their own, so one bad
+        attestation cannot keep failing the batches it is put in.
+        """
+        now = time.time()
+        due = sorted(
+            (
+                item_id
+                for item_id, item in self._items.items()
+                if item_id not in self._in_flight
+                and item["next_attempt_at"] <= now
+                and not self._awaiting_receipt(item)
+            ),
+            key=lambda item_id: self._items[item_id]["next_attempt_at"],
+        )
+        fresh = [item_id for item_id in due if self._items[item_id]["attempts"] == 0]
+        groups = [
+            fresh[i : i + self.batch_size]
+            for i in range(0, len(fresh), self.batch_size)
+        ]
+        groups.extend([item_id] for item_id in due if item_id not in fresh)
+
+        tasks = []
+        for group in groups[: max(0, self.max_concurrency - self._submissions())]:
+            task = asyncio.create_task(self._process(group))
+            for item_id in group:
+                self._in_flight[item_id] = task
+            tasks.append(task)
+        return tasks
+
+    def _submissions(self) -> int:
+        """Number of Safe transactions currently being submitted."""
+        return len(set(self._in_flight.values()))
+
+    def _next_wakeup_in(self) -> float:
+        """Seconds until the earliest waiting item is due."""
+        waiting = [
+            item["next_attempt_at"]
+            for item_id, item in self._items.items()
+            if item_id not in self._in_flight and not self._awaiting_receipt(item)
+        ]
+        if not waiting or self._submissions() >= self.max_concurrency:
+            return IDLE_POLL_SECONDS
+        return min(IDLE_POLL_SECONDS, max(0.0, min(waiting) - time.time()))
+
+    async def _process(self, item_ids: List[str]) -> None:
+        """Submit one attestation, or a batch of them, and record the outcomes."""
+        items = [self._items[item_id] for item_id in item_ids]
+        wait_for_receipt = self.receipt_reconciler is None
+        submission = None
+        try:
+            self.logger.info(
+                f"Submitting EAS attestations (count={len(items)}, "
+                f"proposal_ids={[item['proposal_id'] for item in items]})"
+            )
+            if len(items) == 1:
+                result = await self.safe_service.create_eas_attestation(
+                    build_attestation_data(items[0]),
+                    wait_for_receipt=wait_for_receipt,
+                )
+                results = [result]
+                submission = result.get("submission")
+            else:
+                batch = await self.safe_service.create_eas_attestations_batch(
+                    [build_attestation_data(item) for item in items],
+                    wait_for_receipt=wait_for_receipt,
+                )
+                results = batch["results"]
+                submission = batch.get("submission")
+        except Exception as e:
+            results = [{"success": False, "error": str(e)}] * len(items)
+
+        try:
+            if submission is not None:
+                await self._on_submitted(item_ids, submission)
+                return
+            for item_id, item, result in zip(item_ids, items, results):
+                if result.get("success"):
+                    await self._on_success(item_id, result)
+                else:
+                    await self._on_failure(
+                        item_id,
+                        item["attempts"] + 1,
+                        f"Attestation failed: {result.get('error')}",
+                    )
+        finally:
+            for item_id in item_ids:
+                self._in_flight.pop(item_id, None)
+            self._wakeup.set()
+
+    async def _on_submitted(
+        self, item_ids: List[str], submission: Dict[str, Any]
+    ) -> None:
+        """Hand a broadcast transaction to the reconciler and park its items."""
+        assert self.receipt_reconciler is not None
+        tracking_id = await self.receipt_reconciler.track(
+            submission, KIND_ATTESTATION, {"item_ids": item_ids}
+        )
+        chain, _, tx_hash = tracking_id.partition(":")
+        fields = {
+            "tracking_id": tracking_id,
+            "chain": chain,
+            "tx_hash": tx_hash,
+            "batch": item_ids,
+        }
+        for item_id in item_ids:
+            self._items[item_id].update(fields)
+            await self._safe_append(
+                {"event": EVENT_SUBMITTED, "item_id": item_id, **fields}
+            )
+
+    async def _on_receipt(
+        self, record: Dict[str, Any], logs: List[Dict[str, Any]]
+    ) -> None:
+        """Complete or retry the items of a transaction the reconciler settled."""
+        item_ids = record["ref"]["item_ids"]
+        if record["status"] == STATUS_CONFIRMED:
+            uids = self.safe_service.extract_attestation_uids(logs)
+            if len(uids) != len(item_ids):
+                uids = [None] * len(item_ids)
+        else:
+            uids = [None] * len(item_ids)
+
+        for item_id, uid in zip(item_ids, uids):
+            item = self._items.get(item_id)
+            if item is None or item.get("tracking_id") != record["tracking_id"]:
+                continue
+            if record["status"] == STATUS_CONFIRMED:
+                await self._on_success(
+                    item_id, {"safe_tx_hash": record["tx_hash"], "attestation_uid": uid}
+                )
+            else:
+                self._clear_submission(item)
+                await self._on_failure(
+                    item_id,
+                    item["attempts"] + 1,
+                    f"Attestation failed: {record.get('error')}",
+                )
+        self._wakeup.set()
+
+    async def _on_success(self, item_id: str, result: Dict[str, Any]) -> None:
+        """Remove a submitted item from the queue."""
+        item = self._items.pop(item_id)
+        self.completed += 1
+        await self._safe_append(
+            {
+                "event": EVENT_COMPLETED,
+                "item_id": item_id,
+                "tx_hash": result.get("safe_tx_hash"),
+                "attestation_uid": result.get("attestation_uid"),
+            }
+        )
+        self.logger.info(
+            f"Attestation submitted (proposal_id={item['proposal_id']}, "
+            f"tx_hash={result.get('safe_tx_hash')}, "
+            f"attestation_uid={result.get('attestation_uid')}, "
+            f"queue_seconds={time.time() - item['enqueued_at']:.1f})"
+        )
+        self._finished_records += 1
+        if self._finished_records >= COMPACT_AFTER_FINISHED:
+            await self._compact()
+
+    async def _on_failure(self, item_id: str, attempt: int, error: str) -> None:
+        """Reschedule a failed item with exponential backoff, or drop it."""
+        self.failed_attempts += 1
+        item = self._items[item_id]
+
+        if attempt >= self.max_attempts:
+            del self._items[item_id]
+            self.dropped += 1
+            self._finished_records += 1
+            await self._safe_append(
+                {"event": EVENT_DROPPED, "item_id": item_id, "error": error}
+            )
+            self.logger.warning(
+                f"Attestation dropped after max attempts (proposal_id="
+                f"{item['proposal_id']}, attempts={attempt}, error={error})"
+            )
+            return
+
+        delay = min(self.max_backoff, self.base_backoff * 2 ** (attempt - 1))
+        item.update(
+            attempts=attempt, next_attempt_at=time.time() + delay, last_error=error
+        )
+        await self._safe_append(
+            {
+                "event": EVENT_FAILED,
+                "item_id": item_id,
+                "attempts": attempt,
+                "next_attempt_at": item["next_attempt_at"],
+                "error": error,
+            }
+        )
+        self.logger.warning(
+            f"Attestation attempt failed, retrying (proposal_id={item['proposal_id']}, "
+            f"attempt={attempt}, retry_in={delay:.0f}s, error={error})"
+        )
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Return queue depth, age and outcome counters."""
+        now = time.time()
+        oldest = min(
+            (item["enqueued_at"] for item in self._items.values()), default=None
+        )
+        return {
+            "running": self.is_running,
+            "depth": self.depth,
+            "due": sum(
+                1
+                for i in self._items.values()
+                if i["next_attempt_at"] <= now and not self._awaiting_receipt(i)
+            ),
+            "in_flight": len(self._in_flight),
+            "awaiting_receipt": sum(
+                1 for i in self._items.values() if self._awaiting_receipt(i)
+            ),
+            "oldest_age_seconds": round(now - oldest, 1) if oldest else 0.0,
+            "completed": self.completed,
+            "failed_attempts": self.failed_attempts,
+            "dropped": self.dropped,
+        }
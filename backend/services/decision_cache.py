@@ -0,0 +1,249 @@
+"""Decision cache for pre-computed proposal summaries and vote decisions."""
+
+import asyncio
+import hashlib
+import json
+import time
+from typing import Any, Dict, Optional
+
+from logging_config import setup_pearl_logger
+from models import Proposal, ProposalSummary, UserPreferences, VoteDecision
+
+# Constants
+DECISION_CACHE_STATE_NAME = "decision_cache"
+DEFAULT_MAX_CACHE_ENTRIES = 500
+
+
+class DecisionCache:
+    """Cache of AI output keyed by proposal content and decision inputs.
+
+    Entries are keyed by proposal ID and a fingerprint of the proposal fields
+    the AI actually reads, so an edited proposal is re-analyzed instead of being
+    served a stale decision. Within an entry, decisions are keyed by the user
+    preferences and model that produced them, so changing either one is not
+    answered with a decision made under the old settings. Entries expire once
+    the proposal's voting period has ended. When a StateManager is provided
+    the cache is persisted so that pre-computed work survives a restart.
+    """
+
+    def __init__(
+        self, state_manager=None, max_entries: int = DEFAULT_MAX_CACHE_ENTRIES
+    ) -> None:
+        """Initialize the decision cache.
+
+        Args:
+            state_manager: Optional StateManager instance for persistence
+            max_entries: Maximum number of proposals kept in the cache
+        """
+        assert max_entries > 0, "max_entries must be positive"
+
+        self.state_manager = state_manager
+        self.max_entries = max_entries
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = asyncio.Lock()
+        self._loaded = False
+        self.hits = 0
+        self.misses = 0
+        self.logger = setup_pearl_logger(__name__)
+
+    @staticmethod
+    def fingerprint(proposal: Proposal) -> str:
+        """Compute a fingerprint of the proposal content used for analysis.
+
+        Args:
+            proposal: Proposal to fingerprint
+
+        Returns:
+            Hex SHA-256 digest of the analyzed proposal fields
+        """
+        content = json.dumps(
+            [proposal.title, proposal.body, proposal.choices, proposal.end],
+            sort_keys=True,
+        )
+        return hashlib.sha256(content.encode()).hexdigest()
+
+    @staticmethod
+    def decision_key(preferences: UserPreferences, model_name: str) -> str:
+        """Compute the key of the inputs a vote decision was made with.
+
+        Args:
+            preferences: User preferences the decision was made under
+            model_name: Identifier of the AI model that made the decision
+
+        Returns:
+            Hex SHA-256 digest of the preferences and model name
+        """
+        content = json.dumps(
+            [str(model_name), preferences.model_dump(mode="json")], sort_keys=True
+        )
+        return hashlib.sha256(content.encode()).hexdigest()
+
+    async def load(self) -> None:
+        """Load persisted cache entries, dropping those that have expired."""
+        if self._loaded:
+            return
+        self._loaded = True
+
+        if not self.state_manager:
+            return
+
+        try:
+            data = await self.state_manager.load_state(
+                DECISION_CACHE_STATE_NAME, allow_recovery=True
+            )
+        except Exception as e:
+            self.logger.warning(f"Could not load decision cache (error={str(e)})")
+            return
+
+        now = int(time.time())
+        entries = (data or {}).get("entries", {})
+        self._entries = {
+            proposal_id: entry
+            for proposal_id, entry in entries.items()
+            if entry.get("proposal_end", 0) > now
+        }
+        self.logger.info(
+            f"Decision cache loaded (entries={len(self._entries)}, "
+            f"expired={len(entries) - len(self._entries)})"
+        )
+
+    def _get_entry(self, proposal: Proposal) -> Optional[Dict[str, Any]]:
+        """Return the cache entry for a proposal if it is still valid."""
+        entry = self._entries.get(proposal.id)
+        if entry is None:
+            return None
+        if entry.get("fingerprint") != self.fingerprint(proposal):
+            return None
+        if entry.get("proposal_end", 0) <= int(time.time()):
+            return None
+        return entry
+
+    def get_decision(
+        self, proposal: Proposal, preferences: UserPreferences, model_name: str
+    ) -> Optional[VoteDecision]:
+        """Return a cached vote decision for the proposal and decision inputs.
+
+        Args:
+            proposal: Proposal the decision was made for
+            preferences: User preferences the decision must have been made under
+            model_name: AI model the decision must have been made by
+
+        Returns:
+            Cached VoteDecision, or None on a cache miss
+        """
+        entry = self._get_entry(proposal)
+        key = self.decision_key(preferences, model_name)
+        decision_data = (entry or {}).get("decisions", {}).get(key)
+        if decision_data is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return VoteDecision(**decision_data)
+
+    def get_summary(self, proposal: Proposal) -> Optional[ProposalSummary]:
+        """Return a cached summary for the proposal.
+
+        Args:
+            proposal: Proposal the summary was generated for
+
+        Returns:
+            Cached ProposalSummary, or None on a cache miss
+        """
+        entry = self._get_entry(proposal)
+        summary_data = (entry or {}).get("summary")
+        if summary_data is None:
+            return None
+        return ProposalSummary(**summary_data)
+
+    def has_decision(
+        self, proposal: Proposal, preferences: UserPreferences, model_name: str
+    ) -> bool:
+        """Check for a cached decision without affecting hit/miss counters."""
+        entry = self._get_entry(proposal)
+        key = self.decision_key(preferences, model_name)
+        return key in (entry or {}).get("decisions", {})
+
+    async def put_decision(
+        self,
+        proposal: Proposal,
+        decision: VoteDecision,
+        preferences: UserPreferences,
+        model_name: str,
+    ) -> None:
+        """Store a vote decision for the proposal.
+
+        Args:
+            proposal: Proposal the decision was made for
+            decision: The AI vote decision
+            preferences: User preferences the decision was made under
+            model_name: AI model that made the decision
+        """
+        assert decision.proposal_id == proposal.id, "Decision proposal_id mismatch"
+
+        async with self._lock:
+            entry = self._ensure_entry(proposal)
+            key = self.decision_key(preferences, model_name)
+            entry["decisions"][key] = decision.model_dump(mode="json")
+            await self._persist()
+
+    async def put_summary(self, proposal: Proposal, summary: ProposalSummary) -> None:
+        """Store a summary for the proposal.
+
+        Args:
+            proposal: Proposal the summary was generated for
+            summary: The AI proposal summary
+        """
+        assert summary.proposal_id == proposal.id, "Summary proposal_id mismatch"
+
+        async with self._lock:
+            entry = self._ensure_entry(proposal)
+            entry["summary"] = summary.model_dump(mode="json")
+            await self._persist()
+
+    def _ensure_entry(self, proposal: Proposal) -> Dict[str, Any]:
+        """Return the entry for a proposal, replacing it if the content changed."""
+        if self._get_entry(proposal) is None:
+            self._evict_if_full()
+            self._entries[proposal.id] = {
+                "fingerprint": self.fingerprint(proposal),
+                "proposal_end": proposal.end,
+                "space_id": proposal.space_id,
+                "created_at": time.time(),
+                "decisions": {},
+                "summary": None,
+            }
+        return self._entries[proposal.id]
+
+    def _evict_if_full(self) -> None:
+        """Drop expired entries, then the oldest ones, to stay within max_entries."""
+        now = int(time.time())
+        for proposal_id in [
+            pid for pid, e in self._entries.items() if e.get("proposal_end", 0) <= now
+        ]:
+            del self._entries[proposal_id]
+
+        while len(self._entries) >= self.max_entries:
+            oldest = min(
+                self._entries, key=lambda pid: self._entries[pid]["created_at"]
+            )
+            del self._entries[oldest]
+
+    async def _persist(self) -> None:
+        """Persist the cache if a StateManager is configured."""
+        if not self.state_manager:
+            return
+        try:
+            await self.state_manager.save_state(
+                DECISION_CACHE_STATE_NAME, {"entries": self._entries}
+            )
+        except Exception as e:
+            self.logger.warning(f"Could not persist decision cache (error={str(e)})")
+
+    def get_stats(self) -> Dict[str, int]:
+        """Return cache size and hit/miss counters."""
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
@@ -0,0 +1,126 @@
+"""Event-loop stall monitor.
+
+A background task repeatedly sleeps for a short interval and measures how late
+it wakes up. The excess is time the loop spent running something else without
+yielding, typically a blocking call made from a coroutine. Lag above the stall
+threshold is counted as a stall and logged, so blocking chain or file I/O on
+the loop shows up in the metrics instead of as unexplained request latency.
+"""
+
+import asyncio
+from typing import Any, Dict, Optional
+
+from config import settings
+from logging_config import setup_pearl_logger
+
+# Constants
+DEFAULT_SAMPLE_INTERVAL_SECONDS = 0.05
+
+
+class EventLoopMonitor:
+    """Samples event-loop lag and accumulates stall statistics."""
+
+    def __init__(
+        self,
+        interval_seconds: float = DEFAULT_SAMPLE_INTERVAL_SECONDS,
+        stall_threshold_seconds: Optional[float] = None,
+    ) -> None:
+        """Initialize the monitor.
+
+        Args:
+            interval_seconds: Time between lag samples
+            stall_threshold_seconds: Lag above which a sample counts as a stall
+        """
+        self.interval_seconds = interval_seconds
+        self.stall_threshold_seconds = (
+            stall_threshold_seconds
+            if stall_threshold_seconds is not None
+            else settings.loop_stall_threshold_ms / 1000
+        )
+
+        assert self.interval_seconds > 0, "interval_seconds must be positive"
+        assert self.stall_threshold_seconds > 0, (
+            "stall_threshold_seconds must be positive"
+        )
+
+        self._task: Optional[asyncio.Task] = None
+        self.samples = 0
+        self.stalls = 0
+        self.total_lag_seconds = 0.0
+        self.total_stall_seconds = 0.0
+        self.max_lag_seconds = 0.0
+        self.last_lag_seconds = 0.0
+
+        self.logger = setup_pearl_logger(__name__)
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the background task is running."""
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start sampling if not already running."""
+        if self.is_running:
+            return
+        self._task = asyncio.create_task(self._run_loop())
+        self.logger.info(
+            f"Event loop monitor started (interval_seconds={self.interval_seconds}, "
+            f"stall_threshold_seconds={self.stall_threshold_seconds})"
+        )
+
+    async def stop(self) -> None:
+        """Stop sampling and wait for the task to exit."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self.logger.info(
+            f"Event loop monitor stopped (stalls={self.stalls}, "
+            f"max_lag_ms={self.max_lag_seconds * 1000:.1f})"
+        )
+
+    async def _run_loop(self) -> None:
+        """Sample lag until cancelled."""
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval_seconds)
+            self.record(loop.time() - started - self.interval_seconds)
+
+    def record(self, lag_seconds: float) -> None:
+        """Record one lag sample.
+
+        Args:
+            lag_seconds: How late the sampler woke up
+        """
+        lag_seconds = max(lag_seconds, 0.0)
+        self.samples += 1
+        self.last_lag_seconds = lag_seconds
+        self.total_lag_seconds += lag_seconds
+        self.max_lag_seconds = max(self.max_lag_seconds, lag_seconds)
+
+        if lag_seconds >= self.stall_threshold_seconds:
+            self.stalls += 1
+            self.total_stall_seconds += lag_seconds
+            self.logger.warning(
+                f"Event loop stalled (lag_ms={lag_seconds * 1000:.1f}, "
+                f"stalls={self.stalls})"
+            )
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Return lag and stall statistics in milliseconds."""
+        mean_lag = self.total_lag_seconds / self.samples if self.samples else 0.0
+        return {
+            "running": self.is_running,
+            "samples": self.samples,
+            "stalls": self.stalls,
+            "stall_threshold_ms": round(self.stall_threshold_seconds * 1000, 1),
+            "total_stall_ms": round(self.total_stall_seconds * 1000, 1),
+            "max_lag_ms": round(self.max_lag_seconds * 1000, 1),
+            "mean_lag_ms": round(mean_lag * 1000, 2),
+            "last_lag_ms": round(self.last_lag_seconds * 1000, 1),
+        }
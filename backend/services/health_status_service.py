@@ -8,6 +8,7 @@ from models import AgentHealth, HealthCheckResponse
 from services.safe_service import SafeService
 from services.activity_service import ActivityService
 from services.state_transition_tracker import StateTransitionTracker
+from utils.chain_executor import run_in_chain_executor
 
 
 class HealthStatusService:
@@ -121,8 +122,19 @@ class HealthStatusService:
             async with asyncio.timeout(0.05):  # 50ms timeout
                 # Try to get optimal chain connection as a health check
                 optimal_chain = self.safe_service.select_optimal_chain()
-                web3 = self.safe_service.get_web3_connection(optimal_chain)
-                is_connected = web3.is_connected()
+
+                # Never queue behind agent traffic on a throttled endpoint
+                rpc_url = self.safe_service.rpc_endpoints.get(optimal_chain, "")
+                if not self.safe_service.rate_limiter.try_acquire(rpc_url):
+                    self.logger.debug(
+                        "Skipping RPC health probe, endpoint is rate limited (chain=%s)",
+                        optimal_chain,
+                    )
+                    return True
+
+                is_connected = await run_in_chain_executor(
+                    self._is_chain_connected, optimal_chain
+                )
 
                 self.logger.debug(
                     "Transaction manager health check (chain=%s, connected=%s)",
@@ -136,6 +148,23 @@ class HealthStatusService:
             self.logger.warning("Transaction manager health check failed: %s", str(e))
             return True  # Safe default
 
+    def _is_chain_connected(self, chain: str) -> bool:
+        """Check the Web3 connection for a chain (blocking).
+
+        The probe reads the chain ID and latest block in one JSON-RPC batch
+        and caches both for transaction building. A failed probe drops the
+        chain's cached clients so that the next caller reconnects instead of
+        reusing a dead session.
+        """
+        w3 = self.safe_service.get_web3_connection(chain)
+        try:
+            self.safe_service.metadata.refresh(chain, w3)
+            return True
+        except Exception as e:
+            self.logger.debug("Chain probe failed (chain=%s, error=%s)", chain, str(e))
+            self.safe_service.invalidate_chain_clients(chain)
+            return False
+
     async def _check_agent_health(self) -> AgentHealth:
         """
         Check agent health including activity, staking, and funds status.
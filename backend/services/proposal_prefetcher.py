@@ -0,0 +1,254 @@
+"""Background pre-analysis of newly detected proposals.
+
+The prefetcher polls the monitored Snapshot spaces while the agent is idle and
+runs the AI summarization and vote decision for proposals that are not in the
+decision cache yet. Only proposals a run would decide on are analyzed: those
+already voted on and those the user preferences filter out are skipped. A
+subsequent agent run then reads its decisions from the cache instead of
+waiting on the model.
+
+Foreground work always wins: the worker pauses whenever an agent run is
+active, spends at most ``prefetch_max_ai_calls_per_hour`` model calls per
+rolling hour, and sleeps between analyses so that it uses no more than
+``prefetch_cpu_share`` of wall-clock time. It spends model calls on
+proposals that may never be voted on, so it only runs when
+``PREFETCH_ENABLED`` is set.
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from config import settings
+from logging_config import setup_pearl_logger, log_span
+from models import Proposal, UserPreferences
+from services.decision_cache import DecisionCache
+
+# Constants
+BUDGET_WINDOW_SECONDS = 3600
+AI_CALLS_PER_PROPOSAL = 2  # One summary plus one vote decision
+
+
+class ProposalPrefetcher:
+    """Low-priority worker that pre-computes AI output for active proposals."""
+
+    def __init__(
+        self,
+        agent_run_service,
+        decision_cache: DecisionCache,
+        interval_seconds: Optional[int] = None,
+        max_ai_calls_per_hour: Optional[int] = None,
+        cpu_share: Optional[float] = None,
+    ) -> None:
+        """Initialize the prefetcher.
+
+        Args:
+            agent_run_service: AgentRunService providing the AI, Snapshot and
+                preference services and the idle signal
+            decision_cache: Cache the pre-computed output is written to
+            interval_seconds: Seconds between polls of the monitored spaces
+            max_ai_calls_per_hour: Rolling-hour budget of AI model calls
+            cpu_share: Maximum fraction of wall-clock time spent analyzing
+        """
+        self.agent_run_service = agent_run_service
+        self.decision_cache = decision_cache
+        self.interval_seconds = interval_seconds or settings.prefetch_interval_seconds
+        self.max_ai_calls_per_hour = (
+            max_ai_calls_per_hour
+            if max_ai_calls_per_hour is not None
+            else settings.prefetch_max_ai_calls_per_hour
+        )
+        self.cpu_share = cpu_share or settings.prefetch_cpu_share
+
+        assert self.interval_seconds > 0, "interval_seconds must be positive"
+        assert self.max_ai_calls_per_hour >= 0, "max_ai_calls_per_hour must be >= 0"
+        assert 0.0 < self.cpu_share <= 1.0, "cpu_share must be in (0, 1]"
+
+        self._ai_call_times: Deque[float] = deque()
+        self._task: Optional[asyncio.Task] = None
+        self._stop_event = asyncio.Event()
+        self.proposals_analyzed = 0
+        self.analysis_failures = 0
+
+        self.logger = setup_pearl_logger(__name__)
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the background task is running."""
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start the background worker if it is not already running."""
+        if self.is_running:
+            return
+        self._stop_event.clear()
+        self._task = asyncio.create_task(self._run_loop())
+        self.logger.info(
+            f"Proposal prefetcher started (interval_seconds={self.interval_seconds}, "
+            f"max_ai_calls_per_hour={self.max_ai_calls_per_hour}, "
+            f"cpu_share={self.cpu_share})"
+        )
+
+    async def stop(self) -> None:
+        """Stop the background worker and wait for it to exit."""
+        self._stop_event.set()
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self.logger.info("Proposal prefetcher stopped")
+
+    async def _run_loop(self) -> None:
+        """Poll monitored spaces until stopped."""
+        await self.decision_cache.load()
+        while not self._stop_event.is_set():
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.error(f"Prefetch cycle failed (error={str(e)})")
+            await self._sleep(self.interval_seconds)
+
+    async def _sleep(self, seconds: float) -> None:
+        """Sleep for the given time, returning early if the worker is stopped."""
+        try:
+            await asyncio.wait_for(self._stop_event.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
+
+    def _is_idle(self) -> bool:
+        """Whether the agent is idle and the AI service can be used."""
+        if self.agent_run_service.is_agent_active():
+            return False
+        return self.agent_run_service.ai_service.voting_agent is not None
+
+    def _remaining_budget(self) -> int:
+        """Return the number of AI calls left in the rolling budget window."""
+        cutoff = time.time() - BUDGET_WINDOW_SECONDS
+        while self._ai_call_times and self._ai_call_times[0] < cutoff:
+            self._ai_call_times.popleft()
+        return self.max_ai_calls_per_hour - len(self._ai_call_times)
+
+    def _record_ai_calls(self, count: int) -> None:
+        """Charge AI calls against the rolling budget."""
+        now = time.time()
+        self._ai_call_times.extend([now] * count)
+
+    async def run_once(self) -> int:
+        """Run one prefetch cycle over all monitored spaces.
+
+        Returns:
+            Number of proposals analyzed in this cycle
+        """
+        if not self._is_idle():
+            return 0
+
+        preferences = await self._load_preferences()
+        analyzed = 0
+
+        with log_span(self.logger, "prefetch_cycle"):
+            for space_id in settings.monitored_daos_list:
+                proposals = await self._fetch_candidates(space_id, preferences)
+                for proposal in proposals:
+                    if self._stop_event.is_set() or not self._is_idle():
+                        return analyzed
+                    if self._remaining_budget() < AI_CALLS_PER_PROPOSAL:
+                        self.logger.info(
+                            "Prefetch AI call budget exhausted, deferring remaining proposals"
+                        )
+                        return analyzed
+
+                    elapsed = await self._analyze(proposal, preferences, space_id)
+                    analyzed += 1
+
+                    # Duty-cycle throttling keeps the worker at cpu_share of wall time
+                    await self._sleep(elapsed * (1 - self.cpu_share) / self.cpu_share)
+
+        return analyzed
+
+    async def _load_preferences(self) -> UserPreferences:
+        """Load the preferences a foreground run would use."""
+        try:
+            return (
+                await self.agent_run_service.user_preferences_service.load_preferences()
+            )
+        except Exception as e:
+            self.logger.warning(
+                f"Could not load preferences for prefetch, using defaults (error={str(e)})"
+            )
+            return UserPreferences()
+
+    async def _fetch_candidates(
+        self, space_id: str, preferences: UserPreferences
+    ) -> List[Proposal]:
+        """Fetch the proposals a run would decide on that have no cached decision."""
+        try:
+            proposals = await self.agent_run_service.fetch_votable_proposals(
+                space_id, preferences
+            )
+        except Exception as e:
+            self.logger.warning(
+                f"Prefetch could not fetch proposals (space_id={space_id}, error={str(e)})"
+            )
+            return []
+
+        model_name = self.agent_run_service.ai_service.model_name
+        return [
+            p
+            for p in proposals
+            if not self.decision_cache.has_decision(p, preferences, model_name)
+        ]
+
+    async def _analyze(
+        self, proposal: Proposal, preferences: UserPreferences, space_id: str
+    ) -> float:
+        """Summarize and decide on a proposal, storing the results in the cache.
+
+        Returns:
+            Wall-clock seconds spent on the analysis
+        """
+        ai_service = self.agent_run_service.ai_service
+        start = time.monotonic()
+        self._record_ai_calls(AI_CALLS_PER_PROPOSAL)
+
+        try:
+            if self.decision_cache.get_summary(proposal) is None:
+                summary = await ai_service.summarize_proposal(proposal)
+                await self.decision_cache.put_summary(proposal, summary)
+
+            decision = await ai_service.decide_vote(
+                proposal=proposal,
+                strategy=preferences.voting_strategy,
+                space_id=space_id,
+            )
+            await self.decision_cache.put_decision(
+                proposal, decision, preferences, ai_service.model_name
+            )
+            self.proposals_analyzed += 1
+            self.logger.info(
+                f"Pre-analyzed proposal (proposal_id={proposal.id}, space_id={space_id}, "
+                f"vote={decision.vote.value}, confidence={decision.confidence})"
+            )
+        except Exception as e:
+            self.analysis_failures += 1
+            self.logger.warning(
+                f"Pre-analysis failed (proposal_id={proposal.id}, error={str(e)})"
+            )
+
+        return time.monotonic() - start
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return worker and cache statistics."""
+        return {
+            "running": self.is_running,
+            "proposals_analyzed": self.proposals_analyzed,
+            "analysis_failures": self.analysis_failures,
+            "ai_calls_remaining": self._remaining_budget(),
+            "cache": self.decision_cache.get_stats(),
+        }
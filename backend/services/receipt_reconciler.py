@@ -0,0 +1,403 @@
+"""Background confirmation of Safe transactions submitted without waiting.
+
+Submitting with ``wait_for_receipt=False`` returns as soon as a Safe
+transaction is broadcast. The submission is handed to the reconciler, which
+persists it in the StateManager and polls the receipts of all pending
+transactions of a chain with a single JSON-RPC batch per tick. Once a receipt
+is found, or the transaction times out, the Safe nonce is settled and the
+handler registered for the transaction's kind updates the owning record (an
+attestation queue item or a pending withdrawal).
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from hexbytes import HexBytes
+from web3 import Web3
+
+from config import settings
+from logging_config import setup_pearl_logger
+from utils.chain_executor import run_in_chain_executor
+from utils.safe_nonce_manager import NonceReservation
+
+# Constants
+TRACKED_TRANSACTIONS_STATE_NAME = "tracked_transactions"
+MAX_SETTLED_RECORDS = 200
+
+STATUS_PENDING = "pending"
+STATUS_CONFIRMED = "confirmed"
+STATUS_FAILED = "failed"
+
+KIND_ATTESTATION = "attestation"
+KIND_WITHDRAWAL = "withdrawal"
+
+# Called with the settled record and the receipt logs (empty without a receipt)
+ReceiptHandler = Callable[[Dict[str, Any], List[Dict[str, Any]]], Awaitable[None]]
+
+
+def _parse_receipt(raw: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a raw eth_getTransactionReceipt result into plain values."""
+    return {
+        "tx_hash": raw["transactionHash"].lower(),
+        "status": int(raw["status"], 16),
+        "block_number": int(raw["blockNumber"], 16),
+        "gas_used": int(raw["gasUsed"], 16),
+        "logs": raw.get("logs", []),
+    }
+
+
+class ReceiptReconciler:
+    """Tracks broadcast Safe transactions until their receipts are known."""
+
+    def __init__(
+        self,
+        safe_service,
+        state_manager=None,
+        poll_interval_seconds: Optional[float] = None,
+        timeout_seconds: Optional[float] = None,
+    ) -> None:
+        """Initialize the reconciler.
+
+        Args:
+            safe_service: SafeService providing Web3 connections and the
+                rate limiter and nonce manager of each chain
+            state_manager: Optional StateManager instance for persistence
+            poll_interval_seconds: Seconds between receipt polls
+            timeout_seconds: Seconds without a receipt before a transaction
+                is marked failed
+        """
+        self.safe_service = safe_service
+        self.state_manager = state_manager
+        self.poll_interval_seconds = (
+            poll_interval_seconds or settings.receipt_poll_interval_seconds
+        )
+        self.timeout_seconds = timeout_seconds or settings.receipt_timeout_seconds
+
+        assert self.poll_interval_seconds > 0, "poll_interval_seconds must be positive"
+        assert self.timeout_seconds > 0, "timeout_seconds must be positive"
+
+        # tracking_id -> record, for pending and recently settled transactions
+        self._records: Dict[str, Dict[str, Any]] = {}
+        self._handlers: Dict[str, ReceiptHandler] = {}
+        self._loaded = False
+        self._task: Optional[asyncio.Task] = None
+        self._stop_event = asyncio.Event()
+
+        # Metrics
+        self.confirmed = 0
+        self.failed = 0
+        self.timed_out = 0
+        self.polls = 0
+        self.poll_errors = 0
+
+        self.logger = setup_pearl_logger(__name__)
+
+    @staticmethod
+    def tracking_id(chain: str, tx_hash: str) -> str:
+        """Build the tracking handle of a broadcast transaction."""
+        return f"{chain}:{tx_hash.lower()}"
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the background task is running."""
+        return self._task is not None and not self._task.done()
+
+    def register_handler(self, kind: str, handler: ReceiptHandler) -> None:
+        """Set the coroutine called when a transaction of ``kind`` settles."""
+        self._handlers[kind] = handler
+
+    async def load(self) -> None:
+        """Load tracked transactions persisted by a previous process."""
+        if self._loaded:
+            return
+        self._loaded = True
+
+        if not self.state_manager:
+            return
+
+        try:
+            data = await self.state_manager.load_state(
+                TRACKED_TRANSACTIONS_STATE_NAME, allow_recovery=True
+            )
+        except Exception as e:
+            self.logger.warning(f"Could not load tracked transactions (error={str(e)})")
+            return
+
+        self._records = (data or {}).get("transactions", {})
+        self.logger.info(
+            f"Tracked transactions loaded (pending={len(self.pending())}, "
+            f"total={len(self._records)})"
+        )
+
+    async def _persist(self) -> None:
+        """Persist tracked transactions if a StateManager is configured."""
+        if not self.state_manager:
+            return
+        try:
+            await self.state_manager.save_state(
+                TRACKED_TRANSACTIONS_STATE_NAME, {"transactions": self._records}
+            )
+        except Exception as e:
+            self.logger.warning(
+                f"Could not persist tracked transactions (error={str(e)})"
+            )
+
+    async def track(
+        self, submission: Dict[str, Any], kind: str, ref: Dict[str, Any]
+    ) -> str:
+        """Start tracking a transaction submitted with ``wait_for_receipt=False``.
+
+        Args:
+            submission: Pending result of SafeService._submit_safe_transaction
+            kind: Selects the handler called when the transaction settles
+            ref: JSON-serializable data identifying what the transaction is for
+
+        Returns:
+            Tracking handle for get_status
+        """
+        await self.load()
+        chain = submission["chain"]
+        tx_hash = Web3.to_hex(HexBytes(submission["tx_hash"])).lower()
+        tracking_id = self.tracking_id(chain, tx_hash)
+        self._records[tracking_id] = {
+            "tracking_id": tracking_id,
+            "chain": chain,
+            "tx_hash": tx_hash,
+            "kind": kind,
+            "ref": ref,
+            "safe_address": submission.get("safe_address"),
+            "safe_nonce": submission.get("safe_nonce"),
+            "status": STATUS_PENDING,
+            "submitted_at": time.time(),
+        }
+        await self._persist()
+        self.logger.info(
+            f"Tracking transaction receipt (chain={chain}, tx_hash={tx_hash}, "
+            f"kind={kind})"
+        )
+        return tracking_id
+
+    def get_status(self, tracking_id: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of a tracked transaction's record, if known."""
+        record = self._records.get(tracking_id)
+        return dict(record) if record else None
+
+    def is_pending(self, tracking_id: str) -> bool:
+        """Whether the transaction is still waiting for its receipt."""
+        record = self._records.get(tracking_id)
+        return record is not None and record["status"] == STATUS_PENDING
+
+    def pending(self) -> List[Dict[str, Any]]:
+        """Records of all transactions still waiting for their receipt."""
+        return [r for r in self._records.values() if r["status"] == STATUS_PENDING]
+
+    def start(self) -> None:
+        """Start the background worker if it is not already running."""
+        if self.is_running:
+            return
+        self._stop_event.clear()
+        self._task = asyncio.create_task(self._run_loop())
+        self.logger.info(
+            f"Receipt reconciler started (poll_interval_seconds="
+            f"{self.poll_interval_seconds}, timeout_seconds={self.timeout_seconds})"
+        )
+
+    async def stop(self) -> None:
+        """Stop the background worker and wait for it to exit."""
+        self._stop_event.set()
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self.logger.info(f"Receipt reconciler stopped (pending={len(self.pending())})")
+
+    async def _run_loop(self) -> None:
+        """Poll receipts until stopped."""
+        await self.load()
+        while not self._stop_event.is_set():
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.error(f"Receipt poll failed (error={str(e)})")
+            try:
+                await asyncio.wait_for(
+                    self._stop_event.wait(), timeout=self.poll_interval_seconds
+                )
+            except asyncio.TimeoutError:
+                pass
+
+    async def run_once(self) -> int:
+        """Poll the receipts of all pending transactions once.
+
+        Returns:
+            Number of transactions settled
+        """
+        await self.load()
+        by_chain: Dict[str, List[Dict[str, Any]]] = {}
+        for record in self.pending():
+            by_chain.setdefault(record["chain"], []).append(record)
+
+        settled = 0
+        for chain, records in by_chain.items():
+            try:
+                receipts = await self._fetch_receipts(
+                    chain, [record["tx_hash"] for record in records]
+                )
+            except Exception as e:
+                # Leave the transactions pending; timeouts only count polls
+                # that actually reached the node
+                self.poll_errors += 1
+                self.safe_service._on_chain_error(chain, e)
+                self.logger.warning(
+                    f"Could not fetch receipts (chain={chain}, "
+                    f"count={len(records)}, error={str(e)})"
+                )
+                continue
+
+            now = time.time()
+            for record in records:
+                receipt = receipts.get(record["tx_hash"])
+                if receipt is not None:
+                    await self._settle(record, receipt)
+                elif now - record["submitted_at"] > self.timeout_seconds:
+                    self.timed_out += 1
+                    await self._settle(
+                        record,
+                        None,
+                        error=f"No receipt after {self.timeout_seconds:.0f}s",
+                    )
+                else:
+                    continue
+                settled += 1
+
+        if settled:
+            self._prune()
+            await self._persist()
+        return settled
+
+    async def _fetch_receipts(
+        self, chain: str, tx_hashes: List[str]
+    ) -> Dict[str, Dict[str, Any]]:
+        """Fetch the receipts of several transactions in one RPC round trip."""
+        await self.safe_service.rate_limiter.acquire(
+            self.safe_service.rpc_endpoints[chain]
+        )
+        self.polls += 1
+        return await run_in_chain_executor(self._batch_get_receipts, chain, tx_hashes)
+
+    def _batch_get_receipts(
+        self, chain: str, tx_hashes: List[str]
+    ) -> Dict[str, Dict[str, Any]]:
+        """Send one eth_getTransactionReceipt batch (blocking).
+
+        Returns:
+            Parsed receipts by lowercase transaction hash; transactions that
+            are not mined yet are missing
+        """
+        w3 = self.safe_service.get_web3_connection(chain)
+        responses = w3.provider.make_batch_request(
+            [("eth_getTransactionReceipt", [tx_hash]) for tx_hash in tx_hashes]
+        )
+        if not isinstance(responses, list):
+            # The node rejected the whole batch
+            raise ValueError(f"Receipt batch request failed: {responses.get('error')}")
+
+        receipts = {}
+        for response in responses:
+            if response.get("result"):
+                receipt = _parse_receipt(response["result"])
+                receipts[receipt["tx_hash"]] = receipt
+        return receipts
+
+    async def _settle(
+        self,
+        record: Dict[str, Any],
+        receipt: Optional[Dict[str, Any]],
+        error: Optional[str] = None,
+    ) -> None:
+        """Record the outcome, settle the Safe nonce and call the kind handler."""
+        success = receipt is not None and receipt["status"] == 1
+        record.update(
+            status=STATUS_CONFIRMED if success else STATUS_FAILED,
+            settled_at=time.time(),
+        )
+        if receipt is not None:
+            record.update(
+                block_number=receipt["block_number"], gas_used=receipt["gas_used"]
+            )
+        if not success:
+            record["error"] = error or "Transaction reverted"
+
+        if record.get("safe_address") and record.get("safe_nonce") is not None:
+            self.safe_service.nonce_manager.confirm(
+                NonceReservation(
+                    chain=record["chain"],
+                    safe_address=record["safe_address"],
+                    nonce=record["safe_nonce"],
+                    pipelined=False,
+                ),
+                success=success,
+            )
+
+        if success:
+            self.confirmed += 1
+            self.logger.info(
+                f"Transaction confirmed (chain={record['chain']}, "
+                f"tx_hash={record['tx_hash']}, block_number={record['block_number']}, "
+                f"gas_used={record['gas_used']}, "
+                f"confirm_seconds={record['settled_at'] - record['submitted_at']:.1f})"
+            )
+        else:
+            self.failed += 1
+            self.logger.warning(
+                f"Transaction failed (chain={record['chain']}, "
+                f"tx_hash={record['tx_hash']}, error={record['error']})"
+            )
+
+        handler = self._handlers.get(record["kind"])
+        if handler is None:
+            self.logger.warning(
+                f"No receipt handler registered (kind={record['kind']}, "
+                f"tx_hash={record['tx_hash']})"
+            )
+            return
+        try:
+            await handler(record, receipt["logs"] if receipt else [])
+        except Exception as e:
+            self.logger.error(
+                f"Receipt handler failed (kind={record['kind']}, "
+                f"tx_hash={record['tx_hash']}, error={str(e)})"
+            )
+
+    def _prune(self) -> None:
+        """Keep pending records and only the most recently settled ones."""
+        settled = sorted(
+            (r for r in self._records.values() if r["status"] != STATUS_PENDING),
+            key=lambda r: r["settled_at"],
+        )
+        for record in settled[: max(0, len(settled) - MAX_SETTLED_RECORDS)]:
+            del self._records[record["tracking_id"]]
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Return pending count, age and outcome counters."""
+        pending = self.pending()
+        oldest = min((r["submitted_at"] for r in pending), default=None)
+        return {
+            "running": self.is_running,
+            "pending": len(pending),
+            "oldest_pending_age_seconds": (
+                round(time.time() - oldest, 1) if oldest else 0.0
+            ),
+            "confirmed": self.confirmed,
+            "failed": self.failed,
+            "timed_out": self.timed_out,
+            "polls": self.polls,
+            "poll_errors": self.poll_errors,
+        }
@@ -0,0 +1,217 @@
+"""Append-only per-run journal for resumable agent runs.
+
+Each agent run writes one JSON Lines file. The file records the run start,
+then one marker per proposal as it passes each step of the workflow, and
+finally a completion marker:
+
+- ``fetched``: proposal selected for analysis (the proposal is stored inline)
+- ``decided``: AI vote decision made (the decision is stored inline)
+- ``submitted``: vote accepted by the Snapshot hub
+- ``attested``: attestation handed to the attestation queue
+
+A run that failed with an error is marked abandoned instead, so that later
+runs start afresh. A run that has neither marker was interrupted, for example
+by a crash or shutdown. The next run for the same space resumes it:
+journaled proposals and decisions are replayed instead of being fetched and
+re-analyzed, and submitted votes are not sent again.
+"""
+
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+from logging_config import setup_pearl_logger
+from models import Proposal, VoteDecision
+
+# Constants
+JOURNAL_DIR_NAME = "run_journals"
+JOURNAL_SUFFIX = ".jsonl"
+MAX_RESUME_AGE_SECONDS = 6 * 3600
+MAX_JOURNAL_FILES = 100
+
+STEP_FETCHED = "fetched"
+STEP_DECIDED = "decided"
+STEP_SUBMITTED = "submitted"
+STEP_ATTESTED = "attested"
+EVENT_RUN_STARTED = "run_started"
+EVENT_RUN_COMPLETED = "run_completed"
+EVENT_RUN_ABANDONED = "run_abandoned"
+TERMINAL_EVENTS = (EVENT_RUN_COMPLETED, EVENT_RUN_ABANDONED)
+
+
+@dataclass
+class JournalState:
+    """Replayed state of an interrupted run."""
+
+    run_id: str
+    space_id: str
+    dry_run: bool
+    started_at: float
+    proposals: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    decisions: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    vote_ids: Dict[str, Optional[str]] = field(default_factory=dict)
+    steps: Dict[str, Set[str]] = field(default_factory=dict)
+
+    def has_step(self, proposal_id: str, step: str) -> bool:
+        """Whether the proposal already completed the given step."""
+        return step in self.steps.get(proposal_id, set())
+
+    def get_proposals(self) -> List[Proposal]:
+        """Journaled proposals that are still open for voting."""
+        now = int(time.time())
+        return [
+            Proposal(**data)
+            for data in self.proposals.values()
+            if data.get("end", 0) > now
+        ]
+
+    def get_decision(self, proposal_id: str) -> Optional[VoteDecision]:
+        """Journaled decision for a proposal, if one was made."""
+        data = self.decisions.get(proposal_id)
+        return VoteDecision(**data) if data else None
+
+
+class RunJournal:
+    """Writes and replays per-run JSON Lines journals."""
+
+    def __init__(self, journal_dir: Path) -> None:
+        """Initialize the journal.
+
+        Args:
+            journal_dir: Directory holding one journal file per run
+        """
+        self.journal_dir = Path(journal_dir)
+        self.journal_dir.mkdir(parents=True, exist_ok=True)
+        self.logger = setup_pearl_logger(__name__)
+
+    def _path(self, run_id: str) -> Path:
+        """Return the journal file path for a run."""
+        safe_run_id = "".join(c if c.isalnum() or c in "._-" else "_" for c in run_id)
+        return self.journal_dir / f"{safe_run_id}{JOURNAL_SUFFIX}"
+
+    def _append(self, run_id: str, record: Dict[str, Any]) -> None:
+        """Durably append a record to a run's journal."""
+        record = {"timestamp": time.time(), **record}
+        try:
+            with open(self._path(run_id), "a") as f:
+                f.write(json.dumps(record, separators=(",", ":")) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+        except OSError as e:
+            # The journal is an optimization; never fail the run because of it
+            self.logger.warning(
+                f"Failed to write run journal (run_id={run_id}, "
+                f"event={record.get('event')}, error={str(e)})"
+            )
+
+    def start_run(self, run_id: str, space_id: str, dry_run: bool) -> None:
+        """Record the start of a new run."""
+        self._append(
+            run_id,
+            {"event": EVENT_RUN_STARTED, "space_id": space_id, "dry_run": dry_run},
+        )
+        self._prune()
+
+    def record(self, run_id: str, step: str, proposal_id: str, **data: Any) -> None:
+        """Record that a proposal completed a step.
+
+        Args:
+            run_id: Run the step belongs to
+            step: One of the STEP_* markers
+            proposal_id: Proposal that completed the step
+            **data: JSON-serializable payload stored with the marker
+        """
+        assert step in (STEP_FETCHED, STEP_DECIDED, STEP_SUBMITTED, STEP_ATTESTED), (
+            f"Unknown journal step: {step}"
+        )
+        self._append(run_id, {"event": step, "proposal_id": proposal_id, **data})
+
+    def complete_run(self, run_id: str) -> None:
+        """Record that a run finished and must not be resumed."""
+        self._append(run_id, {"event": EVENT_RUN_COMPLETED})
+
+    def abandon_run(self, run_id: str) -> None:
+        """Record that a run failed and must not be resumed."""
+        self._append(run_id, {"event": EVENT_RUN_ABANDONED})
+
+    def _read(self, path: Path) -> List[Dict[str, Any]]:
+        """Read journal records, ignoring a torn trailing line."""
+        records = []
+        with open(path) as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    break
+        return records
+
+    def _replay(self, run_id: str, records: List[Dict[str, Any]]) -> JournalState:
+        """Build the state of a run from its records."""
+        start = records[0]
+        state = JournalState(
+            run_id=run_id,
+            space_id=start["space_id"],
+            dry_run=start.get("dry_run", False),
+            started_at=start["timestamp"],
+        )
+        for record in records[1:]:
+            proposal_id = record.get("proposal_id")
+            event = record.get("event")
+            if proposal_id is None:
+                continue
+            state.steps.setdefault(proposal_id, set()).add(event)
+            if event == STEP_FETCHED:
+                state.proposals[proposal_id] = record["proposal"]
+            elif event == STEP_DECIDED:
+                state.decisions[proposal_id] = record["decision"]
+            elif event == STEP_SUBMITTED:
+                state.vote_ids[proposal_id] = record.get("vote_id")
+        return state
+
+    def find_incomplete(self, space_id: str, dry_run: bool) -> Optional[JournalState]:
+        """Find the most recent interrupted run for a space.
+
+        Args:
+            space_id: Space the run was for
+            dry_run: Only runs with the same dry_run mode are resumed
+
+        Returns:
+            JournalState of the interrupted run, or None
+        """
+        cutoff = time.time() - MAX_RESUME_AGE_SECONDS
+        candidates = sorted(
+            self.journal_dir.glob(f"*{JOURNAL_SUFFIX}"),
+            key=lambda p: p.stat().st_mtime,
+            reverse=True,
+        )
+        for path in candidates:
+            if path.stat().st_mtime < cutoff:
+                break
+            try:
+                records = self._read(path)
+            except OSError:
+                continue
+            if not records or records[0].get("event") != EVENT_RUN_STARTED:
+                continue
+            if records[0].get("space_id") != space_id:
+                continue
+            if records[0].get("dry_run", False) != dry_run:
+                continue
+            if records[-1].get("event") in TERMINAL_EVENTS:
+                return None
+            return self._replay(path.stem, records)
+        return None
+
+    def _prune(self) -> None:
+        """Delete the oldest journals beyond MAX_JOURNAL_FILES."""
+        paths = sorted(
+            self.journal_dir.glob(f"*{JOURNAL_SUFFIX}"), key=lambda p: p.stat().st_mtime
+        )
+        for path in paths[: max(0, len(paths) - MAX_JOURNAL_FILES)]:
+            try:
+                path.unlink()
+            except OSError:
+                pass
@@ -0,0 +1,335 @@
+"""Earliest-deadline-first scheduler for autonomous agent runs.
+
+The scheduler keeps a priority queue of active proposals across all monitored
+spaces, keyed by the time the agent has to act on them: the proposal ``end``
+minus ``settings.min_time_before_deadline``. It sleeps until the earliest of
+the next due proposal and the next proposal refresh, then triggers an agent
+run for the space of every due proposal.
+"""
+
+import asyncio
+import heapq
+import os
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from config import settings
+from logging_config import setup_pearl_logger, log_span
+from models import AgentRunRequest
+
+# Constants
+MAX_PROPOSALS_PER_SPACE_REFRESH = 20
+RETRY_BACKOFF_SECONDS = 60
+
+
+class RunScheduler:
+    """In-process EDF scheduler that triggers agent runs before proposal deadlines."""
+
+    def __init__(
+        self,
+        agent_run_service,
+        refresh_interval: Optional[int] = None,
+        safety_margin: Optional[int] = None,
+        dry_run: bool = False,
+    ) -> None:
+        """Initialize the scheduler.
+
+        Args:
+            agent_run_service: AgentRunService used to fetch proposals and run the agent
+            refresh_interval: Seconds between proposal refreshes
+                (defaults to settings.proposal_check_interval)
+            safety_margin: Seconds before a proposal's end at which to act
+                (defaults to settings.min_time_before_deadline)
+            dry_run: Whether scheduled runs should simulate votes only
+        """
+        self.agent_run_service = agent_run_service
+        self.refresh_interval = refresh_interval or settings.proposal_check_interval
+        self.safety_margin = safety_margin or settings.min_time_before_deadline
+        self.dry_run = dry_run
+
+        assert self.refresh_interval > 0, "refresh_interval must be positive"
+        assert self.safety_margin > 0, "safety_margin must be positive"
+
+        # Heap of (act_at, proposal_end, proposal_id, space_id)
+        self._queue: List[Tuple[float, int, str, str]] = []
+        self._queued_ids: Set[str] = set()
+        self._handled_ids: Set[str] = set()
+        self._next_refresh = 0.0
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+        # Metrics
+        self.runs_triggered = 0
+        self.last_lag_seconds = 0.0
+        self.max_lag_seconds = 0.0
+
+        self.logger = setup_pearl_logger(__name__)
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of proposals waiting in the queue."""
+        return len(self._queue)
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the scheduler task is running."""
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start the scheduler loop if it is not already running."""
+        if self.is_running:
+            return
+        self._stopping = False
+        self._task = asyncio.create_task(self._run_loop())
+        self.logger.info(
+            f"Run scheduler started (refresh_interval={self.refresh_interval}, "
+            f"safety_margin={self.safety_margin}, dry_run={self.dry_run})"
+        )
+
+    async def stop(self) -> None:
+        """Stop the scheduler loop and wait for it to exit."""
+        self._stopping = True
+        self._wakeup.set()
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self.logger.info("Run scheduler stopped")
+
+    def enqueue(self, space_id: str, proposal_id: str, proposal_end: int) -> bool:
+        """Add a proposal to the queue.
+
+        Args:
+            space_id: Snapshot space the proposal belongs to
+            proposal_id: Proposal identifier
+            proposal_end: Voting end timestamp of the proposal
+
+        Returns:
+            True if the proposal was queued, False if already queued or handled
+        """
+        if proposal_id in self._queued_ids or proposal_id in self._handled_ids:
+            return False
+        if proposal_end <= time.time():
+            return False
+
+        act_at = proposal_end - self.safety_margin
+        heapq.heappush(self._queue, (act_at, proposal_end, proposal_id, space_id))
+        self._queued_ids.add(proposal_id)
+        self._wakeup.set()
+        return True
+
+    def discard(self, proposal_id: str) -> bool:
+        """Remove a proposal from the queue, e.g. when it ended or was deleted.
+
+        Args:
+            proposal_id: Proposal identifier
+
+        Returns:
+            True if the proposal was queued and has been removed
+        """
+        if proposal_id not in self._queued_ids:
+            return False
+        self._queue = [entry for entry in self._queue if entry[2] != proposal_id]
+        heapq.heapify(self._queue)
+        self._queued_ids.discard(proposal_id)
+        return True
+
+    def next_due_in(self, now: Optional[float] = None) -> Optional[float]:
+        """Seconds until the earliest queued proposal is due, or None if empty."""
+        if not self._queue:
+            return None
+        now = time.time() if now is None else now
+        return max(0.0, self._queue[0][0] - now)
+
+    async def refresh(self) -> int:
+        """Fetch active proposals for all monitored spaces and queue new ones.
+
+        Returns:
+            Number of proposals newly queued
+        """
+        added = 0
+        active_ids: Set[str] = set()
+        all_fetched = True
+        with log_span(self.logger, "scheduler_refresh"):
+            for space_id in settings.monitored_daos_list:
+                try:
+                    proposals = (
+                        await self.agent_run_service.snapshot_service.get_proposals(
+                            space_ids=[space_id],
+                            state="active",
+                            first=MAX_PROPOSALS_PER_SPACE_REFRESH,
+                        )
+                    )
+                except Exception as e:
+                    self.logger.warning(
+                        f"Scheduler could not fetch proposals (space_id={space_id}, error={str(e)})"
+                    )
+                    all_fetched = False
+                    continue
+
+                for proposal in proposals:
+                    active_ids.add(proposal.id)
+                    if self.enqueue(space_id, proposal.id, proposal.end):
+                        added += 1
+
+        # Forget handled proposals once they are no longer active
+        if all_fetched:
+            self._handled_ids &= active_ids
+
+        self._next_refresh = time.time() + self.refresh_interval
+        self.logger.info(
+            f"Scheduler refresh completed (added={added}, queue_depth={self.queue_depth})"
+        )
+        return added
+
+    def _pop_due(self, now: float) -> Dict[str, List[Tuple[float, int, str]]]:
+        """Pop all due proposals, grouped by space.
+
+        Returns:
+            Mapping of space_id to a list of (act_at, proposal_end, proposal_id)
+        """
+        due: Dict[str, List[Tuple[float, int, str]]] = {}
+        while self._queue and self._queue[0][0] <= now:
+            act_at, proposal_end, proposal_id, space_id = heapq.heappop(self._queue)
+            self._queued_ids.discard(proposal_id)
+            if proposal_end <= now:
+                self.logger.warning(
+                    f"Scheduled proposal ended before it could be handled "
+                    f"(proposal_id={proposal_id}, space_id={space_id})"
+                )
+                continue
+            due.setdefault(space_id, []).append((act_at, proposal_end, proposal_id))
+        return due
+
+    async def _dispatch(
+        self, space_id: str, items: List[Tuple[float, int, str]]
+    ) -> None:
+        """Run the agent for a space whose proposals are due."""
+        now = time.time()
+        lag = max(0.0, now - min(act_at for act_at, _, _ in items))
+        self.last_lag_seconds = lag
+        self.max_lag_seconds = max(self.max_lag_seconds, lag)
+
+        proposal_ids = [proposal_id for _, _, proposal_id in items]
+        self.logger.info(
+            f"Scheduler triggering agent run (space_id={space_id}, "
+            f"proposal_ids={proposal_ids}, lag_seconds={lag:.2f})"
+        )
+
+        try:
+            # Wait for a run started elsewhere since the deferral check
+            async with self.agent_run_service.run_lock:
+                response = await self.agent_run_service.execute_agent_run(
+                    AgentRunRequest(
+                        space_id=space_id,
+                        dry_run=self.dry_run,
+                        proposal_ids=proposal_ids,
+                    )
+                )
+        except Exception as e:
+            self.logger.error(
+                f"Scheduled agent run failed (space_id={space_id}, error={str(e)})"
+            )
+            self._requeue(space_id, items, now)
+            return
+
+        self.runs_triggered += 1
+        if response.errors:
+            self.logger.warning(
+                f"Scheduled agent run reported errors (space_id={space_id}, "
+                f"errors={response.errors})"
+            )
+
+        # Only proposals the run is done with count as handled
+        processed_ids = set(response.processed_proposal_ids)
+        self._handled_ids.update(processed_ids & set(proposal_ids))
+        unprocessed = [item for item in items if item[2] not in processed_ids]
+        if unprocessed:
+            self.logger.warning(
+                f"Scheduled agent run left proposals unprocessed (space_id={space_id}, "
+                f"proposal_ids={[proposal_id for _, _, proposal_id in unprocessed]})"
+            )
+            self._requeue(space_id, unprocessed, now)
+
+    def _requeue(
+        self, space_id: str, items: List[Tuple[float, int, str]], now: float
+    ) -> None:
+        """Retry proposals later, as long as they are still open."""
+        retry_at = now + RETRY_BACKOFF_SECONDS
+        for _, proposal_end, proposal_id in items:
+            if retry_at < proposal_end:
+                heapq.heappush(
+                    self._queue, (retry_at, proposal_end, proposal_id, space_id)
+                )
+                self._queued_ids.add(proposal_id)
+
+    def _should_defer(self) -> bool:
+        """Whether due work must wait for the agent or the operating mode."""
+        if os.environ.get("WITHDRAWAL_MODE", "false").lower() == "true":
+            return True
+        return self.agent_run_service.is_agent_active()
+
+    async def run_once(self, now: Optional[float] = None) -> int:
+        """Refresh if needed and dispatch every due proposal.
+
+        Returns:
+            Number of agent runs triggered
+        """
+        now = time.time() if now is None else now
+        if now >= self._next_refresh:
+            await self.refresh()
+
+        if self._should_defer():
+            return 0
+
+        due = self._pop_due(now)
+        for space_id, items in due.items():
+            await self._dispatch(space_id, items)
+        return len(due)
+
+    def _sleep_seconds(self) -> float:
+        """Seconds to sleep until the next due proposal or refresh."""
+        now = time.time()
+        until_refresh = max(0.0, self._next_refresh - now)
+        next_due = self.next_due_in(now)
+        if next_due is None:
+            return until_refresh
+        return min(until_refresh, next_due)
+
+    async def _run_loop(self) -> None:
+        """Sleep until work is due, then dispatch it."""
+        while not self._stopping:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.error(f"Scheduler iteration failed (error={str(e)})")
+
+            # Poll again shortly when deferred so due work is not delayed a full cycle
+            sleep_for = self._sleep_seconds()
+            if self._should_defer() and self.next_due_in() == 0.0:
+                sleep_for = min(sleep_for, settings.retry_delay_seconds)
+
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=sleep_for)
+            except asyncio.TimeoutError:
+                pass
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Return scheduler metrics for export."""
+        next_due = self.next_due_in()
+        return {
+            "running": self.is_running,
+            "queue_depth": self.queue_depth,
+            "next_due_in_seconds": next_due,
+            "last_lag_seconds": round(self.last_lag_seconds, 3),
+            "max_lag_seconds": round(self.max_lag_seconds, 3),
+            "runs_triggered": self.runs_triggered,
+        }
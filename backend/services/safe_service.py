@@ -1,18 +1,38 @@
 """Safe transaction service for handling multi-signature wallet operations."""
 
+import asyncio
 import json
-import time
 from typing import Dict, Optional, Any, List
+from hexbytes import HexBytes
 from web3 import Web3
 from eth_account import Account
 from safe_eth.eth import EthereumClient
 from safe_eth.safe import Safe
 from safe_eth.safe.api import TransactionServiceApi
+from safe_eth.safe.multi_send import MultiSend, MultiSendOperation, MultiSendTx
 
 from config import settings
 
 from models import EASAttestationData
-from utils.eas_signature import generate_eas_delegated_signature
+from utils.chain_client_registry import (
+    CLIENT_ETHEREUM,
+    CLIENT_SAFE,
+    CLIENT_TRANSACTION_SERVICE,
+    CLIENT_WEB3,
+    get_chain_client_registry,
+    is_connection_error,
+)
+from utils.calldata_encoder import get_calldata_encoder
+from utils.chain_executor import run_in_chain_executor
+from utils.chain_metadata import get_chain_metadata_cache
+from utils.gas_oracle import GasQuote, gas_token_usd_price, get_gas_oracle
+from utils.rpc_endpoint_pool import build_provider, use_failover
+from utils.rpc_rate_limiter import get_rpc_rate_limiter
+from utils.safe_nonce_manager import get_safe_nonce_manager
+from utils.eas_signature import (
+    encode_attestation_data,
+    generate_eas_delegated_signature,
+)
 from services.key_manager import KeyManager
 
 from logging_config import setup_pearl_logger, log_span
@@ -30,15 +50,30 @@ SAFE_SERVICE_URLS = {
     "mode": "https://safe-transaction-mode.safe.global/",
 }
 
+# Static preference, cheapest gas first; breaks ties between sampled costs
+CHAIN_PRIORITY = ["gnosis", "mode", "base", "ethereum"]
+
 # Gas limit for EAS attestation transactions
 # Increased from 300,000 to handle complex nested calls through AttestationTracker to EAS
 EAS_ATTESTATION_GAS_LIMIT = 1000000
 
 
+# Gas the Safe forwards to a single inner call; set to avoid GS013
+DEFAULT_SAFE_TX_GAS = 100000
+
 # Safe operation types
 SAFE_OPERATION_CALL = 0
 SAFE_OPERATION_DELEGATECALL = 1
 
+# MultiSendCallOnly v1.3.0, deployed at the same address on all supported chains
+MULTISEND_CALL_ONLY_ADDRESS = "0x40A2aCCbd92BCA938b02010E17A5b8929b49130D"
+
+# topic0 of EAS Attested(address indexed recipient, address indexed attester,
+# bytes32 uid, bytes32 indexed schemaUID)
+EAS_ATTESTED_EVENT_TOPIC = Web3.to_hex(
+    Web3.keccak(text="Attested(address,address,bytes32,bytes32)")
+)
+
 
 class SafeService:
     """Service for handling Safe multi-signature wallet transactions.
@@ -79,6 +114,11 @@ class SafeService:
         self.private_key = self.key_manager.get_private_key()
         self.account = Account.from_key(self.private_key)
         self._web3_connections = {}
+        self.rate_limiter = get_rpc_rate_limiter()
+        self.clients = get_chain_client_registry()
+        self.metadata = get_chain_metadata_cache()
+        self.nonce_manager = get_safe_nonce_manager()
+        self.gas_oracle = get_gas_oracle()
 
         # Log initialization details
         eoa_address = self.account.address
@@ -140,17 +180,16 @@ class SafeService:
             "safe_service_url": SAFE_SERVICE_URLS.get(chain),
         }
 
-    def _rate_limit_base_rpc(self, rpc_url: str) -> None:
-        """Add rate limiting delay for Base mainnet RPC calls to prevent 429 errors.
+    def _rate_limit_rpc(self, rpc_url: str) -> None:
+        """Wait for the endpoint's rate limiter before an RPC call.
+
+        Blocks the calling thread, so only use it from chain I/O threads;
+        coroutines await ``self.rate_limiter.acquire`` instead.
 
         Args:
-            rpc_url: The RPC endpoint URL to check
+            rpc_url: The RPC endpoint URL about to be called
         """
-        if "mainnet.base.org" in rpc_url:
-            self.logger.debug(
-                f"Adding 1-second delay for Base mainnet RPC call to {rpc_url}"
-            )
-            time.sleep(1.0)
+        self.rate_limiter.acquire_blocking(rpc_url)
 
     def get_web3_connection(self, chain: str) -> Web3:
         """Get Web3 connection for specified chain.
@@ -172,16 +211,83 @@ class SafeService:
         if not rpc_url:
             raise ValueError(f"No RPC endpoint configured for chain: {chain}")
 
-        # Add rate limiting for Base mainnet RPC calls
-        self._rate_limit_base_rpc(rpc_url)
-
-        w3 = Web3(Web3.HTTPProvider(rpc_url))
+        w3 = self._get_web3_instance(chain)
         if not w3.is_connected():
+            self.clients.invalidate(rpc_url)
             raise ConnectionError(f"Failed to connect to {chain} network")
 
         self._web3_connections[chain] = w3
         return w3
 
+    def _get_ethereum_client(self, chain: str) -> EthereumClient:
+        """Get the shared EthereumClient for a chain (blocking on first use)."""
+        rpc_url = self.rpc_endpoints[chain]
+        return self.clients.get(
+            CLIENT_ETHEREUM,
+            rpc_url,
+            lambda: use_failover(EthereumClient(rpc_url), chain, rpc_url),  # type: ignore
+        )
+
+    def _get_safe(self, chain: str, safe_address: str) -> Safe:
+        """Get the shared Safe instance for a checksummed address on a chain."""
+        return self.clients.get(
+            CLIENT_SAFE,
+            f"{self.rpc_endpoints[chain]}|{safe_address}",
+            lambda: Safe(safe_address, self._get_ethereum_client(chain)),  # type: ignore
+        )
+
+    def _get_transaction_service(self, chain: str) -> TransactionServiceApi:
+        """Get the shared Safe Transaction Service client for a chain."""
+        safe_service_url = SAFE_SERVICE_URLS[chain]
+        return self.clients.get(
+            CLIENT_TRANSACTION_SERVICE,
+            safe_service_url,
+            lambda: TransactionServiceApi(
+                network=chain,  # type: ignore
+                base_url=safe_service_url,
+            ),
+        )
+
+    def invalidate_chain_clients(self, chain: str) -> None:
+        """Drop cached clients for a chain so the next call reconnects."""
+        self._web3_connections.pop(chain, None)
+        self.metadata.invalidate(chain)
+        rpc_url = self.rpc_endpoints.get(chain)
+        if rpc_url:
+            self.clients.invalidate(rpc_url)
+        if chain in SAFE_SERVICE_URLS:
+            self.clients.invalidate(SAFE_SERVICE_URLS[chain])
+
+    def _on_chain_error(self, chain: str, error: BaseException) -> None:
+        """Feed a failed chain call back to the rate limiter and client cache."""
+        rpc_url = self.rpc_endpoints.get(chain)
+        if rpc_url and self.rate_limiter.observe_error(rpc_url, error):
+            return
+        if is_connection_error(error):
+            self.invalidate_chain_clients(chain)
+
+    async def warm_up_clients(self) -> None:
+        """Create clients for every configured chain ahead of the first call.
+
+        Failures are logged and left for the first real call to retry.
+        """
+        for chain in self.get_supported_chains():
+            try:
+                await run_in_chain_executor(self._warm_up_chain, chain)
+                self.logger.info(f"Chain clients warmed up (chain={chain})")
+            except Exception as e:
+                self._on_chain_error(chain, e)
+                self.logger.warning(
+                    f"Could not warm up chain clients (chain={chain}, error={str(e)})"
+                )
+
+    def _warm_up_chain(self, chain: str) -> None:
+        """Connect and build the clients used for Safe transactions (blocking)."""
+        w3 = self.get_web3_connection(chain)
+        self.metadata.get_chain_id(chain, w3)
+        self._get_safe(chain, Web3.to_checksum_address(self.safe_addresses[chain]))
+        self._get_transaction_service(chain)
+
     def select_optimal_chain(self) -> str:
         """Select the cheapest chain for Safe transactions.
 
@@ -191,11 +297,7 @@ class SafeService:
         Raises:
             ValueError: If no valid chain configuration found
         """
-        # Priority order: cheapest to most expensive gas fees
-        # Note: Only include chains that have Safe service URLs
-        chain_priority = ["gnosis", "mode", "base", "ethereum"]
-
-        for chain in chain_priority:
+        for chain in CHAIN_PRIORITY:
             if self.is_chain_fully_configured(chain):
                 return chain
 
@@ -214,6 +316,88 @@ class SafeService:
         )
         raise ValueError(error_msg)
 
+    async def select_cheapest_chain(self) -> str:
+        """Select the chain where the activity transaction costs least right now.
+
+        Samples gas price, base fee and, on OP-stack chains, the L1 data fee
+        of every fully configured chain that has a ``GAS_TOKEN_USD_PRICES``
+        entry (cached for ``GAS_PRICE_CACHE_TTL_SECONDS``) and compares the
+        USD cost of a 0-value Safe self-transaction. Chains that cannot be
+        sampled, or whose RPC endpoint is paused after a 429, are skipped.
+        Falls back to ``select_optimal_chain`` if no chain could be priced,
+        which is the default as no token prices are configured.
+
+        Returns:
+            Chain name with the lowest sampled cost
+
+        Raises:
+            ValueError: If no valid chain configuration found
+        """
+        chains = [
+            chain
+            for chain in self.get_supported_chains()
+            if gas_token_usd_price(chain) is not None
+        ]
+        if not chains:
+            return self.select_optimal_chain()
+
+        quotes = await asyncio.gather(*(self._sample_gas(chain) for chain in chains))
+
+        costs = {}
+        decision_inputs = {}
+        for chain, quote in zip(chains, quotes):
+            if quote is None:
+                decision_inputs[chain] = "unavailable"
+                continue
+            cost_usd = quote.cost_usd()
+            decision_inputs[chain] = {
+                "gas_price_wei": quote.gas_price_wei,
+                "base_fee_wei": quote.base_fee_wei,
+                "l1_fee_wei": quote.l1_fee_wei,
+                "cost_wei": quote.cost_wei(),
+                "cost_usd": cost_usd,
+            }
+            if cost_usd is not None:
+                costs[chain] = cost_usd
+
+        if not costs:
+            chain = self.select_optimal_chain()
+            self.logger.warning(
+                f"No chain could be priced, using static preference "
+                f"(chain={chain}, inputs={decision_inputs})"
+            )
+            return chain
+
+        chain = min(costs, key=lambda c: (costs[c], CHAIN_PRIORITY.index(c)))
+        self.logger.info(
+            f"Selected cheapest chain (chain={chain}, cost_usd={costs[chain]:.6f}, "
+            f"inputs={decision_inputs})"
+        )
+        return chain
+
+    async def _sample_gas(self, chain: str) -> Optional[GasQuote]:
+        """Return a gas quote for a chain, or None if its RPC is unhealthy."""
+        quote = self.gas_oracle.get_cached(chain)
+        if quote is not None:
+            return quote
+
+        rpc_url = self.rpc_endpoints[chain]
+        if self.rate_limiter.is_paused(rpc_url):
+            return None
+        try:
+            await self.rate_limiter.acquire(rpc_url)
+            return await run_in_chain_executor(self._read_gas_quote, chain)
+        except Exception as e:
+            self._on_chain_error(chain, e)
+            self.logger.warning(
+                f"Could not sample gas price (chain={chain}, error={str(e)})"
+            )
+            return None
+
+    def _read_gas_quote(self, chain: str) -> GasQuote:
+        """Read gas price and base fee of a chain (blocking)."""
+        return self.gas_oracle.get_quote(chain, self.get_web3_connection(chain))
+
     async def _submit_safe_transaction(
         self,
         *,
@@ -222,6 +406,8 @@ class SafeService:
         value: int,
         data: bytes,
         operation: int = SAFE_OPERATION_CALL,
+        safe_tx_gas: int = DEFAULT_SAFE_TX_GAS,
+        wait_for_receipt: bool = True,
     ) -> Dict[str, Any]:
         """Submit a Safe transaction with the given parameters.
 
@@ -231,6 +417,10 @@ class SafeService:
             value: ETH value to send (in wei)
             data: Transaction data
             operation: Safe operation type (0=CALL, 1=DELEGATECALL)
+            safe_tx_gas: Gas the Safe forwards to the inner call
+            wait_for_receipt: If False, return right after broadcast with
+                ``pending`` set; the caller must hand the result to the
+                ReceiptReconciler, which settles the Safe nonce
 
         Returns:
             Dict with transaction details and success status
@@ -270,38 +460,79 @@ class SafeService:
         ):
             self.logger.info(f"Creating Safe transaction on {chain} to {to}")
 
-            try:
-                safe_address = self.safe_addresses.get(chain)
-                if not safe_address:
-                    raise ValueError(f"No Safe address configured for chain: {chain}")
+            await self.rate_limiter.acquire(self.rpc_endpoints[chain])
+
+            # safe-eth-py and web3's HTTPProvider block, so the whole submission
+            # runs in the chain I/O pool instead of on the event loop
+            return await run_in_chain_executor(
+                self._execute_safe_transaction,
+                chain=chain,
+                to=to,
+                value=value,
+                data=data,
+                operation=operation,
+                safe_tx_gas=safe_tx_gas,
+                wait_for_receipt=wait_for_receipt,
+            )
+
+    def _execute_safe_transaction(
+        self,
+        *,
+        chain: str,
+        to: str,
+        value: int,
+        data: bytes,
+        operation: int,
+        safe_tx_gas: int,
+        wait_for_receipt: bool = True,
+    ) -> Dict[str, Any]:
+        """Build, propose, simulate and execute a Safe transaction.
 
-                safe_address = Web3.to_checksum_address(safe_address)
+        Blocks until the transaction is broadcast, and unless
+        ``wait_for_receipt`` is False until its receipt is available; call it
+        through ``run_in_chain_executor``.
 
-                # Get Web3 and Ethereum client
-                w3 = self.get_web3_connection(chain)
+        Args:
+            chain: Blockchain network name (already validated)
+            to: Transaction recipient address
+            value: ETH value to send (in wei)
+            data: Transaction data
+            operation: Safe operation type (0=CALL, 1=DELEGATECALL)
+            safe_tx_gas: Gas the Safe forwards to the inner call
+            wait_for_receipt: Whether to wait for the receipt after broadcast
 
-                # Add rate limiting before creating EthereumClient
-                rpc_url = self.rpc_endpoints[chain]
-                self._rate_limit_base_rpc(rpc_url)
-                eth_client = EthereumClient(rpc_url)  # type: ignore
+        Returns:
+            Dict with transaction details and success status
+        """
+        try:
+            safe_address = self.safe_addresses.get(chain)
+            if not safe_address:
+                raise ValueError(f"No Safe address configured for chain: {chain}")
 
-                # Initialize Safe instance
-                safe_instance = Safe(safe_address, eth_client)  # type: ignore
+            safe_address = Web3.to_checksum_address(safe_address)
 
-                # Get Safe service for this chain (validation already done upfront)
-                safe_service_url = SAFE_SERVICE_URLS[chain]
-                safe_service = TransactionServiceApi(
-                    network=chain,  # type: ignore
-                    base_url=safe_service_url,
-                )
+            # Get Web3 and Ethereum client
+            w3 = self.get_web3_connection(chain)
+
+            rpc_url = self.rpc_endpoints[chain]
+            safe_instance = self._get_safe(chain, safe_address)
 
+            # Get Safe service for this chain (validation already done upfront)
+            safe_service = self._get_transaction_service(chain)
+
+            # Nonces are handed out locally, so this transaction can be built
+            # and broadcast while earlier ones are still waiting for receipts
+            with self.nonce_manager.reserve(
+                chain, safe_address, safe_instance.retrieve_nonce
+            ) as reservation:
                 # Build Safe transaction with proper gas estimation
                 safe_tx = safe_instance.build_multisig_tx(
                     to=to,
                     value=value,
                     data=data,
                     operation=operation,
-                    safe_tx_gas=100000,  # Set reasonable gas limit to avoid GS013
+                    safe_tx_gas=safe_tx_gas,
+                    safe_nonce=reservation.nonce,
                 )
 
                 # Sign Safe transaction hash
@@ -318,29 +549,40 @@ class SafeService:
                 self.logger.info(
                     f"Built Safe transaction (chain={chain}, safe_address={safe_address}, "
                     f"to={to}, value={value}, data_length={data_length}, "
-                    f"nonce={nonce}, safe_tx_hash={tx_hash})"
+                    f"nonce={nonce}, safe_tx_hash={tx_hash}, "
+                    f"pipelined={reservation.pipelined})"
                 )
 
                 # Propose transaction to Safe Transaction Service
                 safe_service.post_transaction(safe_tx)
                 self.logger.info("Proposed transaction to Safe service")
 
-                # Simulate transaction before execution to catch revert reasons
-                try:
-                    self.logger.info("Simulating Safe transaction before execution")
-                    safe_tx.call()  # This will reveal the specific revert reason if transaction would fail
-                    self.logger.info("Transaction simulation successful")
-                except Exception as simulation_error:
-                    self.logger.error(
-                        f"Transaction simulation failed: {str(simulation_error)}"
+                if reservation.pipelined:
+                    # The on-chain nonce is still behind this one, so a
+                    # simulation or gas estimate would fail on the nonce
+                    self.logger.info(
+                        "Skipping simulation while earlier Safe transactions are pending"
                     )
-                    return {
-                        "success": False,
-                        "error": f"Transaction would revert: {str(simulation_error)}",
-                        "simulation_failed": True,
-                    }
-
-                # Execute Safe transaction on-chain
+                    tx_gas = safe_tx.recommended_gas()
+                else:
+                    # Simulate transaction before execution to catch revert reasons
+                    try:
+                        self.logger.info("Simulating Safe transaction before execution")
+                        safe_tx.call()  # This will reveal the specific revert reason if transaction would fail
+                        self.logger.info("Transaction simulation successful")
+                    except Exception as simulation_error:
+                        self.logger.error(
+                            f"Transaction simulation failed: {str(simulation_error)}"
+                        )
+                        return {
+                            "success": False,
+                            "error": f"Transaction would revert: {str(simulation_error)}",
+                            "simulation_failed": True,
+                        }
+                    tx_gas = None
+
+                # Execute Safe transaction on-chain; the sender's account nonce
+                # is taken from the pending block so back-to-back sends queue up
                 ethereum_tx_sent = safe_instance.send_multisig_tx(
                     to=safe_tx.to,
                     value=safe_tx.value,
@@ -353,50 +595,72 @@ class SafeService:
                     refund_receiver=safe_tx.refund_receiver,
                     signatures=safe_tx.signatures,
                     tx_sender_private_key=self.private_key,
+                    tx_gas=tx_gas,
+                    block_identifier="pending",
                 )
 
                 tx_hash = ethereum_tx_sent.tx_hash
+                self.nonce_manager.mark_sent(reservation, tx_hash.hex())
                 self.logger.info(
                     f"Executed Safe transaction on-chain (tx_hash={tx_hash.hex()})"
                 )
 
-                # Wait for confirmation
-                receipt = w3.eth.wait_for_transaction_receipt(tx_hash)  # type: ignore
-
-                # Extract receipt details for cleaner code
-                tx_hash_hex = tx_hash.hex()
-                block_number = receipt["blockNumber"]
-                gas_used = receipt["gasUsed"]
-                tx_successful = receipt["status"] == 1
+            if not wait_for_receipt:
+                # The nonce stays in flight until the receipt reconciler
+                # confirms the transaction
+                return {
+                    "success": True,
+                    "pending": True,
+                    "tx_hash": tx_hash.hex(),
+                    "chain": chain,
+                    "safe_address": safe_address,
+                    "safe_nonce": reservation.nonce,
+                }
 
-                if tx_successful:
-                    self.logger.info(
-                        f"Transaction successful (tx_hash={tx_hash_hex}, "
-                        f"block_number={block_number}, gas_used={gas_used})"
-                    )
+            # Wait for confirmation
+            try:
+                receipt = w3.eth.wait_for_transaction_receipt(tx_hash)  # type: ignore
+            except Exception:
+                # Outcome unknown: re-read the Safe nonce before the next build
+                self.nonce_manager.confirm(reservation, success=False)
+                raise
+
+            # Extract receipt details for cleaner code
+            tx_hash_hex = tx_hash.hex()
+            block_number = receipt["blockNumber"]
+            gas_used = receipt["gasUsed"]
+            tx_successful = receipt["status"] == 1
+            self.nonce_manager.confirm(reservation, success=tx_successful)
+
+            if tx_successful:
+                self.rate_limiter.report_success(rpc_url)
+                self.logger.info(
+                    f"Transaction successful (tx_hash={tx_hash_hex}, "
+                    f"block_number={block_number}, gas_used={gas_used})"
+                )
 
-                    return {
-                        "success": True,
-                        "tx_hash": tx_hash_hex,
-                        "chain": chain,
-                        "safe_address": safe_address,
-                        "block_number": block_number,
-                        "gas_used": gas_used,
-                    }
-                else:
-                    self.logger.exception(
-                        f"Transaction reverted (tx_hash={tx_hash_hex})"
-                    )
-                    return {
-                        "success": False,
-                        "error": "Transaction reverted",
-                        "tx_hash": tx_hash_hex,
-                    }
+                return {
+                    "success": True,
+                    "tx_hash": tx_hash_hex,
+                    "chain": chain,
+                    "safe_address": safe_address,
+                    "block_number": block_number,
+                    "gas_used": gas_used,
+                    "logs": receipt.get("logs", []),
+                }
+            else:
+                self.logger.exception(f"Transaction reverted (tx_hash={tx_hash_hex})")
+                return {
+                    "success": False,
+                    "error": "Transaction reverted",
+                    "tx_hash": tx_hash_hex,
+                }
 
-            except Exception as e:
-                self.logger.exception(f"Error creating Safe transaction: {str(e)}")
+        except Exception as e:
+            self._on_chain_error(chain, e)
+            self.logger.exception(f"Error creating Safe transaction: {str(e)}")
 
-                return {"success": False, "error": str(e)}
+            return {"success": False, "error": str(e)}
 
     async def perform_activity_transaction(
         self, chain: Optional[str] = None
@@ -406,13 +670,13 @@ class SafeService:
         Creates a 0-ETH transaction from the Safe to itself to satisfy activity tracking.
 
         Args:
-            chain: Specific chain to use, or None to select optimal
+            chain: Specific chain to use, or None to select the cheapest
 
         Returns:
             Dict with transaction details and success status
         """
         if not chain:
-            chain = self.select_optimal_chain()
+            chain = await self.select_cheapest_chain()
 
         safe_address = self.safe_addresses.get(chain)
         if not safe_address:
@@ -441,13 +705,20 @@ class SafeService:
         Returns:
             Current Safe nonce
         """
-        # Add rate limiting for Base mainnet RPC calls
         rpc_url = self.rpc_endpoints[chain]
-        self._rate_limit_base_rpc(rpc_url)
+        await self.rate_limiter.acquire(rpc_url)
+        try:
+            return await run_in_chain_executor(
+                self._retrieve_safe_nonce, chain, safe_address
+            )
+        except Exception as e:
+            self._on_chain_error(chain, e)
+            raise
 
-        eth_client = EthereumClient(rpc_url)  # type: ignore
-        safe_instance = Safe(Web3.to_checksum_address(safe_address), eth_client)  # type: ignore
-        return safe_instance.retrieve_nonce()
+    def _retrieve_safe_nonce(self, chain: str, safe_address: str) -> int:
+        """Read the Safe nonce from chain (blocking)."""
+        safe_address = Web3.to_checksum_address(safe_address)
+        return self._get_safe(chain, safe_address).retrieve_nonce()
 
     async def build_safe_transaction(
         self, chain: str, to: str, value: int = 0, data: bytes = b"", operation: int = 0
@@ -470,19 +741,15 @@ class SafeService:
 
         safe_address = Web3.to_checksum_address(safe_address)
 
-        # Add rate limiting for Base mainnet RPC calls
         rpc_url = self.rpc_endpoints[chain]
-        self._rate_limit_base_rpc(rpc_url)
-
-        eth_client = EthereumClient(rpc_url)  # type: ignore
-        safe_instance = Safe(safe_address, eth_client)  # type: ignore
-
-        safe_tx = safe_instance.build_multisig_tx(
-            to=to,
-            value=value,
-            data=data,
-            operation=operation,
-        )
+        await self.rate_limiter.acquire(rpc_url)
+        try:
+            safe_tx = await run_in_chain_executor(
+                self._build_multisig_tx, chain, safe_address, to, value, data, operation
+            )
+        except Exception as e:
+            self._on_chain_error(chain, e)
+            raise
 
         return {
             "safe_address": safe_address,
@@ -499,13 +766,33 @@ class SafeService:
             "safe_tx_hash": safe_tx.safe_tx_hash.hex(),
         }
 
+    def _build_multisig_tx(
+        self,
+        chain: str,
+        safe_address: str,
+        to: str,
+        value: int,
+        data: bytes,
+        operation: int,
+    ):
+        """Build a Safe multisig transaction from on-chain nonce and gas (blocking)."""
+        return self._get_safe(chain, safe_address).build_multisig_tx(
+            to=to,
+            value=value,
+            data=data,
+            operation=operation,
+        )
+
     async def create_eas_attestation(
-        self, attestation_data: EASAttestationData
+        self, attestation_data: EASAttestationData, wait_for_receipt: bool = True
     ) -> Dict[str, Any]:
         """Create an EAS attestation for a Snapshot vote.
 
         Args:
             attestation_data: The attestation data containing vote details
+            wait_for_receipt: If False, return once the transaction is
+                broadcast; ``submission`` then holds what
+                ReceiptReconciler.track needs
 
         Returns:
             Dict containing success status and transaction details or error
@@ -539,7 +826,9 @@ class SafeService:
 
             # Build the attestation transaction
             self.logger.debug("Building EAS attestation transaction data")
-            tx_data = self._build_eas_attestation_tx(attestation_data)
+            tx_data = await run_in_chain_executor(
+                self._build_eas_attestation_tx, attestation_data
+            )
 
             self.logger.info(
                 f"Built EAS transaction data - to={tx_data['to']}, "
@@ -564,6 +853,7 @@ class SafeService:
                 to=tx_data["to"],
                 data=tx_data_bytes,
                 value=tx_data.get("value", 0),
+                wait_for_receipt=wait_for_receipt,
             )
 
             if result.get("success"):
@@ -576,10 +866,13 @@ class SafeService:
                     f"EAS attestation transaction failed - error={result.get('error')}"
                 )
 
-            return {
+            response = {
                 "success": result.get("success", False),
                 "safe_tx_hash": result.get("tx_hash"),
             }
+            if result.get("pending"):
+                response.update(pending=True, submission=result)
+            return response
 
         except Exception as e:
             self.logger.exception(
@@ -588,6 +881,191 @@ class SafeService:
             )
             return {"success": False, "error": str(e)}
 
+    async def create_eas_attestations_batch(
+        self, attestations: List[EASAttestationData], wait_for_receipt: bool = True
+    ) -> Dict[str, Any]:
+        """Create several EAS attestations in one Safe transaction.
+
+        The attestation calls are encoded into a MultiSendCallOnly payload that
+        the Safe executes with DELEGATECALL, so the batch needs one Safe
+        signature and one receipt. MultiSend is atomic: either every
+        attestation is made or none is.
+
+        Args:
+            attestations: Attestations to create, in order
+            wait_for_receipt: If False, return once the transaction is
+                broadcast; the attestation UIDs are then only known from the
+                receipt the ReceiptReconciler fetches for ``submission``
+
+        Returns:
+            Dict with overall success, the transaction hash, and ``results``: one
+            dict per attestation (same order) with success, attestation_uid and error
+        """
+        assert attestations, "At least one attestation is required"
+
+        try:
+            self.logger.info(
+                f"Creating batched EAS attestations (count={len(attestations)}, "
+                f"proposal_ids={[a.proposal_id for a in attestations]})"
+            )
+
+            if not settings.eas_contract_address or not settings.eas_schema_uid:
+                error = (
+                    "EAS configuration missing: contract address or schema UID not set"
+                )
+                self.logger.error(error)
+                return self._batch_failure(attestations, error)
+
+            if not settings.base_safe_address:
+                self.logger.error("Base Safe address not configured")
+                return self._batch_failure(
+                    attestations, "Base Safe address not configured"
+                )
+
+            tx_data = await run_in_chain_executor(
+                self.build_eas_attestation_batch_tx, attestations
+            )
+            result = await self._submit_safe_transaction(
+                chain="base",
+                to=tx_data["to"],
+                data=tx_data["data"],
+                value=0,
+                operation=tx_data["operation"],
+                safe_tx_gas=DEFAULT_SAFE_TX_GAS * len(attestations),
+                wait_for_receipt=wait_for_receipt,
+            )
+
+            if not result.get("success"):
+                self.logger.error(
+                    f"Batched EAS attestation transaction failed - error={result.get('error')}"
+                )
+                return self._batch_failure(
+                    attestations, result.get("error", "Transaction failed")
+                )
+
+            if result.get("pending"):
+                self.logger.info(
+                    f"Batched EAS attestations broadcast (count={len(attestations)}, "
+                    f"tx_hash={result.get('tx_hash')})"
+                )
+                return {
+                    "success": True,
+                    "pending": True,
+                    "safe_tx_hash": result.get("tx_hash"),
+                    "submission": result,
+                    "results": [
+                        {
+                            "proposal_id": attestation.proposal_id,
+                            "success": True,
+                            "pending": True,
+                            "safe_tx_hash": result.get("tx_hash"),
+                            "attestation_uid": None,
+                        }
+                        for attestation in attestations
+                    ],
+                }
+
+            uids = self.extract_attestation_uids(result.get("logs", []))
+            if len(uids) != len(attestations):
+                self.logger.warning(
+                    f"Attestation UID count does not match batch size "
+                    f"(expected={len(attestations)}, found={len(uids)})"
+                )
+                uids = [None] * len(attestations)
+
+            self.logger.info(
+                f"Batched EAS attestations submitted (count={len(attestations)}, "
+                f"tx_hash={result.get('tx_hash')}, gas_used={result.get('gas_used')})"
+            )
+            return {
+                "success": True,
+                "safe_tx_hash": result.get("tx_hash"),
+                "results": [
+                    {
+                        "proposal_id": attestation.proposal_id,
+                        "success": True,
+                        "safe_tx_hash": result.get("tx_hash"),
+                        "attestation_uid": uid,
+                    }
+                    for attestation, uid in zip(attestations, uids)
+                ],
+            }
+
+        except Exception as e:
+            self.logger.exception(
+                f"Failed to create batched EAS attestations - error={str(e)}"
+            )
+            return self._batch_failure(attestations, str(e))
+
+    def build_eas_attestation_batch_tx(
+        self, attestations: List[EASAttestationData]
+    ) -> Dict[str, Any]:
+        """Build the MultiSend DELEGATECALL transaction for several attestations.
+
+        Args:
+            attestations: Attestations to encode, in order
+
+        Returns:
+            Transaction dict with 'to' (MultiSend), 'data' (bytes) and 'operation'
+        """
+        multi_send_txs = []
+        for attestation in attestations:
+            tx_data = self._build_eas_attestation_tx(attestation)
+            multi_send_txs.append(
+                MultiSendTx(
+                    MultiSendOperation.CALL,
+                    Web3.to_checksum_address(tx_data["to"]),
+                    tx_data.get("value", 0),
+                    tx_data["data"],
+                )
+            )
+
+        multisend_address = Web3.to_checksum_address(
+            settings.multisend_address or MULTISEND_CALL_ONLY_ADDRESS
+        )
+        # Encode offline; MultiSend.build_tx_data would query the node for chainId
+        data = HexBytes(
+            MultiSend(address=multisend_address)
+            .get_contract()
+            .encode_abi(
+                "multiSend", args=[b"".join(tx.encoded_data for tx in multi_send_txs)]
+            )
+        )
+
+        self.logger.info(
+            f"Built MultiSend attestation batch - to={multisend_address}, "
+            f"count={len(multi_send_txs)}, data_length={len(data)}"
+        )
+        return {
+            "to": multisend_address,
+            "data": bytes(data),
+            "operation": SAFE_OPERATION_DELEGATECALL,
+        }
+
+    @staticmethod
+    def extract_attestation_uids(logs: List[Any]) -> List[str]:
+        """Return the UIDs of EAS Attested events in receipt log order."""
+        uids = []
+        for log in logs:
+            topics = log["topics"]
+            if topics and Web3.to_hex(HexBytes(topics[0])) == EAS_ATTESTED_EVENT_TOPIC:
+                uids.append(Web3.to_hex(HexBytes(log["data"])[:32]))
+        return uids
+
+    @staticmethod
+    def _batch_failure(
+        attestations: List[EASAttestationData], error: str
+    ) -> Dict[str, Any]:
+        """Build a batch result where every attestation failed with the same error."""
+        return {
+            "success": False,
+            "error": error,
+            "results": [
+                {"proposal_id": a.proposal_id, "success": False, "error": error}
+                for a in attestations
+            ],
+        }
+
     def _build_eas_attestation_tx(
         self, attestation_data: EASAttestationData
     ) -> Dict[str, Any]:
@@ -656,28 +1134,21 @@ class SafeService:
         )
 
         from utils.web3_provider import get_w3
-        from utils.abi_loader import load_abi
 
         # Get Web3 connection
         self.logger.debug(
             f"Getting Web3 connection for chain: {settings.attestation_chain}"
         )
         w3 = get_w3(settings.attestation_chain)
-        current_block = w3.eth.get_block("latest")
+
+        # Chain ID and block come from the metadata cache, so a build needs
+        # at most one RPC call (the block, once it has expired)
+        chain_id = self.metadata.get_chain_id(settings.attestation_chain, w3)
+        current_block = self.metadata.get_latest_block(settings.attestation_chain, w3)
         self.logger.debug(
             f"Current block number: {current_block['number']}, timestamp: {current_block['timestamp']}"
         )
 
-        # Load ABI using existing utility
-        self.logger.debug(f"Loading ABI for contract type: {abi_name}")
-        contract_abi = load_abi(abi_name)
-        self.logger.debug(f"Loaded ABI with {len(contract_abi)} functions/events")
-
-        contract = w3.eth.contract(
-            address=Web3.to_checksum_address(target_address), abi=contract_abi
-        )
-        self.logger.info(f"Created contract instance at address: {target_address}")
-
         eas_schema_uid = Web3.to_bytes(hexstr=settings.eas_schema_uid)
         assert isinstance(eas_schema_uid, bytes), (
             f"eas_schema_uid must be bytes, got {type(eas_schema_uid)}"
@@ -723,7 +1194,7 @@ class SafeService:
             f"Generating EAS delegated signature for EAS contract: {eas_address}"
         )
         signature = self._generate_eas_delegated_signature(
-            attestation_request_data, w3, eas_address
+            attestation_request_data, w3, eas_address, chain_id=chain_id
         )
 
         # For AttestationTracker, we need to use the new interface with 12 separate parameters
@@ -740,11 +1211,11 @@ class SafeService:
                 f"Built delegated request for AttestationTracker with 12 params - attester={attester}, deadline={deadline}"
             )
 
-            # Build transaction with 12 separate parameters
+            # Encode calldata with 12 separate parameters
             self.logger.debug(
-                "Building attestByDelegation transaction with 12-parameter interface"
+                "Encoding attestByDelegation calldata with 12-parameter interface"
             )
-            tx = contract.functions.attestByDelegation(
+            calldata = get_calldata_encoder(abi_name, "attestByDelegation").encode(
                 eas_schema_uid,  # schema
                 attestation_request_data["recipient"],  # recipient
                 attestation_request_data["expirationTime"],  # expirationTime
@@ -757,11 +1228,6 @@ class SafeService:
                 s,  # s
                 attester,  # attester
                 deadline,  # deadline
-            ).build_transaction(
-                {
-                    "from": settings.base_safe_address,
-                    "gas": EAS_ATTESTATION_GAS_LIMIT,
-                }
             )
         else:
             # For EIP712Proxy, parse signature and include attester
@@ -796,23 +1262,25 @@ class SafeService:
                 f"Built complete delegated request for {abi_name} contract at {target_address} with attester={attester}"
             )
 
-            # Build transaction
-            self.logger.debug("Building attestByDelegation transaction")
-            tx = contract.functions.attestByDelegation(
+            # Encode calldata
+            self.logger.debug("Encoding attestByDelegation calldata")
+            calldata = get_calldata_encoder(abi_name, "attestByDelegation").encode(
                 delegated_request
-            ).build_transaction(
-                {
-                    "from": settings.base_safe_address,
-                    "gas": EAS_ATTESTATION_GAS_LIMIT,
-                }
             )
 
+        # The Safe wraps the call, so only to/data/value are needed; encoding
+        # offline avoids building a web3 transaction and its RPC lookups
+        tx = {
+            "to": Web3.to_checksum_address(target_address),
+            "data": Web3.to_hex(calldata),
+            "value": 0,
+        }
         self.logger.info(
             f"Built delegated attestation transaction - to={tx['to']}, "
-            f"data_length={len(tx['data'])}, gas={tx.get('gas', 'N/A')}"
+            f"data_length={len(tx['data'])}"
         )
 
-        return {"to": tx["to"], "data": tx["data"], "value": tx.get("value", 0)}
+        return tx
 
     def _encode_attestation_data(self, attestation_data: EASAttestationData) -> bytes:
         """Encode attestation data according to EAS schema.
@@ -833,36 +1301,7 @@ class SafeService:
         Returns:
             ABI-encoded bytes
         """
-        w3 = Web3()
-
-        # Ensure agent address is checksummed
-        agent_address = Web3.to_checksum_address(attestation_data.agent)
-
-        # Encode the attestation data with new schema
-        encoded = w3.codec.encode(
-            [
-                "address",
-                "string",
-                "string",
-                "uint8",
-                "string",
-                "uint256",
-                "string",
-                "uint8",
-            ],
-            [
-                agent_address,
-                attestation_data.space_id,
-                attestation_data.proposal_id,
-                attestation_data.vote_choice,
-                attestation_data.snapshot_sig,
-                attestation_data.timestamp,
-                attestation_data.run_id,
-                attestation_data.confidence,
-            ],
-        )
-
-        return encoded
+        return encode_attestation_data(attestation_data)
 
     def _get_web3_instance(self, chain: str) -> Web3:
         """Get Web3 instance for a specific chain.
@@ -877,13 +1316,18 @@ class SafeService:
         if not rpc_url:
             raise ValueError(f"No RPC endpoint configured for chain: {chain}")
 
-        # Add rate limiting for Base mainnet RPC calls
-        self._rate_limit_base_rpc(rpc_url)
+        self._rate_limit_rpc(rpc_url)
 
-        return Web3(Web3.HTTPProvider(rpc_url))
+        return self.clients.get(
+            CLIENT_WEB3, rpc_url, lambda: Web3(build_provider(chain, rpc_url))
+        )
 
     def _generate_eas_delegated_signature(
-        self, request_data: Dict[str, Any], w3: Web3, eas_contract_address: str
+        self,
+        request_data: Dict[str, Any],
+        w3: Web3,
+        eas_contract_address: str,
+        chain_id: Optional[int] = None,
     ) -> bytes:
         """Generate EIP-712 signature for EAS delegated attestation.
 
@@ -894,12 +1338,16 @@ class SafeService:
             request_data: The attestation request data (without signature)
             w3: Web3 instance
             eas_contract_address: EAS contract address
+            chain_id: Chain ID for the EIP-712 domain (read from ``w3`` if omitted)
 
         Returns:
             EIP-712 signature bytes
         """
+        if chain_id is None:
+            chain_id = w3.eth.chain_id
+
         self.logger.info(
-            f"Generating EAS delegated signature - chain_id={w3.eth.chain_id}, "
+            f"Generating EAS delegated signature - chain_id={chain_id}, "
             f"eas_contract={eas_contract_address}, signer={self.account.address}"
         )
 
@@ -915,6 +1363,7 @@ class SafeService:
             w3=w3,
             eas_contract_address=eas_contract_address,
             private_key=self.private_key,
+            chain_id=chain_id,
         )
 
         self.logger.info(
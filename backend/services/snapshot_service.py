@@ -436,6 +436,21 @@ class SnapshotService:
     }
     """
 
+    GET_VOTER_VOTES_QUERY = """
+    query GetVoterVotes($voter: String!, $space: String!, $proposals: [String!]!, $first: Int) {
+        votes(where: {voter: $voter, space: $space, proposal_in: $proposals}, first: $first) {
+            id
+            voter
+            choice
+            vp
+            created
+            proposal {
+                id
+            }
+        }
+    }
+    """
+
     GET_VOTING_POWER_QUERY = """
     query GetVotingPower($voter: String!, $space: String!) {
         vp(voter: $voter, space: $space) {
@@ -578,6 +593,40 @@ class SnapshotService:
 
             return [Vote(**vote_data) for vote_data in result.get("votes", [])]
 
+    async def get_voter_votes(
+        self, voter_address: str, space_id: str, proposal_ids: List[str]
+    ) -> List[Vote]:
+        """Get a voter's votes on several proposals in one query.
+
+        Args:
+            voter_address: The voter's wallet address
+            space_id: The space identifier
+            proposal_ids: Proposals to look up votes for
+
+        Returns:
+            List of Vote objects with the ``proposal`` field set
+        """
+        if not proposal_ids:
+            return []
+
+        variables = {
+            "voter": voter_address,
+            "space": space_id,
+            "proposals": proposal_ids,
+            "first": len(proposal_ids),
+        }
+
+        with log_span(
+            logger,
+            "get_voter_votes",
+            voter_address=voter_address,
+            space_id=space_id,
+            proposal_count=len(proposal_ids),
+        ):
+            result = await self.execute_query(self.GET_VOTER_VOTES_QUERY, variables)
+
+            return [Vote(**vote_data) for vote_data in result.get("votes", [])]
+
     async def get_voting_power(self, space_id: str, voter_address: str) -> float:
         """Get voting power for a voter in a specific space.
 
@@ -0,0 +1,300 @@
+"""Snapshot hub webhook handling.
+
+Snapshot delivers proposal lifecycle events to ``/webhooks/snapshot``. Each
+accepted event schedules targeted work for its proposal. Events are
+deduplicated, and a burst of events for one space is debounced into a single
+unit of work for that space once no new event has arrived for
+``webhook_debounce_seconds``:
+
+- Active proposals from the burst are fetched, analyzed and voted on in one
+  agent run limited to those proposals.
+- Proposals that have not started yet are skipped; Snapshot sends
+  ``proposal/start`` when their voting opens.
+- With the run scheduler enabled, the proposals are also queued by deadline
+  as a fallback, and ended or deleted proposals are removed from the queue.
+"""
+
+import asyncio
+import hashlib
+import hmac
+import time
+from collections import OrderedDict
+from typing import Dict, List, Mapping, Optional, Set
+
+from config import settings
+from logging_config import setup_pearl_logger, log_span
+from models import AgentRunRequest, SnapshotWebhookEvent
+
+# Constants
+PROPOSAL_ACTIVATION_EVENTS = {"proposal/created", "proposal/start"}
+PROPOSAL_REMOVAL_EVENTS = {"proposal/end", "proposal/deleted"}
+SUPPORTED_EVENTS = PROPOSAL_ACTIVATION_EVENTS | PROPOSAL_REMOVAL_EVENTS
+MAX_SEEN_EVENTS = 1000
+# A steady stream of events delays processing by at most this many debounce periods
+MAX_DEBOUNCE_PERIODS = 10
+SIGNATURE_HEADER = "x-signature"
+AUTHENTICATION_HEADER = "authentication"
+
+
+def verify_webhook_request(
+    body: bytes, headers: Mapping[str, str], secret: Optional[str]
+) -> bool:
+    """Verify a webhook request against the configured secret.
+
+    Accepts either an HMAC-SHA256 signature of the raw body in ``X-Signature``
+    (optionally prefixed with ``sha256=``) or the shared secret in the
+    ``Authentication`` header, which is how Snapshot hub webhooks authenticate.
+
+    Args:
+        body: Raw request body
+        headers: Request headers (case-insensitive mapping)
+        secret: Configured webhook secret; verification fails when unset
+
+    Returns:
+        True if the request is authentic
+    """
+    if not secret:
+        return False
+
+    signature = headers.get(SIGNATURE_HEADER)
+    if signature:
+        expected = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+        provided = signature.split("=", 1)[-1].strip().lower()
+        return hmac.compare_digest(expected, provided)
+
+    token = headers.get(AUTHENTICATION_HEADER)
+    if token:
+        return hmac.compare_digest(token.strip().encode(), secret.encode())
+
+    return False
+
+
+class SnapshotWebhookService:
+    """Turns Snapshot webhook events into debounced, deduplicated agent work."""
+
+    def __init__(
+        self,
+        agent_run_service,
+        run_scheduler=None,
+        debounce_seconds: Optional[float] = None,
+    ) -> None:
+        """Initialize the webhook service.
+
+        Args:
+            agent_run_service: AgentRunService used to fetch proposals and run the agent
+            run_scheduler: Optional RunScheduler that receives targeted proposals
+            debounce_seconds: Quiet period after the last event of a burst
+                before the space is processed
+        """
+        self.agent_run_service = agent_run_service
+        self.run_scheduler = run_scheduler
+        self.debounce_seconds = (
+            debounce_seconds
+            if debounce_seconds is not None
+            else settings.webhook_debounce_seconds
+        )
+        assert self.debounce_seconds >= 0, "debounce_seconds must be non-negative"
+
+        self._seen: "OrderedDict[str, None]" = OrderedDict()
+        self._pending: Dict[str, Dict[str, SnapshotWebhookEvent]] = {}
+        self._timers: Dict[str, asyncio.Task] = {}
+        # Event loop times at which each space's burst started and is due
+        self._burst_started: Dict[str, float] = {}
+        self._due_at: Dict[str, float] = {}
+
+        self.events_received = 0
+        self.events_deduplicated = 0
+        self.batches_processed = 0
+
+        self.logger = setup_pearl_logger(__name__)
+
+    def _is_duplicate(self, event: SnapshotWebhookEvent) -> bool:
+        """Record an event and report whether it has been seen before."""
+        key = f"{event.event}:{event.id}"
+        if key in self._seen:
+            return True
+        self._seen[key] = None
+        if len(self._seen) > MAX_SEEN_EVENTS:
+            self._seen.popitem(last=False)
+        return False
+
+    def _is_monitored(self, space_id: str) -> bool:
+        """Whether the space is one the agent monitors."""
+        return space_id in settings.monitored_daos_list
+
+    async def handle_event(self, event: SnapshotWebhookEvent) -> bool:
+        """Accept a webhook event and schedule work for its space.
+
+        Args:
+            event: Parsed webhook event
+
+        Returns:
+            True if the event was accepted, False if ignored or duplicate
+        """
+        self.events_received += 1
+
+        if event.event not in SUPPORTED_EVENTS:
+            self.logger.info(
+                f"Ignoring unsupported webhook event (event={event.event})"
+            )
+            return False
+        if not self._is_monitored(event.space):
+            self.logger.info(
+                f"Ignoring webhook event for unmonitored space (space_id={event.space})"
+            )
+            return False
+        if (
+            event.event in PROPOSAL_ACTIVATION_EVENTS
+            and event.expire is not None
+            and event.expire <= time.time()
+        ):
+            self.logger.info(
+                f"Ignoring webhook event for ended proposal (proposal_id={event.proposal_id})"
+            )
+            return False
+        if self._is_duplicate(event):
+            self.events_deduplicated += 1
+            return False
+
+        # The latest event for a proposal wins within a burst
+        self._pending.setdefault(event.space, {})[event.proposal_id] = event
+        self._schedule(event.space, self.debounce_seconds)
+
+        self.logger.info(
+            f"Webhook event accepted (event={event.event}, space_id={event.space}, "
+            f"proposal_id={event.proposal_id})"
+        )
+        return True
+
+    def _schedule(self, space_id: str, delay: float) -> None:
+        """Process the space once ``delay`` seconds pass without another event."""
+        now = asyncio.get_running_loop().time()
+        started = self._burst_started.setdefault(space_id, now)
+        self._due_at[space_id] = min(
+            now + delay, started + delay * MAX_DEBOUNCE_PERIODS
+        )
+        if space_id not in self._timers:
+            self._timers[space_id] = asyncio.create_task(
+                self._process_after_debounce(space_id)
+            )
+
+    async def _process_after_debounce(self, space_id: str) -> None:
+        """Wait until the burst has settled, then process the space once."""
+        loop = asyncio.get_running_loop()
+        try:
+            # Every event of the burst pushes the due time back
+            while (remaining := self._due_at[space_id] - loop.time()) > 0:
+                await asyncio.sleep(remaining)
+            events = self._pending.pop(space_id, {})
+            self._timers.pop(space_id, None)
+            self._due_at.pop(space_id, None)
+            self._burst_started.pop(space_id, None)
+            await self._process_space(space_id, events)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.logger.error(
+                f"Failed to process webhook events (space_id={space_id}, error={str(e)})"
+            )
+
+    async def _process_space(
+        self, space_id: str, events: Dict[str, SnapshotWebhookEvent]
+    ) -> None:
+        """Process the collapsed events for a single space."""
+        if not events:
+            return
+
+        self.batches_processed += 1
+        with log_span(
+            self.logger, "webhook_batch", space_id=space_id, event_count=len(events)
+        ):
+            removed: Set[str] = {
+                pid for pid, e in events.items() if e.event in PROPOSAL_REMOVAL_EVENTS
+            }
+            if self.run_scheduler is not None:
+                for proposal_id in removed:
+                    self.run_scheduler.discard(proposal_id)
+
+            activated = [pid for pid in events if pid not in removed]
+            active_ids = await self._active_proposal_ids(space_id, activated)
+            if active_ids:
+                await self._run_proposals(
+                    space_id, active_ids, {pid: events[pid] for pid in active_ids}
+                )
+
+    async def _active_proposal_ids(
+        self, space_id: str, proposal_ids: List[str]
+    ) -> List[str]:
+        """Fetch the proposals and return the IDs of those open for voting.
+
+        Proposals are also queued in the run scheduler, if enabled, so that
+        they are handled by their deadline if the targeted run fails.
+        """
+        snapshot_service = self.agent_run_service.snapshot_service
+        active_ids = []
+        for proposal_id in proposal_ids:
+            try:
+                proposal = await snapshot_service.get_proposal(proposal_id)
+            except Exception as e:
+                self.logger.warning(
+                    f"Could not fetch webhook proposal (proposal_id={proposal_id}, error={str(e)})"
+                )
+                continue
+            if proposal is None:
+                continue
+            if self.run_scheduler is not None:
+                self.run_scheduler.enqueue(space_id, proposal.id, proposal.end)
+            if proposal.state == "active":
+                active_ids.append(proposal.id)
+            else:
+                self.logger.info(
+                    f"Skipping webhook proposal that is not open for voting "
+                    f"(proposal_id={proposal_id}, state={proposal.state})"
+                )
+        return active_ids
+
+    async def _run_proposals(
+        self,
+        space_id: str,
+        proposal_ids: List[str],
+        events: Dict[str, SnapshotWebhookEvent],
+    ) -> None:
+        """Run the agent for the given proposals, retrying if a run is active."""
+        if self.agent_run_service.is_agent_active():
+            self.logger.info(f"Agent busy, deferring webhook run (space_id={space_id})")
+            self._pending.setdefault(space_id, {}).update(events)
+            self._schedule(
+                space_id, max(self.debounce_seconds, settings.retry_delay_seconds)
+            )
+            return
+
+        async with self.agent_run_service.run_lock:
+            await self.agent_run_service.execute_agent_run(
+                AgentRunRequest(
+                    space_id=space_id,
+                    dry_run=settings.scheduler_dry_run,
+                    proposal_ids=proposal_ids,
+                )
+            )
+
+    async def stop(self) -> None:
+        """Cancel pending debounce timers."""
+        for task in list(self._timers.values()):
+            task.cancel()
+        for task in list(self._timers.values()):
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._timers.clear()
+        self._due_at.clear()
+        self._burst_started.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Return webhook processing counters."""
+        return {
+            "events_received": self.events_received,
+            "events_deduplicated": self.events_deduplicated,
+            "batches_processed": self.batches_processed,
+            "pending_spaces": len(self._pending),
+        }
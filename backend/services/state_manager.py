@@ -6,23 +6,29 @@ and provides migration capabilities for evolving state schemas.
 """
 
 import asyncio
-import hashlib
+import copy
 import json
 import os
-import shutil
-import tempfile
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional, Tuple
 
+from config import settings
 from logging_config import setup_pearl_logger
+from services.state_storage import (
+    StateCorruptionError,
+    StorageEngine,
+    create_storage_engine,
+    read_json_file,
+)
+from utils.state_executor import run_in_state_executor
 
 
-class StateCorruptionError(Exception):
-    """Raised when state file corruption is detected."""
-
-    pass
+# Durability levels for save_state
+DURABILITY_IMMEDIATE = "immediate"
+DURABILITY_COALESCED = "coalesced"
+DURABILITY_LEVELS = (DURABILITY_IMMEDIATE, DURABILITY_COALESCED)
 
 
 class StateMigrationError(Exception):
@@ -31,12 +37,6 @@ class StateMigrationError(Exception):
     pass
 
 
-class StatePermissionError(Exception):
-    """Raised when file permissions are insufficient."""
-
-    pass
-
-
 @dataclass(frozen=True)
 class StateVersion:
     """Represents a semantic version for state schemas."""
@@ -84,6 +84,23 @@ class StateVersion:
         )
 
 
+@dataclass(frozen=True)
+class CachedState:
+    """Parsed contents of a state and the storage revision they were read from."""
+
+    revision: Any
+    state_data: Dict[str, Any]
+
+
+@dataclass
+class PendingWrite:
+    """A coalesced save waiting to be written."""
+
+    state_data: Dict[str, Any]
+    sensitive: bool
+    saves: int = 1
+
+
 @dataclass
 class StateSchema:
     """Defines the schema for validating state data."""
@@ -112,10 +129,6 @@ class StateManager:
         # Ensure store path exists
         self.store_path.mkdir(parents=True, exist_ok=True)
 
-        # Create subdirectories for organization
-        self.backups_dir = self.store_path / "backups"
-        self.backups_dir.mkdir(exist_ok=True)
-
         # Migration paths for legacy data
         self._migration_paths: List[Path] = []
 
@@ -128,6 +141,42 @@ class StateManager:
         # Maximum number of backups to keep
         self.max_backups = 5
 
+        # Where state is stored: JSON files or a SQLite database
+        self.engine: StorageEngine = create_storage_engine(
+            settings.state_storage_engine,
+            self.store_path,
+            self.max_backups,
+        )
+
+        # Write-through cache of parsed state files by state name
+        self._cache: Dict[str, CachedState] = {}
+        self._cache_hits = 0
+        self._cache_misses = 0
+
+        # Coalesced saves waiting for their write, and the timers writing them
+        self.coalesce_window_seconds = settings.state_write_coalesce_ms / 1000
+        self.durability: Dict[str, str] = json.loads(settings.state_durability or "{}")
+        assert all(level in DURABILITY_LEVELS for level in self.durability.values()), (
+            f"Durability levels must be one of {DURABILITY_LEVELS}"
+        )
+        self._pending: Dict[str, PendingWrite] = {}
+        self._flush_tasks: Dict[str, asyncio.Task] = {}
+        self._writes = 0
+        self._coalesced_saves = 0
+
+    def durability_for(self, name: str) -> str:
+        """Return the configured durability of a state; the longest prefix wins."""
+        matches = [prefix for prefix in self.durability if name.startswith(prefix)]
+        if not matches:
+            return DURABILITY_IMMEDIATE
+        return self.durability[max(matches, key=len)]
+
+    def _get_lock(self, name: str) -> asyncio.Lock:
+        """Get or create the lock for a state file."""
+        if name not in self._locks:
+            self._locks[name] = asyncio.Lock()
+        return self._locks[name]
+
     async def save_state(
         self,
         name: str,
@@ -135,57 +184,131 @@ class StateManager:
         sensitive: bool = False,
         schema: Optional[StateSchema] = None,
         version: Optional[StateVersion] = None,
+        durability: Optional[str] = None,
     ) -> Path:
-        """Save state data atomically."""
+        """Save state data atomically.
+
+        With ``immediate`` durability the file is written before this returns.
+        With ``coalesced`` durability the data is written once the coalescing
+        window has passed, together with any later saves of the same state;
+        loads see it immediately and ``flush`` writes it at once.
+
+        Args:
+            name: State name
+            data: State data
+            sensitive: Restrict the file to the owner
+            schema: Optional schema to validate ``data`` against
+            version: Schema version stored with the data
+            durability: Overrides the level configured in STATE_DURABILITY
+
+        Returns:
+            File the state is stored in; with SQLite, the database file
+        """
         # Validate schema if provided
         if schema:
             self._validate_schema(data, schema)
 
-        # Get or create lock for this state file
-        if name not in self._locks:
-            self._locks[name] = asyncio.Lock()
+        level = durability or self.durability_for(name)
+        assert level in DURABILITY_LEVELS, f"Unknown durability level: {level}"
 
-        async with self._locks[name]:
-            state_file = self.store_path / f"{name}.json"
+        async with self._get_lock(name):
+            state_file = self.engine.location(name)
 
-            # Create backup of existing file
-            if state_file.exists():
-                await self._create_backup(name, state_file)
-
-            # Prepare state data with metadata
+            # Prepare state data with metadata; the data is copied so callers
+            # can keep modifying it while the file is written
             state_data = {
                 "version": str(version) if version else "1.0.0",
                 "timestamp": datetime.now(timezone.utc).isoformat(),
-                "data": data,
-                "checksum": self._calculate_checksum(data),
+                "data": copy.deepcopy(data),
             }
 
-            # Write atomically using temporary file
-            temp_fd, temp_path = tempfile.mkstemp(dir=self.store_path, suffix=".tmp")
-            try:
-                with os.fdopen(temp_fd, "w") as f:
-                    json.dump(state_data, f, indent=2)
-
-                # Set permissions for sensitive files
-                if sensitive:
-                    os.chmod(temp_path, 0o600)
+            if level == DURABILITY_COALESCED and self.coalesce_window_seconds > 0:
+                pending = self._pending.get(name)
+                if pending is None:
+                    self._pending[name] = PendingWrite(state_data, sensitive)
+                else:
+                    pending.state_data = state_data
+                    pending.sensitive = pending.sensitive or sensitive
+                    pending.saves += 1
+                    self._coalesced_saves += 1
+                if name not in self._flush_tasks:
+                    self._flush_tasks[name] = asyncio.create_task(
+                        self._flush_later(name)
+                    )
+                return state_file
 
-                # Atomic rename
-                Path(temp_path).replace(state_file)
+            # An immediate save supersedes any coalesced one
+            self._pending.pop(name, None)
+            await self._write_state(name, state_data, sensitive)
+            return state_file
 
-                # Check if file is writable after creation
-                if not os.access(state_file, os.W_OK):
-                    raise PermissionError(f"State file {name} is not writable")
+    async def _write_state(
+        self,
+        name: str,
+        state_data: Dict[str, Any],
+        sensitive: bool,
+    ) -> None:
+        """Write a state and cache it; the caller holds the state's lock."""
+        try:
+            revision = await run_in_state_executor(
+                self._write_state_file, name, state_data, sensitive
+            )
+        except Exception as e:
+            self._cache.pop(name, None)
+            self.logger.error(f"Failed to save state {name}: {e}")
+            raise
 
-                self.logger.info(f"Successfully saved state: {name}")
-                return state_file
+        self._writes += 1
+        self._cache[name] = CachedState(revision, state_data)
+        self.logger.info(f"Successfully saved state: {name}")
 
-            except Exception as e:
-                # Clean up temp file on error
-                if os.path.exists(temp_path):
-                    os.unlink(temp_path)
-                self.logger.error(f"Failed to save state {name}: {e}")
+    async def _flush_later(self, name: str) -> None:
+        """Write a coalesced save once the coalescing window has passed."""
+        try:
+            await asyncio.sleep(self.coalesce_window_seconds)
+            self._flush_tasks.pop(name, None)
+            await self._flush_pending(name)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.logger.error(f"Failed to write coalesced state {name}: {e}")
+
+    async def _flush_pending(self, name: str) -> None:
+        """Write the pending save of one state, if there is one."""
+        async with self._get_lock(name):
+            pending = self._pending.pop(name, None)
+            if pending is None:
+                return
+            try:
+                await self._write_state(name, pending.state_data, pending.sensitive)
+            except Exception:
+                # Keep the data so the next flush retries it
+                self._pending[name] = pending
                 raise
+            if pending.saves > 1:
+                self.logger.debug(
+                    f"Coalesced state saves (name={name}, saves={pending.saves})"
+                )
+
+    async def flush(self, name: Optional[str] = None) -> None:
+        """Write pending coalesced saves now.
+
+        Args:
+            name: State to flush; all states when omitted
+        """
+        names = [name] if name is not None else list(self._pending)
+        for pending_name in names:
+            await self._flush_pending(pending_name)
+
+    def _write_state_file(
+        self, name: str, state_data: Dict[str, Any], sensitive: bool
+    ) -> Any:
+        """Encode, checksum and store a state; runs in the state I/O pool.
+
+        Returns:
+            Storage revision of the written state
+        """
+        return self.engine.write(name, state_data, sensitive)
 
     async def load_state(
         self,
@@ -198,18 +321,19 @@ class StateManager:
         """Load state data with validation."""
         state_file = self.store_path / f"{name}.json"
 
-        # Try to find state file, migrating if necessary
-        state_file = await self._find_or_migrate_state(name, state_file)
-        if not state_file or not state_file.exists():
-            return None
+        # A coalesced save that is not written yet is the current state
+        if name not in self._pending:
+            # Try to find stored state, migrating if necessary
+            if not await self._find_or_migrate_state(name, state_file):
+                return None
 
-        # Validate permissions for sensitive files
-        if sensitive:
-            self._validate_file_permissions(state_file, name)
+            # Validate permissions for sensitive files
+            if sensitive:
+                await run_in_state_executor(self.engine.validate_permissions, name)
 
         try:
             # Load and validate state data
-            data = await self._load_and_validate_state(state_file, name, target_version)
+            data = await self._load_and_validate_state(name, target_version)
 
             # Validate schema if provided
             if schema:
@@ -225,44 +349,53 @@ class StateManager:
 
             raise
 
-    async def _find_or_migrate_state(
-        self, name: str, state_file: Path
-    ) -> Optional[Path]:
-        """Find state file or migrate from legacy location."""
-        if state_file.exists():
-            return state_file
+    async def _find_or_migrate_state(self, name: str, state_file: Path) -> bool:
+        """Check that a state is stored, migrating it from a legacy location."""
+        if await run_in_state_executor(self.engine.exists, name):
+            return True
 
         for migration_path in self._migration_paths:
             legacy_file = migration_path / f"{name}.json"
-            if legacy_file.exists():
+            if await run_in_state_executor(legacy_file.exists):
                 await self._migrate_legacy_file(legacy_file, state_file)
-                return state_file
-
-        return None
+                return True
 
-    def _validate_file_permissions(self, state_file: Path, name: str) -> None:
-        """Validate file permissions for sensitive files."""
-        stat_info = os.stat(state_file)
-        permissions = stat_info.st_mode & 0o777
-        if permissions != 0o600:
-            raise StatePermissionError(
-                f"State file {name} has insufficient permissions: {oct(permissions)}"
-            )
+        return False
 
     async def _load_and_validate_state(
-        self, state_file: Path, name: str, target_version: Optional[StateVersion]
+        self, name: str, target_version: Optional[StateVersion]
     ) -> Dict[str, Any]:
-        """Load state data and validate integrity."""
-        with open(state_file, "r") as f:
-            state_data = json.load(f)
+        """Load state data and validate integrity.
 
-        # Verify checksum
-        if "checksum" in state_data:
-            expected_checksum = state_data["checksum"]
-            actual_checksum = self._calculate_checksum(state_data["data"])
-            if expected_checksum != actual_checksum:
-                raise StateCorruptionError(f"State file {name} has checksum mismatch")
+        The parsed state is cached by name; while its storage revision (for
+        JSON files: inode, modification time and size) is unchanged the
+        cached copy is returned without reading or re-verifying it.
+        """
+        pending = self._pending.get(name)
+        if pending is not None:
+            self._cache_hits += 1
+            return await self._extract_data(
+                copy.deepcopy(pending.state_data), target_version
+            )
+
+        cached = self._cache.get(name)
+        revision, state_data = await run_in_state_executor(
+            self.engine.read, name, cached.revision if cached is not None else None
+        )
+        if state_data is None:
+            self._cache_hits += 1
+            state_data = cached.state_data
+        else:
+            self._cache_misses += 1
+            self._cache[name] = CachedState(revision, state_data)
+
+        # Callers own the returned data and may modify it
+        return await self._extract_data(copy.deepcopy(state_data), target_version)
 
+    async def _extract_data(
+        self, state_data: Dict[str, Any], target_version: Optional[StateVersion]
+    ) -> Dict[str, Any]:
+        """Return the data of a state file, migrated to ``target_version``."""
         data = state_data.get("data", state_data)  # Handle legacy format
 
         # Apply migrations if needed
@@ -275,6 +408,66 @@ class StateManager:
 
         return data
 
+    async def load_states(self, prefix: str) -> Dict[str, Dict[str, Any]]:
+        """Load every state whose name starts with ``prefix``.
+
+        States are read in one pass over the storage engine; unchanged ones
+        come from the cache. A state that cannot be read is recovered from
+        its latest backup or left out.
+
+        Args:
+            prefix: State name prefix, e.g. ``agent_checkpoint_``
+
+        Returns:
+            State data by name
+        """
+        cached_revisions = {
+            name: cached.revision
+            for name, cached in self._cache.items()
+            if name.startswith(prefix)
+        }
+        records = await run_in_state_executor(
+            self.engine.read_many, prefix, cached_revisions
+        )
+
+        states: Dict[str, Dict[str, Any]] = {}
+        for name, (revision, state_data) in records.items():
+            if revision is None:
+                recovered = await self._attempt_recovery(name)
+                if recovered is not None:
+                    states[name] = recovered
+                continue
+            if state_data is None:
+                self._cache_hits += 1
+                state_data = self._cache[name].state_data
+            else:
+                self._cache_misses += 1
+                self._cache[name] = CachedState(revision, state_data)
+            states[name] = await self._extract_data(copy.deepcopy(state_data), None)
+
+        for name, pending in self._pending.items():
+            if name.startswith(prefix):
+                states[name] = await self._extract_data(
+                    copy.deepcopy(pending.state_data), None
+                )
+        return states
+
+    async def load_latest_state(self, prefix: str) -> Optional[Dict[str, Any]]:
+        """Load the most recently saved state whose name starts with ``prefix``."""
+        candidates = [
+            copy.deepcopy(pending.state_data)
+            for name, pending in self._pending.items()
+            if name.startswith(prefix)
+        ]
+        stored = await run_in_state_executor(self.engine.latest, prefix)
+        if stored is not None and stored[0] not in self._pending:
+            candidates.append(stored[1])
+        if not candidates:
+            return None
+
+        latest = max(candidates, key=lambda state_data: state_data.get("timestamp", ""))
+        return await self._extract_data(latest, None)
+
     async def _attempt_recovery(self, name: str) -> Optional[Dict[str, Any]]:
         """Attempt to recover from backup."""
         backups = await self.list_backups(name)
@@ -296,41 +489,58 @@ class StateManager:
         """Register a migration function between versions."""
         self._migrations[(from_version, to_version)] = migration_func
 
-    async def list_backups(self, name: str) -> List[Path]:
-        """List available backups for a state file."""
-        backup_pattern = f"{name}.*.backup"
-        backups = sorted(
-            self.backups_dir.glob(backup_pattern),
-            key=lambda p: p.stat().st_mtime,
-            reverse=True,
-        )
-        return backups
-
-    async def restore_from_backup(
-        self, _name: str, backup_path: Path
-    ) -> Dict[str, Any]:
-        """Restore state from a specific backup."""
-        with open(backup_path, "r") as f:
-            backup_data = json.load(f)
+    async def list_backups(self, name: str) -> List[Any]:
+        """List available backups for a state, newest first.
 
-        # Verify backup integrity
-        if "checksum" in backup_data:
-            expected_checksum = backup_data["checksum"]
-            actual_checksum = self._calculate_checksum(backup_data["data"])
-            if expected_checksum != actual_checksum:
-                raise StateCorruptionError(f"Backup {backup_path} is corrupted")
+        Backups are file paths with the JSON engine and history revisions
+        with the SQLite engine.
+        """
+        return await run_in_state_executor(self.engine.list_backups, name)
 
+    async def restore_from_backup(self, name: str, backup: Any) -> Dict[str, Any]:
+        """Restore state from a specific backup."""
+        backup_data = await run_in_state_executor(self.engine.read_backup, name, backup)
         return backup_data.get("data", backup_data)
 
     async def cleanup(self) -> None:
-        """Cleanup any resources like file locks."""
+        """Write pending saves and cleanup any resources like file locks."""
+        await self.flush()
+        for task in self._flush_tasks.values():
+            task.cancel()
+        self._flush_tasks.clear()
+        # Let writes already in progress finish
+        for lock in list(self._locks.values()):
+            async with lock:
+                pass
+
         # Release all locks
         self._locks.clear()
+        self.invalidate_cache()
+        await run_in_state_executor(self.engine.close)
+
+    def invalidate_cache(self, name: Optional[str] = None) -> None:
+        """Drop the cached contents of one state, or of all states."""
+        if name is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(name, None)
+
+    def get_cache_metrics(self) -> Dict[str, Any]:
+        """Return the number of cached states and load hit/miss counters."""
+        return {
+            "cached_states": len(self._cache),
+            "hits": self._cache_hits,
+            "misses": self._cache_misses,
+        }
 
-    def _calculate_checksum(self, data: Dict[str, Any]) -> str:
-        """Calculate SHA256 checksum of data."""
-        json_str = json.dumps(data, sort_keys=True)
-        return hashlib.sha256(json_str.encode()).hexdigest()
+    def get_write_metrics(self) -> Dict[str, Any]:
+        """Return file write counters and the saves waiting to be coalesced."""
+        return {
+            "writes": self._writes,
+            "coalesced_saves": self._coalesced_saves,
+            "pending": sorted(self._pending),
+            "coalesce_window_ms": self.coalesce_window_seconds * 1000,
+        }
 
     def _validate_schema(self, data: Dict[str, Any], schema: StateSchema) -> None:
         """Validate data against schema."""
@@ -356,23 +566,9 @@ class StateManager:
                     f"Schema validation failed: field '{field}' failed validation"
                 )
 
-    async def _create_backup(self, name: str, state_file: Path) -> None:
-        """Create a backup of the state file."""
-        timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S_%f")
-        backup_file = self.backups_dir / f"{name}.{timestamp}.backup"
-
-        shutil.copy2(state_file, backup_file)
-
-        # Rotate old backups
-        backups = await self.list_backups(name)
-        if len(backups) > self.max_backups:
-            for old_backup in backups[self.max_backups :]:
-                old_backup.unlink()
-
     async def _migrate_legacy_file(self, legacy_file: Path, new_file: Path) -> None:
         """Migrate a legacy state file to the new format."""
-        with open(legacy_file, "r") as f:
-            data = json.load(f)
+        data = await run_in_state_executor(read_json_file, legacy_file)
 
         # Save in new format
         await self.save_state(new_file.stem, data)
@@ -413,22 +609,26 @@ class StateManager:
         self.logger.info("State manager shutdown completed")
 
     async def save_service_state(self) -> None:
-        """Save current service state (StateManager has no internal state to save)."""
-        # StateManager itself doesn't maintain state that needs to be saved
-        # It manages state for other services
-        pass
+        """Write saves that are still waiting to be coalesced."""
+        await self.flush()
 
     async def stop(self) -> None:
         """Stop the service gracefully."""
         await self.cleanup()
 
     async def list_files(self) -> List[str]:
-        """List all state files in the store directory."""
+        """List the stored states as the storage engine names them.
+
+        These are file names with the JSON engine and state names with SQLite.
+        """
         try:
-            files = []
-            for file_path in self.store_path.glob("*.json"):
-                files.append(file_path.name)
-            return sorted(files)
+            names = await run_in_state_executor(self.engine.names)
+            return sorted(
+                {
+                    self.engine.entry_name(name)
+                    for name in set(names) | set(self._pending)
+                }
+            )
         except Exception as e:
             self.logger.error(f"Failed to list state files: {e}")
             return []
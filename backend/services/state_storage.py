@@ -0,0 +1,619 @@
+"""Storage engines for StateManager.
+
+A storage engine persists one record per state name. A record is the envelope
+StateManager builds around the state data, holding the version, timestamp,
+data and checksum. Engines are synchronous and are only called from the state
+I/O thread pool.
+
+- ``JsonFileEngine`` (default) stores each state as ``<name>.json`` in the
+  store directory and keeps the previous versions as rolling file copies in
+  ``backups/``.
+- ``SqliteEngine`` stores all states in one SQLite database in WAL mode. Each
+  write is one transaction, names and save times are indexed, and previous
+  versions are kept as history rows.
+
+Every engine hands out a revision token per record that changes whenever the
+record does; StateManager uses it to decide whether its cached copy is current.
+
+Records are single-line JSON objects. The state data is serialized once, in
+the canonical form the checksum has always been computed over (JSON with
+sorted keys), and stored as-is as the last member of the record. The record
+holds the SHA256 of those payload bytes, so it is verified on load by hashing
+the raw bytes before anything is parsed. Because the checksum is unchanged,
+earlier versions and external JSON tools read these records as before.
+Records written before this format (pretty-printed JSON) are still read and
+are rewritten on next save.
+
+``migrate_storage`` copies the current version of every state from one engine
+to another. Run it while the agent is stopped::
+
+    cd backend && python ../scripts/migrate_state_storage.py --to sqlite
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from logging_config import setup_pearl_logger
+
+# Constants
+STORAGE_ENGINE_JSON = "json"
+STORAGE_ENGINE_SQLITE = "sqlite"
+STORAGE_ENGINES = (STORAGE_ENGINE_JSON, STORAGE_ENGINE_SQLITE)
+SQLITE_DB_NAME = "state.db"
+BACKUPS_DIR_NAME = "backups"
+DEFAULT_MAX_BACKUPS = 5
+SENSITIVE_FILE_MODE = 0o600
+# Sorts after every character that can appear in a state name
+PREFIX_RANGE_END = "\U0010ffff"
+RECORD_FORMAT = "state-record/1"
+# Every record starts with these bytes; legacy records never do
+RECORD_HEADER_PREFIX = b'{"format":'
+# Precedes the data, which is the last member of a record. Metadata values
+# are scalars, and quotes inside JSON strings are escaped, so the first
+# occurrence is always the data key.
+RECORD_DATA_KEY = b',"data":'
+
+logger = setup_pearl_logger(__name__)
+
+
+class StateCorruptionError(Exception):
+    """Raised when state file corruption is detected."""
+
+    pass
+
+
+class StatePermissionError(Exception):
+    """Raised when file permissions are insufficient."""
+
+    pass
+
+
+def calculate_checksum(data: Dict[str, Any]) -> str:
+    """Calculate SHA256 checksum of data."""
+    json_str = json.dumps(data, sort_keys=True)
+    return hashlib.sha256(json_str.encode()).hexdigest()
+
+
+def verify_checksum(state_data: Dict[str, Any], label: str) -> None:
+    """Raise StateCorruptionError if a record does not match its checksum."""
+    if "checksum" in state_data and state_data["checksum"] != calculate_checksum(
+        state_data["data"]
+    ):
+        raise StateCorruptionError(f"{label} has checksum mismatch")
+
+
+def encode_record(state_data: Dict[str, Any]) -> bytes:
+    """Serialize a record, hashing the data as it is serialized.
+
+    The data is serialized once; the checksum of those bytes is stored in the
+    record and set as ``state_data["checksum"]``.
+
+    Args:
+        state_data: Record with a ``data`` key and metadata such as the version
+
+    Returns:
+        The record as one line of JSON, with the data last
+    """
+    payload = json.dumps(state_data["data"], sort_keys=True).encode()
+    state_data["checksum"] = hashlib.sha256(payload).hexdigest()
+
+    header = {"format": RECORD_FORMAT}
+    header.update((key, value) for key, value in state_data.items() if key != "data")
+    header_bytes = json.dumps(header, separators=(",", ":")).encode()
+    return header_bytes[:-1] + RECORD_DATA_KEY + payload + b"}"
+
+
+def decode_record(raw: Union[bytes, str], label: str) -> Dict[str, Any]:
+    """Verify and parse a record.
+
+    The checksum is compared against the raw payload bytes, before the
+    payload is parsed. Legacy JSON records are verified the way they were
+    written.
+
+    Raises:
+        StateCorruptionError: If the record fails verification
+    """
+    if isinstance(raw, str):
+        raw = raw.encode()
+    raw = raw.rstrip()
+    if not raw.startswith(RECORD_HEADER_PREFIX):
+        state_data = json.loads(raw)
+        verify_checksum(state_data, label)
+        return state_data
+
+    split = raw.find(RECORD_DATA_KEY)
+    if split < 0 or not raw.endswith(b"}"):
+        raise StateCorruptionError(f"{label} is truncated")
+    payload = raw[split + len(RECORD_DATA_KEY) : -1]
+    header = json.loads(raw[:split] + b"}")
+    if header.get("checksum") != hashlib.sha256(payload).hexdigest():
+        raise StateCorruptionError(f"{label} has checksum mismatch")
+
+    header.pop("format")
+    header["data"] = json.loads(payload)
+    return header
+
+
+class StorageEngine(ABC):
+    """Interface implemented by state storage engines."""
+
+    kind = ""
+
+    @abstractmethod
+    def exists(self, name: str) -> bool:
+        """Whether a record is stored under ``name``."""
+
+    @abstractmethod
+    def read(
+        self, name: str, cached_revision: Any = None
+    ) -> Tuple[Any, Optional[Dict[str, Any]]]:
+        """Read and verify a record.
+
+        Returns:
+            The record's revision, and the record or None if the revision
+            equals ``cached_revision``
+
+        Raises:
+            StateCorruptionError: If the record fails verification
+        """
+
+    def read_many(
+        self, prefix: str, cached_revisions: Dict[str, Any]
+    ) -> Dict[str, Tuple[Any, Optional[Dict[str, Any]]]]:
+        """Read all records whose name starts with ``prefix``.
+
+        Records matching ``cached_revisions`` are returned without contents,
+        as in ``read``. Records that cannot be read or verified are returned
+        as ``(None, None)``.
+        """
+        records = {}
+        for name in self.names(prefix):
+            try:
+                records[name] = self.read(name, cached_revisions.get(name))
+            except (OSError, ValueError, StateCorruptionError) as e:
+                logger.warning(f"Skipping unreadable state (name={name}, error={e})")
+                records[name] = (None, None)
+        return records
+
+    def latest(self, prefix: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """Return the most recently saved record whose name starts with ``prefix``."""
+        records = [
+            (name, record)
+            for name, (_, record) in self.read_many(prefix, {}).items()
+            if record is not None
+        ]
+        if not records:
+            return None
+        return max(records, key=lambda item: item[1].get("timestamp", ""))
+
+    @abstractmethod
+    def write(self, name: str, state_data: Dict[str, Any], sensitive: bool) -> Any:
+        """Store a record, keeping the previous version as a backup.
+
+        Returns:
+            The new revision
+        """
+
+    @abstractmethod
+    def names(self, prefix: str = "") -> List[str]:
+        """Names of the stored records, sorted."""
+
+    @abstractmethod
+    def location(self, name: str) -> Path:
+        """File the record stored under ``name`` lives in."""
+
+    def entry_name(self, name: str) -> str:
+        """How the record appears in a listing of the store."""
+        return name
+
+    @abstractmethod
+    def is_sensitive(self, name: str) -> bool:
+        """Whether a record was written as sensitive."""
+
+    @abstractmethod
+    def validate_permissions(self, name: str) -> None:
+        """Raise StatePermissionError if a sensitive record is readable by others."""
+
+    @abstractmethod
+    def list_backups(self, name: str) -> List[Any]:
+        """Identifiers of the previous versions of a record, newest first."""
+
+    @abstractmethod
+    def read_backup(self, name: str, backup: Any) -> Dict[str, Any]:
+        """Read and verify one previous version of a record."""
+
+    def close(self) -> None:
+        """Release resources held by the engine."""
+
+
+def _file_key(stat_result: os.stat_result) -> Tuple[int, int, int]:
+    """Identity of a file version: inode, modification time and size.
+
+    Atomic saves replace the file, so they always change the inode.
+    """
+    return (stat_result.st_ino, stat_result.st_mtime_ns, stat_result.st_size)
+
+
+def read_json_file(path: Path) -> Any:
+    """Parse a JSON file."""
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+class JsonFileEngine(StorageEngine):
+    """One record file per state with rolling backup copies.
+
+    The revision of a record is its file's inode, modification time and size.
+    """
+
+    kind = STORAGE_ENGINE_JSON
+
+    def __init__(
+        self,
+        store_path: Path,
+        max_backups: int = DEFAULT_MAX_BACKUPS,
+    ):
+        """Initialize the engine.
+
+        Args:
+            store_path: Directory holding the state files
+            max_backups: Previous versions kept per state
+        """
+        self.store_path = Path(store_path)
+        self.backups_dir = self.store_path / BACKUPS_DIR_NAME
+        self.max_backups = max_backups
+        self.store_path.mkdir(parents=True, exist_ok=True)
+        self.backups_dir.mkdir(exist_ok=True)
+
+    def _path(self, name: str) -> Path:
+        return self.store_path / f"{name}.json"
+
+    def exists(self, name: str) -> bool:
+        """Whether ``<name>.json`` exists."""
+        return self._path(name).exists()
+
+    def location(self, name: str) -> Path:
+        """The record's own file."""
+        return self._path(name)
+
+    def entry_name(self, name: str) -> str:
+        """The record's file name."""
+        return self._path(name).name
+
+    def read(
+        self, name: str, cached_revision: Any = None
+    ) -> Tuple[Any, Optional[Dict[str, Any]]]:
+        """Read and verify ``<name>.json`` unless it is unchanged."""
+        state_file = self._path(name)
+        revision = _file_key(state_file.stat())
+        if revision == cached_revision:
+            return revision, None
+
+        return revision, decode_record(state_file.read_bytes(), f"State file {name}")
+
+    def write(self, name: str, state_data: Dict[str, Any], sensitive: bool) -> Any:
+        """Back up the current file and atomically replace it."""
+        state_file = self._path(name)
+        record = encode_record(state_data)
+
+        # Create backup of existing file
+        if state_file.exists():
+            self._create_backup(name, state_file)
+
+        # Write atomically using temporary file
+        temp_fd, temp_path = tempfile.mkstemp(dir=self.store_path, suffix=".tmp")
+        try:
+            with os.fdopen(temp_fd, "wb") as f:
+                f.write(record)
+
+            # Set permissions for sensitive files
+            if sensitive:
+                os.chmod(temp_path, SENSITIVE_FILE_MODE)
+
+            # Atomic rename
+            Path(temp_path).replace(state_file)
+
+            # Check if file is writable after creation
+            if not os.access(state_file, os.W_OK):
+                raise PermissionError(f"State file {name} is not writable")
+
+            return _file_key(state_file.stat())
+
+        except Exception:
+            # Clean up temp file on error
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+
+    def _create_backup(self, name: str, state_file: Path) -> None:
+        """Copy the current file to the backups directory and rotate old copies."""
+        timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S_%f")
+        backup_file = self.backups_dir / f"{name}.{timestamp}.backup"
+
+        shutil.copy2(state_file, backup_file)
+
+        # Rotate old backups
+        backups = self.list_backups(name)
+        if len(backups) > self.max_backups:
+            for old_backup in backups[self.max_backups :]:
+                old_backup.unlink()
+
+    def names(self, prefix: str = "") -> List[str]:
+        """Names of the ``*.json`` files in the store directory."""
+        return sorted(path.stem for path in self.store_path.glob(f"{prefix}*.json"))
+
+    def is_sensitive(self, name: str) -> bool:
+        """Whether ``<name>.json`` is readable by its owner only."""
+        return self._path(name).stat().st_mode & 0o077 == 0
+
+    def validate_permissions(self, name: str) -> None:
+        """Require mode 0600 on ``<name>.json``."""
+        permissions = self._path(name).stat().st_mode & 0o777
+        if permissions != SENSITIVE_FILE_MODE:
+            raise StatePermissionError(
+                f"State file {name} has insufficient permissions: {oct(permissions)}"
+            )
+
+    def list_backups(self, name: str) -> List[Path]:
+        """Backup files of a state, newest first."""
+        backup_pattern = f"{name}.*.backup"
+        return sorted(
+            self.backups_dir.glob(backup_pattern),
+            key=lambda p: p.stat().st_mtime,
+            reverse=True,
+        )
+
+    def read_backup(self, name: str, backup: Path) -> Dict[str, Any]:
+        """Read and verify a backup file."""
+        return decode_record(backup.read_bytes(), f"Backup {backup} of {name}")
+
+
+class SqliteEngine(StorageEngine):
+    """All states in one SQLite database in WAL mode.
+
+    ``states`` holds the current version of each state, keyed by name and
+    indexed by save time. ``state_history`` holds up to ``max_backups``
+    previous versions per state. The revision of a record is a counter that
+    increases with every write.
+    """
+
+    kind = STORAGE_ENGINE_SQLITE
+
+    SCHEMA = (
+        """
+        CREATE TABLE IF NOT EXISTS states (
+            name TEXT PRIMARY KEY,
+            revision INTEGER NOT NULL,
+            saved_at TEXT NOT NULL,
+            sensitive INTEGER NOT NULL DEFAULT 0,
+            body BLOB NOT NULL
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS states_saved_at ON states (saved_at)",
+        """
+        CREATE TABLE IF NOT EXISTS state_history (
+            name TEXT NOT NULL,
+            revision INTEGER NOT NULL,
+            saved_at TEXT NOT NULL,
+            body BLOB NOT NULL,
+            PRIMARY KEY (name, revision)
+        )
+        """,
+    )
+
+    def __init__(
+        self,
+        db_path: Path,
+        max_backups: int = DEFAULT_MAX_BACKUPS,
+    ):
+        """Initialize the engine; the database is opened on first use.
+
+        Args:
+            db_path: SQLite database file
+            max_backups: Previous versions kept per state
+        """
+        self.db_path = Path(db_path)
+        self.max_backups = max_backups
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database, creating the schema; the caller holds the lock."""
+        if self._connection is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(
+                self.db_path, check_same_thread=False, isolation_level=None
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            for statement in self.SCHEMA:
+                connection.execute(statement)
+            # The database may hold sensitive states
+            os.chmod(self.db_path, SENSITIVE_FILE_MODE)
+            self._connection = connection
+        return self._connection
+
+    def _query(self, sql: str, params: Tuple = ()) -> List[Tuple]:
+        with self._lock:
+            return self._connect().execute(sql, params).fetchall()
+
+    @staticmethod
+    def _decode(name: str, body: Union[bytes, str]) -> Dict[str, Any]:
+        return decode_record(body, f"State {name}")
+
+    def exists(self, name: str) -> bool:
+        """Whether a row is stored for ``name``."""
+        return bool(self._query("SELECT 1 FROM states WHERE name = ?", (name,)))
+
+    def read(
+        self, name: str, cached_revision: Any = None
+    ) -> Tuple[Any, Optional[Dict[str, Any]]]:
+        """Read and verify a row, skipping the body if the revision is cached."""
+        rows = self._query(
+            "SELECT revision, CASE WHEN revision = ? THEN NULL ELSE body END "
+            "FROM states WHERE name = ?",
+            (cached_revision, name),
+        )
+        if not rows:
+            raise FileNotFoundError(f"State {name} does not exist")
+        revision, body = rows[0]
+        if body is None:
+            return revision, None
+        return revision, self._decode(name, body)
+
+    def read_many(
+        self, prefix: str, cached_revisions: Dict[str, Any]
+    ) -> Dict[str, Tuple[Any, Optional[Dict[str, Any]]]]:
+        """Read all rows in a name range with one indexed query."""
+        rows = self._query(
+            "SELECT name, revision, body FROM states WHERE name >= ? AND name < ?",
+            (prefix, prefix + PREFIX_RANGE_END),
+        )
+        records = {}
+        for name, revision, body in rows:
+            if cached_revisions.get(name) == revision:
+                records[name] = (revision, None)
+                continue
+            try:
+                records[name] = (revision, self._decode(name, body))
+            except (OSError, ValueError, StateCorruptionError) as e:
+                logger.warning(f"Skipping unreadable state (name={name}, error={e})")
+                records[name] = (None, None)
+        return records
+
+    def latest(self, prefix: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """Return the most recently saved row in a name range."""
+        rows = self._query(
+            "SELECT name, body FROM states WHERE name >= ? AND name < ? "
+            "ORDER BY saved_at DESC LIMIT 1",
+            (prefix, prefix + PREFIX_RANGE_END),
+        )
+        if not rows:
+            return None
+        name, body = rows[0]
+        return name, self._decode(name, body)
+
+    def write(self, name: str, state_data: Dict[str, Any], sensitive: bool) -> Any:
+        """Replace a row and move its previous version to the history, atomically."""
+        body = encode_record(state_data)
+        saved_at = state_data.get("timestamp") or datetime.now(timezone.utc).isoformat()
+        with self._lock:
+            connection = self._connect()
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                connection.execute(
+                    "INSERT INTO state_history (name, revision, saved_at, body) "
+                    "SELECT name, revision, saved_at, body FROM states WHERE name = ?",
+                    (name,),
+                )
+                row = connection.execute(
+                    "SELECT revision FROM states WHERE name = ?", (name,)
+                ).fetchone()
+                revision = (row[0] if row else 0) + 1
+                connection.execute(
+                    "INSERT OR REPLACE INTO states "
+                    "(name, revision, saved_at, sensitive, body) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (name, revision, saved_at, int(sensitive), body),
+                )
+                connection.execute(
+                    "DELETE FROM state_history WHERE name = ? AND revision <= ?",
+                    (name, revision - 1 - self.max_backups),
+                )
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+        return revision
+
+    def names(self, prefix: str = "") -> List[str]:
+        """Names in a range of the primary key index."""
+        rows = self._query(
+            "SELECT name FROM states WHERE name >= ? AND name < ? ORDER BY name",
+            (prefix, prefix + PREFIX_RANGE_END),
+        )
+        return [row[0] for row in rows]
+
+    def location(self, _name: str) -> Path:
+        """The database file, which holds every record."""
+        return self.db_path
+
+    def is_sensitive(self, name: str) -> bool:
+        """Whether the row was written as sensitive."""
+        rows = self._query("SELECT sensitive FROM states WHERE name = ?", (name,))
+        return bool(rows and rows[0][0])
+
+    def validate_permissions(self, name: str) -> None:
+        """Require mode 0600 on the database file."""
+        permissions = self.db_path.stat().st_mode & 0o777
+        if permissions != SENSITIVE_FILE_MODE:
+            raise StatePermissionError(
+                f"State database holding {name} has insufficient permissions: "
+                f"{oct(permissions)}"
+            )
+
+    def list_backups(self, name: str) -> List[int]:
+        """Revisions kept in the history, newest first."""
+        rows = self._query(
+            "SELECT revision FROM state_history WHERE name = ? ORDER BY revision DESC",
+            (name,),
+        )
+        return [row[0] for row in rows]
+
+    def read_backup(self, name: str, backup: int) -> Dict[str, Any]:
+        """Read and verify one history row."""
+        rows = self._query(
+            "SELECT body FROM state_history WHERE name = ? AND revision = ?",
+            (name, backup),
+        )
+        if not rows:
+            raise FileNotFoundError(f"State {name} has no revision {backup}")
+        return decode_record(rows[0][0], f"Revision {backup} of {name}")
+
+    def close(self) -> None:
+        """Close the database connection; it is reopened on next use."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+def create_storage_engine(
+    kind: str,
+    store_path: Path,
+    max_backups: int = DEFAULT_MAX_BACKUPS,
+) -> StorageEngine:
+    """Create the storage engine selected by ``kind`` for a store directory."""
+    assert kind in STORAGE_ENGINES, f"Unknown state storage engine: {kind}"
+    if kind == STORAGE_ENGINE_SQLITE:
+        return SqliteEngine(Path(store_path) / SQLITE_DB_NAME, max_backups)
+    return JsonFileEngine(Path(store_path), max_backups)
+
+
+def migrate_storage(source: StorageEngine, target: StorageEngine) -> int:
+    """Copy the current version of every state from one engine to another.
+
+    Records are verified before they are copied; backups are not copied.
+
+    Returns:
+        Number of states copied
+    """
+    copied = 0
+    for name in source.names():
+        _, state_data = source.read(name)
+        target.write(name, state_data, source.is_sensitive(name))
+        copied += 1
+    logger.info(
+        f"Migrated state storage (source={source.kind}, target={target.kind}, "
+        f"states={copied})"
+    )
+    return copied
@@ -0,0 +1,221 @@
+"""Concurrent Snapshot vote submission under a hub rate limit.
+
+Votes on different proposals are independent, so ``VoteDispatcher`` submits
+them concurrently, at most ``max_concurrency`` at a time, and paces requests
+to the Snapshot hub with a token bucket that also backs off after HTTP 429.
+Votes on the same proposal are submitted one after another, in request order.
+
+A vote that failed transiently (HTTP 429, a 5xx or an unreachable hub) is
+retried on a fixed exponential schedule without jitter. Its timestamp is
+chosen before the first attempt, so every attempt signs and submits the same
+message and the hub never sees two different votes for one request. Other
+rejections are final.
+
+Each outcome is passed to ``on_outcome`` as soon as it is known, so callers
+can record accepted votes without waiting for slower ones.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+from config import settings
+from logging_config import setup_pearl_logger
+from utils.rpc_rate_limiter import RpcRateLimiter
+
+# Constants
+HTTP_TOO_MANY_REQUESTS = 429
+HTTP_SERVER_ERROR = 500
+
+logger = setup_pearl_logger(__name__)
+
+
+@dataclass(frozen=True)
+class VoteRequest:
+    """One vote to submit."""
+
+    space: str
+    proposal: str
+    choice: int
+
+
+@dataclass
+class VoteOutcome:
+    """Result of submitting one vote, after all attempts."""
+
+    request: VoteRequest
+    result: Dict[str, Any] = field(default_factory=dict)
+    attempts: int = 0
+    error: Optional[str] = None
+
+    @property
+    def success(self) -> bool:
+        """Whether the hub accepted the vote."""
+        return bool(self.result.get("success"))
+
+    @property
+    def vote_id(self) -> Optional[str]:
+        """Vote ID assigned by the hub, if it accepted the vote."""
+        submission = self.result.get("submission_result") or {}
+        if not submission.get("success"):
+            return None
+        return (submission.get("response") or {}).get("id")
+
+
+def is_transient_failure(result: Dict[str, Any]) -> bool:
+    """Whether a failed submission may succeed if retried unchanged."""
+    submission = result.get("submission_result") or {}
+    status_code = submission.get("status_code")
+    if status_code is None:
+        # The hub did not answer at all
+        return True
+    return status_code == HTTP_TOO_MANY_REQUESTS or status_code >= HTTP_SERVER_ERROR
+
+
+class VoteDispatcher:
+    """Submits votes concurrently through a VotingService."""
+
+    def __init__(
+        self,
+        voting_service,
+        max_concurrency: Optional[int] = None,
+        rate_per_second: Optional[float] = None,
+        max_attempts: Optional[int] = None,
+        retry_backoff_seconds: Optional[float] = None,
+        hub_url: Optional[str] = None,
+    ) -> None:
+        """Initialize the dispatcher.
+
+        Args:
+            voting_service: VotingService used to sign and submit votes
+            max_concurrency: Votes in flight at once (defaults to
+                ``settings.vote_max_concurrency``)
+            rate_per_second: Hub requests per second (defaults to
+                ``settings.snapshot_hub_rate_limit``)
+            max_attempts: Attempts per vote (defaults to
+                ``settings.vote_max_attempts``)
+            retry_backoff_seconds: Delay before the first retry, doubled per
+                attempt, and the first hub pause after a 429 (defaults to
+                ``settings.vote_retry_backoff_seconds``)
+            hub_url: Hub endpoint the rate limit applies to (defaults to
+                ``settings.snapshot_hub_url``)
+        """
+        self.voting_service = voting_service
+        self.max_concurrency = max_concurrency or settings.vote_max_concurrency
+        self.max_attempts = max_attempts or settings.vote_max_attempts
+        self.retry_backoff_seconds = (
+            retry_backoff_seconds
+            if retry_backoff_seconds is not None
+            else settings.vote_retry_backoff_seconds
+        )
+        self.hub_url = hub_url or settings.snapshot_hub_url
+
+        assert self.max_concurrency >= 1, "max_concurrency must be at least 1"
+        assert self.max_attempts >= 1, "max_attempts must be at least 1"
+        assert self.retry_backoff_seconds >= 0, "retry backoff must not be negative"
+
+        self.rate_limiter = RpcRateLimiter(
+            limits={self.hub_url: rate_per_second or settings.snapshot_hub_rate_limit},
+            burst=self.max_concurrency,
+            backoff_seconds=self.retry_backoff_seconds,
+        )
+
+    def retry_delay(self, attempt: int) -> float:
+        """Delay after failed attempt number ``attempt`` (1-based)."""
+        return self.retry_backoff_seconds * 2 ** (attempt - 1)
+
+    async def dispatch(
+        self,
+        requests: Sequence[VoteRequest],
+        on_outcome: Optional[Callable[[int, VoteOutcome], Awaitable[None]]] = None,
+    ) -> List[VoteOutcome]:
+        """Submit votes concurrently.
+
+        Args:
+            requests: Votes to submit
+            on_outcome: Awaited with the request index and its outcome as soon
+                as each vote is final
+
+        Returns:
+            One outcome per request, in request order
+        """
+        if not requests:
+            return []
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        proposal_locks: Dict[Tuple[str, str], asyncio.Lock] = {}
+        started = time.monotonic()
+
+        async def run(index: int, request: VoteRequest) -> VoteOutcome:
+            lock = proposal_locks.setdefault(
+                (request.space, request.proposal), asyncio.Lock()
+            )
+            async with lock, semaphore:
+                outcome = await self._submit(request)
+            if on_outcome is not None:
+                await on_outcome(index, outcome)
+            return outcome
+
+        # Locks are acquired in creation order, which keeps votes on the same
+        # proposal in request order
+        outcomes = await asyncio.gather(
+            *(run(index, request) for index, request in enumerate(requests))
+        )
+
+        accepted = sum(1 for outcome in outcomes if outcome.success)
+        logger.info(
+            f"Vote dispatch completed (votes={len(requests)}, accepted={accepted}, "
+            f"max_concurrency={self.max_concurrency}, "
+            f"elapsed_seconds={time.monotonic() - started:.2f})"
+        )
+        return list(outcomes)
+
+    async def _submit(self, request: VoteRequest) -> VoteOutcome:
+        """Submit one vote, retrying transient failures."""
+        outcome = VoteOutcome(request=request)
+        # Fixed for all attempts so each retry carries the same signed message
+        timestamp = int(time.time())
+
+        for attempt in range(1, self.max_attempts + 1):
+            await self.rate_limiter.acquire(self.hub_url)
+            outcome.attempts = attempt
+            try:
+                outcome.result = await self.voting_service.vote_on_proposal(
+                    space=request.space,
+                    proposal=request.proposal,
+                    choice=request.choice,
+                    timestamp=timestamp,
+                )
+            except Exception as e:
+                # Signing or validation failed; retrying would not help
+                outcome.error = str(e)
+                return outcome
+
+            if outcome.success:
+                self.rate_limiter.report_success(self.hub_url)
+                outcome.error = None
+                return outcome
+
+            submission = outcome.result.get("submission_result") or {}
+            outcome.error = submission.get("error", "Unknown error")
+            if submission.get("status_code") == HTTP_TOO_MANY_REQUESTS:
+                retry_after = submission.get("retry_after")
+                self.rate_limiter.report_rate_limited(
+                    self.hub_url,
+                    float(retry_after)
+                    if retry_after and str(retry_after).isdigit()
+                    else None,
+                )
+            if not is_transient_failure(outcome.result):
+                return outcome
+            if attempt < self.max_attempts:
+                delay = self.retry_delay(attempt)
+                logger.warning(
+                    f"Retrying vote submission (proposal_id={request.proposal}, "
+                    f"attempt={attempt}, error={outcome.error}, "
+                    f"delay_seconds={delay:.1f})"
+                )
+                await asyncio.sleep(delay)
+
+        return outcome
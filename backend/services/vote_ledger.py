@@ -0,0 +1,190 @@
+"""Persistent ledger of submitted votes for idempotent vote submission."""
+
+import asyncio
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from logging_config import setup_pearl_logger
+from models import Vote
+
+# Constants
+VOTE_LEDGER_STATE_NAME = "vote_ledger"
+MAX_LEDGER_AGE_SECONDS = 30 * 24 * 3600
+DEFAULT_MAX_LEDGER_ENTRIES = 5000
+
+STATUS_SUBMITTED = "submitted"
+STATUS_CONFIRMED = "confirmed"
+
+
+class VoteLedger:
+    """Ledger of (space, proposal, voter) tuples that already have a vote.
+
+    Entries are recorded as ``submitted`` when the Snapshot hub accepts a vote
+    and as ``confirmed`` when the vote is seen in the hub's vote index during
+    reconciliation. Either status means the proposal must not be analyzed or
+    voted on again by the same voter. When a StateManager is provided the
+    ledger is persisted so that it survives a restart.
+    """
+
+    def __init__(
+        self, state_manager=None, max_entries: int = DEFAULT_MAX_LEDGER_ENTRIES
+    ) -> None:
+        """Initialize the vote ledger.
+
+        Args:
+            state_manager: Optional StateManager instance for persistence
+            max_entries: Maximum number of votes kept in the ledger
+        """
+        assert max_entries > 0, "max_entries must be positive"
+
+        self.state_manager = state_manager
+        self.max_entries = max_entries
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = asyncio.Lock()
+        self._loaded = False
+        self.logger = setup_pearl_logger(__name__)
+
+    @staticmethod
+    def _key(space_id: str, proposal_id: str, voter: str) -> str:
+        """Build the ledger key for a (space, proposal, voter) tuple."""
+        return f"{space_id}:{proposal_id}:{voter.lower()}"
+
+    async def load(self) -> None:
+        """Load persisted ledger entries, dropping those that have aged out."""
+        if self._loaded:
+            return
+        self._loaded = True
+
+        if not self.state_manager:
+            return
+
+        try:
+            data = await self.state_manager.load_state(
+                VOTE_LEDGER_STATE_NAME, allow_recovery=True
+            )
+        except Exception as e:
+            self.logger.warning(f"Could not load vote ledger (error={str(e)})")
+            return
+
+        cutoff = time.time() - MAX_LEDGER_AGE_SECONDS
+        entries = (data or {}).get("entries", {})
+        self._entries = {
+            key: entry
+            for key, entry in entries.items()
+            if entry.get("updated_at", 0) > cutoff
+        }
+        self.logger.info(
+            f"Vote ledger loaded (entries={len(self._entries)}, "
+            f"expired={len(entries) - len(self._entries)})"
+        )
+
+    def has_voted(self, space_id: str, proposal_id: str, voter: str) -> bool:
+        """Check whether the voter already has a vote on the proposal."""
+        return self._key(space_id, proposal_id, voter) in self._entries
+
+    def voted_proposal_ids(self, space_id: str, voter: str) -> Set[str]:
+        """Return the IDs of proposals in a space the voter already voted on."""
+        voter = voter.lower()
+        return {
+            entry["proposal_id"]
+            for entry in self._entries.values()
+            if entry["space_id"] == space_id and entry["voter"] == voter
+        }
+
+    async def record_submission(
+        self,
+        space_id: str,
+        proposal_id: str,
+        voter: str,
+        vote_id: Optional[str] = None,
+    ) -> None:
+        """Record a vote accepted by the Snapshot hub.
+
+        Args:
+            space_id: Space the vote was cast in
+            proposal_id: Proposal that was voted on
+            voter: Address that cast the vote
+            vote_id: Vote ID returned by the hub, if any
+        """
+        async with self._lock:
+            self._put(space_id, proposal_id, voter, STATUS_SUBMITTED, vote_id)
+            await self._persist()
+
+    async def reconcile(self, space_id: str, voter: str, votes: Iterable[Vote]) -> int:
+        """Mark votes found in the Snapshot vote index as confirmed.
+
+        Args:
+            space_id: Space the votes were queried for
+            voter: Address the votes were queried for
+            votes: Votes returned by the hub, with the ``proposal`` field set
+
+        Returns:
+            Number of votes that were not in the ledger before
+        """
+        added = 0
+        async with self._lock:
+            for vote in votes:
+                proposal_id = (vote.proposal or {}).get("id")
+                if not proposal_id:
+                    continue
+                if not self.has_voted(space_id, proposal_id, voter):
+                    added += 1
+                self._put(space_id, proposal_id, voter, STATUS_CONFIRMED, vote.id)
+            await self._persist()
+
+        if added:
+            self.logger.info(
+                f"Vote ledger reconciled with Snapshot (space_id={space_id}, "
+                f"voter={voter}, votes_added={added})"
+            )
+        return added
+
+    def _put(
+        self,
+        space_id: str,
+        proposal_id: str,
+        voter: str,
+        status: str,
+        vote_id: Optional[str],
+    ) -> None:
+        """Insert or update a ledger entry."""
+        key = self._key(space_id, proposal_id, voter)
+        if key not in self._entries:
+            self._evict_if_full()
+        previous = self._entries.get(key, {})
+        self._entries[key] = {
+            "space_id": space_id,
+            "proposal_id": proposal_id,
+            "voter": voter.lower(),
+            "status": status,
+            "vote_id": vote_id or previous.get("vote_id"),
+            "updated_at": time.time(),
+        }
+
+    def _evict_if_full(self) -> None:
+        """Drop the least recently updated entries to stay within max_entries."""
+        while len(self._entries) >= self.max_entries:
+            oldest = min(
+                self._entries, key=lambda key: self._entries[key]["updated_at"]
+            )
+            del self._entries[oldest]
+
+    async def _persist(self) -> None:
+        """Persist the ledger if a StateManager is configured."""
+        if not self.state_manager:
+            return
+        try:
+            await self.state_manager.save_state(
+                VOTE_LEDGER_STATE_NAME, {"entries": self._entries}
+            )
+        except Exception as e:
+            self.logger.warning(f"Could not persist vote ledger (error={str(e)})")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return ledger size by status."""
+        statuses: List[str] = [entry["status"] for entry in self._entries.values()]
+        return {
+            "entries": len(statuses),
+            "submitted": statuses.count(STATUS_SUBMITTED),
+            "confirmed": statuses.count(STATUS_CONFIRMED),
+        }
@@ -1,5 +1,6 @@
 """Voting service for handling Snapshot DAO voting operations."""
 
+import asyncio
 import time
 import logging
 from typing import Dict, Optional, Any, List
@@ -9,6 +10,14 @@ from eth_account.messages import encode_typed_data
 import httpx
 from logging_config import setup_pearl_logger, log_span
 from config import settings
+from utils.crypto_executor import run_in_crypto_executor
+from utils.eip712_signer import (
+    TypedDataSigner,
+    TypedStruct,
+    domain_separator,
+    register_signer,
+    sign_full_typed_data,
+)
 
 
 # Constants for vote choices and API configuration
@@ -26,6 +35,38 @@ VOTE_CHOICE_DESCRIPTIONS = {
 # Snapshot vote message configuration
 SNAPSHOT_DOMAIN_NAME = "snapshot"
 SNAPSHOT_DOMAIN_VERSION = "0.1.4"
+SNAPSHOT_DOMAIN = {"name": SNAPSHOT_DOMAIN_NAME, "version": SNAPSHOT_DOMAIN_VERSION}
+SNAPSHOT_DOMAIN_SEPARATOR = domain_separator(
+    SNAPSHOT_DOMAIN_NAME, SNAPSHOT_DOMAIN_VERSION
+)
+
+# Vote struct per proposal ID type, with type hashes computed once
+SNAPSHOT_VOTE_STRUCTS = {
+    proposal_type: TypedStruct(
+        "Vote",
+        [
+            ("from", "string"),
+            ("space", "string"),
+            ("timestamp", "uint64"),
+            ("proposal", proposal_type),
+            ("choice", "uint32"),
+            ("reason", "string"),
+            ("app", "string"),
+            ("metadata", "string"),
+        ],
+    )
+    for proposal_type in ("string", "bytes32")
+}
+SNAPSHOT_VOTE_TYPES = {
+    proposal_type: {
+        "EIP712Domain": [
+            {"name": "name", "type": "string"},
+            {"name": "version", "type": "string"},
+        ],
+        "Vote": struct.types(),
+    }
+    for proposal_type, struct in SNAPSHOT_VOTE_STRUCTS.items()
+}
 
 
 class VotingService:
@@ -44,6 +85,11 @@ class VotingService:
 
         # Initialize account lazily
         self._account = None
+        self._signer = None
+
+        # Pooled HTTP client for hub submissions, created on first use
+        self._http_client: Optional[httpx.AsyncClient] = None
+        self._active_votes: List[Dict[str, Any]] = []
 
         # Initialize Pearl-compliant logger
         self.logger = setup_pearl_logger(name="voting_service", level=logging.INFO)
@@ -61,6 +107,30 @@ class VotingService:
             )
         return self._account
 
+    @property
+    def signer(self) -> TypedDataSigner:
+        """Get the EIP-712 signer for the account."""
+        if self._signer is None:
+            self._signer = register_signer(self.account)
+        return self._signer
+
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        """Get the HTTP client shared by hub submissions.
+
+        Reusing one client keeps connections to the hub alive between votes
+        instead of paying a TCP and TLS handshake for each one.
+        """
+        if self._http_client is None or self._http_client.is_closed:
+            self._http_client = httpx.AsyncClient()
+        return self._http_client
+
+    async def close(self) -> None:
+        """Close the HTTP client and release its connections."""
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+
     def create_snapshot_vote_message(
         self, space: str, proposal: str, choice: int, timestamp: Optional[int] = None
     ) -> Dict[str, Any]:
@@ -121,29 +191,9 @@ class VotingService:
         proposal_type = "bytes32" if proposal_is_bytes32 else "string"
 
         return {
-            "domain": {
-                "name": SNAPSHOT_DOMAIN_NAME,
-                "version": SNAPSHOT_DOMAIN_VERSION,
-            },
-            "types": {
-                "EIP712Domain": [
-                    {"name": "name", "type": "string"},
-                    {"name": "version", "type": "string"},
-                ],
-                "Vote": [
-                    {"name": "from", "type": "string"},
-                    {"name": "space", "type": "string"},
-                    {"name": "timestamp", "type": "uint64"},
-                    {
-                        "name": "proposal",
-                        "type": proposal_type,
-                    },
-                    {"name": "choice", "type": "uint32"},
-                    {"name": "reason", "type": "string"},
-                    {"name": "app", "type": "string"},
-                    {"name": "metadata", "type": "string"},
-                ],
-            },
+            "domain": dict(SNAPSHOT_DOMAIN),
+            # Shared, precomputed type definitions; do not mutate
+            "types": SNAPSHOT_VOTE_TYPES[proposal_type],
             "primaryType": "Vote",
             "message": {
                 "from": from_address,
@@ -172,13 +222,51 @@ class VotingService:
             "Snapshot message must contain 'message' field"
         )
 
+        struct = self._snapshot_vote_struct(snapshot_message)
+        if struct is not None:
+            signature_bytes = self.signer.sign(
+                SNAPSHOT_DOMAIN_SEPARATOR, struct, snapshot_message["message"]
+            )
+        else:
+            signable_message = encode_typed_data(full_message=snapshot_message)
+            signature_bytes = self.account.sign_message(signable_message).signature
+        return self._format_signature(signature_bytes)
+
+    async def sign_snapshot_message_async(
+        self, snapshot_message: Dict[str, Any]
+    ) -> str:
+        """Sign a Snapshot vote message in the crypto worker pool.
+
+        Args:
+            snapshot_message: The vote message dictionary from create_snapshot_vote_message
+
+        Returns:
+            Hex string of the signature
+        """
+        # Runtime assertions
+        assert snapshot_message, "Snapshot message must not be empty"
+        assert "message" in snapshot_message, (
+            "Snapshot message must contain 'message' field"
+        )
+
+        struct = self._snapshot_vote_struct(snapshot_message)
+        if struct is not None:
+            signature_bytes = await self.signer.sign_async(
+                SNAPSHOT_DOMAIN_SEPARATOR, struct, snapshot_message["message"]
+            )
+        else:
+            signature_bytes = await run_in_crypto_executor(
+                sign_full_typed_data, self.signer.address, snapshot_message
+            )
+        return self._format_signature(signature_bytes)
+
+    def _format_signature(self, signature_bytes: bytes) -> str:
+        """Hex-encode a signature and log a preview of it."""
         # Constants
         HEX_PREFIX = "0x"
         PREVIEW_LENGTH = 10
 
-        signable_message = encode_typed_data(full_message=snapshot_message)
-        signed = self.account.sign_message(signable_message)
-        signature = HEX_PREFIX + signed.signature.hex()
+        signature = HEX_PREFIX + signature_bytes.hex()
 
         # Create signature preview for logging
         signature_preview = (
@@ -192,6 +280,38 @@ class VotingService:
 
         return signature
 
+    async def sign_snapshot_messages(
+        self, snapshot_messages: List[Dict[str, Any]]
+    ) -> List[str]:
+        """Sign several Snapshot vote messages concurrently in the crypto worker pool.
+
+        Args:
+            snapshot_messages: Vote messages from create_snapshot_vote_message
+
+        Returns:
+            Hex signature strings, in order
+        """
+        return list(
+            await asyncio.gather(
+                *(self.sign_snapshot_message_async(m) for m in snapshot_messages)
+            )
+        )
+
+    @staticmethod
+    def _snapshot_vote_struct(
+        snapshot_message: Dict[str, Any],
+    ) -> Optional[TypedStruct]:
+        """Return the precomputed Vote struct matching a message, if any."""
+        if (
+            snapshot_message.get("primaryType") != "Vote"
+            or snapshot_message.get("domain") != SNAPSHOT_DOMAIN
+        ):
+            return None
+        for proposal_type, types in SNAPSHOT_VOTE_TYPES.items():
+            if snapshot_message.get("types") == types:
+                return SNAPSHOT_VOTE_STRUCTS[proposal_type]
+        return None
+
     async def submit_vote_to_snapshot(
         self, snapshot_message: Dict[str, Any], signature: str
     ) -> Dict[str, Any]:
@@ -237,12 +357,11 @@ class VotingService:
 
             # Submit Snapshot vote
             try:
-                async with httpx.AsyncClient() as client:
-                    response = await client.post(
-                        url,
-                        json=request_body,
-                        headers={"Content-Type": "application/json"},
-                    )
+                response = await self.http_client.post(
+                    url,
+                    json=request_body,
+                    headers={"Content-Type": "application/json"},
+                )
 
                 # Constants for HTTP status
                 HTTP_OK = 200
@@ -263,6 +382,8 @@ class VotingService:
                 return {
                     "success": False,
                     "error": f"HTTP {response.status_code}",
+                    "status_code": response.status_code,
+                    "retry_after": response.headers.get("Retry-After"),
                     "response_text": error_text,
                 }
 
@@ -304,7 +425,7 @@ class VotingService:
             )
 
             # Sign message
-            signature = self.sign_snapshot_message(vote_message)
+            signature = await self.sign_snapshot_message_async(vote_message)
 
             # Submit to Snapshot
             submission_result = await self.submit_vote_to_snapshot(
@@ -416,6 +537,7 @@ class VotingService:
             # Clear active votes as they would have completed or failed by now
             self._active_votes.clear()
 
+        await self.close()
         self.logger.info("Voting service shutdown completed")
 
     async def save_service_state(self) -> None:
@@ -428,6 +550,7 @@ class VotingService:
         """Stop the service gracefully."""
         # Clear any tracking of active votes
         self._active_votes.clear()
+        await self.close()
 
     async def get_active_votes(self) -> List[Dict[str, Any]]:
         """Get list of active votes for shutdown coordination."""
@@ -8,10 +8,11 @@ Safe contracts.
 
 import os
 from decimal import Decimal
-from typing import Dict, List
+from typing import Any, Dict, List, Optional
 from datetime import datetime
 
 from models import InvestedPosition, WithdrawalTransaction, WithdrawalStatus
+from services.receipt_reconciler import KIND_WITHDRAWAL, STATUS_FAILED
 from services.state_manager import StateManager
 from services.safe_service import SafeService
 from services.snapshot_service import SnapshotService
@@ -19,6 +20,9 @@ from logging_config import setup_pearl_logger
 
 logger = setup_pearl_logger(__name__)
 
+# SafeService chain names by chain ID, for receipt tracking
+CHAIN_NAMES = {1: "ethereum", 100: "gnosis", 8453: "base", 34443: "mode"}
+
 
 class WithdrawalService:
     """Service for handling emergency withdrawal operations."""
@@ -33,8 +37,14 @@ class WithdrawalService:
         self.state_manager = state_manager
         self.safe_service = safe_service
         self.snapshot_service = snapshot_service
+        self.receipt_reconciler = None
         logger.info("WithdrawalService initialized")
 
+    def use_receipt_reconciler(self, reconciler) -> None:
+        """Let ``reconciler`` confirm submitted withdrawals in the background."""
+        self.receipt_reconciler = reconciler
+        reconciler.register_handler(KIND_WITHDRAWAL, self._on_receipt)
+
     async def is_withdrawal_mode_active(self) -> bool:
         """Check if withdrawal mode is active via environment variable."""
         withdrawal_mode = os.environ.get("WITHDRAWAL_MODE", "false").lower()
@@ -172,7 +182,8 @@ class WithdrawalService:
                 )
 
                 # Update state with pending withdrawal
-                await self._update_pending_withdrawal(withdrawal)
+                tracking_id = await self._track_receipt(position, result)
+                await self._update_pending_withdrawal(withdrawal, tracking_id)
 
                 logger.info(
                     f"Withdrawal transaction submitted: {withdrawal.transaction_hash}"
@@ -209,7 +220,46 @@ class WithdrawalService:
         _ = amount  # noqa: F841
         return "0x"
 
-    async def _update_pending_withdrawal(self, withdrawal: WithdrawalTransaction):
+    async def _track_receipt(
+        self, position: InvestedPosition, result: Dict[str, Any]
+    ) -> Optional[str]:
+        """Hand a submitted withdrawal to the receipt reconciler, if attached.
+
+        Returns:
+            The tracking handle, or None if the withdrawal is left to
+            monitor_pending_withdrawals
+        """
+        chain = CHAIN_NAMES.get(position.chain_id)
+        if self.receipt_reconciler is None or chain is None:
+            return None
+        return await self.receipt_reconciler.track(
+            {
+                "chain": chain,
+                "tx_hash": result["transaction_hash"],
+                "safe_address": result.get("safe_address"),
+                "safe_nonce": result.get("safe_nonce"),
+            },
+            KIND_WITHDRAWAL,
+            {"position_id": position.position_id},
+        )
+
+    async def _on_receipt(self, record: Dict[str, Any], _logs: List[Dict]) -> None:
+        """Record the outcome of a tracked withdrawal transaction."""
+        state = await self.state_manager.load_state("withdrawal_service") or {}
+        for withdrawal_data in state.get("pending_withdrawals", []):
+            if withdrawal_data.get("tracking_id") != record["tracking_id"]:
+                continue
+            withdrawal_data["status"] = record["status"]
+            if record["status"] == STATUS_FAILED:
+                withdrawal_data["error_message"] = record.get("error")
+            logger.info(
+                f"Withdrawal {withdrawal_data['transaction_hash']} {record['status']}"
+            )
+        await self.state_manager.save_state("withdrawal_service", state)
+
+    async def _update_pending_withdrawal(
+        self, withdrawal: WithdrawalTransaction, tracking_id: Optional[str] = None
+    ):
         """Update state with pending withdrawal."""
         state = await self.state_manager.load_state("withdrawal_service") or {}
 
@@ -224,6 +274,7 @@ class WithdrawalService:
                 "chain_id": withdrawal.chain_id,
                 "timestamp": withdrawal.timestamp,
                 "error_message": withdrawal.error_message,
+                "tracking_id": tracking_id,
             }
         )
 
@@ -238,7 +289,10 @@ class WithdrawalService:
         updated_withdrawals = []
 
         for withdrawal_data in pending_withdrawals:
-            if withdrawal_data["status"] == "pending":
+            # Tracked withdrawals are updated by the receipt reconciler
+            if withdrawal_data["status"] == "pending" and not withdrawal_data.get(
+                "tracking_id"
+            ):
                 # Check transaction status
                 tx_status = await self.safe_service.get_transaction_status(
                     withdrawal_data["transaction_hash"]
@@ -0,0 +1,172 @@
+"""Tests for the persistent attestation queue and its worker."""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, Mock
+
+from services.attestation_queue import ATTESTATION_QUEUE_FILE, AttestationQueue
+
+VOTER = "0x742d35Cc6634C0532925a3b844Bc454e4438f44e"
+
+
+def _item(proposal_id: str) -> dict:
+    return {
+        "space_id": "test.eth",
+        "proposal_id": proposal_id,
+        "vote_choice": 1,
+        "voter_address": VOTER,
+        "delegate_address": VOTER,
+        "vote_tx_hash": "0x" + "1" * 64,
+        "reasoning": "Good proposal",
+        "timestamp": time.time(),
+        "run_id": "run_1",
+        "confidence": 80,
+    }
+
+
+def _safe_service(result=None):
+    safe_service = Mock()
+    safe_service.create_eas_attestation = AsyncMock(
+        return_value=result or {"success": True, "safe_tx_hash": "0xtx"}
+    )
+    return safe_service
+
+
+class TestAttestationQueue:
+    """Test persistence, retries and concurrency of the queue."""
+
+    async def test_pending_items_survive_restart(self, tmp_path):
+        """Test that queued items are replayed from the log."""
+        queue = AttestationQueue(tmp_path, _safe_service())
+        assert await queue.enqueue(_item("0x1"))
+        assert await queue.enqueue(_item("0x1"))
+
+        restored = AttestationQueue(tmp_path, _safe_service())
+
+        assert restored.depth == 1
+
+    async def test_concurrent_enqueues_are_logged_once(self, tmp_path):
+        """Test that the same vote queued twice at once is written once."""
+        queue = AttestationQueue(tmp_path, _safe_service())
+
+        results = await asyncio.gather(
+            queue.enqueue(_item("0x1")), queue.enqueue(_item("0x1"))
+        )
+
+        assert results == [True, True]
+        lines = (tmp_path / ATTESTATION_QUEUE_FILE).read_text().splitlines()
+        assert len(lines) == 1
+
+    async def test_log_is_compacted_while_running(self, tmp_path, monkeypatch):
+        """Test that finished records are compacted away without a restart."""
+        monkeypatch.setattr("services.attestation_queue.COMPACT_AFTER_FINISHED", 2)
+        queue = AttestationQueue(tmp_path, _safe_service())
+        for i in range(3):
+            await queue.enqueue(_item(f"0x{i}"))
+        queue._items[queue.item_id("test.eth", "0x2", VOTER)]["next_attempt_at"] = (
+            time.time() + 3600
+        )
+
+        await queue.run_once()
+
+        lines = (tmp_path / ATTESTATION_QUEUE_FILE).read_text().splitlines()
+        assert len(lines) == 1
+        assert queue._finished_records == 0
+        assert AttestationQueue(tmp_path, _safe_service()).depth == 1
+
+    async def test_completed_items_are_compacted_away(self, tmp_path):
+        """Test that submitted items leave the queue and the log."""
+        safe_service = _safe_service()
+        queue = AttestationQueue(tmp_path, safe_service)
+        await queue.enqueue(_item("0x1"))
+        await queue.enqueue(_item("0x2"))
+
+        assert await queue.run_once() == 2
+
+        assert queue.depth == 0
+        assert queue.get_metrics()["completed"] == 2
+        assert AttestationQueue(tmp_path, safe_service).depth == 0
+        assert (tmp_path / ATTESTATION_QUEUE_FILE).read_text() == ""
+
+    async def test_failure_is_retried_with_exponential_backoff(self, tmp_path):
+        """Test that failed attempts back off and are dropped at max_attempts."""
+        safe_service = _safe_service({"success": False, "error": "rpc down"})
+        queue = AttestationQueue(
+            tmp_path, safe_service, max_attempts=3, base_backoff=10.0
+        )
+        await queue.enqueue(_item("0x1"))
+        item = queue._items[queue.item_id("test.eth", "0x1", VOTER)]
+
+        await queue.run_once()
+        first_delay = item["next_attempt_at"] - time.time()
+        item["next_attempt_at"] = 0
+        await queue.run_once()
+        second_delay = item["next_attempt_at"] - time.time()
+
+        assert 9 < first_delay <= 10
+        assert 19 < second_delay <= 20
+        assert AttestationQueue(tmp_path, safe_service).depth == 1
+
+        item["next_attempt_at"] = 0
+        await queue.run_once()
+
+        assert queue.depth == 0
+        assert queue.get_metrics()["dropped"] == 1
+
+    async def test_worker_respects_max_concurrency(self, tmp_path):
+        """Test that the worker never exceeds max_concurrency submissions."""
+        active = 0
+        peak = 0
+
+        async def submit(_data, **_kwargs):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return {"success": True}
+
+        safe_service = Mock()
+        safe_service.create_eas_attestation = submit
+        queue = AttestationQueue(tmp_path, safe_service, max_concurrency=2)
+        for i in range(5):
+            await queue.enqueue(_item(f"0x{i}"))
+
+        queue.start()
+        for _ in range(50):
+            if queue.depth == 0:
+                break
+            await asyncio.sleep(0.01)
+        await queue.stop()
+
+        assert queue.depth == 0
+        assert peak == 2
+
+    async def test_fresh_items_are_batched_and_failures_retried_alone(self, tmp_path):
+        """Test MultiSend batching with per-item results."""
+        safe_service = _safe_service()
+        safe_service.create_eas_attestations_batch = AsyncMock(
+            return_value={
+                "success": True,
+                "results": [
+                    {"success": True, "attestation_uid": "0x01"},
+                    {"success": False, "error": "reverted"},
+                    {"success": True, "attestation_uid": "0x03"},
+                ],
+            }
+        )
+        queue = AttestationQueue(tmp_path, safe_service, batch_size=3)
+        for i in range(3):
+            await queue.enqueue(_item(f"0x{i}"))
+
+        await queue.run_once()
+
+        safe_service.create_eas_attestations_batch.assert_awaited_once()
+        assert queue.depth == 1
+        assert queue.get_metrics()["completed"] == 2
+
+        next(iter(queue._items.values()))["next_attempt_at"] = 0
+        await queue.run_once()
+
+        safe_service.create_eas_attestation.assert_awaited_once()
+        assert queue.depth == 0
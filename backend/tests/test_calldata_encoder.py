@@ -0,0 +1,77 @@
+"""Tests for offline calldata encoding."""
+
+import pytest
+from web3 import Web3
+
+from utils.abi_loader import load_abi
+from utils.calldata_encoder import CalldataEncoder, get_calldata_encoder
+
+CONTRACT_ADDRESS = "0x1111111111111111111111111111111111111111"
+RECIPIENT = "0x4567890123456789012345678901234567890123"
+ATTESTER = "0x2222222222222222222222222222222222222222"
+
+
+def _web3_calldata(abi_name: str, *args) -> str:
+    """Encode the same call through a web3 contract object."""
+    contract = Web3().eth.contract(address=CONTRACT_ADDRESS, abi=load_abi(abi_name))
+    return contract.encode_abi("attestByDelegation", args=list(args))
+
+
+class TestCalldataEncoder:
+    """Test that offline encoding matches web3's contract encoding."""
+
+    def test_flat_arguments_match_web3(self):
+        """Test the 12-parameter AttestationTracker interface."""
+        args = (
+            b"\xaa" * 32,
+            RECIPIENT,
+            0,
+            True,
+            b"\x00" * 32,
+            b"attestation data",
+            0,
+            27,
+            b"\x01" * 32,
+            b"\x02" * 32,
+            ATTESTER,
+            1234567890,
+        )
+
+        encoder = get_calldata_encoder("attestation_tracker", "attestByDelegation")
+
+        assert Web3.to_hex(encoder.encode(*args)) == _web3_calldata(
+            "attestation_tracker", *args
+        )
+
+    def test_struct_argument_given_as_dict_matches_web3(self):
+        """Test the nested EIP712Proxy request, passed as a dict."""
+        request = {
+            "schema": b"\xaa" * 32,
+            "data": {
+                "recipient": RECIPIENT,
+                "expirationTime": 0,
+                "revocable": True,
+                "refUID": b"\x00" * 32,
+                "data": b"attestation data",
+                "value": 0,
+            },
+            "signature": {"v": 27, "r": b"\x01" * 32, "s": b"\x02" * 32},
+            "attester": ATTESTER,
+            "deadline": 1234567890,
+        }
+
+        encoder = get_calldata_encoder("eip712proxy", "attestByDelegation")
+
+        assert encoder.signature.startswith("attestByDelegation((bytes32,(address,")
+        assert Web3.to_hex(encoder.encode(request)) == _web3_calldata(
+            "eip712proxy", request
+        )
+
+    def test_rejects_unknown_function_and_wrong_arity(self):
+        """Test that misuse fails loudly instead of producing bad calldata."""
+        with pytest.raises(AssertionError):
+            CalldataEncoder("attestation_tracker", "doesNotExist")
+
+        encoder = get_calldata_encoder("attestation_tracker", "attestByDelegation")
+        with pytest.raises(AssertionError):
+            encoder.encode(b"\xaa" * 32)
@@ -0,0 +1,58 @@
+"""Tests for the shared chain client registry."""
+
+from unittest.mock import Mock
+
+import requests
+
+from utils.chain_client_registry import (
+    CLIENT_ETHEREUM,
+    CLIENT_SAFE,
+    CLIENT_WEB3,
+    ChainClientRegistry,
+    is_connection_error,
+)
+
+RPC_URL = "https://base-rpc.com"
+
+
+class TestChainClientRegistry:
+    """Test client reuse, invalidation and error classification."""
+
+    def test_client_created_once_per_endpoint(self):
+        """Test that the factory runs once and later calls reuse the client."""
+        registry = ChainClientRegistry()
+        factory = Mock(side_effect=lambda: object())
+
+        first = registry.get(CLIENT_WEB3, RPC_URL, factory)
+        second = registry.get(CLIENT_WEB3, RPC_URL, factory)
+        other = registry.get(CLIENT_WEB3, "https://eth-rpc.com", factory)
+
+        assert first is second
+        assert other is not first
+        assert factory.call_count == 2
+        assert registry.get_metrics()["reused"] == 1
+
+    def test_invalidate_drops_every_client_of_an_endpoint(self):
+        """Test that invalidation covers clients bound to the endpoint."""
+        registry = ChainClientRegistry()
+        registry.get(CLIENT_WEB3, RPC_URL, object)
+        registry.get(CLIENT_ETHEREUM, RPC_URL, object)
+        registry.get(CLIENT_SAFE, f"{RPC_URL}|0xSafe", object)
+        registry.get(CLIENT_WEB3, "https://eth-rpc.com", object)
+
+        assert registry.invalidate(RPC_URL) == 3
+
+        metrics = registry.get_metrics()
+        assert metrics["clients"] == {CLIENT_WEB3: 1}
+        assert metrics["invalidated"] == 3
+
+    def test_connection_errors_are_distinguished_from_rate_limits(self):
+        """Test which errors cause clients to be rebuilt."""
+        rate_limited = requests.HTTPError(
+            "429 Client Error: Too Many Requests", response=Mock(status_code=429)
+        )
+
+        assert is_connection_error(requests.ConnectionError("connection refused"))
+        assert is_connection_error(requests.Timeout("read timed out"))
+        assert not is_connection_error(rate_limited)
+        assert not is_connection_error(ValueError("execution reverted"))
@@ -0,0 +1,71 @@
+"""Tests for the chain metadata cache."""
+
+from unittest.mock import patch
+
+from web3 import Web3
+from web3.providers import BaseProvider
+
+from utils.chain_metadata import ChainMetadataCache
+
+TRACKER_ADDRESS = "0x1111111111111111111111111111111111111111"
+
+
+class CountingProvider(BaseProvider):
+    """Provider that answers a few read calls and records every request."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls = []
+
+    def make_request(self, method, _params):
+        self.calls.append(method)
+        results = {
+            "eth_chainId": "0x2105",
+            "eth_getBlockByNumber": {"number": "0x10", "timestamp": "0x64"},
+        }
+        return {"jsonrpc": "2.0", "id": 1, "result": results.get(method, "0x1")}
+
+
+class TestChainMetadataCache:
+    """Test what the cache serves without going back to the node."""
+
+    def test_chain_id_read_once(self):
+        """Test that the chain ID is fetched from the node only once."""
+        provider = CountingProvider()
+        w3 = Web3(provider)
+        cache = ChainMetadataCache(block_ttl_seconds=2.0)
+
+        assert cache.get_chain_id("base", w3) == 8453
+        assert cache.get_chain_id("base", w3) == 8453
+
+        assert provider.calls == ["eth_chainId"]
+
+    def test_latest_block_reused_within_ttl(self):
+        """Test that the latest block is refetched only after the TTL."""
+        provider = CountingProvider()
+        w3 = Web3(provider)
+        cache = ChainMetadataCache(block_ttl_seconds=2.0)
+
+        with patch("utils.chain_metadata.time.monotonic", side_effect=[0, 1, 3]):
+            first = cache.get_latest_block("base", w3)
+            cache.get_latest_block("base", w3)
+            cache.get_latest_block("base", w3)
+
+        assert first["timestamp"] == 100
+        assert provider.calls.count("eth_getBlockByNumber") == 2
+
+    def test_contract_rebuilt_for_new_web3_or_after_invalidate(self):
+        """Test that contracts are reused only with the Web3 they were built for."""
+        cache = ChainMetadataCache()
+        w3 = Web3(CountingProvider())
+
+        first = cache.get_contract("base", w3, TRACKER_ADDRESS, "attestation_tracker")
+        again = cache.get_contract("base", w3, TRACKER_ADDRESS, "attestation_tracker")
+        reconnected = cache.get_contract(
+            "base", Web3(CountingProvider()), TRACKER_ADDRESS, "attestation_tracker"
+        )
+        cache.invalidate("base")
+
+        assert again is first
+        assert reconnected is not first
+        assert cache.get_metrics()["contracts"] == 0
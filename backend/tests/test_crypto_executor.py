@@ -0,0 +1,107 @@
+"""Tests for the signing and ABI encoding worker pool."""
+
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from utils.crypto_executor import (
+    CRYPTO_EXECUTOR_THREAD_PREFIX,
+    add_worker_initializer,
+    get_crypto_executor_metrics,
+    run_in_crypto_executor,
+    shutdown_crypto_executor,
+)
+from utils.eas_signature import EAS_ATTEST_STRUCT, eas_domain_separator
+from utils.eip712_signer import get_typed_data_signer, sign_typed_messages
+
+PRIVATE_KEY = "0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80"
+REQUEST = {
+    "schema": bytes(32),
+    "recipient": "0x742d35Cc6634C0532925a3b844Bc9e7595f0fA27",
+    "expirationTime": 0,
+    "revocable": True,
+    "refUID": bytes(32),
+    "data": b"data",
+    "value": 0,
+    "deadline": 1,
+}
+
+
+def _thread_name() -> str:
+    return threading.current_thread().name
+
+
+def _fail() -> None:
+    raise ValueError("boom")
+
+
+_worker_value = None
+
+
+def _set_worker_value(value: str) -> None:
+    global _worker_value
+    _worker_value = value
+
+
+def _get_worker_value():
+    return _worker_value
+
+
+@pytest.fixture(autouse=True)
+def fresh_executor(monkeypatch):
+    """Start and end every test without a running pool or initializers."""
+    shutdown_crypto_executor()
+    monkeypatch.setattr("utils.crypto_executor._worker_initializers", [])
+    yield
+    shutdown_crypto_executor()
+
+
+class TestCryptoExecutor:
+    """Test offloading and instrumentation."""
+
+    async def test_runs_in_worker_thread_and_records_timing(self):
+        """Test that work leaves the loop thread and its timing is recorded."""
+        name = await run_in_crypto_executor(_thread_name)
+
+        assert name.startswith(CRYPTO_EXECUTOR_THREAD_PREFIX)
+        stats = get_crypto_executor_metrics()["functions"]["_thread_name"]
+        assert stats["calls"] >= 1
+        assert stats["max_queue_ms"] >= 0 and stats["max_run_ms"] >= 0
+
+    async def test_errors_propagate_and_are_counted(self):
+        """Test that a failing call raises and counts as a failure."""
+        with pytest.raises(ValueError, match="boom"):
+            await run_in_crypto_executor(_fail)
+
+        assert get_crypto_executor_metrics()["functions"]["_fail"]["failures"] >= 1
+
+    async def test_process_pool_signs(self):
+        """Test that signing runs in a process pool when configured."""
+        domain = eas_domain_separator(
+            8453, "0xF095fE4b23958b08D38e52d5d5674bBF0C03cbF6"
+        )
+        address = get_typed_data_signer(PRIVATE_KEY).address
+        with patch("utils.crypto_executor.settings") as mock_settings:
+            mock_settings.crypto_executor_kind = "process"
+            mock_settings.crypto_executor_max_workers = 1
+
+            signatures = await run_in_crypto_executor(
+                sign_typed_messages, address, domain, EAS_ATTEST_STRUCT, [REQUEST]
+            )
+
+        assert signatures == sign_typed_messages(
+            address, domain, EAS_ATTEST_STRUCT, [REQUEST]
+        )
+
+    async def test_process_workers_run_initializers(self):
+        """Test that worker processes are initialized once instead of per call."""
+        with patch("utils.crypto_executor.settings") as mock_settings:
+            mock_settings.crypto_executor_kind = "process"
+            mock_settings.crypto_executor_max_workers = 1
+
+            assert await run_in_crypto_executor(_get_worker_value) is None
+            add_worker_initializer(_set_worker_value, "loaded")
+
+            assert await run_in_crypto_executor(_get_worker_value) == "loaded"
+        assert _worker_value is None
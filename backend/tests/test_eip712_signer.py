@@ -0,0 +1,128 @@
+"""Tests for EIP-712 signing with precomputed hashes."""
+
+from unittest.mock import Mock
+
+import pytest
+from eth_account import Account
+from eth_account.messages import encode_typed_data
+
+from services.voting_service import VotingService
+from utils.eas_signature import (
+    EAS_ATTEST_STRUCT,
+    generate_eas_delegated_signature,
+    generate_eas_delegated_signatures,
+)
+from utils.eip712_signer import domain_separator
+
+PRIVATE_KEY = "0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80"
+EAS_CONTRACT = "0xF095fE4b23958b08D38e52d5d5674bBF0C03cbF6"
+
+
+def _attest_request(deadline: int = 1234567890) -> dict:
+    return {
+        "schema": bytes.fromhex(
+            "56e7ff73404d5c8102a063b9efeb4b992c90b01c9c958de4c2baae18340f242b"
+        ),
+        "recipient": "0x742d35Cc6634C0532925a3b844Bc9e7595f0fA27",
+        "expirationTime": 0,
+        "revocable": True,
+        "refUID": bytes(32),
+        "data": b"test attestation data",
+        "value": 0,
+        "deadline": deadline,
+    }
+
+
+def _reference_signature(typed_data: dict) -> bytes:
+    """Sign with eth_account's generic EIP-712 encoder."""
+    signable = encode_typed_data(full_message=typed_data)
+    return bytes(Account.from_key(PRIVATE_KEY).sign_message(signable).signature)
+
+
+def _eas_typed_data(request: dict, chain_id: int) -> dict:
+    return {
+        "domain": {
+            "name": "EIP712Proxy",
+            "version": "1.2.0",
+            "chainId": chain_id,
+            "verifyingContract": EAS_CONTRACT,
+        },
+        "primaryType": "Attest",
+        "types": {
+            "EIP712Domain": [
+                {"name": "name", "type": "string"},
+                {"name": "version", "type": "string"},
+                {"name": "chainId", "type": "uint256"},
+                {"name": "verifyingContract", "type": "address"},
+            ],
+            "Attest": EAS_ATTEST_STRUCT.types(),
+        },
+        "message": request,
+    }
+
+
+class TestEasSigning:
+    """Test that cached EAS signing matches the generic encoder."""
+
+    def test_signature_matches_encode_typed_data(self):
+        """Test byte-identical signatures for an EAS attestation request."""
+        request = _attest_request()
+
+        signature = generate_eas_delegated_signature(
+            request, Mock(), EAS_CONTRACT, PRIVATE_KEY, chain_id=8453
+        )
+
+        assert signature == _reference_signature(_eas_typed_data(request, 8453))
+
+    def test_domain_separator_cached_per_chain(self):
+        """Test that each chain and contract gets its own cached separator."""
+        base = domain_separator("EIP712Proxy", "1.2.0", 8453, EAS_CONTRACT)
+
+        assert domain_separator("EIP712Proxy", "1.2.0", 8453, EAS_CONTRACT) is base
+        assert domain_separator("EIP712Proxy", "1.2.0", 1, EAS_CONTRACT) != base
+
+    async def test_batch_signing(self):
+        """Test that batch signing returns one matching signature per request."""
+        requests = [_attest_request(deadline) for deadline in (1, 2, 3)]
+
+        signatures = await generate_eas_delegated_signatures(
+            requests, 8453, EAS_CONTRACT, PRIVATE_KEY
+        )
+
+        assert signatures == [
+            _reference_signature(_eas_typed_data(request, 8453)) for request in requests
+        ]
+
+
+class TestSnapshotSigning:
+    """Test that Snapshot votes are signed from precomputed hashes."""
+
+    @pytest.fixture
+    def voting_service(self):
+        key_manager = Mock()
+        key_manager.get_private_key.return_value = PRIVATE_KEY
+        return VotingService(key_manager=key_manager)
+
+    @pytest.mark.parametrize("proposal", ["QmProposalHash", "0x" + "ab" * 32])
+    def test_vote_signature_matches_encode_typed_data(self, voting_service, proposal):
+        """Test string and bytes32 proposal IDs against the generic encoder."""
+        message = voting_service.create_snapshot_vote_message(
+            "aave.eth", proposal, 1, timestamp=1700000000
+        )
+
+        signature = voting_service.sign_snapshot_message(message)
+
+        assert signature == "0x" + _reference_signature(message).hex()
+
+    async def test_batch_vote_signing(self, voting_service):
+        """Test that batch signing matches signing one by one."""
+        messages = [
+            voting_service.create_snapshot_vote_message(
+                "aave.eth", f"Qm{n}", 1, timestamp=1700000000
+            )
+            for n in range(3)
+        ]
+
+        signatures = await voting_service.sign_snapshot_messages(messages)
+
+        assert signatures == [voting_service.sign_snapshot_message(m) for m in messages]
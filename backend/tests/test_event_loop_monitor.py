@@ -0,0 +1,91 @@
+"""Tests for the event-loop stall monitor and the chain I/O executor."""
+
+import asyncio
+import contextvars
+import threading
+import time
+
+import pytest
+
+from services.event_loop_monitor import EventLoopMonitor
+from utils.chain_executor import CHAIN_EXECUTOR_THREAD_PREFIX, run_in_chain_executor
+
+REQUEST_ID = contextvars.ContextVar("request_id", default=None)
+
+
+async def _measure(work) -> EventLoopMonitor:
+    """Run work while sampling the loop and return the monitor."""
+    monitor = EventLoopMonitor(interval_seconds=0.01, stall_threshold_seconds=0.1)
+    monitor.start()
+    await asyncio.sleep(0.02)
+    await work()
+    await asyncio.sleep(0.02)
+    await monitor.stop()
+    return monitor
+
+
+class TestEventLoopMonitor:
+    """Test lag sampling and stall accounting."""
+
+    def test_record_accumulates_stalls(self):
+        """Test that only lag above the threshold counts as a stall."""
+        monitor = EventLoopMonitor(stall_threshold_seconds=0.1)
+
+        monitor.record(0.01)
+        monitor.record(0.25)
+        monitor.record(-0.001)
+
+        metrics = monitor.get_metrics()
+        assert metrics["samples"] == 3
+        assert metrics["stalls"] == 1
+        assert metrics["total_stall_ms"] == 250.0
+        assert metrics["max_lag_ms"] == 250.0
+        assert metrics["last_lag_ms"] == 0.0
+
+    async def test_blocking_call_on_loop_is_a_stall(self):
+        """Test that a blocking call made from a coroutine is detected."""
+
+        async def blocking():
+            time.sleep(0.2)
+
+        monitor = await _measure(blocking)
+
+        assert monitor.stalls == 1
+        assert monitor.max_lag_seconds >= 0.15
+
+    async def test_blocking_call_in_chain_executor_is_not_a_stall(self):
+        """Test that the same call in the chain executor leaves the loop free."""
+
+        async def offloaded():
+            await run_in_chain_executor(time.sleep, 0.2)
+
+        monitor = await _measure(offloaded)
+
+        assert monitor.stalls == 0
+        assert monitor.samples >= 10
+
+
+class TestChainExecutor:
+    """Test the chain I/O thread pool."""
+
+    async def test_runs_in_named_thread_with_caller_context(self):
+        """Test that work runs in a chain-io thread and sees context vars."""
+        REQUEST_ID.set("req-1")
+
+        thread_name, request_id = await run_in_chain_executor(
+            lambda: (threading.current_thread().name, REQUEST_ID.get())
+        )
+
+        assert thread_name.startswith(CHAIN_EXECUTOR_THREAD_PREFIX)
+        assert request_id == "req-1"
+
+    async def test_passes_arguments_and_exceptions(self):
+        """Test that args, kwargs and exceptions cross the thread boundary."""
+
+        def divide(a, b=1):
+            return a / b
+
+        assert await run_in_chain_executor(divide, 6, b=3) == 2
+
+        with pytest.raises(ZeroDivisionError):
+            await run_in_chain_executor(divide, 1, b=0)
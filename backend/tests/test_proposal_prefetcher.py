@@ -0,0 +1,168 @@
+"""Tests for the decision cache and the background proposal prefetcher."""
+
+from unittest.mock import AsyncMock, Mock
+
+from models import RiskLevel, UserPreferences, VoteDecision, VoteType, VotingStrategy
+from services.decision_cache import DecisionCache
+from services.proposal_prefetcher import ProposalPrefetcher
+
+
+MODEL_NAME = "google/gemini-2.0-flash-001"
+PREFERENCES = UserPreferences()
+
+
+def _decision(proposal_id: str, strategy=VotingStrategy.BALANCED) -> VoteDecision:
+    return VoteDecision(
+        proposal_id=proposal_id,
+        vote=VoteType.FOR,
+        confidence=0.9,
+        reasoning="Good proposal",
+        risk_assessment=RiskLevel.LOW,
+        strategy_used=strategy,
+    )
+
+
+class TestDecisionCache:
+    """Test cache keying, invalidation and persistence."""
+
+    async def test_put_and_get_decision(self, sample_proposal):
+        """Test a stored decision is returned for the same proposal and inputs."""
+        cache = DecisionCache()
+        await cache.put_decision(
+            sample_proposal, _decision(sample_proposal.id), PREFERENCES, MODEL_NAME
+        )
+
+        cached = cache.get_decision(sample_proposal, PREFERENCES, MODEL_NAME)
+
+        assert cached is not None
+        assert cached.vote == VoteType.FOR
+        assert cache.get_stats() == {"entries": 1, "hits": 1, "misses": 0}
+
+    async def test_changed_preferences_or_model_miss(self, sample_proposal):
+        """Test that decisions made under other preferences or models are not served."""
+        cache = DecisionCache()
+        await cache.put_decision(
+            sample_proposal, _decision(sample_proposal.id), PREFERENCES, MODEL_NAME
+        )
+        conservative = UserPreferences(voting_strategy=VotingStrategy.CONSERVATIVE)
+        stricter = UserPreferences(confidence_threshold=0.9)
+
+        assert cache.get_decision(sample_proposal, conservative, MODEL_NAME) is None
+        assert cache.get_decision(sample_proposal, stricter, MODEL_NAME) is None
+        assert cache.get_decision(sample_proposal, PREFERENCES, "other/model") is None
+
+    async def test_edited_proposal_misses(self, sample_proposal):
+        """Test that changing the proposal body invalidates the cached decision."""
+        cache = DecisionCache()
+        await cache.put_decision(
+            sample_proposal, _decision(sample_proposal.id), PREFERENCES, MODEL_NAME
+        )
+
+        edited = sample_proposal.model_copy(update={"body": "Completely new text"})
+
+        assert cache.get_decision(edited, PREFERENCES, MODEL_NAME) is None
+
+    async def test_ended_proposal_misses(self, sample_proposal):
+        """Test that decisions for proposals past their end are not served."""
+        cache = DecisionCache()
+        ended = sample_proposal.model_copy(update={"end": 1})
+        await cache.put_decision(ended, _decision(ended.id), PREFERENCES, MODEL_NAME)
+
+        assert cache.get_decision(ended, PREFERENCES, MODEL_NAME) is None
+
+    async def test_persists_through_state_manager(self, sample_proposal):
+        """Test that entries are saved and reloaded via the StateManager."""
+        state_manager = Mock()
+        state_manager.save_state = AsyncMock()
+        cache = DecisionCache(state_manager)
+        await cache.put_decision(
+            sample_proposal, _decision(sample_proposal.id), PREFERENCES, MODEL_NAME
+        )
+
+        saved = state_manager.save_state.call_args[0][1]
+        state_manager.load_state = AsyncMock(return_value=saved)
+        reloaded = DecisionCache(state_manager)
+        await reloaded.load()
+
+        assert reloaded.has_decision(sample_proposal, PREFERENCES, MODEL_NAME)
+
+    async def test_evicts_oldest_when_full(self, sample_proposal, complex_proposal):
+        """Test that the oldest entry is evicted at capacity."""
+        cache = DecisionCache(max_entries=1)
+        await cache.put_decision(
+            sample_proposal, _decision(sample_proposal.id), PREFERENCES, MODEL_NAME
+        )
+        await cache.put_decision(
+            complex_proposal, _decision(complex_proposal.id), PREFERENCES, MODEL_NAME
+        )
+
+        assert not cache.has_decision(sample_proposal, PREFERENCES, MODEL_NAME)
+        assert cache.has_decision(complex_proposal, PREFERENCES, MODEL_NAME)
+
+
+class TestProposalPrefetcher:
+    """Test idle detection, budgeting and cache population."""
+
+    def _make_prefetcher(self, proposals, max_ai_calls_per_hour=10):
+        agent_run_service = Mock()
+        agent_run_service.is_agent_active.return_value = False
+        agent_run_service.ai_service.voting_agent = Mock()
+        agent_run_service.ai_service.summarize_proposal = AsyncMock(
+            side_effect=lambda p: Mock(proposal_id=p.id)
+        )
+        agent_run_service.ai_service.model_name = MODEL_NAME
+        agent_run_service.ai_service.decide_vote = AsyncMock(
+            side_effect=lambda proposal, **_kwargs: _decision(proposal.id)
+        )
+        agent_run_service.fetch_votable_proposals = AsyncMock(return_value=proposals)
+        agent_run_service.user_preferences_service.load_preferences = AsyncMock(
+            return_value=UserPreferences()
+        )
+        cache = DecisionCache()
+        cache.put_summary = AsyncMock()
+        prefetcher = ProposalPrefetcher(
+            agent_run_service,
+            cache,
+            interval_seconds=60,
+            max_ai_calls_per_hour=max_ai_calls_per_hour,
+            cpu_share=1.0,
+        )
+        return prefetcher, agent_run_service, cache
+
+    async def test_run_once_populates_cache(self, sample_proposal, monkeypatch):
+        """Test that new proposals are analyzed and cached once."""
+        monkeypatch.setenv("MONITORED_DAOS", "test.eth")
+        prefetcher, agent_run_service, cache = self._make_prefetcher([sample_proposal])
+
+        analyzed = await prefetcher.run_once()
+        again = await prefetcher.run_once()
+
+        assert analyzed == 1
+        assert again == 0
+        assert cache.has_decision(sample_proposal, PREFERENCES, MODEL_NAME)
+        agent_run_service.ai_service.decide_vote.assert_awaited_once()
+        agent_run_service.fetch_votable_proposals.assert_awaited_with(
+            "test.eth", PREFERENCES
+        )
+
+    async def test_skips_when_agent_active(self, sample_proposal):
+        """Test that nothing is analyzed while a foreground run is active."""
+        prefetcher, agent_run_service, _ = self._make_prefetcher([sample_proposal])
+        agent_run_service.is_agent_active.return_value = True
+
+        assert await prefetcher.run_once() == 0
+        agent_run_service.fetch_votable_proposals.assert_not_awaited()
+
+    async def test_respects_ai_call_budget(
+        self, sample_proposal, complex_proposal, monkeypatch
+    ):
+        """Test that analysis stops once the hourly AI call budget is spent."""
+        monkeypatch.setenv("MONITORED_DAOS", "test.eth")
+        prefetcher, _, _ = self._make_prefetcher(
+            [sample_proposal, complex_proposal], max_ai_calls_per_hour=2
+        )
+
+        analyzed = await prefetcher.run_once()
+
+        assert analyzed == 1
+        assert prefetcher.get_stats()["ai_calls_remaining"] == 0
@@ -0,0 +1,265 @@
+"""Tests for background receipt tracking of broadcast Safe transactions."""
+
+import time
+from decimal import Decimal
+from unittest.mock import AsyncMock, Mock
+
+from models import InvestedPosition
+from services.attestation_queue import AttestationQueue
+from services.receipt_reconciler import (
+    KIND_WITHDRAWAL,
+    STATUS_CONFIRMED,
+    STATUS_FAILED,
+    ReceiptReconciler,
+)
+from services.safe_service import EAS_ATTESTED_EVENT_TOPIC
+from services.withdrawal_service import WithdrawalService
+
+SAFE = "0x1234567890123456789012345678901234567890"
+VOTER = "0x742d35Cc6634C0532925a3b844Bc454e4438f44e"
+
+
+def _tx_hash(n: int) -> str:
+    return "0x" + f"{n:064x}"
+
+
+def _receipt(n: int, status: int = 1, logs=None) -> dict:
+    return {
+        "transactionHash": _tx_hash(n),
+        "status": hex(status),
+        "blockNumber": "0x10",
+        "gasUsed": "0x5208",
+        "logs": logs or [],
+    }
+
+
+def _submission(n: int, nonce: int = 5) -> dict:
+    return {
+        "success": True,
+        "pending": True,
+        "tx_hash": _tx_hash(n)[2:],
+        "chain": "base",
+        "safe_address": SAFE,
+        "safe_nonce": nonce,
+    }
+
+
+class MemoryStateManager:
+    """In-memory stand-in for StateManager."""
+
+    def __init__(self):
+        self.states = {}
+
+    async def save_state(self, name, data, **_kwargs):
+        self.states[name] = data
+
+    async def load_state(self, name, **_kwargs):
+        return self.states.get(name)
+
+
+def _safe_service(receipts):
+    """SafeService mock whose node knows the given receipts."""
+    safe_service = Mock()
+    safe_service.rpc_endpoints = {"base": "https://base-rpc.com"}
+    safe_service.rate_limiter.acquire = AsyncMock()
+    w3 = safe_service.get_web3_connection.return_value
+
+    def make_batch_request(requests):
+        known = {r["transactionHash"]: r for r in receipts}
+        return [
+            {"jsonrpc": "2.0", "id": i, "result": known.get(params[0])}
+            for i, (_method, params) in enumerate(requests)
+        ]
+
+    w3.provider.make_batch_request.side_effect = make_batch_request
+    return safe_service
+
+
+class TestReceiptReconciler:
+    """Test batched polling, settlement and persistence."""
+
+    async def test_pending_receipts_polled_in_one_batch(self):
+        """Test that one batch per chain settles mined txs and keeps the rest."""
+        safe_service = _safe_service([_receipt(1), _receipt(2, status=0)])
+        state_manager = MemoryStateManager()
+        reconciler = ReceiptReconciler(safe_service, state_manager)
+        handler = AsyncMock()
+        reconciler.register_handler(KIND_WITHDRAWAL, handler)
+
+        handles = [
+            await reconciler.track(_submission(n, nonce=n), KIND_WITHDRAWAL, {})
+            for n in (1, 2, 3)
+        ]
+
+        assert await reconciler.run_once() == 2
+
+        provider = safe_service.get_web3_connection.return_value.provider
+        provider.make_batch_request.assert_called_once()
+        assert len(provider.make_batch_request.call_args.args[0]) == 3
+        statuses = [reconciler.get_status(h)["status"] for h in handles]
+        assert statuses == [STATUS_CONFIRMED, STATUS_FAILED, "pending"]
+        assert handler.await_count == 2
+        confirms = safe_service.nonce_manager.confirm.call_args_list
+        assert [(c.args[0].nonce, c.kwargs["success"]) for c in confirms] == [
+            (1, True),
+            (2, False),
+        ]
+
+        restored = ReceiptReconciler(safe_service, state_manager)
+        await restored.load()
+        assert [r["tracking_id"] for r in restored.pending()] == [handles[2]]
+
+    async def test_unmined_transaction_times_out(self):
+        """Test that a tx without a receipt is failed after the timeout."""
+        reconciler = ReceiptReconciler(_safe_service([]), timeout_seconds=60)
+        handle = await reconciler.track(_submission(1), KIND_WITHDRAWAL, {})
+
+        assert await reconciler.run_once() == 0
+        reconciler._records[handle]["submitted_at"] = time.time() - 61
+        assert await reconciler.run_once() == 1
+
+        assert reconciler.get_status(handle)["error"] == "No receipt after 60s"
+        assert reconciler.get_metrics()["timed_out"] == 1
+
+    async def test_poll_error_leaves_transactions_pending(self):
+        """Test that a failed batch request does not settle anything."""
+        safe_service = _safe_service([])
+        provider = safe_service.get_web3_connection.return_value.provider
+        provider.make_batch_request.side_effect = ConnectionError("down")
+        reconciler = ReceiptReconciler(safe_service, timeout_seconds=1)
+        handle = await reconciler.track(_submission(1), KIND_WITHDRAWAL, {})
+        reconciler._records[handle]["submitted_at"] = 0
+
+        assert await reconciler.run_once() == 0
+
+        assert reconciler.is_pending(handle)
+        assert reconciler.get_metrics()["poll_errors"] == 1
+
+
+class TestReceiptHandlers:
+    """Test the attestation queue and withdrawal status updates."""
+
+    async def test_attestation_completed_from_receipt_logs(self, tmp_path):
+        """Test that a tracked attestation completes with the UID from its logs."""
+        uid = "0x" + "ab" * 32
+        log = {"topics": [EAS_ATTESTED_EVENT_TOPIC], "data": uid}
+        safe_service = _safe_service([_receipt(1, logs=[log])])
+        safe_service.create_eas_attestation = AsyncMock(
+            return_value={
+                "success": True,
+                "pending": True,
+                "safe_tx_hash": _tx_hash(1)[2:],
+                "submission": _submission(1),
+            }
+        )
+        safe_service.extract_attestation_uids.return_value = [uid]
+        reconciler = ReceiptReconciler(safe_service)
+        queue = AttestationQueue(tmp_path, safe_service)
+        queue.use_receipt_reconciler(reconciler)
+        await queue.enqueue(
+            {
+                "space_id": "test.eth",
+                "proposal_id": "0x1",
+                "vote_choice": 1,
+                "voter_address": VOTER,
+                "vote_tx_hash": "0x" + "1" * 64,
+                "timestamp": time.time(),
+                "run_id": "run_1",
+                "confidence": 80,
+            }
+        )
+
+        assert await queue.run_once() == 1
+        assert queue.get_metrics()["awaiting_receipt"] == 1
+        assert safe_service.create_eas_attestation.call_args.kwargs == {
+            "wait_for_receipt": False
+        }
+        # Parked items are not submitted again while the receipt is pending
+        assert await queue.run_once() == 0
+        assert AttestationQueue(tmp_path, safe_service).depth == 1
+
+        await reconciler.run_once()
+
+        assert queue.depth == 0
+        assert queue.get_metrics()["completed"] == 1
+        safe_service.extract_attestation_uids.assert_called_once_with([log])
+
+    async def test_broadcast_attestation_is_not_resubmitted_after_restart(
+        self, tmp_path
+    ):
+        """Test that a lost tracked transaction is re-tracked, not resubmitted."""
+        safe_service = _safe_service([])
+        safe_service.create_eas_attestation = AsyncMock(
+            return_value={
+                "success": True,
+                "pending": True,
+                "safe_tx_hash": _tx_hash(1)[2:],
+                "submission": _submission(1),
+            }
+        )
+        safe_service.extract_attestation_uids.return_value = ["0x" + "ab" * 32]
+        queue = AttestationQueue(tmp_path, safe_service)
+        queue.use_receipt_reconciler(ReceiptReconciler(safe_service))
+        await queue.enqueue(
+            {
+                "space_id": "test.eth",
+                "proposal_id": "0x1",
+                "vote_choice": 1,
+                "voter_address": VOTER,
+                "vote_tx_hash": "0x" + "1" * 64,
+                "timestamp": time.time(),
+                "run_id": "run_1",
+                "confidence": 80,
+            }
+        )
+        assert await queue.run_once() == 1
+
+        # Restart with a reconciler that lost its tracked transactions
+        restarted_safe_service = _safe_service([_receipt(1)])
+        restarted_safe_service.create_eas_attestation = AsyncMock()
+        restarted_safe_service.extract_attestation_uids.return_value = [
+            "0x" + "ab" * 32
+        ]
+        reconciler = ReceiptReconciler(restarted_safe_service)
+        restarted = AttestationQueue(tmp_path, restarted_safe_service)
+        restarted.use_receipt_reconciler(reconciler)
+
+        assert await restarted.run_once() == 0
+        restarted_safe_service.create_eas_attestation.assert_not_called()
+        assert [r["tx_hash"] for r in reconciler.pending()] == [_tx_hash(1)]
+
+        await reconciler.run_once()
+
+        assert restarted.depth == 0
+        assert restarted.get_metrics()["completed"] == 1
+
+    async def test_withdrawal_status_updated_from_receipt(self):
+        """Test that a tracked withdrawal is marked confirmed in StateManager."""
+        state_manager = MemoryStateManager()
+        safe_service = _safe_service([_receipt(1)])
+        safe_service.execute_transaction = AsyncMock(
+            return_value={"transaction_hash": _tx_hash(1)}
+        )
+        reconciler = ReceiptReconciler(safe_service, state_manager)
+        withdrawal_service = WithdrawalService(
+            state_manager=state_manager,
+            safe_service=safe_service,
+            snapshot_service=Mock(),
+        )
+        withdrawal_service.use_receipt_reconciler(reconciler)
+        position = InvestedPosition(
+            position_id="pos_1",
+            protocol="aave",
+            chain_id=8453,
+            asset="USDC",
+            amount=Decimal("100"),
+            timestamp="2026-01-01T00:00:00",
+            contract_address=SAFE,
+        )
+
+        await withdrawal_service.execute_withdrawal(position, Decimal("100"))
+        await reconciler.run_once()
+
+        withdrawals = state_manager.states["withdrawal_service"]["pending_withdrawals"]
+        assert withdrawals[0]["status"] == STATUS_CONFIRMED
+        assert withdrawals[0]["tracking_id"] == f"base:{_tx_hash(1)}"
@@ -0,0 +1,164 @@
+"""Tests for JSON-RPC batching and Multicall3 aggregation."""
+
+import pytest
+from eth_abi import encode
+from web3 import Web3
+from web3.providers import BaseProvider
+
+from utils.calldata_encoder import get_calldata_encoder
+from utils.chain_metadata import ChainMetadataCache
+from utils.gas_oracle import ACTIVITY_TX_GAS, GAS_PRICE_ORACLE_ADDRESS, GasOracle
+from utils.rpc_batch import (
+    MULTICALL3_ADDRESS,
+    ContractCall,
+    RpcBatch,
+    RpcBatchError,
+)
+
+TRACKER_ADDRESS = "0x1111111111111111111111111111111111111111"
+MULTISIG = "0x2222222222222222222222222222222222222222"
+
+
+class BatchProvider(BaseProvider):
+    """Provider that answers batches and records each one."""
+
+    def __init__(self, call_results=None) -> None:
+        super().__init__()
+        self.batches = []
+        self.call_results = call_results or {}
+
+    def make_request(self, method, _params):
+        raise AssertionError(f"{method} sent outside a batch")
+
+    def make_batch_request(self, requests):
+        self.batches.append([method for method, _ in requests])
+        return [
+            {"jsonrpc": "2.0", "id": i, **self._answer(method, params)}
+            for i, (method, params) in enumerate(requests)
+        ]
+
+    def _answer(self, method, params):
+        if method == "eth_call":
+            result = self.call_results.get(params[0]["to"].lower())
+            if result is None:
+                return {"error": {"code": 3, "message": "execution reverted"}}
+            return {"result": Web3.to_hex(result)}
+        results = {
+            "eth_chainId": "0x2105",
+            "eth_gasPrice": "0x3b9aca00",
+            "eth_blockNumber": "0x10",
+            "eth_getBlockByNumber": {
+                "number": "0x10",
+                "timestamp": "0x64",
+                "baseFeePerGas": "0x5f5e100",
+            },
+            "eth_getTransactionCount": "0x7",
+        }
+        return {"result": results[method]}
+
+
+class TestRpcBatch:
+    """Test that reads share one round trip and are formatted."""
+
+    def test_reads_sent_in_one_batch(self):
+        """Test chain, block, nonce and contract reads in one request."""
+        provider = BatchProvider({TRACKER_ADDRESS: encode(["uint256"], [3])})
+        batch = RpcBatch(Web3(provider))
+        indexes = [
+            batch.chain_id(),
+            batch.get_block("latest"),
+            batch.get_transaction_count(MULTISIG),
+            batch.call_function(
+                TRACKER_ADDRESS,
+                get_calldata_encoder("attestation_tracker", "getNumAttestations"),
+                MULTISIG,
+            ),
+        ]
+
+        results = batch.execute()
+
+        assert len(provider.batches) == 1
+        chain_id, block, nonce, count = (results[i] for i in indexes)
+        assert (chain_id, block["timestamp"], nonce, count) == (8453, 100, 7, 3)
+
+    def test_failed_call_raises(self):
+        """Test that an error response for one call fails the batch."""
+        batch = RpcBatch(Web3(BatchProvider()))
+        batch.block_number()
+        batch.call(TRACKER_ADDRESS, b"\x00")
+
+        with pytest.raises(RpcBatchError, match="eth_call failed"):
+            batch.execute()
+
+    def test_multicall_aggregates_contract_reads(self):
+        """Test that several contract reads become one eth_call to Multicall3."""
+        count = get_calldata_encoder("attestation_tracker", "getNumAttestations")
+        owner = get_calldata_encoder("attestation_tracker", "owner")
+        aggregate_result = encode(
+            ["(bool,bytes)[]"],
+            [
+                [
+                    (True, encode(["uint256"], [5])),
+                    (True, encode(["address"], [MULTISIG])),
+                    (False, b""),
+                ]
+            ],
+        )
+        provider = BatchProvider({MULTICALL3_ADDRESS.lower(): aggregate_result})
+        batch = RpcBatch(Web3(provider))
+        index = batch.multicall(
+            [
+                ContractCall(TRACKER_ADDRESS, count, (MULTISIG,)),
+                ContractCall(TRACKER_ADDRESS, owner),
+                ContractCall(TRACKER_ADDRESS, count, (MULTISIG,), allow_failure=True),
+            ]
+        )
+
+        results = batch.execute()
+
+        assert provider.batches == [["eth_call"]]
+        assert results[index] == [5, Web3.to_checksum_address(MULTISIG), None]
+
+
+class TestBatchedReaders:
+    """Test the readers that were moved onto batches."""
+
+    def test_metadata_refresh_reads_chain_id_and_block_together(self):
+        """Test that refresh seeds both caches from one request."""
+        provider = BatchProvider()
+        w3 = Web3(provider)
+        cache = ChainMetadataCache(block_ttl_seconds=60.0)
+
+        block = cache.refresh("base", w3)
+
+        assert block["number"] == 16
+        assert provider.batches == [["eth_chainId", "eth_getBlockByNumber"]]
+        assert cache.get_chain_id("base", w3) == 8453
+        assert cache.get_latest_block("base", w3) is block
+
+    def test_gas_quote_sampled_once_per_ttl(self):
+        """Test that gas price, base fee and L1 fee share a batch and are cached."""
+        provider = BatchProvider(
+            {GAS_PRICE_ORACLE_ADDRESS.lower(): encode(["uint256"], [5 * 10**12])}
+        )
+        w3 = Web3(provider)
+        oracle = GasOracle(ttl_seconds=60.0)
+
+        quote = oracle.get_quote("base", w3)
+
+        assert (quote.gas_price_wei, quote.base_fee_wei) == (10**9, 10**8)
+        assert quote.l1_fee_wei == 5 * 10**12
+        assert quote.cost_wei() == ACTIVITY_TX_GAS * 10**9 + 5 * 10**12
+        assert oracle.get_quote("base", w3) is quote
+        assert provider.batches == [
+            ["eth_gasPrice", "eth_getBlockByNumber", "eth_call"]
+        ]
+
+    def test_gas_quote_without_l1_fee_outside_op_stack(self):
+        """Test that chains without an L1 data fee skip the oracle call."""
+        provider = BatchProvider()
+
+        quote = GasOracle(ttl_seconds=60.0).get_quote("gnosis", Web3(provider))
+
+        assert quote.l1_fee_wei == 0
+        assert provider.batches == [["eth_gasPrice", "eth_getBlockByNumber"]]
@@ -0,0 +1,246 @@
+"""Tests for latency-scored RPC endpoint failover and hedged reads."""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from unittest.mock import patch
+
+import pytest
+from web3 import HTTPProvider, Web3
+from web3.providers import BaseProvider
+
+from utils.rpc_endpoint_pool import (
+    FailoverHTTPProvider,
+    RpcEndpointPool,
+    build_provider,
+    clear_rpc_endpoint_pools,
+)
+from utils.rpc_rate_limiter import RpcRateLimiter
+
+PRIMARY = "https://primary-rpc.com"
+BACKUP = "https://backup-rpc.com"
+
+
+class FakeProvider(BaseProvider):
+    """Provider that answers after a delay, or raises."""
+
+    def __init__(self, delay: float = 0.0, error: Optional[Exception] = None) -> None:
+        super().__init__()
+        self.delay = delay
+        self.error = error
+        self.calls = []
+
+    def make_request(self, method, _params):
+        self.calls.append(method)
+        time.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return {"jsonrpc": "2.0", "id": 1, "result": "0x2105"}
+
+    def make_batch_request(self, requests):
+        self.calls.append("batch")
+        if self.error is not None:
+            raise self.error
+        return [{"jsonrpc": "2.0", "id": i, "result": "0x1"} for i in requests]
+
+
+@pytest.fixture(autouse=True)
+def rate_limiter():
+    """Use a fresh rate limiter without configured limits."""
+    limiter = RpcRateLimiter(limits={})
+    with patch("utils.rpc_endpoint_pool.get_rpc_rate_limiter", return_value=limiter):
+        yield limiter
+
+
+def _provider(pool, **providers):
+    return FailoverHTTPProvider(
+        pool, {PRIMARY: providers["primary"], BACKUP: providers["backup"]}
+    )
+
+
+class TestRpcEndpointPool:
+    """Test endpoint scoring and cooldowns."""
+
+    def test_fastest_healthy_endpoint_ranked_first(self):
+        """Test that measured latency overrides configuration order."""
+        pool = RpcEndpointPool("base", [PRIMARY, BACKUP], cooldown_seconds=30)
+        assert pool.ranked() == [PRIMARY, BACKUP]
+
+        pool.record_success(PRIMARY, 0.4)
+        pool.record_success(BACKUP, 0.05)
+
+        assert pool.ranked() == [BACKUP, PRIMARY]
+
+    def test_failing_endpoint_cools_down(self):
+        """Test that repeated failures move an endpoint to the back."""
+        pool = RpcEndpointPool("base", [PRIMARY, BACKUP], cooldown_seconds=30)
+        pool.record_success(PRIMARY, 0.01)
+        pool.record_success(BACKUP, 0.3)
+
+        pool.record_failure(PRIMARY, ConnectionError("down"))
+        pool.record_failure(PRIMARY, ConnectionError("down"))
+
+        assert pool.ranked() == [BACKUP, PRIMARY]
+        assert pool.get_metrics()[PRIMARY]["cooldown_seconds"] == 30
+
+    def test_rate_limited_endpoint_skipped(self, rate_limiter):
+        """Test that an endpoint paused after a 429 is not preferred."""
+        pool = RpcEndpointPool("base", [PRIMARY, BACKUP], cooldown_seconds=30)
+
+        pool.record_failure(PRIMARY, Exception("429 Client Error: Too Many Requests"))
+
+        assert rate_limiter.is_paused(PRIMARY)
+        assert pool.ranked() == [BACKUP, PRIMARY]
+
+
+class TestFailoverHTTPProvider:
+    """Test failover and hedging across providers."""
+
+    def test_fails_over_to_next_endpoint(self):
+        """Test that a connection error is retried on the backup."""
+        pool = RpcEndpointPool("base", [PRIMARY, BACKUP], hedge_delay_seconds=0)
+        primary = FakeProvider(error=ConnectionError("down"))
+        backup = FakeProvider()
+
+        w3 = Web3(_provider(pool, primary=primary, backup=backup))
+
+        assert w3.eth.chain_id == 8453
+        assert pool.get_metrics()[PRIMARY]["failures"] == 1
+
+    def test_raises_when_all_endpoints_fail(self):
+        """Test that the last error surfaces when nothing answers."""
+        pool = RpcEndpointPool("base", [PRIMARY, BACKUP], hedge_delay_seconds=0)
+        provider = _provider(
+            pool,
+            primary=FakeProvider(error=ConnectionError("primary down")),
+            backup=FakeProvider(error=ConnectionError("backup down")),
+        )
+
+        with pytest.raises(ConnectionError, match="backup down"):
+            provider.make_batch_request([("eth_chainId", [])])
+
+    def test_slow_read_hedged_to_backup(self):
+        """Test that a read slower than the hedge delay is answered by the backup."""
+        pool = RpcEndpointPool("base", [PRIMARY, BACKUP], hedge_delay_seconds=0.02)
+        primary = FakeProvider(delay=0.5)
+        backup = FakeProvider()
+        provider = _provider(pool, primary=primary, backup=backup)
+
+        started = time.monotonic()
+        response = provider.make_request("eth_chainId", [])
+
+        assert response["result"] == "0x2105"
+        assert time.monotonic() - started < 0.4
+        assert pool.get_metrics()[BACKUP]["hedges_won"] == 1
+
+    def test_writes_never_hedged(self):
+        """Test that a slow transaction submission is not duplicated."""
+        pool = RpcEndpointPool("base", [PRIMARY, BACKUP], hedge_delay_seconds=0.01)
+        primary = FakeProvider(delay=0.05)
+        backup = FakeProvider()
+        provider = _provider(pool, primary=primary, backup=backup)
+
+        provider.make_request("eth_sendRawTransaction", ["0x00"])
+
+        assert primary.calls == ["eth_sendRawTransaction"]
+        assert backup.calls == []
+
+    @pytest.mark.parametrize(
+        "method, params",
+        [
+            ("eth_getTransactionCount", ["0xabc", "latest"]),
+            ("eth_estimateGas", [{"to": "0xabc"}]),
+            ("eth_getBalance", ["0xabc", "pending"]),
+        ],
+    )
+    def test_pending_state_reads_never_hedged(self, method, params):
+        """Test that nonce, gas estimate and pending block reads are not hedged."""
+        pool = RpcEndpointPool("base", [PRIMARY, BACKUP], hedge_delay_seconds=0.01)
+        primary = FakeProvider(delay=0.05)
+        backup = FakeProvider()
+        provider = _provider(pool, primary=primary, backup=backup)
+
+        provider.make_request(method, params)
+
+        assert primary.calls == [method]
+        assert backup.calls == []
+
+    def test_reads_after_write_pinned_to_write_endpoint(self):
+        """Test that reads following a write go to the endpoint that took it."""
+        pool = RpcEndpointPool("base", [PRIMARY, BACKUP], hedge_delay_seconds=0.01)
+        pool.record_success(PRIMARY, 0.5)
+        pool.record_success(BACKUP, 0.01)
+        primary = FakeProvider(delay=0.05)
+        backup = FakeProvider(error=ConnectionError("down"))
+        provider = _provider(pool, primary=primary, backup=backup)
+
+        provider.make_request("eth_sendRawTransaction", ["0x00"])
+        backup.error = None
+        provider.make_request("eth_getTransactionReceipt", ["0x01"])
+
+        assert primary.calls == ["eth_sendRawTransaction", "eth_getTransactionReceipt"]
+        assert backup.calls == ["eth_sendRawTransaction"]
+        assert pool.ranked()[0] == PRIMARY
+
+
+class JsonRpcNode(BaseHTTPRequestHandler):
+    """Minimal JSON-RPC node answering eth_chainId after ``server.delay``."""
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        time.sleep(self.server.delay)
+        body = json.dumps(
+            {"jsonrpc": "2.0", "id": request["id"], "result": hex(self.server.chain)}
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_args):
+        pass
+
+
+@pytest.fixture
+def local_nodes():
+    """Start a slow and a fast local JSON-RPC node."""
+    servers = []
+    for delay in (0.3, 0.0):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), JsonRpcNode)
+        server.delay, server.chain = delay, 8453
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+    yield [f"http://127.0.0.1:{s.server_address[1]}" for s in servers]
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+class TestLocalNodes:
+    """Test failover against real HTTP endpoints."""
+
+    def test_single_url_uses_plain_provider(self):
+        """Test that chains without fallbacks are unchanged."""
+        with patch("utils.rpc_endpoint_pool.settings") as mock_settings:
+            mock_settings.rpc_fallback_urls = "{}"
+            assert type(build_provider("base", PRIMARY)) is HTTPProvider
+
+    def test_reads_move_to_faster_node(self, local_nodes):
+        """Test that hedging and scoring route reads to the faster node."""
+        slow, fast = local_nodes
+        clear_rpc_endpoint_pools()
+        with patch("utils.rpc_endpoint_pool.settings") as mock_settings:
+            mock_settings.rpc_fallback_urls = json.dumps({"base": [fast]})
+            mock_settings.rpc_hedge_delay_ms = 50.0
+            mock_settings.rpc_endpoint_cooldown_seconds = 30.0
+            provider = build_provider("base", slow)
+        w3 = Web3(provider)
+
+        assert w3.eth.chain_id == 8453
+        assert provider.pool.ranked() == [fast, slow]
+        assert w3.eth.chain_id == 8453
+        assert provider.pool.get_metrics()[fast]["requests"] == 2
+        clear_rpc_endpoint_pools()
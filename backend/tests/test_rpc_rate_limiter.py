@@ -0,0 +1,83 @@
+"""Tests for the per-endpoint RPC rate limiter."""
+
+import asyncio
+import time
+from unittest.mock import Mock
+
+import requests
+
+from services.event_loop_monitor import EventLoopMonitor
+from utils.rpc_rate_limiter import RpcRateLimiter, is_rate_limit_error
+
+URL = "https://mainnet.base.org"
+
+
+def _http_429(retry_after=None) -> requests.HTTPError:
+    response = Mock(status_code=429)
+    response.headers = {"Retry-After": retry_after} if retry_after else {}
+    return requests.HTTPError("429 Client Error: Too Many Requests", response=response)
+
+
+class TestRpcRateLimiter:
+    """Test token buckets, 429 feedback and async waiting."""
+
+    def test_burst_then_steady_rate(self):
+        """Test that the burst passes immediately and later calls are spaced."""
+        limiter = RpcRateLimiter(limits={"base.org": 4.0}, burst=2)
+
+        waits = [limiter.reserve(URL) for _ in range(4)]
+
+        assert waits[:2] == [0.0, 0.0]
+        assert 0.2 < waits[2] <= 0.25
+        assert 0.45 < waits[3] <= 0.5
+        assert limiter.reserve("https://eth-rpc.com") == 0.0
+        assert limiter.get_metrics()[URL]["throttled"] == 2
+
+    def test_429_pauses_endpoint_with_growing_backoff(self):
+        """Test that a 429 drains the bucket and repeated 429s back off."""
+        limiter = RpcRateLimiter(
+            limits={"base.org": 10.0}, burst=5, backoff_seconds=2.0
+        )
+
+        assert limiter.observe_error(URL, _http_429())
+        first = limiter.reserve(URL)
+        assert limiter.observe_error(URL, _http_429())
+        second = limiter.reserve(URL)
+
+        assert 1.9 < first <= 2.0
+        assert 3.9 < second <= 4.0
+        assert not limiter.try_acquire(URL)
+        assert limiter.get_metrics()[URL]["rate_limited"] == 2
+
+    def test_retry_after_header_wins_and_success_resets_backoff(self):
+        """Test that Retry-After sets the pause and success resets backoff."""
+        limiter = RpcRateLimiter(limits={}, burst=1, backoff_seconds=2.0)
+
+        limiter.observe_error(URL, _http_429(retry_after="7"))
+        assert 6.9 < limiter.reserve(URL) <= 7.0
+
+        limiter.report_success(URL)
+        limiter.report_rate_limited(URL)
+        assert limiter._buckets[URL].consecutive_rate_limits == 1
+
+    def test_non_rate_limit_errors_are_ignored(self):
+        """Test that other errors do not pause the endpoint."""
+        limiter = RpcRateLimiter(limits={}, burst=1)
+
+        assert not is_rate_limit_error(ValueError("execution reverted"))
+        assert not limiter.observe_error(URL, ValueError("execution reverted"))
+        assert limiter.try_acquire(URL)
+
+    async def test_async_acquire_does_not_stall_the_loop(self):
+        """Test that throttled coroutines wait without blocking the loop."""
+        limiter = RpcRateLimiter(limits={"base.org": 10.0}, burst=1)
+        monitor = EventLoopMonitor(interval_seconds=0.01, stall_threshold_seconds=0.1)
+        monitor.start()
+
+        started = time.monotonic()
+        await asyncio.gather(*(limiter.acquire(URL) for _ in range(4)))
+        elapsed = time.monotonic() - started
+        await monitor.stop()
+
+        assert 0.28 < elapsed < 0.5
+        assert monitor.stalls == 0
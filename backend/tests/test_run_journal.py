@@ -0,0 +1,111 @@
+"""Tests for the append-only per-run journal."""
+
+import json
+
+from models import RiskLevel, VoteDecision, VoteType, VotingStrategy
+from services.run_journal import (
+    STEP_ATTESTED,
+    STEP_DECIDED,
+    STEP_FETCHED,
+    STEP_SUBMITTED,
+    RunJournal,
+)
+
+
+def _decision(proposal_id: str) -> VoteDecision:
+    return VoteDecision(
+        proposal_id=proposal_id,
+        vote=VoteType.AGAINST,
+        confidence=0.8,
+        reasoning="Too risky for the treasury",
+        risk_assessment=RiskLevel.HIGH,
+        strategy_used=VotingStrategy.CONSERVATIVE,
+    )
+
+
+class TestRunJournal:
+    """Test journal writing, replay and resume selection."""
+
+    def test_interrupted_run_is_replayed(self, tmp_path, sample_proposal):
+        """Test that an unfinished run is found with all of its markers."""
+        journal = RunJournal(tmp_path)
+        journal.start_run("run_1", "test.eth", dry_run=False)
+        journal.record(
+            "run_1",
+            STEP_FETCHED,
+            sample_proposal.id,
+            proposal=sample_proposal.model_dump(mode="json"),
+        )
+        journal.record(
+            "run_1",
+            STEP_DECIDED,
+            sample_proposal.id,
+            decision=_decision(sample_proposal.id).model_dump(mode="json"),
+        )
+        journal.record("run_1", STEP_SUBMITTED, sample_proposal.id, vote_id="0xvote")
+
+        state = journal.find_incomplete("test.eth", dry_run=False)
+
+        assert state is not None
+        assert state.run_id == "run_1"
+        assert [p.id for p in state.get_proposals()] == [sample_proposal.id]
+        assert state.get_decision(sample_proposal.id).vote == VoteType.AGAINST
+        assert state.has_step(sample_proposal.id, STEP_SUBMITTED)
+        assert not state.has_step(sample_proposal.id, STEP_ATTESTED)
+        assert state.vote_ids[sample_proposal.id] == "0xvote"
+
+    def test_completed_run_is_not_resumed(self, tmp_path):
+        """Test that a run with a completion marker is not resumed."""
+        journal = RunJournal(tmp_path)
+        journal.start_run("run_1", "test.eth", dry_run=False)
+        journal.complete_run("run_1")
+
+        assert journal.find_incomplete("test.eth", dry_run=False) is None
+
+    def test_abandoned_run_is_not_resumed(self, tmp_path, sample_proposal):
+        """Test that a run that failed with an error is not resumed."""
+        journal = RunJournal(tmp_path)
+        journal.start_run("run_1", "test.eth", dry_run=False)
+        journal.record(
+            "run_1",
+            STEP_FETCHED,
+            sample_proposal.id,
+            proposal=sample_proposal.model_dump(mode="json"),
+        )
+        journal.abandon_run("run_1")
+
+        assert journal.find_incomplete("test.eth", dry_run=False) is None
+
+    def test_other_space_or_mode_is_not_resumed(self, tmp_path):
+        """Test that only runs for the same space and dry_run mode are resumed."""
+        journal = RunJournal(tmp_path)
+        journal.start_run("run_1", "other.eth", dry_run=False)
+        journal.start_run("run_2", "test.eth", dry_run=True)
+
+        assert journal.find_incomplete("test.eth", dry_run=False) is None
+        assert journal.find_incomplete("test.eth", dry_run=True).run_id == "run_2"
+
+    def test_torn_trailing_line_is_ignored(self, tmp_path):
+        """Test that a partially written last record does not break replay."""
+        journal = RunJournal(tmp_path)
+        journal.start_run("run_1", "test.eth", dry_run=False)
+        with open(tmp_path / "run_1.jsonl", "a") as f:
+            f.write('{"event": "decided", "proposal_id"')
+
+        state = journal.find_incomplete("test.eth", dry_run=False)
+
+        assert state is not None
+        assert state.decisions == {}
+
+    def test_records_are_appended_as_json_lines(self, tmp_path):
+        """Test the on-disk format is one JSON object per line."""
+        journal = RunJournal(tmp_path)
+        journal.start_run("run_1", "test.eth", dry_run=False)
+        journal.record("run_1", STEP_ATTESTED, "prop-1")
+
+        lines = (tmp_path / "run_1.jsonl").read_text().splitlines()
+
+        assert [json.loads(line)["event"] for line in lines] == [
+            "run_started",
+            "attested",
+        ]
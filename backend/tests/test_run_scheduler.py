@@ -0,0 +1,138 @@
+"""Tests for the earliest-deadline-first run scheduler."""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, Mock
+
+from models import AgentRunResponse
+from services.run_scheduler import RunScheduler
+
+
+def _make_scheduler(proposals=None, safety_margin=600):
+    agent_run_service = Mock()
+    agent_run_service.is_agent_active.return_value = False
+    agent_run_service.run_lock = asyncio.Lock()
+    agent_run_service.snapshot_service.get_proposals = AsyncMock(
+        return_value=proposals or []
+    )
+    agent_run_service.execute_agent_run = AsyncMock(
+        side_effect=lambda request: AgentRunResponse(
+            space_id=request.space_id,
+            proposals_analyzed=1,
+            votes_cast=[],
+            user_preferences_applied=True,
+            execution_time=0.1,
+            processed_proposal_ids=request.proposal_ids or [],
+        )
+    )
+    scheduler = RunScheduler(
+        agent_run_service, refresh_interval=300, safety_margin=safety_margin
+    )
+    return scheduler, agent_run_service
+
+
+class TestRunScheduler:
+    """Test queue ordering, dispatch and metrics."""
+
+    def test_queue_is_ordered_by_deadline(self):
+        """Test that the earliest deadline is at the head of the queue."""
+        scheduler, _ = _make_scheduler()
+        now = int(time.time())
+
+        scheduler.enqueue("late.eth", "late", now + 7200)
+        scheduler.enqueue("soon.eth", "soon", now + 1200)
+
+        assert scheduler.queue_depth == 2
+        assert scheduler._queue[0][2] == "soon"
+        assert 500 < scheduler.next_due_in(now) <= 600
+
+    def test_enqueue_deduplicates_and_skips_ended(self):
+        """Test that duplicates and ended proposals are not queued."""
+        scheduler, _ = _make_scheduler()
+        now = int(time.time())
+
+        assert scheduler.enqueue("a.eth", "p1", now + 3600) is True
+        assert scheduler.enqueue("a.eth", "p1", now + 3600) is False
+        assert scheduler.enqueue("a.eth", "p2", now - 1) is False
+        assert scheduler.queue_depth == 1
+
+    async def test_run_once_dispatches_due_space_once(self, monkeypatch):
+        """Test that due proposals trigger a single run per space."""
+        monkeypatch.setenv("MONITORED_DAOS", "a.eth")
+        now = int(time.time())
+        proposals = [Mock(id="p1", end=now + 100), Mock(id="p2", end=now + 200)]
+        scheduler, agent_run_service = _make_scheduler(proposals)
+
+        runs = await scheduler.run_once()
+
+        assert runs == 1
+        agent_run_service.execute_agent_run.assert_awaited_once()
+        request = agent_run_service.execute_agent_run.call_args[0][0]
+        assert request.space_id == "a.eth"
+        assert request.dry_run is False
+        assert request.proposal_ids == ["p1", "p2"]
+        assert scheduler.queue_depth == 0
+        assert scheduler._handled_ids == {"p1", "p2"}
+        metrics = scheduler.get_metrics()
+        assert metrics["runs_triggered"] == 1
+        assert metrics["last_lag_seconds"] >= 0
+
+    async def test_run_once_defers_while_agent_active(self, monkeypatch):
+        """Test that due work waits while a run is in progress."""
+        monkeypatch.setenv("MONITORED_DAOS", "a.eth")
+        now = int(time.time())
+        scheduler, agent_run_service = _make_scheduler([Mock(id="p1", end=now + 100)])
+        agent_run_service.is_agent_active.return_value = True
+
+        assert await scheduler.run_once() == 0
+        assert scheduler.queue_depth == 1
+
+    async def test_failed_run_is_requeued(self, monkeypatch):
+        """Test that a failed run is retried while the proposal is open."""
+        monkeypatch.setenv("MONITORED_DAOS", "a.eth")
+        now = int(time.time())
+        scheduler, agent_run_service = _make_scheduler([Mock(id="p1", end=now + 500)])
+        agent_run_service.execute_agent_run.side_effect = Exception("boom")
+
+        await scheduler.run_once()
+
+        assert scheduler.queue_depth == 1
+        assert scheduler.next_due_in() > 0
+
+    async def test_unprocessed_proposals_are_requeued(self):
+        """Test that only proposals the run processed are marked handled."""
+        now = int(time.time())
+        scheduler, agent_run_service = _make_scheduler()
+        agent_run_service.execute_agent_run.side_effect = None
+        agent_run_service.execute_agent_run.return_value = AgentRunResponse(
+            space_id="a.eth",
+            proposals_analyzed=2,
+            votes_cast=[],
+            user_preferences_applied=True,
+            execution_time=0.1,
+            processed_proposal_ids=["p1"],
+        )
+
+        await scheduler._dispatch(
+            "a.eth", [(now, now + 500, "p1"), (now, now + 500, "p2")]
+        )
+
+        assert scheduler._handled_ids == {"p1"}
+        assert scheduler._queued_ids == {"p2"}
+        assert scheduler.next_due_in(now) > 0
+
+    async def test_dispatch_waits_for_run_lock(self):
+        """Test that a run started elsewhere is not overlapped by a scheduled run."""
+        now = int(time.time())
+        scheduler, agent_run_service = _make_scheduler()
+        await agent_run_service.run_lock.acquire()
+
+        task = asyncio.create_task(
+            scheduler._dispatch("a.eth", [(now, now + 500, "p1")])
+        )
+        await asyncio.sleep(0)
+        agent_run_service.execute_agent_run.assert_not_awaited()
+
+        agent_run_service.run_lock.release()
+        await task
+        agent_run_service.execute_agent_run.assert_awaited_once()
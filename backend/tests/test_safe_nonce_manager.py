@@ -0,0 +1,87 @@
+"""Tests for local Safe nonce allocation."""
+
+from unittest.mock import Mock
+
+import pytest
+
+from utils.safe_nonce_manager import SafeNonceManager
+
+SAFE = "0x1234567890123456789012345678901234567890"
+
+
+class TestSafeNonceManager:
+    """Test nonce hand-out, give-back and resync."""
+
+    def test_nonces_handed_out_locally_while_in_flight(self):
+        """Test that the chain is read once and later nonces are pipelined."""
+        manager = SafeNonceManager()
+        fetch = Mock(return_value=7)
+
+        with manager.reserve("base", SAFE, fetch) as first:
+            manager.mark_sent(first, "0xaa")
+        with manager.reserve("base", SAFE, fetch) as second:
+            manager.mark_sent(second, "0xbb")
+
+        assert (first.nonce, first.pipelined) == (7, False)
+        assert (second.nonce, second.pipelined) == (8, True)
+        assert fetch.call_count == 1
+        assert manager.get_metrics()[f"base:{SAFE.lower()}"]["in_flight"] == [7, 8]
+
+    def test_unsent_nonce_is_given_back(self):
+        """Test that failing before broadcast frees the nonce for the next tx."""
+        manager = SafeNonceManager()
+        fetch = Mock(return_value=7)
+
+        with manager.reserve("base", SAFE, fetch) as first:
+            manager.mark_sent(first, "0xaa")
+        with pytest.raises(RuntimeError):
+            with manager.reserve("base", SAFE, fetch):
+                raise RuntimeError("Safe Transaction Service unavailable")
+        with manager.reserve("base", SAFE, fetch) as retry:
+            pass
+
+        assert retry.nonce == 8
+        assert fetch.call_count == 1
+
+    def test_revert_resyncs_from_chain(self):
+        """Test that a reverted tx makes the next reservation re-read the chain."""
+        manager = SafeNonceManager()
+        fetch = Mock(side_effect=[7, 7])
+
+        with manager.reserve("base", SAFE, fetch) as first:
+            manager.mark_sent(first, "0xaa")
+        manager.confirm(first, success=False)
+        with manager.reserve("base", SAFE, fetch) as retry:
+            pass
+
+        assert retry.nonce == 7
+        assert retry.pipelined is False
+        assert fetch.call_count == 2
+        assert manager.get_metrics()[f"base:{SAFE.lower()}"]["resyncs"] == 1
+
+    def test_failure_while_another_nonce_is_in_flight(self):
+        """Test that a failed tx does not make an in-flight nonce reusable."""
+        manager = SafeNonceManager()
+        # The chain still reports 7 while the tx with nonce 8 is pending
+        fetch = Mock(return_value=7)
+
+        with manager.reserve("base", SAFE, fetch) as first:
+            manager.mark_sent(first, "0xaa")
+        with manager.reserve("base", SAFE, fetch) as second:
+            manager.mark_sent(second, "0xbb")
+        manager.confirm(first, success=False)
+        with manager.reserve("base", SAFE, fetch) as third:
+            manager.mark_sent(third, "0xcc")
+
+        assert (first.nonce, second.nonce, third.nonce) == (7, 8, 9)
+        assert fetch.call_count == 1
+
+        # Once nothing is in flight the chain is read again
+        manager.confirm(second, success=True)
+        manager.confirm(third, success=True)
+        fetch.return_value = 10
+        with manager.reserve("base", SAFE, fetch) as fourth:
+            pass
+
+        assert fourth.nonce == 10
+        assert fetch.call_count == 2
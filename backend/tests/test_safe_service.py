@@ -4,7 +4,12 @@ This test suite covers the SafeService class which handles multi-signature walle
 transactions across different blockchain networks.
 """
 
+import asyncio
+import threading
+import time
+
 import pytest
+import requests
 from unittest.mock import Mock, patch, mock_open, AsyncMock
 
 
@@ -18,6 +23,25 @@ def _mock_key_manager_for_safe_service():
         yield mock_km_class
 
 
+@pytest.fixture(autouse=True)
+def _fresh_chain_client_registry():
+    """Start every test without chain clients, metadata, nonces or gas prices."""
+    from utils.chain_client_registry import get_chain_client_registry
+    from utils.chain_metadata import get_chain_metadata_cache
+    from utils.gas_oracle import get_gas_oracle
+    from utils.safe_nonce_manager import get_safe_nonce_manager
+
+    get_chain_client_registry().clear()
+    get_chain_metadata_cache().clear()
+    get_safe_nonce_manager().clear()
+    get_gas_oracle().clear()
+    yield
+    get_chain_client_registry().clear()
+    get_chain_metadata_cache().clear()
+    get_safe_nonce_manager().clear()
+    get_gas_oracle().clear()
+
+
 class MockHash(bytes):
     """Mock class for hash objects that support both hex() and direct bytes usage."""
 
@@ -42,8 +66,20 @@ from services.safe_service import (
     SafeService,
     SAFE_SERVICE_URLS,
     EAS_ATTESTATION_GAS_LIMIT,
+    EAS_ATTESTED_EVENT_TOPIC,
+    MULTISEND_CALL_ONLY_ADDRESS,
+    SAFE_OPERATION_DELEGATECALL,
 )
+from eth_abi import decode
+from web3 import Web3
+
 from models import EASAttestationData
+from services.event_loop_monitor import EventLoopMonitor
+from utils.calldata_encoder import get_calldata_encoder
+from utils.gas_oracle import GasQuote
+
+TOKEN_PRICES = '{"ethereum": 3000, "base": 3000, "mode": 3000, "gnosis": 1}'
+from utils.rpc_rate_limiter import RpcRateLimiter
 
 
 class TestSafeServiceInitialization:
@@ -232,7 +268,7 @@ class TestWeb3Connection:
         mock_web3.is_connected.return_value = True
         mock_web3_class.return_value = mock_web3
 
-        with patch.object(self.service, "_rate_limit_base_rpc"):
+        with patch.object(self.service, "_rate_limit_rpc"):
             w3 = self.service.get_web3_connection("base")
 
             assert w3 == mock_web3
@@ -263,23 +299,18 @@ class TestWeb3Connection:
         mock_web3.is_connected.return_value = False
         mock_web3_class.return_value = mock_web3
 
-        with patch.object(self.service, "_rate_limit_base_rpc"):
+        with patch.object(self.service, "_rate_limit_rpc"):
             with pytest.raises(
                 ConnectionError, match="Failed to connect to base network"
             ):
                 self.service.get_web3_connection("base")
 
-    @patch("services.safe_service.time.sleep")
-    def test_rate_limit_base_rpc(self, mock_sleep):
-        """Test rate limiting for Base mainnet RPC calls."""
-        # Test with Base mainnet URL
-        self.service._rate_limit_base_rpc("https://mainnet.base.org/rpc")
-        mock_sleep.assert_called_once_with(1.0)
+    def test_rate_limit_rpc(self):
+        """Test that RPC rate limiting goes through the shared limiter."""
+        with patch.object(self.service.rate_limiter, "acquire_blocking") as acquire:
+            self.service._rate_limit_rpc("https://mainnet.base.org/rpc")
 
-        # Test with non-Base URL
-        mock_sleep.reset_mock()
-        self.service._rate_limit_base_rpc("https://ethereum-rpc.com")
-        mock_sleep.assert_not_called()
+        acquire.assert_called_once_with("https://mainnet.base.org/rpc")
 
 
 class TestChainSelection:
@@ -322,6 +353,54 @@ class TestChainSelection:
             with pytest.raises(ValueError, match="No valid chain configuration found"):
                 self.service.select_optimal_chain()
 
+    async def test_select_cheapest_chain_uses_sampled_gas(self):
+        """Test that the lowest USD cost wins over the static preference."""
+        quotes = {
+            "base": GasQuote("base", 10**6, 10**6, time.monotonic()),
+            "ethereum": GasQuote("ethereum", 10**10, 10**10, time.monotonic()),
+            "gnosis": GasQuote("gnosis", 10**12, 10**9, time.monotonic()),
+        }
+        with (
+            patch("utils.gas_oracle.settings.gas_token_usd_prices", TOKEN_PRICES),
+            patch.object(self.service.rate_limiter, "acquire", new_callable=AsyncMock),
+            patch.object(
+                self.service, "_read_gas_quote", side_effect=lambda c: quotes[c]
+            ),
+        ):
+            chain = await self.service.select_cheapest_chain()
+
+        assert chain == "base"
+
+    async def test_select_cheapest_chain_skips_unhealthy_rpc(self):
+        """Test that chains whose gas price cannot be read are skipped."""
+
+        def read_gas_quote(chain):
+            if chain == "base":
+                raise ConnectionError("down")
+            return GasQuote(chain, 10**10, None, time.monotonic())
+
+        with (
+            patch("utils.gas_oracle.settings.gas_token_usd_prices", TOKEN_PRICES),
+            patch.object(self.service.rate_limiter, "acquire", new_callable=AsyncMock),
+            patch.object(self.service, "_read_gas_quote", side_effect=read_gas_quote),
+            patch.object(self.service, "invalidate_chain_clients") as invalidate,
+        ):
+            chain = await self.service.select_cheapest_chain()
+
+        assert chain == "gnosis"
+        invalidate.assert_called_once_with("base")
+
+    async def test_select_cheapest_chain_without_prices_uses_priority(self):
+        """Test that chains are not sampled when no token prices are configured."""
+        with (
+            patch("utils.gas_oracle.settings.gas_token_usd_prices", "{}"),
+            patch.object(self.service, "_sample_gas") as sample_gas,
+        ):
+            chain = await self.service.select_cheapest_chain()
+
+        assert chain == self.service.select_optimal_chain()
+        sample_gas.assert_not_called()
+
 
 class TestSafeTransactionBuilding:
     """Test Safe transaction building functionality."""
@@ -365,7 +444,7 @@ class TestSafeTransactionBuilding:
         mock_safe.build_multisig_tx.return_value = mock_safe_tx
         mock_safe_class.return_value = mock_safe
 
-        with patch.object(self.service, "_rate_limit_base_rpc"):
+        with patch.object(self.service, "_rate_limit_rpc"):
             result = await self.service.build_safe_transaction(
                 chain="base", to="0x456", value=100, data=b"test_data"
             )
@@ -419,7 +498,7 @@ class TestSafeTransactionBuilding:
             mock_safe.build_multisig_tx.return_value = mock_safe_tx
             mock_safe_class.return_value = mock_safe
 
-            with patch.object(self.service, "_rate_limit_base_rpc"):
+            with patch.object(self.service, "_rate_limit_rpc"):
                 result = await self.service.build_safe_transaction(
                     chain="base", to="0x456", value=100, data=b"test_data"
                 )
@@ -445,7 +524,7 @@ class TestSafeTransactionBuilding:
         mock_safe.retrieve_nonce.return_value = 10
         mock_safe_class.return_value = mock_safe
 
-        with patch.object(self.service, "_rate_limit_base_rpc"):
+        with patch.object(self.service, "_rate_limit_rpc"):
             nonce = await self.service.get_safe_nonce(
                 "base", "0x1234567890123456789012345678901234567890"
             )
@@ -453,6 +532,33 @@ class TestSafeTransactionBuilding:
         assert nonce == 10
         mock_safe.retrieve_nonce.assert_called_once()
 
+    @patch("services.safe_service.EthereumClient")
+    @patch("services.safe_service.Safe")
+    async def test_chain_clients_reused_until_connection_error(
+        self, mock_safe_class, mock_eth_client
+    ):
+        """Test that Safe clients are built once and rebuilt after a connection error."""
+        mock_safe = Mock()
+        mock_safe.retrieve_nonce.return_value = 10
+        mock_safe_class.return_value = mock_safe
+        safe_address = "0x1234567890123456789012345678901234567890"
+
+        with patch.object(self.service, "_rate_limit_rpc"):
+            await self.service.get_safe_nonce("base", safe_address)
+            await self.service.get_safe_nonce("base", safe_address)
+            assert mock_eth_client.call_count == 1
+            assert mock_safe_class.call_count == 1
+
+            mock_safe.retrieve_nonce.side_effect = requests.ConnectionError("reset")
+            with pytest.raises(requests.ConnectionError):
+                await self.service.get_safe_nonce("base", safe_address)
+
+            mock_safe.retrieve_nonce.side_effect = None
+            await self.service.get_safe_nonce("base", safe_address)
+
+        assert mock_eth_client.call_count == 2
+        assert mock_safe_class.call_count == 2
+
     @patch("services.safe_service.Web3")
     @patch("services.safe_service.EthereumClient")
     @patch("services.safe_service.Safe")
@@ -469,7 +575,7 @@ class TestSafeTransactionBuilding:
         mock_safe.retrieve_nonce.return_value = 42
         mock_safe_class.return_value = mock_safe
 
-        with patch.object(self.service, "_rate_limit_base_rpc"):
+        with patch.object(self.service, "_rate_limit_rpc"):
             # Pass a lowercase (non-checksummed) address
             nonce = await self.service.get_safe_nonce(
                 "base", "0xe66364a0e0dec9a22713f3bac43f0d3f0790c1bd"  # lowercase version
@@ -587,6 +693,7 @@ class TestSafeTransactionSubmission:
 
         # Mock Safe instance
         mock_safe = Mock()
+        mock_safe.retrieve_nonce.return_value = 5
         mock_safe.build_multisig_tx.return_value = mock_safe_tx
         # Fix: Create proper mock for ethereum transaction with tx_hash
         mock_ethereum_tx = Mock()
@@ -596,7 +703,7 @@ class TestSafeTransactionSubmission:
 
         with (
             patch.object(self.service, "get_web3_connection", return_value=mock_w3),
-            patch.object(self.service, "_rate_limit_base_rpc"),
+            patch.object(self.service, "_rate_limit_rpc"),
         ):
             result = await self.service._submit_safe_transaction(
                 chain="base", to="0x456", value=0, data=b""
@@ -637,12 +744,13 @@ class TestSafeTransactionSubmission:
 
         # Mock Safe instance
         mock_safe = Mock()
+        mock_safe.retrieve_nonce.return_value = 5
         mock_safe.build_multisig_tx.return_value = mock_safe_tx
         mock_safe_class.return_value = mock_safe
 
         with (
             patch.object(self.service, "get_web3_connection", return_value=mock_w3),
-            patch.object(self.service, "_rate_limit_base_rpc"),
+            patch.object(self.service, "_rate_limit_rpc"),
         ):
             result = await self.service._submit_safe_transaction(
                 chain="base", to="0x456", value=0, data=b""
@@ -652,6 +760,134 @@ class TestSafeTransactionSubmission:
         assert "Transaction would revert" in result["error"]
         assert result["simulation_failed"] is True
 
+    @patch("services.safe_service.EthereumClient")
+    @patch("services.safe_service.Safe")
+    @patch("services.safe_service.TransactionServiceApi")
+    async def test_submit_safe_transaction_does_not_block_event_loop(
+        self, mock_tx_service, mock_safe_class, mock_eth_client
+    ):
+        """Test that a slow receipt wait runs off the event loop."""
+
+        def wait_for_receipt(_tx_hash):
+            time.sleep(0.3)
+            return {"blockNumber": 1, "gasUsed": 21000, "status": 1}
+
+        mock_w3 = Mock()
+        mock_w3.eth.wait_for_transaction_receipt.side_effect = wait_for_receipt
+        mock_safe_tx = Mock()
+        mock_safe_tx.safe_tx_hash = MockHash("0xabc123")
+        mock_safe = Mock()
+        mock_safe.retrieve_nonce.return_value = 5
+        mock_safe.build_multisig_tx.return_value = mock_safe_tx
+        mock_safe.send_multisig_tx.return_value = Mock(tx_hash=MockHash("0x123456"))
+        mock_safe_class.return_value = mock_safe
+
+        monitor = EventLoopMonitor(interval_seconds=0.01, stall_threshold_seconds=0.1)
+        monitor.start()
+        with (
+            patch.object(self.service, "get_web3_connection", return_value=mock_w3),
+            patch.object(self.service, "_rate_limit_rpc"),
+        ):
+            result = await self.service._submit_safe_transaction(
+                chain="base", to="0x456", value=0, data=b""
+            )
+        await monitor.stop()
+
+        assert result["success"] is True
+        assert monitor.samples > 0
+        assert monitor.stalls == 0
+
+    @patch("services.safe_service.EthereumClient")
+    @patch("services.safe_service.Safe")
+    @patch("services.safe_service.TransactionServiceApi")
+    async def test_submit_safe_transactions_are_pipelined(
+        self, mock_tx_service, mock_safe_class, mock_eth_client
+    ):
+        """Test that a second Safe tx is sent before the first one is mined."""
+        both_sent = threading.Event()
+
+        def wait_for_receipt(_tx_hash):
+            # Only returns once both transactions have been broadcast
+            assert both_sent.wait(timeout=2)
+            return {"blockNumber": 1, "gasUsed": 21000, "status": 1}
+
+        def build_multisig_tx(**kwargs):
+            return Mock(
+                safe_nonce=kwargs["safe_nonce"],
+                safe_tx_hash=MockHash(f"0xabc{kwargs['safe_nonce']}"),
+            )
+
+        def send_multisig_tx(**_kwargs):
+            if mock_safe.send_multisig_tx.call_count == 2:
+                both_sent.set()
+            return Mock(tx_hash=MockHash("0x123456"))
+
+        mock_w3 = Mock()
+        mock_w3.eth.wait_for_transaction_receipt.side_effect = wait_for_receipt
+        mock_safe = Mock()
+        mock_safe.retrieve_nonce.return_value = 5
+        mock_safe.build_multisig_tx.side_effect = build_multisig_tx
+        mock_safe.send_multisig_tx.side_effect = send_multisig_tx
+        mock_safe_class.return_value = mock_safe
+
+        with (
+            patch.object(self.service, "get_web3_connection", return_value=mock_w3),
+            patch.object(self.service, "_rate_limit_rpc"),
+        ):
+            results = await asyncio.gather(
+                *(
+                    self.service._submit_safe_transaction(
+                        chain="base", to="0x456", value=0, data=b""
+                    )
+                    for _ in range(2)
+                )
+            )
+
+        assert all(result["success"] for result in results)
+        builds = mock_safe.build_multisig_tx.call_args_list
+        assert [c.kwargs["safe_nonce"] for c in builds] == [5, 6]
+        mock_safe.retrieve_nonce.assert_called_once()
+        # Only the head-of-line transaction can be simulated against chain state
+        sends = mock_safe.send_multisig_tx.call_args_list
+        assert sends[0].kwargs["tx_gas"] is None
+        assert sends[1].kwargs["tx_gas"] is not None
+
+    @patch("services.safe_service.EthereumClient")
+    @patch("services.safe_service.Safe")
+    @patch("services.safe_service.TransactionServiceApi")
+    async def test_submit_without_waiting_for_receipt(
+        self, mock_tx_service, mock_safe_class, mock_eth_client
+    ):
+        """Test that submit-and-track returns after broadcast, nonce in flight."""
+        mock_w3 = Mock()
+        mock_safe = Mock()
+        mock_safe.retrieve_nonce.return_value = 5
+        mock_safe.build_multisig_tx.return_value = Mock(
+            safe_nonce=5, safe_tx_hash=MockHash("0xabc")
+        )
+        mock_safe.send_multisig_tx.return_value = Mock(tx_hash=MockHash("0x123456"))
+        mock_safe_class.return_value = mock_safe
+
+        with (
+            patch.object(self.service, "get_web3_connection", return_value=mock_w3),
+            patch.object(self.service, "_rate_limit_rpc"),
+        ):
+            result = await self.service._submit_safe_transaction(
+                chain="base", to="0x456", value=0, data=b"", wait_for_receipt=False
+            )
+
+        assert result == {
+            "success": True,
+            "pending": True,
+            "tx_hash": "0x123456",
+            "chain": "base",
+            "safe_address": "0x1234567890123456789012345678901234567890",
+            "safe_nonce": 5,
+        }
+        mock_w3.eth.wait_for_transaction_receipt.assert_not_called()
+        nonces = self.service.nonce_manager.get_metrics()
+        assert nonces[f"base:{result['safe_address'].lower()}"]["in_flight"] == [5]
+
 
 class TestActivityTransaction:
     """Test activity transaction functionality."""
@@ -675,7 +911,12 @@ class TestActivityTransaction:
     async def test_perform_activity_transaction_auto_chain(self):
         """Test activity transaction with automatic chain selection."""
         with (
-            patch.object(self.service, "select_optimal_chain", return_value="base"),
+            patch.object(
+                self.service,
+                "select_cheapest_chain",
+                new_callable=AsyncMock,
+                return_value="base",
+            ),
             patch.object(
                 self.service, "_submit_safe_transaction", new_callable=AsyncMock
             ) as mock_submit,
@@ -871,11 +1112,9 @@ class TestEASAttestation:
 
     @patch("services.safe_service.generate_eas_delegated_signature")
     @patch("utils.web3_provider.get_w3")
-    @patch("utils.abi_loader.load_abi")
     @patch("services.safe_service.settings")
-    @patch("builtins.open", new_callable=mock_open, read_data="0x" + "a" * 64)
     def test_build_delegated_attestation_tx_eip712proxy(
-        self, mock_file, mock_settings, mock_load_abi, mock_get_w3, mock_generate_sig
+        self, mock_settings, mock_get_w3, mock_generate_sig
     ):
         """Test building delegated attestation transaction for EIP712Proxy."""
         attestation_data = EASAttestationData(
@@ -897,40 +1136,35 @@ class TestEASAttestation:
         mock_settings.attestation_chain = "base"
         mock_settings.base_safe_address = "0x1234567890123456789012345678901234567890"
 
-        # Mock Web3 and contract
+        # Mock Web3; calldata is encoded offline, so no contract is needed
         mock_w3 = Mock()
         mock_w3.eth.get_block.return_value = {"timestamp": 1234567900, "number": 12345}
         mock_get_w3.return_value = mock_w3
+        mock_generate_sig.return_value = b"\x01" * 64 + b"\x1b"  # 65-byte signature
 
-        mock_contract = Mock()
-        mock_contract.functions.attestByDelegation.return_value.build_transaction.return_value = {
-            "to": "0x1234567890123456789012345678901234567890",
-            "data": "0xabcd",
-            "value": 0,
-        }
-        mock_w3.eth.contract.return_value = mock_contract
+        result = self.service._build_delegated_attestation_tx(
+            attestation_data,
+            target_address="0x1234567890123456789012345678901234567890",
+            abi_name="eip712proxy",
+        )
 
-        mock_load_abi.return_value = []
-        mock_generate_sig.return_value = b"\x01" * 65  # 65-byte signature
-
-        with patch.dict("os.environ", {"ETHEREUM_PRIVATE_KEY": "0x" + "a" * 64}):
-            result = self.service._build_delegated_attestation_tx(
-                attestation_data,
-                target_address="0x1234567890123456789012345678901234567890",
-                abi_name="eip712proxy",
-            )
+        encoder = get_calldata_encoder("eip712proxy", "attestByDelegation")
+        data = bytes.fromhex(result["data"][2:])
+        (request,) = decode(encoder.types, data[4:])
 
         assert result["to"] == "0x1234567890123456789012345678901234567890"
-        assert result["data"] == "0xabcd"
+        assert data[:4] == encoder.selector
         assert result["value"] == 0
+        assert request[0] == b"\xaa" * 32  # schema
+        assert request[2] == (27, b"\x01" * 32, b"\x01" * 32)  # v, r, s
+        assert request[4] == 1234567900 + 3600  # deadline
+        mock_w3.eth.contract.assert_not_called()
 
     @patch("services.safe_service.generate_eas_delegated_signature")
     @patch("utils.web3_provider.get_w3")
-    @patch("utils.abi_loader.load_abi")
     @patch("services.safe_service.settings")
-    @patch("builtins.open", new_callable=mock_open, read_data="0x" + "a" * 64)
     def test_build_delegated_attestation_tx_attestation_tracker(
-        self, mock_file, mock_settings, mock_load_abi, mock_get_w3, mock_generate_sig
+        self, mock_settings, mock_get_w3, mock_generate_sig
     ):
         """Test building delegated attestation transaction for AttestationTracker."""
         attestation_data = EASAttestationData(
@@ -952,32 +1186,166 @@ class TestEASAttestation:
         mock_settings.attestation_chain = "base"
         mock_settings.base_safe_address = "0x1234567890123456789012345678901234567890"
 
-        # Mock Web3 and contract
+        # Mock Web3; calldata is encoded offline, so no contract is needed
         mock_w3 = Mock()
         mock_w3.eth.get_block.return_value = {"timestamp": 1234567900, "number": 12345}
         mock_get_w3.return_value = mock_w3
+        mock_generate_sig.return_value = b"\x01" * 64 + b"\x1b"  # 65-byte signature
 
-        mock_contract = Mock()
-        mock_contract.functions.attestByDelegation.return_value.build_transaction.return_value = {
-            "to": "0x1111111111111111111111111111111111111111",
-            "data": "0xefgh",
-            "value": 0,
-        }
-        mock_w3.eth.contract.return_value = mock_contract
-
-        mock_load_abi.return_value = []
-        mock_generate_sig.return_value = b"\x01" * 65  # 65-byte signature
+        result = self.service._build_delegated_attestation_tx(
+            attestation_data,
+            target_address="0x1111111111111111111111111111111111111111",
+            abi_name="attestation_tracker",
+        )
 
-        with patch.dict("os.environ", {"ETHEREUM_PRIVATE_KEY": "0x" + "a" * 64}):
-            result = self.service._build_delegated_attestation_tx(
-                attestation_data,
-                target_address="0x1111111111111111111111111111111111111111",
-                abi_name="attestation_tracker",
-            )
+        encoder = get_calldata_encoder("attestation_tracker", "attestByDelegation")
+        data = bytes.fromhex(result["data"][2:])
+        args = decode(encoder.types, data[4:])
 
         assert result["to"] == "0x1111111111111111111111111111111111111111"
-        assert result["data"] == "0xefgh"
+        assert data[:4] == encoder.selector
         assert result["value"] == 0
+        assert args[1] == "0x4567890123456789012345678901234567890123"  # recipient
+        assert args[7] == 27  # v
+        assert args[10] == self.service.account.address.lower()  # attester
+        assert args[11] == 1234567900 + 3600  # deadline
+        mock_w3.eth.contract.assert_not_called()
+
+
+class TestBatchedEASAttestation:
+    """Test batching EAS attestations into one MultiSend transaction."""
+
+    TARGET = "0x1111111111111111111111111111111111111111"
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        with (
+            patch("services.safe_service.setup_pearl_logger"),
+            patch("services.safe_service.settings") as mock_settings,
+        ):
+            mock_settings.safe_contract_addresses = (
+                '{"base": "0x1234567890123456789012345678901234567890"}'
+            )
+            mock_settings.get_base_rpc_endpoint.return_value = "https://base-rpc.com"
+            self.service = SafeService()
+
+    def _attestation(self, proposal_id: str) -> EASAttestationData:
+        return EASAttestationData(
+            agent="0x4567890123456789012345678901234567890123",
+            space_id="test.eth",
+            proposal_id=proposal_id,
+            vote_choice=1,
+            snapshot_sig="0x" + "ab" * 32,
+            timestamp=1234567890,
+            run_id="run123",
+            confidence=95,
+        )
+
+    def _attested_log(self, uid: str) -> dict:
+        return {"topics": [EAS_ATTESTED_EVENT_TOPIC, "0x" + "00" * 32], "data": uid}
+
+    @patch("services.safe_service.settings")
+    def test_build_batch_tx_encodes_each_attestation(self, mock_settings):
+        """Test that each attestation call becomes one MultiSend CALL."""
+        from safe_eth.safe.multi_send import MultiSend
+
+        mock_settings.multisend_address = None
+        with patch.object(
+            self.service,
+            "_build_eas_attestation_tx",
+            side_effect=[
+                {"to": self.TARGET, "data": "0xaaaa", "value": 0},
+                {"to": self.TARGET, "data": "0xbbbb", "value": 0},
+            ],
+        ):
+            tx = self.service.build_eas_attestation_batch_tx(
+                [self._attestation("p1"), self._attestation("p2")]
+            )
+
+        decoded = MultiSend.from_transaction_data(tx["data"])
+        assert tx["to"] == MULTISEND_CALL_ONLY_ADDRESS
+        assert tx["operation"] == SAFE_OPERATION_DELEGATECALL
+        assert [bytes(t.data) for t in decoded] == [b"\xaa\xaa", b"\xbb\xbb"]
+        assert all(t.to == self.TARGET for t in decoded)
+
+    def test_extract_attestation_uids_in_log_order(self):
+        """Test that only EAS Attested events are mapped to UIDs."""
+        uid_1, uid_2 = "0x" + "01" * 32, "0x" + "02" * 32
+        logs = [
+            self._attested_log(uid_1),
+            {"topics": ["0x" + "ff" * 32], "data": "0x"},
+            self._attested_log(uid_2),
+        ]
+
+        assert SafeService.extract_attestation_uids(logs) == [uid_1, uid_2]
+
+    @patch("services.safe_service.settings")
+    async def test_batch_maps_results_per_attestation(self, mock_settings):
+        """Test one Safe transaction with per-item UIDs in the result."""
+        mock_settings.eas_contract_address = self.TARGET
+        mock_settings.eas_schema_uid = "0x" + "a" * 64
+        mock_settings.base_safe_address = self.TARGET
+        uids = ["0x" + "01" * 32, "0x" + "02" * 32]
+        submit = AsyncMock(
+            return_value={
+                "success": True,
+                "tx_hash": "0xtx",
+                "logs": [self._attested_log(uid) for uid in uids],
+            }
+        )
+
+        with (
+            patch.object(
+                self.service,
+                "build_eas_attestation_batch_tx",
+                return_value={
+                    "to": MULTISEND_CALL_ONLY_ADDRESS,
+                    "data": b"\x01",
+                    "operation": SAFE_OPERATION_DELEGATECALL,
+                },
+            ),
+            patch.object(self.service, "_submit_safe_transaction", submit),
+        ):
+            result = await self.service.create_eas_attestations_batch(
+                [self._attestation("p1"), self._attestation("p2")]
+            )
+
+        submit.assert_awaited_once()
+        assert submit.call_args.kwargs["operation"] == SAFE_OPERATION_DELEGATECALL
+        assert result["success"] is True
+        assert [r["attestation_uid"] for r in result["results"]] == uids
+        assert [r["proposal_id"] for r in result["results"]] == ["p1", "p2"]
+
+    @patch("services.safe_service.settings")
+    async def test_batch_failure_fails_every_item(self, mock_settings):
+        """Test that a failed batch transaction fails all attestations."""
+        mock_settings.eas_contract_address = self.TARGET
+        mock_settings.eas_schema_uid = "0x" + "a" * 64
+        mock_settings.base_safe_address = self.TARGET
+
+        with (
+            patch.object(
+                self.service,
+                "build_eas_attestation_batch_tx",
+                return_value={
+                    "to": MULTISEND_CALL_ONLY_ADDRESS,
+                    "data": b"\x01",
+                    "operation": SAFE_OPERATION_DELEGATECALL,
+                },
+            ),
+            patch.object(
+                self.service,
+                "_submit_safe_transaction",
+                AsyncMock(return_value={"success": False, "error": "reverted"}),
+            ),
+        ):
+            result = await self.service.create_eas_attestations_batch(
+                [self._attestation("p1"), self._attestation("p2")]
+            )
+
+        assert result["success"] is False
+        assert [r["success"] for r in result["results"]] == [False, False]
+        assert result["results"][0]["error"] == "reverted"
 
 
 class TestUtilityMethods:
@@ -1005,7 +1373,7 @@ class TestUtilityMethods:
         mock_web3 = Mock()
         mock_web3_class.return_value = mock_web3
 
-        with patch.object(self.service, "_rate_limit_base_rpc"):
+        with patch.object(self.service, "_rate_limit_rpc"):
             result = self.service._get_web3_instance("base")
 
         assert result == mock_web3
@@ -1043,6 +1411,7 @@ class TestUtilityMethods:
             w3=mock_w3,
             eas_contract_address="0x1234567890123456789012345678901234567890",
             private_key="0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80",
+            chain_id=8453,
         )
 
 
@@ -1125,6 +1494,7 @@ class TestSafeTransactionSubmissionComprehensive:
 
         # Mock Safe instance
         mock_safe = Mock()
+        mock_safe.retrieve_nonce.return_value = 5
         mock_safe.build_multisig_tx.return_value = mock_safe_tx
         mock_ethereum_tx = Mock()
         mock_ethereum_tx.tx_hash = MockHash("0x123456")
@@ -1137,7 +1507,7 @@ class TestSafeTransactionSubmissionComprehensive:
 
         with (
             patch.object(self.service, "get_web3_connection", return_value=mock_w3),
-            patch.object(self.service, "_rate_limit_base_rpc"),
+            patch.object(self.service, "_rate_limit_rpc"),
         ):
             result = await self.service._submit_safe_transaction(
                 chain="base",
@@ -1197,6 +1567,8 @@ class TestSafeTransactionSubmissionComprehensive:
         mock_safe_tx.call = Mock()  # Simulation succeeds
 
         mock_safe = Mock()
+
+        mock_safe.retrieve_nonce.return_value = 5
         mock_safe.build_multisig_tx.return_value = mock_safe_tx
         mock_ethereum_tx = Mock()
         mock_ethereum_tx.tx_hash = MockHash("0x123456")
@@ -1208,7 +1580,7 @@ class TestSafeTransactionSubmissionComprehensive:
 
         with (
             patch.object(self.service, "get_web3_connection", return_value=mock_w3),
-            patch.object(self.service, "_rate_limit_base_rpc"),
+            patch.object(self.service, "_rate_limit_rpc"),
         ):
             result = await self.service._submit_safe_transaction(
                 chain="base",
@@ -1232,7 +1604,7 @@ class TestSafeTransactionSubmissionComprehensive:
 
         with (
             patch.object(self.service, "get_web3_connection"),
-            patch.object(self.service, "_rate_limit_base_rpc"),
+            patch.object(self.service, "_rate_limit_rpc"),
         ):
             result = await self.service._submit_safe_transaction(
                 chain="base",
@@ -1332,7 +1704,7 @@ class TestSafeTransactionBuildingComprehensive:
         mock_safe.build_multisig_tx.return_value = mock_safe_tx
         mock_safe_class.return_value = mock_safe
 
-        with patch.object(self.service, "_rate_limit_base_rpc"):
+        with patch.object(self.service, "_rate_limit_rpc"):
             result = await self.service.build_safe_transaction(
                 chain="base",
                 to="0x4567890123456789012345678901234567890123",
@@ -1363,14 +1735,16 @@ class TestSafeTransactionBuildingComprehensive:
         mock_safe.retrieve_nonce.return_value = 42
         mock_safe_class.return_value = mock_safe
 
-        with patch.object(self.service, "_rate_limit_base_rpc") as mock_rate_limit:
+        with patch.object(
+            self.service.rate_limiter, "acquire", new_callable=AsyncMock
+        ) as mock_rate_limit:
             nonce = await self.service.get_safe_nonce(
                 "base", "0x1234567890123456789012345678901234567890"
             )
 
         assert nonce == 42
         mock_safe.retrieve_nonce.assert_called_once()
-        mock_rate_limit.assert_called_once_with("https://base-rpc.com")
+        mock_rate_limit.assert_awaited_once_with("https://base-rpc.com")
 
         # Verify Safe was initialized with checksummed address
         mock_safe_class.assert_called_once()
@@ -1454,6 +1828,7 @@ class TestEASAttestationComprehensive:
             to="0x12345678901234567890123456789012345678904567890123456789012345678901234567890",
             data=bytes.fromhex("1234" * 100),
             value=0,
+            wait_for_receipt=True,
         )
 
     async def test_create_eas_attestation_with_attestation_tracker(self):
@@ -1596,7 +1971,7 @@ class TestUtilityMethodsComprehensive:
         mock_web3 = Mock()
         mock_web3_class.return_value = mock_web3
 
-        with patch.object(self.service, "_rate_limit_base_rpc") as mock_rate_limit:
+        with patch.object(self.service, "_rate_limit_rpc") as mock_rate_limit:
             # Test different chains
             for chain in ["base", "ethereum", "gnosis"]:
                 result = self.service._get_web3_instance(chain)
@@ -1647,11 +2022,12 @@ class TestUtilityMethodsComprehensive:
             w3=mock_w3,
             eas_contract_address="0x12345678901234567890123456789012345678904567890123456789012345678901234567890",
             private_key="0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80",
+            chain_id=8453,
         )
 
-    @patch("services.safe_service.time.sleep")
-    def test_rate_limit_base_rpc_comprehensive(self, mock_sleep):
-        """Test comprehensive Base RPC rate limiting scenarios."""
+    def test_rate_limit_rpc_comprehensive(self):
+        """Test which endpoints the default RPC rate limits apply to."""
+        limiter = RpcRateLimiter(limits={"mainnet.base.org": 1.0}, burst=1)
         test_cases = [
             ("https://mainnet.base.org/rpc", True),
             ("https://mainnet.base.org/v1/rpc", True),
@@ -1662,13 +2038,9 @@ class TestUtilityMethodsComprehensive:
         ]
 
         for rpc_url, should_rate_limit in test_cases:
-            mock_sleep.reset_mock()
-            self.service._rate_limit_base_rpc(rpc_url)
-
-            if should_rate_limit:
-                mock_sleep.assert_called_once_with(1.0)
-            else:
-                mock_sleep.assert_not_called()
+            # The first call uses the burst token, the second has to wait
+            assert limiter.reserve(rpc_url) == 0.0
+            assert (limiter.reserve(rpc_url) > 0) is should_rate_limit
 
 
 class TestEdgeCasesAndErrorHandling:
@@ -1772,7 +2144,7 @@ class TestEdgeCasesAndErrorHandling:
         mock_safe.build_multisig_tx.return_value = mock_safe_tx
         mock_safe_class.return_value = mock_safe
 
-        with patch.object(self.service, "_rate_limit_base_rpc"):
+        with patch.object(self.service, "_rate_limit_rpc"):
             result = await self.service.build_safe_transaction(
                 chain="base", to="0x4567890123456789012345678901234567890123"
             )
@@ -1837,20 +2209,20 @@ class TestSafeServiceMissingCoverage:
         assert validation["rpc_endpoint"] is None
         assert validation["safe_service_url"] is None
 
-    def test_rate_limit_base_rpc_multiple_patterns(self):
-        """Test various Base mainnet URL patterns for rate limiting."""
-        with patch("services.safe_service.time.sleep") as mock_sleep:
-            test_urls = [
-                "https://mainnet.base.org/rpc",
-                "https://base-mainnet.base.org/v1/rpc",
-                "https://mainnet.base.org/api/v1/rpc",
-                "https://other-base-mainnet.base.org/rpc",
-            ]
-
-            for url in test_urls:
-                mock_sleep.reset_mock()
-                self.service._rate_limit_base_rpc(url)
-                mock_sleep.assert_called_once_with(1.0)
+    def test_rate_limit_rpc_buckets_are_per_endpoint(self):
+        """Test that Base mainnet URLs are limited independently of each other."""
+        limiter = RpcRateLimiter(limits={"mainnet.base.org": 1.0}, burst=1)
+        test_urls = [
+            "https://mainnet.base.org/rpc",
+            "https://base-mainnet.base.org/v1/rpc",
+            "https://mainnet.base.org/api/v1/rpc",
+            "https://other-base-mainnet.base.org/rpc",
+        ]
+
+        for url in test_urls:
+            assert limiter.reserve(url) == 0.0
+        for url in test_urls:
+            assert 0.9 < limiter.reserve(url) <= 1.0
 
     @patch("services.safe_service.EthereumClient")
     @patch("services.safe_service.Safe")
@@ -1864,7 +2236,7 @@ class TestSafeServiceMissingCoverage:
             patch.object(self.service, "safe_addresses", {"base": None}),
             patch.object(self.service, "is_chain_fully_configured", return_value=True),
             patch.object(self.service, "get_web3_connection"),
-            patch.object(self.service, "_rate_limit_base_rpc"),
+            patch.object(self.service, "_rate_limit_rpc"),
         ):
             # This should trigger the ValueError inside _submit_safe_transaction
             mock_safe_class.side_effect = ValueError(
@@ -1902,7 +2274,7 @@ class TestSafeServiceMissingCoverage:
         mock_safe.build_multisig_tx.return_value = mock_safe_tx
         mock_safe_class.return_value = mock_safe
 
-        with patch.object(self.service, "_rate_limit_base_rpc"):
+        with patch.object(self.service, "_rate_limit_rpc"):
             result = await self.service.build_safe_transaction(
                 chain="base", to="0x456", value=0, data=b"test"
             )
@@ -1987,27 +2359,16 @@ class TestSafeServiceMissingCoverage:
             confidence=95,
         )
 
-        # Mock Web3 and contract
+        # Mock Web3
         mock_w3 = Mock()
         mock_w3.eth.get_block.return_value = {"timestamp": 1234567900, "number": 12345}
 
-        mock_contract = Mock()
-        mock_contract.functions.attestByDelegation.return_value.build_transaction.return_value = {
-            "to": "0xtest123",
-            "data": "0xabcd1234",
-            "value": 0,
-            "gas": 1000000,
-        }
-        mock_w3.eth.contract.return_value = mock_contract
-
         with (
             patch("utils.web3_provider.get_w3", return_value=mock_w3),
-            patch("utils.abi_loader.load_abi", return_value=[]),
             patch("services.safe_service.settings") as mock_settings,
             patch.object(
                 self.service, "_generate_eas_delegated_signature"
             ) as mock_generate_sig,
-            patch("builtins.open", side_effect=FileNotFoundError),
             patch.dict("os.environ", {"ETHEREUM_PRIVATE_KEY": "0x" + "a" * 64}),
         ):
             mock_settings.attestation_chain = "base"
@@ -2027,8 +2388,9 @@ class TestSafeServiceMissingCoverage:
                 "attestation_tracker",
             )
 
-            assert result["to"] == "0xtest123"
-            assert result["data"] == "0xabcd1234"
+            assert result["to"] == "0x1111111111111111111111111111111111111111"
+            encoder = get_calldata_encoder("attestation_tracker", "attestByDelegation")
+            assert result["data"].startswith("0x" + encoder.selector.hex())
             assert result["value"] == 0
 
     @pytest.mark.skip(reason="Obsolete: SafeService now uses KeyManager, private key loaded at init")
@@ -2091,26 +2453,11 @@ class TestSafeServiceMissingCoverage:
             confidence=95,
         )
 
-        with patch("services.safe_service.Web3") as mock_web3_class:
-            mock_w3 = Mock()
-            mock_codec = Mock()
-            mock_codec.encode.return_value = b"encoded_data"
-            mock_w3.codec = mock_codec
-            mock_web3_class.return_value = mock_w3
-
-            # Mock the to_checksum_address static method
-            mock_web3_class.to_checksum_address.return_value = (
-                "0x4567890123456789012345678901234567890123"
-            )
-
-            result = self.service._encode_attestation_data(attestation_data)
+        result = self.service._encode_attestation_data(attestation_data)
 
-            # Verify encode was called and first parameter was checksummed
-            mock_codec.encode.assert_called_once()
-            call_args = mock_codec.encode.call_args[0][1]
-            agent_address = call_args[0]
-            # Should be checksummed version
-            assert agent_address == "0x4567890123456789012345678901234567890123"
+        # The encoded agent decodes to the checksummed address
+        agent_address = decode(["address"], result[:32])[0]
+        assert agent_address == Web3.to_checksum_address(attestation_data.agent)
 
     @patch("services.safe_service.generate_eas_delegated_signature")
     def test_generate_eas_delegated_signature_detailed_logging(
@@ -2145,4 +2492,5 @@ class TestSafeServiceMissingCoverage:
             w3=mock_w3,
             eas_contract_address="0x12345678901234567890123456789012345678904567890123456789012345678901234567890",
             private_key="0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80",
+            chain_id=8453,
         )
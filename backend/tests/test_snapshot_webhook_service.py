@@ -0,0 +1,142 @@
+"""Tests for Snapshot webhook verification, deduplication and debouncing."""
+
+import asyncio
+import hashlib
+import hmac
+import json
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from models import SnapshotWebhookEvent
+from services.snapshot_webhook_service import (
+    SnapshotWebhookService,
+    verify_webhook_request,
+)
+
+SECRET = "test-secret"
+
+
+def _event(proposal_id="0xabc", event="proposal/created", space="test.eth"):
+    return SnapshotWebhookEvent(id=f"proposal/{proposal_id}", event=event, space=space)
+
+
+class TestVerifyWebhookRequest:
+    """Test webhook authentication."""
+
+    def test_valid_hmac_signature(self):
+        """Test that a correct HMAC of the body is accepted."""
+        body = json.dumps({"id": "proposal/0xabc"}).encode()
+        signature = hmac.new(SECRET.encode(), body, hashlib.sha256).hexdigest()
+
+        assert verify_webhook_request(
+            body, {"x-signature": f"sha256={signature}"}, SECRET
+        )
+
+    def test_tampered_body_rejected(self):
+        """Test that a signature for a different body is rejected."""
+        signature = hmac.new(SECRET.encode(), b"original", hashlib.sha256).hexdigest()
+
+        assert not verify_webhook_request(
+            b"tampered", {"x-signature": signature}, SECRET
+        )
+
+    def test_shared_secret_header(self):
+        """Test Snapshot's Authentication header form."""
+        assert verify_webhook_request(b"{}", {"authentication": SECRET}, SECRET)
+        assert not verify_webhook_request(b"{}", {"authentication": "wrong"}, SECRET)
+
+    def test_rejects_when_secret_unset(self):
+        """Test that nothing is accepted when no secret is configured."""
+        assert not verify_webhook_request(b"{}", {"authentication": ""}, None)
+
+
+class TestSnapshotWebhookService:
+    """Test event handling and per-space debouncing."""
+
+    @pytest.fixture(autouse=True)
+    def monitored_space(self, monkeypatch):
+        monkeypatch.setenv("MONITORED_DAOS", "test.eth")
+
+    def _make_service(self, run_scheduler=None, states=None, debounce_seconds=0.01):
+        states = states or {}
+        agent_run_service = Mock()
+        agent_run_service.is_agent_active.return_value = False
+        agent_run_service.run_lock = asyncio.Lock()
+        agent_run_service.execute_agent_run = AsyncMock()
+        agent_run_service.snapshot_service.get_proposal = AsyncMock(
+            side_effect=lambda pid: Mock(
+                id=pid, end=2_000_000_000, state=states.get(pid, "active")
+            )
+        )
+        service = SnapshotWebhookService(
+            agent_run_service,
+            run_scheduler=run_scheduler,
+            debounce_seconds=debounce_seconds,
+        )
+        return service, agent_run_service
+
+    @staticmethod
+    def _run_request(agent_run_service):
+        return agent_run_service.execute_agent_run.await_args.args[0]
+
+    async def test_burst_collapses_into_one_run(self):
+        """Test that several events for a space trigger a single agent run."""
+        service, agent_run_service = self._make_service()
+
+        assert await service.handle_event(_event("0x1"))
+        assert await service.handle_event(_event("0x2"))
+        assert await service.handle_event(_event("0x2", event="proposal/start"))
+        await asyncio.sleep(0.05)
+
+        agent_run_service.execute_agent_run.assert_awaited_once()
+        assert self._run_request(agent_run_service).proposal_ids == ["0x1", "0x2"]
+        assert service.get_stats()["batches_processed"] == 1
+
+    async def test_debounce_waits_for_quiet_period(self):
+        """Test that events arriving within the quiet period keep extending it."""
+        service, agent_run_service = self._make_service(debounce_seconds=0.05)
+
+        for proposal_id in ("0x1", "0x2", "0x3"):
+            await service.handle_event(_event(proposal_id))
+            await asyncio.sleep(0.03)
+        agent_run_service.execute_agent_run.assert_not_awaited()
+
+        await asyncio.sleep(0.05)
+        agent_run_service.execute_agent_run.assert_awaited_once()
+        assert len(self._run_request(agent_run_service).proposal_ids) == 3
+
+    async def test_pending_and_ended_proposals_skipped(self):
+        """Test that only proposals open for voting trigger a run."""
+        service, agent_run_service = self._make_service(states={"0x1": "pending"})
+        ended = _event("0x2").model_copy(update={"expire": 1})
+
+        assert await service.handle_event(_event("0x1"))
+        assert not await service.handle_event(ended)
+        await asyncio.sleep(0.05)
+
+        agent_run_service.execute_agent_run.assert_not_awaited()
+
+    async def test_duplicate_and_unmonitored_events_ignored(self):
+        """Test deduplication and space filtering."""
+        service, _ = self._make_service()
+
+        assert await service.handle_event(_event("0x1"))
+        assert not await service.handle_event(_event("0x1"))
+        assert not await service.handle_event(_event("0x1", space="other.eth"))
+        assert not await service.handle_event(_event("0x1", event="vote/created"))
+        assert service.get_stats()["events_deduplicated"] == 1
+        await service.stop()
+
+    async def test_scheduler_receives_targeted_proposals(self):
+        """Test that new proposals are run and queued, and ended ones discarded."""
+        run_scheduler = Mock()
+        service, agent_run_service = self._make_service(run_scheduler)
+
+        await service.handle_event(_event("0x1"))
+        await service.handle_event(_event("0x2", event="proposal/end"))
+        await asyncio.sleep(0.05)
+
+        run_scheduler.enqueue.assert_called_once_with("test.eth", "0x1", 2_000_000_000)
+        run_scheduler.discard.assert_called_once_with("0x2")
+        assert self._run_request(agent_run_service).proposal_ids == ["0x1"]
@@ -0,0 +1,289 @@
+"""Tests for state persistence."""
+
+import asyncio
+import json
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from config import settings
+from services.state_manager import (
+    DURABILITY_COALESCED,
+    DURABILITY_IMMEDIATE,
+    StateCorruptionError,
+    StateManager,
+)
+from services import state_storage
+from services.state_storage import (
+    SQLITE_DB_NAME,
+    STORAGE_ENGINE_SQLITE,
+    SqliteEngine,
+    decode_record,
+    encode_record,
+    migrate_storage,
+)
+
+
+@pytest.fixture
+def state_manager(tmp_path, monkeypatch):
+    """StateManager storing its files in a temporary directory."""
+    monkeypatch.setenv("STORE_PATH", str(tmp_path))
+    return StateManager()
+
+
+class TestStateCache:
+    """Test the write-through cache used by load_state."""
+
+    async def test_loads_served_from_memory(self, state_manager):
+        """Test that a saved state is loaded without reading the file."""
+        await state_manager.save_state("prefs", {"risk": 0.5})
+
+        with patch("builtins.open", side_effect=AssertionError("file was read")):
+            assert await state_manager.load_state("prefs") == {"risk": 0.5}
+            assert await state_manager.load_state("prefs") == {"risk": 0.5}
+
+        assert state_manager.get_cache_metrics()["hits"] == 2
+
+    async def test_loaded_data_is_a_copy(self, state_manager):
+        """Test that modifying loaded or saved data does not change the cache."""
+        data = {"votes": [1]}
+        await state_manager.save_state("run", data)
+        data["votes"].append(2)
+
+        loaded = await state_manager.load_state("run")
+        loaded["votes"].append(3)
+
+        assert await state_manager.load_state("run") == {"votes": [1]}
+
+    async def test_external_change_invalidates_cache(self, state_manager):
+        """Test that a file replaced outside the manager is re-read and verified."""
+        await state_manager.save_state("prefs", {"risk": 0.5})
+        other = StateManager()
+        await other.save_state("prefs", {"risk": 0.9})
+
+        assert await state_manager.load_state("prefs") == {"risk": 0.9}
+        assert state_manager.get_cache_metrics()["misses"] == 1
+
+    async def test_corrupted_file_detected_after_change(self, state_manager):
+        """Test that the checksum is verified when the file changed."""
+        path = await state_manager.save_state("prefs", {"risk": 0.5})
+        path.write_bytes(path.read_bytes().replace(b"0.5", b"1.0"))
+
+        with pytest.raises(StateCorruptionError):
+            await state_manager.load_state("prefs")
+
+
+class TestStateIO:
+    """Test that file I/O runs in the state I/O thread pool."""
+
+    async def test_files_written_and_read_off_the_event_loop(self, state_manager):
+        """Test that the event loop thread never writes or parses state files."""
+        loop_thread = threading.get_ident()
+        io_threads = set()
+
+        def record_thread(func):
+            def wrapper(*args, **kwargs):
+                io_threads.add(threading.get_ident())
+                return func(*args, **kwargs)
+
+            return wrapper
+
+        with (
+            patch.object(state_storage, "encode_record", record_thread(encode_record)),
+            patch.object(state_storage, "decode_record", record_thread(decode_record)),
+        ):
+            await state_manager.save_state("prefs", {"risk": 0.5})
+            await state_manager.save_state("prefs", {"risk": 0.6})
+            state_manager.invalidate_cache()
+            assert await state_manager.load_state("prefs") == {"risk": 0.6}
+
+        assert io_threads and loop_thread not in io_threads
+        assert len(await state_manager.list_backups("prefs")) == 1
+
+    async def test_failed_write_leaves_previous_file(self, state_manager):
+        """Test that a failed save keeps the old file and removes the temp file."""
+        await state_manager.save_state("prefs", {"risk": 0.5})
+
+        with pytest.raises(TypeError):
+            await state_manager.save_state("prefs", {"risk": object()})
+
+        assert await state_manager.load_state("prefs") == {"risk": 0.5}
+        assert not list(state_manager.store_path.glob("*.tmp"))
+
+
+class TestWriteCoalescing:
+    """Test coalesced saves and flushing."""
+
+    @pytest.fixture
+    def coalescing(self, state_manager):
+        """StateManager coalescing saves of ``transitions`` for 50 ms."""
+        state_manager.coalesce_window_seconds = 0.05
+        state_manager.durability = {"transitions": DURABILITY_COALESCED}
+        return state_manager
+
+    async def test_repeated_saves_written_once(self, coalescing):
+        """Test that saves within the window become one write of the last data."""
+        for count in range(5):
+            await coalescing.save_state("transitions", {"count": count})
+
+        assert await coalescing.load_state("transitions") == {"count": 4}
+        assert coalescing.get_write_metrics()["writes"] == 0
+
+        await asyncio.sleep(0.1)
+
+        metrics = coalescing.get_write_metrics()
+        assert metrics["writes"] == 1
+        assert metrics["coalesced_saves"] == 4
+        assert StateManager().durability_for("prefs") == DURABILITY_IMMEDIATE
+        assert await StateManager().load_state("transitions") == {"count": 4}
+
+    async def test_flush_writes_pending_saves(self, coalescing):
+        """Test that flush makes pending saves durable before the window ends."""
+        coalescing.coalesce_window_seconds = 60
+        await coalescing.save_state("transitions", {"count": 1})
+
+        await coalescing.flush()
+
+        assert await StateManager().load_state("transitions") == {"count": 1}
+        assert coalescing.get_write_metrics()["pending"] == []
+        await coalescing.cleanup()
+
+    async def test_immediate_durability_override(self, coalescing):
+        """Test that a per-call durability writes before returning."""
+        await coalescing.save_state(
+            "transitions", {"count": 1}, durability=DURABILITY_IMMEDIATE
+        )
+
+        assert coalescing.get_write_metrics()["writes"] == 1
+
+
+class TestSqliteStorage:
+    """Test StateManager on the SQLite storage engine."""
+
+    @pytest.fixture
+    def sqlite_manager(self, tmp_path, monkeypatch):
+        """StateManager storing its states in a SQLite database."""
+        monkeypatch.setenv("STORE_PATH", str(tmp_path))
+        with patch.object(settings, "state_storage_engine", STORAGE_ENGINE_SQLITE):
+            manager = StateManager()
+        yield manager
+        manager.engine.close()
+
+    async def test_save_and_load(self, sqlite_manager):
+        """Test that states round-trip through the database, not JSON files."""
+        await sqlite_manager.save_state("prefs", {"risk": 0.5}, sensitive=True)
+        sqlite_manager.invalidate_cache()
+
+        assert await sqlite_manager.load_state("prefs") == {"risk": 0.5}
+        assert (sqlite_manager.store_path / SQLITE_DB_NAME).exists()
+        assert not list(sqlite_manager.store_path.glob("*.json"))
+        assert sqlite_manager.engine.is_sensitive("prefs")
+
+    async def test_location_and_listing_from_engine(self, sqlite_manager):
+        """Test that save_state and list_files describe the database, not files."""
+        path = await sqlite_manager.save_state("prefs", {"risk": 0.5})
+
+        assert path == sqlite_manager.store_path / SQLITE_DB_NAME
+        assert await sqlite_manager.list_files() == ["prefs"]
+
+    async def test_history_kept_as_backups(self, sqlite_manager):
+        """Test that previous versions can be listed and restored."""
+        sqlite_manager.engine.max_backups = 2
+        for risk in (0.1, 0.2, 0.3, 0.4):
+            await sqlite_manager.save_state("prefs", {"risk": risk})
+
+        backups = await sqlite_manager.list_backups("prefs")
+
+        assert len(backups) == 2
+        restored = await sqlite_manager.restore_from_backup("prefs", backups[0])
+        assert restored == {"risk": 0.3}
+
+    async def test_load_states_by_prefix(self, sqlite_manager):
+        """Test that one call loads every state in a name range."""
+        await sqlite_manager.save_state("agent_checkpoint_a", {"run": 1})
+        await sqlite_manager.save_state("agent_checkpoint_b", {"run": 2})
+        await sqlite_manager.save_state("agent_run_service", {"run": 3})
+
+        states = await sqlite_manager.load_states("agent_checkpoint_")
+        latest = await sqlite_manager.load_latest_state("agent_checkpoint_")
+
+        assert states == {
+            "agent_checkpoint_a": {"run": 1},
+            "agent_checkpoint_b": {"run": 2},
+        }
+        assert latest == {"run": 2}
+
+    async def test_migrate_from_json(self, state_manager):
+        """Test that states saved as JSON files can be copied into SQLite."""
+        await state_manager.save_state("prefs", {"risk": 0.5})
+        await state_manager.save_state("keys", {"key": "secret"}, sensitive=True)
+        target = SqliteEngine(state_manager.store_path / SQLITE_DB_NAME)
+
+        assert migrate_storage(state_manager.engine, target) == 2
+
+        _, state_data = target.read("prefs")
+        assert state_data["data"] == {"risk": 0.5}
+        assert target.is_sensitive("keys")
+        target.close()
+
+
+class TestStateRecords:
+    """Test the serialized form of stored states."""
+
+    @staticmethod
+    def record(data):
+        return encode_record(
+            {"version": "1.0.0", "timestamp": "2025-01-01T00:00:00", "data": data}
+        )
+
+    def test_data_serialized_once_and_canonical(self):
+        """Test that equal data gives identical single-line records."""
+        record = self.record({"b": [1, 2], "a": "é"})
+
+        assert record == self.record({"a": "é", "b": [1, 2]})
+        assert b"\n" not in record
+        assert record.endswith(b',"data":{"a": "\\u00e9", "b": [1, 2]}}')
+
+    def test_records_readable_as_plain_json(self):
+        """Test that earlier versions and JSON tools can read a record."""
+        data = {"votes": [{"id": "0x1", "confidence": 0.9}], "note": "é"}
+
+        state_data = json.loads(self.record(data))
+
+        assert state_data["data"] == data
+        # The checksum earlier versions verify on load
+        state_storage.verify_checksum(state_data, "prefs")
+
+    def test_truncated_record_rejected(self):
+        """Test that a record cut short is reported as corrupted."""
+        record = self.record({"risk": 0.5})
+
+        with pytest.raises(StateCorruptionError):
+            decode_record(record[:-10], "prefs")
+
+    def test_checksum_verified_on_raw_bytes(self):
+        """Test that a changed payload is rejected before it is parsed."""
+        record = self.record({"risk": 0.5}).replace(b"0.5", b"1.0")
+
+        with (
+            patch("json.loads", wraps=json.loads) as loads,
+            pytest.raises(StateCorruptionError),
+        ):
+            decode_record(record, "prefs")
+
+        assert loads.call_count == 1  # The header only
+
+    async def test_legacy_records_still_load(self, state_manager):
+        """Test that pretty-printed records from earlier versions are read."""
+        data = {"risk": 0.5}
+        legacy = {
+            "version": "1.0.0",
+            "timestamp": "2025-01-01T00:00:00",
+            "data": data,
+            "checksum": state_storage.calculate_checksum(data),
+        }
+        path = state_manager.store_path / "prefs.json"
+        path.write_text(json.dumps(legacy, indent=2))
+
+        assert await state_manager.load_state("prefs") == data
@@ -0,0 +1,134 @@
+"""Tests for concurrent vote submission."""
+
+import asyncio
+import time
+from typing import Dict, List, Optional
+
+from services.vote_dispatcher import VoteDispatcher, VoteRequest
+
+HUB = "https://hub.test/"
+
+
+class FakeVotingService:
+    """Voting service that answers after a delay with scripted status codes."""
+
+    def __init__(self, delay: float = 0.0, statuses: Optional[Dict] = None) -> None:
+        self.delay = delay
+        self.statuses = statuses or {}
+        self.calls: List[tuple] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def vote_on_proposal(self, space, proposal, choice, timestamp=None):
+        self.calls.append((space, proposal, choice, timestamp))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+
+        scripted = self.statuses.get(proposal, [])
+        status = scripted.pop(0) if scripted else 200
+        if status == 200:
+            submission = {"success": True, "response": {"id": f"vote-{proposal}"}}
+        else:
+            submission = {
+                "success": False,
+                "error": f"HTTP {status}",
+                "status_code": status,
+            }
+        return {"success": submission["success"], "submission_result": submission}
+
+
+def _dispatcher(service, **kwargs) -> VoteDispatcher:
+    options = {
+        "max_concurrency": 4,
+        "rate_per_second": 1000.0,
+        "max_attempts": 3,
+        "retry_backoff_seconds": 0.0,
+        "hub_url": HUB,
+    }
+    options.update(kwargs)
+    return VoteDispatcher(service, **options)
+
+
+def _requests(*proposals: str) -> List[VoteRequest]:
+    return [VoteRequest(space="test.eth", proposal=p, choice=1) for p in proposals]
+
+
+class TestVoteDispatcher:
+    """Test concurrency, ordering, retries and outcome reporting."""
+
+    async def test_independent_votes_submitted_concurrently(self):
+        """Test that N votes take about one round trip, not N."""
+        service = FakeVotingService(delay=0.1)
+        dispatcher = _dispatcher(service)
+
+        started = time.monotonic()
+        outcomes = await dispatcher.dispatch(_requests("0x1", "0x2", "0x3", "0x4"))
+
+        assert time.monotonic() - started < 0.3
+        assert service.max_in_flight == 4
+        assert [o.vote_id for o in outcomes] == [
+            "vote-0x1",
+            "vote-0x2",
+            "vote-0x3",
+            "vote-0x4",
+        ]
+
+    async def test_concurrency_bounded(self):
+        """Test that no more than max_concurrency votes are in flight."""
+        service = FakeVotingService(delay=0.02)
+        dispatcher = _dispatcher(service, max_concurrency=2)
+
+        await dispatcher.dispatch(_requests("0x1", "0x2", "0x3", "0x4", "0x5"))
+
+        assert service.max_in_flight == 2
+
+    async def test_same_proposal_votes_kept_in_order(self):
+        """Test that votes on one proposal are never in flight together."""
+        service = FakeVotingService(delay=0.02)
+        dispatcher = _dispatcher(service)
+        requests = [
+            VoteRequest(space="test.eth", proposal="0x1", choice=choice)
+            for choice in (1, 2, 3)
+        ]
+
+        await dispatcher.dispatch(requests)
+
+        assert service.max_in_flight == 1
+
+    async def test_transient_failure_retried_with_same_timestamp(self):
+        """Test that a 503 is retried and every attempt signs the same message."""
+        service = FakeVotingService(statuses={"0x1": [503, 429]})
+        dispatcher = _dispatcher(service)
+
+        (outcome,) = await dispatcher.dispatch(_requests("0x1"))
+
+        assert outcome.success
+        assert outcome.attempts == 3
+        assert len(set(service.calls)) == 1
+        assert dispatcher.rate_limiter.get_metrics()[HUB]["rate_limited"] == 1
+
+    async def test_rejection_not_retried(self):
+        """Test that a 400 from the hub is final."""
+        service = FakeVotingService(statuses={"0x1": [400]})
+        dispatcher = _dispatcher(service)
+
+        (outcome,) = await dispatcher.dispatch(_requests("0x1"))
+
+        assert not outcome.success
+        assert outcome.attempts == 1
+        assert outcome.error == "HTTP 400"
+
+    async def test_outcomes_reported_as_they_complete(self):
+        """Test that on_outcome receives each request index once."""
+        service = FakeVotingService(statuses={"0x2": [400]})
+        dispatcher = _dispatcher(service)
+        reported = {}
+
+        async def on_outcome(index, outcome):
+            reported[index] = outcome.success
+
+        await dispatcher.dispatch(_requests("0x1", "0x2", "0x3"), on_outcome)
+
+        assert reported == {0: True, 1: False, 2: True}
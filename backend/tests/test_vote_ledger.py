@@ -0,0 +1,83 @@
+"""Tests for the persistent vote ledger."""
+
+from unittest.mock import AsyncMock, Mock
+
+from models import Vote
+from services.vote_ledger import STATUS_CONFIRMED, VOTE_LEDGER_STATE_NAME, VoteLedger
+
+VOTER = "0x742d35Cc6634C0532925a3b844Bc454e4438f44e"
+
+
+def _vote(proposal_id: str, choice=1) -> Vote:
+    return Vote(
+        id=f"0xvote{proposal_id}",
+        voter=VOTER,
+        choice=choice,
+        created=1_700_000_000,
+        vp=10.0,
+        proposal={"id": proposal_id},
+    )
+
+
+class TestVoteLedger:
+    """Test recording, lookup, reconciliation and persistence."""
+
+    async def test_recorded_submission_is_voted(self):
+        """Test that a submitted vote is found regardless of address case."""
+        ledger = VoteLedger()
+
+        await ledger.record_submission("test.eth", "0x1", VOTER, vote_id="0xabc")
+
+        assert ledger.has_voted("test.eth", "0x1", VOTER.lower())
+        assert not ledger.has_voted("other.eth", "0x1", VOTER)
+        assert ledger.voted_proposal_ids("test.eth", VOTER) == {"0x1"}
+
+    async def test_reconcile_adds_votes_seen_on_snapshot(self):
+        """Test that votes from the hub index are added as confirmed."""
+        ledger = VoteLedger()
+        await ledger.record_submission("test.eth", "0x1", VOTER)
+
+        added = await ledger.reconcile("test.eth", VOTER, [_vote("0x1"), _vote("0x2")])
+
+        assert added == 1
+        assert ledger.voted_proposal_ids("test.eth", VOTER) == {"0x1", "0x2"}
+        assert ledger.get_stats()["confirmed"] == 2
+
+    async def test_reconcile_accepts_ranked_and_weighted_votes(self):
+        """Test that votes with list and map choices are reconciled."""
+        ledger = VoteLedger()
+        votes = [
+            _vote("0x1", choice=[2, 1, 3]),
+            _vote("0x2", choice={"1": 2.0, "3": 1.0}),
+        ]
+
+        added = await ledger.reconcile("test.eth", VOTER, votes)
+
+        assert added == 2
+        assert ledger.voted_proposal_ids("test.eth", VOTER) == {"0x1", "0x2"}
+
+    async def test_persisted_through_state_manager(self):
+        """Test that the ledger is saved and restored via the StateManager."""
+        state_manager = Mock()
+        state_manager.save_state = AsyncMock()
+        ledger = VoteLedger(state_manager)
+        await ledger.reconcile("test.eth", VOTER, [_vote("0x1")])
+
+        name, data = state_manager.save_state.call_args.args
+        assert name == VOTE_LEDGER_STATE_NAME
+        state_manager.load_state = AsyncMock(return_value=data)
+
+        restored = VoteLedger(state_manager)
+        await restored.load()
+
+        assert restored.has_voted("test.eth", "0x1", VOTER)
+        assert next(iter(data["entries"].values()))["status"] == STATUS_CONFIRMED
+
+    async def test_oldest_entries_evicted(self):
+        """Test that the ledger stays within max_entries."""
+        ledger = VoteLedger(max_entries=2)
+
+        for proposal_id in ("0x1", "0x2", "0x3"):
+            await ledger.record_submission("test.eth", proposal_id, VOTER)
+
+        assert ledger.voted_proposal_ids("test.eth", VOTER) == {"0x2", "0x3"}
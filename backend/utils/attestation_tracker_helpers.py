@@ -7,8 +7,9 @@ Functions return (0, False) if tracker not configured or on error.
 import logging
 from typing import Tuple
 from config import settings
-from utils.web3_provider import get_w3
-from utils.abi_loader import load_abi
+from utils.calldata_encoder import get_calldata_encoder
+from utils.chain_client_registry import is_connection_error
+from utils.web3_provider import get_w3, invalidate_w3
 from web3 import Web3
 
 logger = logging.getLogger(__name__)
@@ -41,41 +42,22 @@ def get_multisig_info(multisig_address: str) -> Tuple[int, bool]:
             f"Using AttestationTracker at address: {settings.attestation_tracker_address}"
         )
 
-        # Get Web3 instance
-        logger.debug("Getting Web3 connection for base chain")
-        w3 = get_w3("base")
-        current_block = w3.eth.get_block("latest")
-        logger.debug(
-            f"Connected to base chain - block_number={current_block['number']}"
-        )
-
-        # Load contract ABI
-        logger.debug("Loading AttestationTracker ABI")
-        contract_abi = load_abi("attestation_tracker")
-        logger.debug(
-            f"Loaded AttestationTracker ABI with {len(contract_abi)} functions/events"
-        )
-
-        # Create contract instance
-        contract_address = Web3.to_checksum_address(
-            settings.attestation_tracker_address
-        )
-        contract = w3.eth.contract(
-            address=contract_address,
-            abi=contract_abi,
-        )
-        logger.info(
-            f"Created AttestationTracker contract instance at: {contract_address}"
-        )
-
         # Query multisig attestation count using available function
         logger.debug(f"Calling getNumAttestations for multisig: {multisig_address}")
 
         # Convert non-checksummed address to checksummed address
         multisig_checksum_address = Web3.to_checksum_address(multisig_address)
-        count = contract.functions.getNumAttestations(multisig_checksum_address).call()
+        encoder = get_calldata_encoder("attestation_tracker", "getNumAttestations")
+        return_data = get_w3("base").eth.call(
+            {
+                "to": Web3.to_checksum_address(settings.attestation_tracker_address),
+                "data": encoder.encode(multisig_checksum_address),
+            }
+        )
+        (count,) = encoder.decode(return_data)
         logger.info(
-            f"AttestationTracker query successful - multisig={multisig_address}, count={count}"
+            f"AttestationTracker query successful - multisig={multisig_address}, "
+            f"count={count}"
         )
 
         # Default active status to True since separate active status tracking is not available
@@ -85,6 +67,8 @@ def get_multisig_info(multisig_address: str) -> Tuple[int, bool]:
         return (count, is_active)
 
     except Exception as e:
+        if is_connection_error(e):
+            invalidate_w3("base")
         logger.exception(
             f"Error querying AttestationTracker for multisig {multisig_address}: {str(e)}"
         )
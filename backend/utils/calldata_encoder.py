@@ -0,0 +1,90 @@
+"""Offline calldata encoding for contract calls.
+
+Safe transactions only need the raw calldata of the wrapped call, so there is
+no need for a Web3 contract object or ``build_transaction`` (which resolves
+the ABI on every call and fills chain ID and gas fields over RPC). An encoder
+resolves the function from the ABI once, precomputes its 4-byte selector and
+then encodes arguments directly with ``eth_abi``. The same encoder decodes
+the function's return data, e.g. for reads sent in a JSON-RPC batch.
+"""
+
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple
+
+from eth_abi import decode, encode
+from eth_utils import function_signature_to_4byte_selector
+
+from utils.abi_loader import load_abi
+
+
+def _canonical_type(abi_input: Dict[str, Any]) -> str:
+    """Return the canonical ABI type of an input, expanding tuples."""
+    abi_type = abi_input["type"]
+    if not abi_type.startswith("tuple"):
+        return abi_type
+    components = ",".join(_canonical_type(c) for c in abi_input["components"])
+    return f"({components}){abi_type[len('tuple') :]}"
+
+
+def _normalize(value: Any, abi_input: Dict[str, Any]) -> Any:
+    """Convert struct arguments given as dicts into tuples in ABI order."""
+    abi_type = abi_input["type"]
+    if not abi_type.startswith("tuple"):
+        return value
+    if abi_type != "tuple":
+        # Array of structs, e.g. tuple[] or tuple[2]
+        item = {**abi_input, "type": abi_type[: abi_type.rindex("[")]}
+        return [_normalize(v, item) for v in value]
+    components = abi_input["components"]
+    if isinstance(value, dict):
+        value = [value[c["name"]] for c in components]
+    return tuple(_normalize(v, c) for v, c in zip(value, components))
+
+
+class CalldataEncoder:
+    """Encoder for calls to a single contract function."""
+
+    def __init__(self, abi_name: str, function_name: str) -> None:
+        """Resolve the function and precompute its selector.
+
+        Args:
+            abi_name: Name of the ABI file (see ``utils.abi_loader``)
+            function_name: Function to encode calls for; must not be overloaded
+        """
+        matches = [
+            entry
+            for entry in load_abi(abi_name)
+            if entry.get("type") == "function" and entry.get("name") == function_name
+        ]
+        assert len(matches) == 1, (
+            f"Expected one '{function_name}' function in ABI '{abi_name}', "
+            f"found {len(matches)}"
+        )
+
+        self.inputs: List[Dict[str, Any]] = matches[0]["inputs"]
+        self.types = [_canonical_type(i) for i in self.inputs]
+        self.output_types = [_canonical_type(o) for o in matches[0]["outputs"]]
+        self.signature = f"{function_name}({','.join(self.types)})"
+        self.selector = function_signature_to_4byte_selector(self.signature)
+
+    def encode(self, *args: Any) -> bytes:
+        """Encode a call as selector followed by the ABI-encoded arguments.
+
+        Struct arguments may be given as tuples or as dicts keyed by
+        component name.
+        """
+        assert len(args) == len(self.inputs), (
+            f"{self.signature} takes {len(self.inputs)} arguments, got {len(args)}"
+        )
+        values = [_normalize(v, i) for v, i in zip(args, self.inputs)]
+        return self.selector + encode(self.types, values)
+
+    def decode(self, data: bytes) -> Tuple[Any, ...]:
+        """Decode the function's return data into a tuple of output values."""
+        return decode(self.output_types, data)
+
+
+@lru_cache(maxsize=32)
+def get_calldata_encoder(abi_name: str, function_name: str) -> CalldataEncoder:
+    """Return the shared encoder for a contract function."""
+    return CalldataEncoder(abi_name, function_name)
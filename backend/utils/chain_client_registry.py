@@ -0,0 +1,133 @@
+"""Process-wide registry of chain clients.
+
+Creating a ``Web3`` provider, an ``EthereumClient`` or a Safe Transaction
+Service client opens a new HTTP session, and ``EthereumClient`` also makes an
+RPC round trip to detect the network. The registry creates each client once
+per endpoint and hands the same instance (and its pooled HTTP connections) to
+every caller. Clients for an endpoint are dropped when a call fails at the
+connection level, so the next caller reconnects.
+"""
+
+import threading
+from typing import Any, Callable, Dict, Tuple, TypeVar
+
+from web3.exceptions import ProviderConnectionError
+
+from logging_config import setup_pearl_logger
+from utils.rpc_rate_limiter import is_rate_limit_error
+
+# Client kinds
+CLIENT_WEB3 = "web3"
+CLIENT_ETHEREUM = "ethereum_client"
+CLIENT_SAFE = "safe"
+CLIENT_TRANSACTION_SERVICE = "transaction_service"
+
+T = TypeVar("T")
+
+logger = setup_pearl_logger(__name__)
+
+
+class ChainClientRegistry:
+    """Cache of chain clients keyed by client kind and endpoint.
+
+    Keys start with the endpoint the client talks to (an RPC URL, or a Safe
+    Transaction Service URL). Clients bound to something more specific, such
+    as a Safe address, append it after a ``|`` so that invalidating the
+    endpoint also drops them.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty registry."""
+        self._clients: Dict[Tuple[str, str], Any] = {}
+        self._lock = threading.Lock()
+        self.created = 0
+        self.reused = 0
+        self.invalidated = 0
+
+    def get(self, kind: str, key: str, factory: Callable[[], T]) -> T:
+        """Return the cached client, creating it with ``factory`` on first use.
+
+        The factory runs outside the lock because client construction may make
+        network calls; if two threads race, the first stored client wins.
+
+        Args:
+            kind: Client kind, one of the ``CLIENT_*`` constants
+            key: Endpoint the client is bound to
+            factory: Callable that builds the client
+
+        Returns:
+            The shared client instance
+        """
+        with self._lock:
+            client = self._clients.get((kind, key))
+            if client is not None:
+                self.reused += 1
+                return client
+
+        client = factory()
+        with self._lock:
+            existing = self._clients.setdefault((kind, key), client)
+            if existing is client:
+                self.created += 1
+                logger.debug(f"Created chain client (kind={kind}, key={key})")
+            return existing
+
+    def invalidate(self, endpoint: str) -> int:
+        """Drop every client bound to ``endpoint``.
+
+        Returns:
+            Number of clients dropped
+        """
+        with self._lock:
+            stale = [
+                entry
+                for entry in self._clients
+                if entry[1] == endpoint or entry[1].startswith(f"{endpoint}|")
+            ]
+            for entry in stale:
+                del self._clients[entry]
+            self.invalidated += len(stale)
+
+        if stale:
+            logger.info(
+                f"Invalidated chain clients (endpoint={endpoint}, count={len(stale)})"
+            )
+        return len(stale)
+
+    def clear(self) -> None:
+        """Drop all clients."""
+        with self._lock:
+            self._clients.clear()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Return client counts and cache hit counters."""
+        with self._lock:
+            kinds: Dict[str, int] = {}
+            for kind, _ in self._clients:
+                kinds[kind] = kinds.get(kind, 0) + 1
+            return {
+                "clients": kinds,
+                "created": self.created,
+                "reused": self.reused,
+                "invalidated": self.invalidated,
+            }
+
+
+def is_connection_error(error: BaseException) -> bool:
+    """Whether an error means the client's connection should be rebuilt.
+
+    requests and urllib3 connection failures and timeouts are ``OSError``
+    subclasses. HTTP 429 responses are excluded: the endpoint is reachable
+    and the rate limiter handles them.
+    """
+    if is_rate_limit_error(error):
+        return False
+    return isinstance(error, (OSError, ProviderConnectionError))
+
+
+_registry = ChainClientRegistry()
+
+
+def get_chain_client_registry() -> ChainClientRegistry:
+    """Return the process-wide chain client registry."""
+    return _registry
@@ -0,0 +1,67 @@
+"""Dedicated thread pool for blocking chain I/O.
+
+web3.py's ``HTTPProvider`` and safe-eth-py are synchronous: every RPC call,
+Safe Transaction Service request and receipt wait blocks the calling thread.
+Coroutines hand such work to ``run_in_chain_executor`` so that the event loop
+keeps serving requests while the chain call is in flight. The pool is kept
+separate from the loop's default executor so that slow RPC endpoints cannot
+starve other ``run_in_executor`` users.
+"""
+
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+from config import settings
+
+# Constants
+CHAIN_EXECUTOR_THREAD_PREFIX = "chain-io"
+
+T = TypeVar("T")
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_chain_executor() -> ThreadPoolExecutor:
+    """Return the shared chain I/O thread pool, creating it on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.chain_executor_max_workers,
+                thread_name_prefix=CHAIN_EXECUTOR_THREAD_PREFIX,
+            )
+        return _executor
+
+
+async def run_in_chain_executor(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking chain call in the chain I/O thread pool.
+
+    The caller's context variables are propagated so that log spans and
+    request-scoped state stay attached to the work.
+
+    Args:
+        func: Blocking callable to run
+        *args: Positional arguments for ``func``
+        **kwargs: Keyword arguments for ``func``
+
+    Returns:
+        The return value of ``func``
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    call = functools.partial(context.run, func, *args, **kwargs)
+    return await loop.run_in_executor(get_chain_executor(), call)
+
+
+def shutdown_chain_executor(wait: bool = True) -> None:
+    """Shut down the chain I/O thread pool; it is recreated on next use."""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=wait)
@@ -0,0 +1,171 @@
+"""Cached chain metadata for transaction building.
+
+Building one attestation used to read the chain ID several times, fetch the
+latest block and rebuild the contract object on every call. This cache keeps:
+
+- the chain ID of each chain for the life of the process;
+- the latest block of each chain for ``CHAIN_BLOCK_CACHE_TTL_SECONDS``;
+- contract objects per chain, address and ABI for as long as the chain's
+  Web3 instance stays the same (a reconnect builds them again).
+
+``refresh`` reads the chain ID and latest block in one JSON-RPC batch.
+"""
+
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from web3 import Web3
+from web3.contract import Contract
+
+from config import settings
+from logging_config import setup_pearl_logger
+from utils.rpc_batch import RpcBatch
+
+logger = setup_pearl_logger(__name__)
+
+
+class ChainMetadataCache:
+    """Per-chain cache of chain IDs, recent blocks and contract objects."""
+
+    def __init__(self, block_ttl_seconds: Optional[float] = None) -> None:
+        """Initialize an empty cache.
+
+        Args:
+            block_ttl_seconds: How long a fetched latest block is reused
+                (defaults to ``settings.chain_block_cache_ttl_seconds``)
+        """
+        self.block_ttl_seconds = (
+            block_ttl_seconds
+            if block_ttl_seconds is not None
+            else settings.chain_block_cache_ttl_seconds
+        )
+        assert self.block_ttl_seconds >= 0, "block_ttl_seconds must not be negative"
+
+        self._chain_ids: Dict[str, int] = {}
+        self._blocks: Dict[str, Tuple[float, Any]] = {}
+        self._contracts: Dict[Tuple[str, str, str], Tuple[Web3, Contract]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_chain_id(self, chain: str, w3: Web3) -> int:
+        """Return the chain ID, reading it from the node only once."""
+        with self._lock:
+            chain_id = self._chain_ids.get(chain)
+            if chain_id is not None:
+                self.hits += 1
+                return chain_id
+
+        chain_id = w3.eth.chain_id
+        with self._lock:
+            self._chain_ids[chain] = chain_id
+            self.misses += 1
+        return chain_id
+
+    def get_latest_block(self, chain: str, w3: Web3) -> Any:
+        """Return the latest block, refetching it once the cached one expires."""
+        now = time.monotonic()
+        with self._lock:
+            cached = self._blocks.get(chain)
+            if cached is not None and now - cached[0] < self.block_ttl_seconds:
+                self.hits += 1
+                return cached[1]
+
+        block = w3.eth.get_block("latest")
+        with self._lock:
+            self._blocks[chain] = (now, block)
+            self.misses += 1
+        return block
+
+    def refresh(self, chain: str, w3: Web3) -> Any:
+        """Read chain ID and latest block in one round trip and cache both.
+
+        Doubles as a connectivity probe: it raises if the node is unreachable
+        or answers with an error.
+
+        Returns:
+            The latest block
+        """
+        batch = RpcBatch(w3)
+        chain_id_index = batch.chain_id()
+        block_index = batch.get_block("latest")
+        results = batch.execute()
+
+        with self._lock:
+            self._chain_ids[chain] = results[chain_id_index]
+            self._blocks[chain] = (time.monotonic(), results[block_index])
+            self.misses += 1
+        return results[block_index]
+
+    def get_contract(
+        self, chain: str, w3: Web3, address: str, abi_name: str
+    ) -> Contract:
+        """Return a contract object bound to ``w3``, building it on first use.
+
+        Args:
+            chain: Chain the contract lives on
+            w3: Web3 instance the contract should use
+            address: Contract address
+            abi_name: Name of the ABI file to load
+
+        Returns:
+            The cached contract object
+        """
+        key = (chain, address.lower(), abi_name)
+        with self._lock:
+            cached = self._contracts.get(key)
+            if cached is not None and cached[0] is w3:
+                self.hits += 1
+                return cached[1]
+
+        from utils.abi_loader import load_abi
+
+        contract = w3.eth.contract(
+            address=Web3.to_checksum_address(address), abi=load_abi(abi_name)
+        )
+        with self._lock:
+            self._contracts[key] = (w3, contract)
+            self.misses += 1
+        logger.debug(
+            f"Cached contract object (chain={chain}, address={address}, abi={abi_name})"
+        )
+        return contract
+
+    def invalidate(self, chain: str) -> None:
+        """Drop the cached block and contracts of a chain; the chain ID is kept."""
+        with self._lock:
+            self._blocks.pop(chain, None)
+            for key in [key for key in self._contracts if key[0] == chain]:
+                del self._contracts[key]
+
+    def clear(self) -> None:
+        """Drop everything, including chain IDs."""
+        with self._lock:
+            self._chain_ids.clear()
+            self._blocks.clear()
+            self._contracts.clear()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Return cached entry counts and hit/miss counters."""
+        with self._lock:
+            return {
+                "chain_ids": dict(self._chain_ids),
+                "blocks": len(self._blocks),
+                "contracts": len(self._contracts),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+_metadata_cache: Optional[ChainMetadataCache] = None
+_metadata_cache_lock = threading.Lock()
+
+
+def get_chain_metadata_cache() -> ChainMetadataCache:
+    """Return the process-wide chain metadata cache."""
+    global _metadata_cache
+    with _metadata_cache_lock:
+        if _metadata_cache is None:
+            _metadata_cache = ChainMetadataCache()
+        return _metadata_cache
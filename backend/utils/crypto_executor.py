@@ -0,0 +1,201 @@
+"""Worker pool for CPU-bound signing and ABI encoding.
+
+ECDSA signing, keccak hashing and ABI encoding are pure CPU work. Run on the
+event loop they delay every other coroutine; run in the chain I/O pool they
+hold threads that should be waiting on RPC endpoints. Coroutines hand such
+work to ``run_in_crypto_executor`` instead.
+
+``CRYPTO_EXECUTOR_KIND`` selects a thread pool (default) or a process pool.
+With a process pool the callable and its arguments are pickled, so only
+module-level functions with plain arguments can be submitted, and context
+variables do not reach the worker. State a worker needs for every call,
+such as a signing key, is set up once per process by a worker initializer
+instead of being pickled with each call. Each call records how long it
+waited in the queue and how long it ran.
+"""
+
+import asyncio
+import contextvars
+import functools
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+from config import settings
+from logging_config import setup_pearl_logger
+
+# Constants
+CRYPTO_EXECUTOR_THREAD_PREFIX = "crypto"
+EXECUTOR_KIND_THREAD = "thread"
+EXECUTOR_KIND_PROCESS = "process"
+
+T = TypeVar("T")
+
+logger = setup_pearl_logger(__name__)
+
+_executor: Optional[Executor] = None
+_executor_lock = threading.Lock()
+_worker_initializers: List[Tuple[Callable[..., Any], Tuple[Any, ...]]] = []
+
+
+def add_worker_initializer(func: Callable[..., Any], *args: Any) -> None:
+    """Run ``func(*args)`` once in every worker process before it takes work.
+
+    Only process pools use initializers; threads share the caller's state. A
+    running process pool is replaced so that its workers run the new one too.
+
+    Args:
+        func: Module-level callable; it and ``args`` must be picklable
+        *args: Positional arguments for ``func``
+    """
+    global _executor
+    with _executor_lock:
+        _worker_initializers.append((func, args))
+        executor = _executor
+        if isinstance(executor, ProcessPoolExecutor):
+            _executor = None
+    if isinstance(executor, ProcessPoolExecutor):
+        # Submitted calls still finish in the old workers
+        executor.shutdown(wait=False)
+
+
+def _initialize_worker(
+    initializers: List[Tuple[Callable[..., Any], Tuple[Any, ...]]],
+) -> None:
+    """Run the registered initializers in a new worker process."""
+    for func, args in initializers:
+        func(*args)
+
+
+def get_crypto_executor() -> Executor:
+    """Return the shared crypto worker pool, creating it on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            kind = settings.crypto_executor_kind
+            assert kind in (EXECUTOR_KIND_THREAD, EXECUTOR_KIND_PROCESS), (
+                f"Unknown crypto executor kind: {kind}"
+            )
+            if kind == EXECUTOR_KIND_PROCESS:
+                _executor = ProcessPoolExecutor(
+                    max_workers=settings.crypto_executor_max_workers,
+                    initializer=_initialize_worker,
+                    initargs=(list(_worker_initializers),),
+                )
+            else:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.crypto_executor_max_workers,
+                    thread_name_prefix=CRYPTO_EXECUTOR_THREAD_PREFIX,
+                )
+            logger.info(
+                f"Crypto executor started (kind={kind}, "
+                f"max_workers={settings.crypto_executor_max_workers})"
+            )
+        return _executor
+
+
+def _timed_call(
+    submitted_at: float, func: Callable[..., T], *args: Any, **kwargs: Any
+) -> Tuple[T, float, float]:
+    """Run ``func`` and return its result with queue and run times in seconds.
+
+    Wall-clock time is used because the worker may be another process.
+    """
+    started_at = time.time()
+    result = func(*args, **kwargs)
+    return result, started_at - submitted_at, time.time() - started_at
+
+
+async def run_in_crypto_executor(
+    func: Callable[..., T], *args: Any, **kwargs: Any
+) -> T:
+    """Run CPU-bound work in the crypto worker pool.
+
+    In thread mode the caller's context variables are propagated so that log
+    spans stay attached to the work.
+
+    Args:
+        func: Callable to run; must be picklable in process mode
+        *args: Positional arguments for ``func``
+        **kwargs: Keyword arguments for ``func``
+
+    Returns:
+        The return value of ``func``
+    """
+    loop = asyncio.get_running_loop()
+    executor = get_crypto_executor()
+    call = functools.partial(_timed_call, time.time(), func, *args, **kwargs)
+    if isinstance(executor, ThreadPoolExecutor):
+        call = functools.partial(contextvars.copy_context().run, call)
+
+    try:
+        result, queued, ran = await loop.run_in_executor(executor, call)
+    except Exception:
+        _record(func, None, None, failed=True)
+        raise
+    _record(func, queued, ran, failed=False)
+    return result
+
+
+_stats_lock = threading.Lock()
+_stats: Dict[str, Dict[str, float]] = {}
+
+
+def _record(
+    func: Callable[..., Any],
+    queued: Optional[float],
+    ran: Optional[float],
+    failed: bool,
+) -> None:
+    name = getattr(func, "__qualname__", repr(func))
+    with _stats_lock:
+        stats = _stats.setdefault(
+            name,
+            {
+                "calls": 0,
+                "failures": 0,
+                "queue_seconds": 0.0,
+                "max_queue_seconds": 0.0,
+                "run_seconds": 0.0,
+                "max_run_seconds": 0.0,
+            },
+        )
+        stats["calls"] += 1
+        if failed:
+            stats["failures"] += 1
+            return
+        stats["queue_seconds"] += queued
+        stats["max_queue_seconds"] = max(stats["max_queue_seconds"], queued)
+        stats["run_seconds"] += ran
+        stats["max_run_seconds"] = max(stats["max_run_seconds"], ran)
+
+
+def get_crypto_executor_metrics() -> Dict[str, Any]:
+    """Return per-function call counts, queue latency and execution time."""
+    with _stats_lock:
+        functions = {}
+        for name, stats in _stats.items():
+            completed = max(stats["calls"] - stats["failures"], 1)
+            functions[name] = {
+                "calls": int(stats["calls"]),
+                "failures": int(stats["failures"]),
+                "avg_queue_ms": round(stats["queue_seconds"] / completed * 1000, 3),
+                "max_queue_ms": round(stats["max_queue_seconds"] * 1000, 3),
+                "avg_run_ms": round(stats["run_seconds"] / completed * 1000, 3),
+                "max_run_ms": round(stats["max_run_seconds"] * 1000, 3),
+            }
+    return {
+        "kind": settings.crypto_executor_kind,
+        "max_workers": settings.crypto_executor_max_workers,
+        "functions": functions,
+    }
+
+
+def shutdown_crypto_executor(wait: bool = True) -> None:
+    """Shut down the crypto worker pool; it is recreated on next use."""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=wait)
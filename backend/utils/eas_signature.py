@@ -5,14 +5,95 @@ delegated attestations. It's designed to be used by both SafeService and test sc
 to ensure consistency.
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Sequence
 from web3 import Web3
+from eth_abi import encode
 from eth_account import Account
-from eth_account.messages import encode_typed_data
+
+from models import EASAttestationData
+from utils.crypto_executor import run_in_crypto_executor
+from utils.eip712_signer import (
+    TypedStruct,
+    domain_separator,
+    get_typed_data_signer,
+    sign_typed_messages,
+)
+
+# EAS EIP-712 domain; MUST match the EIP712Proxy contract's domain exactly
+EAS_DOMAIN_NAME = "EIP712Proxy"
+EAS_DOMAIN_VERSION = "1.2.0"
+
+# Type hash computed once at import instead of on every signature
+EAS_ATTEST_STRUCT = TypedStruct(
+    "Attest",
+    [
+        ("schema", "bytes32"),
+        ("recipient", "address"),
+        ("expirationTime", "uint64"),
+        ("revocable", "bool"),
+        ("refUID", "bytes32"),
+        ("data", "bytes"),
+        ("value", "uint256"),
+        ("deadline", "uint64"),
+    ],
+)
+
+# ABI types of the agent's attestation schema: agent, space_id, proposal_id,
+# vote_choice, snapshot_sig, timestamp, run_id, confidence
+ATTESTATION_SCHEMA_TYPES = (
+    "address",
+    "string",
+    "string",
+    "uint8",
+    "string",
+    "uint256",
+    "string",
+    "uint8",
+)
+
+
+def encode_attestation_data(attestation_data: EASAttestationData) -> bytes:
+    """ABI-encode attestation data according to the EAS schema.
+
+    A module-level function so it can run in the crypto worker pool.
+
+    Args:
+        attestation_data: The attestation data to encode
+
+    Returns:
+        ABI-encoded bytes
+    """
+    return encode(
+        ATTESTATION_SCHEMA_TYPES,
+        [
+            Web3.to_checksum_address(attestation_data.agent),
+            attestation_data.space_id,
+            attestation_data.proposal_id,
+            attestation_data.vote_choice,
+            attestation_data.snapshot_sig,
+            attestation_data.timestamp,
+            attestation_data.run_id,
+            attestation_data.confidence,
+        ],
+    )
+
+
+def eas_domain_separator(chain_id: int, eas_contract_address: str) -> bytes:
+    """Return the cached EIP712Proxy domain separator for a chain and contract."""
+    return domain_separator(
+        EAS_DOMAIN_NAME,
+        EAS_DOMAIN_VERSION,
+        chain_id,
+        Web3.to_checksum_address(eas_contract_address),
+    )
 
 
 def generate_eas_delegated_signature(
-    request_data: Dict[str, Any], w3: Web3, eas_contract_address: str, private_key: str
+    request_data: Dict[str, Any],
+    w3: Web3,
+    eas_contract_address: str,
+    private_key: str,
+    chain_id: Optional[int] = None,
 ) -> bytes:
     """Generate EIP-712 signature for EAS delegated attestation.
 
@@ -32,67 +113,44 @@ def generate_eas_delegated_signature(
         w3: Web3 instance for chain interaction
         eas_contract_address: Address of the EAS contract (EIP712Proxy)
         private_key: Private key for signing
+        chain_id: Chain ID for the domain; read from ``w3`` when omitted
 
     Returns:
         65-byte signature (r: 32 bytes, s: 32 bytes, v: 1 byte)
     """
-    account = Account.from_key(private_key)
+    domain = eas_domain_separator(
+        chain_id if chain_id is not None else w3.eth.chain_id, eas_contract_address
+    )
+    return get_typed_data_signer(private_key).sign(
+        domain, EAS_ATTEST_STRUCT, request_data
+    )
+
+
+async def generate_eas_delegated_signatures(
+    requests: Sequence[Dict[str, Any]],
+    chain_id: int,
+    eas_contract_address: str,
+    private_key: str,
+) -> List[bytes]:
+    """Sign many EAS attestation requests in the crypto worker pool.
 
-    # EAS EIP-712 domain and types structure
-    # These MUST match the EIP712Proxy contract's domain
-    types = {
-        "EIP712Domain": [
-            {"name": "name", "type": "string"},
-            {"name": "version", "type": "string"},
-            {"name": "chainId", "type": "uint256"},
-            {"name": "verifyingContract", "type": "address"},
-        ],
-        "Attest": [
-            {"name": "schema", "type": "bytes32"},
-            {"name": "recipient", "type": "address"},
-            {"name": "expirationTime", "type": "uint64"},
-            {"name": "revocable", "type": "bool"},
-            {"name": "refUID", "type": "bytes32"},
-            {"name": "data", "type": "bytes"},
-            {"name": "value", "type": "uint256"},
-            {"name": "deadline", "type": "uint64"},
-        ],
-    }
-
-    # Domain MUST match EIP712Proxy's domain exactly
-    domain = {
-        "name": "EIP712Proxy",
-        "version": "1.2.0",
-        "chainId": w3.eth.chain_id,
-        "verifyingContract": Web3.to_checksum_address(eas_contract_address),
-    }
-
-    # Message data - ensure all fields are present and correctly typed
-    message = {
-        "schema": request_data["schema"],
-        "recipient": request_data["recipient"],
-        "expirationTime": request_data["expirationTime"],
-        "revocable": request_data["revocable"],
-        "refUID": request_data["refUID"],
-        "data": request_data["data"],
-        "value": request_data["value"],
-        "deadline": request_data["deadline"],
-    }
-
-    # Create EIP-712 encoded data
-    typed_data = {
-        "domain": domain,
-        "primaryType": "Attest",
-        "types": types,
-        "message": message,
-    }
-
-    # Encode and sign
-    encoded = encode_typed_data(full_message=typed_data)
-    signature = account.sign_message(encoded)
-
-    # Return raw signature bytes
-    return signature.signature
+    Args:
+        requests: Attestation request data, as for
+            ``generate_eas_delegated_signature``
+        chain_id: Chain ID for the domain
+        eas_contract_address: Address of the EAS contract (EIP712Proxy)
+        private_key: Private key for signing
+
+    Returns:
+        One 65-byte signature per request, in order
+    """
+    return await run_in_crypto_executor(
+        sign_typed_messages,
+        get_typed_data_signer(private_key).address,
+        eas_domain_separator(chain_id, eas_contract_address),
+        EAS_ATTEST_STRUCT,
+        requests,
+    )
 
 
 def parse_signature_bytes(signature_bytes: bytes) -> Dict[str, Any]:
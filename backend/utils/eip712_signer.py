@@ -0,0 +1,219 @@
+"""EIP-712 signing with precomputed type hashes and domain separators.
+
+``encode_typed_data`` re-parses the type definitions, re-hashes the type
+strings and re-hashes the domain on every signature. The structs signed by
+this agent (EAS ``Attest`` and Snapshot ``Vote``) never change, and neither
+does the domain for a given chain and contract, so:
+
+- ``TypedStruct`` computes its encoded type and type hash once;
+- ``domain_separator`` is cached per name, version, chain and contract;
+- ``TypedDataSigner`` hashes only the message struct per signature and signs
+  the digest with an account that is loaded once.
+
+Signers are kept by address. Work sent to the crypto worker pool names the
+signer by its address; worker processes load each key once when they start.
+
+Signatures are byte-identical to ``encode_typed_data`` + ``sign_message``.
+"""
+
+import threading
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from eth_abi import encode
+from eth_account import Account
+from eth_account.messages import encode_typed_data
+from eth_account.signers.local import LocalAccount
+from eth_utils import keccak
+from hexbytes import HexBytes
+from web3 import Web3
+
+from utils.crypto_executor import add_worker_initializer, run_in_crypto_executor
+
+# Constants
+EIP712_PREFIX = b"\x19\x01"
+DOMAIN_FIELDS = (
+    ("name", "string"),
+    ("version", "string"),
+    ("chainId", "uint256"),
+    ("verifyingContract", "address"),
+)
+
+
+def _encode_value(field_type: str, value: Any) -> bytes:
+    """Encode one atomic or dynamic field as its 32-byte EIP-712 word."""
+    if field_type == "string":
+        return keccak(text=value)
+    if field_type == "bytes":
+        return keccak(HexBytes(value))
+    if field_type.startswith("bytes") and isinstance(value, str):
+        value = HexBytes(value)
+    return encode([field_type], [value])
+
+
+class TypedStruct:
+    """An EIP-712 struct type with flat fields and a precomputed type hash."""
+
+    def __init__(self, primary_type: str, fields: Sequence[Tuple[str, str]]) -> None:
+        """Compute the encoded type and type hash.
+
+        Args:
+            primary_type: Struct name, e.g. ``Attest``
+            fields: (name, type) pairs in declaration order; only atomic
+                types, ``string`` and ``bytes`` are supported
+        """
+        assert fields, "A struct needs at least one field"
+
+        self.primary_type = primary_type
+        self.fields = tuple(fields)
+        self.encoded_type = (
+            f"{primary_type}({','.join(f'{t} {n}' for n, t in self.fields)})"
+        )
+        self.type_hash = keccak(text=self.encoded_type)
+
+    def types(self) -> List[Dict[str, str]]:
+        """Field definitions in the ``types`` format of ``encode_typed_data``."""
+        return [{"name": name, "type": field_type} for name, field_type in self.fields]
+
+    def hash(self, message: Dict[str, Any]) -> bytes:
+        """Return ``hashStruct(message)``."""
+        return keccak(
+            self.type_hash
+            + b"".join(
+                _encode_value(field_type, message[name])
+                for name, field_type in self.fields
+            )
+        )
+
+
+@lru_cache(maxsize=64)
+def domain_separator(
+    name: str,
+    version: str,
+    chain_id: Optional[int] = None,
+    verifying_contract: Optional[str] = None,
+) -> bytes:
+    """Return the cached domain separator; None fields are left out of the domain."""
+    values = {
+        "name": name,
+        "version": version,
+        "chainId": chain_id,
+        "verifyingContract": Web3.to_checksum_address(verifying_contract)
+        if verifying_contract
+        else None,
+    }
+    fields = [(n, t) for n, t in DOMAIN_FIELDS if values[n] is not None]
+    return TypedStruct("EIP712Domain", fields).hash(values)
+
+
+def signing_digest(
+    domain: bytes, struct: TypedStruct, message: Dict[str, Any]
+) -> bytes:
+    """Return the EIP-712 digest of ``message`` under a domain separator."""
+    return keccak(EIP712_PREFIX + domain + struct.hash(message))
+
+
+class TypedDataSigner:
+    """Signs EIP-712 messages with one account."""
+
+    def __init__(self, account: LocalAccount) -> None:
+        """Initialize the signer with an already loaded account."""
+        self.account = account
+
+    @property
+    def address(self) -> str:
+        """Checksummed address of the signing account."""
+        return self.account.address
+
+    def sign(
+        self, domain: bytes, struct: TypedStruct, message: Dict[str, Any]
+    ) -> bytes:
+        """Sign one message and return the 65-byte signature (r, s, v)."""
+        digest = signing_digest(domain, struct, message)
+        return bytes(self.account.unsafe_sign_hash(digest).signature)
+
+    def sign_many(
+        self,
+        domain: bytes,
+        struct: TypedStruct,
+        messages: Sequence[Dict[str, Any]],
+    ) -> List[bytes]:
+        """Sign several messages of the same struct and domain."""
+        return [self.sign(domain, struct, message) for message in messages]
+
+    async def sign_async(
+        self, domain: bytes, struct: TypedStruct, message: Dict[str, Any]
+    ) -> bytes:
+        """Sign one message in the crypto worker pool, off the event loop."""
+        signatures = await self.sign_many_async(domain, struct, [message])
+        return signatures[0]
+
+    async def sign_many_async(
+        self,
+        domain: bytes,
+        struct: TypedStruct,
+        messages: Sequence[Dict[str, Any]],
+    ) -> List[bytes]:
+        """Sign several messages in the crypto worker pool, off the event loop."""
+        return await run_in_crypto_executor(
+            sign_typed_messages, self.address, domain, struct, messages
+        )
+
+
+_signers: Dict[str, TypedDataSigner] = {}
+_signers_lock = threading.Lock()
+
+
+def _load_signer(private_key: bytes) -> TypedDataSigner:
+    """Derive an account and keep its signer, unless the address has one."""
+    account = Account.from_key(private_key)
+    with _signers_lock:
+        return _signers.setdefault(account.address, TypedDataSigner(account))
+
+
+def register_signer(account: LocalAccount) -> TypedDataSigner:
+    """Keep a signer for an already loaded account and share it with workers.
+
+    Returns:
+        The signer kept for the account's address
+    """
+    with _signers_lock:
+        signer = _signers.get(account.address)
+        if signer is not None:
+            return signer
+        signer = _signers[account.address] = TypedDataSigner(account)
+    add_worker_initializer(_load_signer, bytes(account.key))
+    return signer
+
+
+def get_typed_data_signer(private_key: Union[str, bytes]) -> TypedDataSigner:
+    """Return the signer for a private key, deriving the account only once."""
+    key = HexBytes(private_key)
+    with _signers_lock:
+        for signer in _signers.values():
+            if signer.account.key == key:
+                return signer
+    return register_signer(Account.from_key(key))
+
+
+def get_signer(address: str) -> TypedDataSigner:
+    """Return the signer kept for an address."""
+    signer = _signers.get(Web3.to_checksum_address(address))
+    assert signer is not None, f"No signer registered for {address}"
+    return signer
+
+
+def sign_typed_messages(
+    address: str,
+    domain: bytes,
+    struct: TypedStruct,
+    messages: Sequence[Dict[str, Any]],
+) -> List[bytes]:
+    """Sign messages with a registered signer; picklable for the crypto worker pool."""
+    return get_signer(address).sign_many(domain, struct, messages)
+
+
+def sign_full_typed_data(address: str, full_message: Dict[str, Any]) -> bytes:
+    """Sign arbitrary typed data through ``encode_typed_data``; picklable."""
+    signable = encode_typed_data(full_message=full_message)
+    return bytes(get_signer(address).account.sign_message(signable).signature)
@@ -0,0 +1,171 @@
+"""Cached gas price sampling for choosing where to send a transaction.
+
+Each sample reads ``eth_gasPrice`` and the latest block's base fee in one
+JSON-RPC batch and is reused for ``GAS_PRICE_CACHE_TTL_SECONDS``. On OP-stack
+chains the same batch asks the GasPriceOracle predeploy for the L1 data fee
+of the activity transaction, which often dominates its cost there. A sample
+prices a transaction in its chain's native token; ``GAS_TOKEN_USD_PRICES``
+converts that to USD so chains paying gas in different tokens can be compared.
+No prices are configured by default, so chains are only compared once an
+operator supplies them.
+"""
+
+import json
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Optional
+
+from web3 import Web3
+
+from config import settings
+from logging_config import setup_pearl_logger
+from utils.calldata_encoder import get_calldata_encoder
+from utils.rpc_batch import RpcBatch
+
+# Constants
+WEI_PER_TOKEN = 10**18
+# Gas used by a 0-value Safe execTransaction to the Safe itself with a single
+# owner signature, with some headroom
+ACTIVITY_TX_GAS = 70_000
+# Chains that charge an L1 data fee on top of execution gas
+OP_STACK_CHAINS = frozenset({"base", "mode"})
+GAS_PRICE_ORACLE_ADDRESS = "0x420000000000000000000000000000000000000F"
+# Stand-in for the activity transaction when pricing its L1 data: the
+# ABI-padded execTransaction calldata is mostly zero bytes; addresses and the
+# owner signature are not and barely compress
+ACTIVITY_TX_L1_DATA = bytes(400) + b"".join(Web3.keccak(bytes([i])) for i in range(4))
+
+logger = setup_pearl_logger(__name__)
+
+
+@dataclass(frozen=True)
+class GasQuote:
+    """Gas prices sampled from one chain."""
+
+    chain: str
+    gas_price_wei: int
+    base_fee_wei: Optional[int]
+    sampled_at: float
+    # L1 data fee of the activity transaction on OP-stack chains
+    l1_fee_wei: int = 0
+
+    def cost_wei(self, gas: int = ACTIVITY_TX_GAS) -> int:
+        """Cost of ``gas`` units at the sampled gas price plus the L1 fee, in wei."""
+        return gas * max(self.gas_price_wei, self.base_fee_wei or 0) + self.l1_fee_wei
+
+    def cost_usd(self, gas: int = ACTIVITY_TX_GAS) -> Optional[float]:
+        """Cost of ``gas`` units in USD, or None if the token price is unknown."""
+        token_price = gas_token_usd_price(self.chain)
+        if token_price is None:
+            return None
+        return self.cost_wei(gas) / WEI_PER_TOKEN * token_price
+
+
+def gas_token_usd_price(chain: str) -> Optional[float]:
+    """Configured USD price of the token a chain pays gas in."""
+    prices = json.loads(settings.gas_token_usd_prices or "{}")
+    price = prices.get(chain)
+    return float(price) if price is not None else None
+
+
+class GasOracle:
+    """Per-chain cache of sampled gas prices."""
+
+    def __init__(self, ttl_seconds: Optional[float] = None) -> None:
+        """Initialize an empty oracle.
+
+        Args:
+            ttl_seconds: How long a sample is reused (defaults to
+                ``settings.gas_price_cache_ttl_seconds``)
+        """
+        self.ttl_seconds = (
+            ttl_seconds
+            if ttl_seconds is not None
+            else settings.gas_price_cache_ttl_seconds
+        )
+        assert self.ttl_seconds >= 0, "ttl_seconds must not be negative"
+
+        self._quotes: Dict[str, GasQuote] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_cached(self, chain: str) -> Optional[GasQuote]:
+        """Return the chain's sample if it is still fresh, without any I/O."""
+        with self._lock:
+            quote = self._quotes.get(chain)
+            if quote is None or time.monotonic() - quote.sampled_at >= self.ttl_seconds:
+                return None
+            self.hits += 1
+            return quote
+
+    def get_quote(self, chain: str, w3: Web3) -> GasQuote:
+        """Return a fresh sample, reading gas price, base fee and L1 fee if needed.
+
+        Blocks on the node when the cached sample expired; call it from the
+        chain I/O executor.
+        """
+        quote = self.get_cached(chain)
+        if quote is not None:
+            return quote
+
+        batch = RpcBatch(w3)
+        gas_price_index = batch.gas_price()
+        block_index = batch.get_block("latest")
+        l1_fee_index = None
+        if chain in OP_STACK_CHAINS:
+            l1_fee_index = batch.call_function(
+                GAS_PRICE_ORACLE_ADDRESS,
+                get_calldata_encoder("gas_price_oracle", "getL1Fee"),
+                ACTIVITY_TX_L1_DATA,
+            )
+        results = batch.execute()
+
+        quote = GasQuote(
+            chain=chain,
+            gas_price_wei=results[gas_price_index],
+            base_fee_wei=results[block_index].get("baseFeePerGas"),
+            sampled_at=time.monotonic(),
+            l1_fee_wei=results[l1_fee_index] if l1_fee_index is not None else 0,
+        )
+        with self._lock:
+            self._quotes[chain] = quote
+            self.misses += 1
+        logger.debug(
+            f"Sampled gas price (chain={chain}, gas_price_wei={quote.gas_price_wei}, "
+            f"base_fee_wei={quote.base_fee_wei}, l1_fee_wei={quote.l1_fee_wei})"
+        )
+        return quote
+
+    def invalidate(self, chain: str) -> None:
+        """Drop a chain's sample."""
+        with self._lock:
+            self._quotes.pop(chain, None)
+
+    def clear(self) -> None:
+        """Drop all samples."""
+        with self._lock:
+            self._quotes.clear()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Return the cached samples and hit/miss counters."""
+        with self._lock:
+            return {
+                "quotes": {chain: asdict(q) for chain, q in self._quotes.items()},
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+_gas_oracle: Optional[GasOracle] = None
+_gas_oracle_lock = threading.Lock()
+
+
+def get_gas_oracle() -> GasOracle:
+    """Return the process-wide gas oracle."""
+    global _gas_oracle
+    with _gas_oracle_lock:
+        if _gas_oracle is None:
+            _gas_oracle = GasOracle()
+        return _gas_oracle
@@ -0,0 +1,272 @@
+"""JSON-RPC batching and Multicall3 aggregation for chain reads.
+
+Independent ``eth_*`` reads (chain ID, latest block, nonces, contract calls)
+made one after another cost one HTTP round trip each. An ``RpcBatch``
+collects them and sends them to the node as a single JSON-RPC batch, then
+formats each result. Contract reads can additionally be folded into one
+``eth_call`` to the Multicall3 contract, which is deployed at the same
+address on every supported chain.
+
+Usage::
+
+    batch = rpc_batch("base")
+    block_number = batch.block_number()
+    count = batch.call_function(tracker, encoder, multisig)
+    results = batch.execute()
+    results[block_number], results[count]
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from eth_utils import to_int
+from hexbytes import HexBytes
+from web3 import Web3
+from web3.datastructures import AttributeDict
+
+from logging_config import setup_pearl_logger
+from utils.calldata_encoder import CalldataEncoder, get_calldata_encoder
+
+# Constants
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+BLOCK_QUANTITY_FIELDS = (
+    "number",
+    "timestamp",
+    "gasLimit",
+    "gasUsed",
+    "baseFeePerGas",
+    "size",
+)
+
+logger = setup_pearl_logger(__name__)
+
+
+class RpcBatchError(Exception):
+    """A JSON-RPC batch, or one of the calls in it, returned an error."""
+
+
+@dataclass
+class ContractCall:
+    """A read-only contract call for Multicall3 aggregation."""
+
+    target: str
+    encoder: CalldataEncoder
+    args: Tuple[Any, ...] = ()
+    # When True a reverting call yields None instead of failing the batch
+    allow_failure: bool = False
+
+
+def _to_quantity(value: Any) -> int:
+    return to_int(hexstr=value)
+
+
+def _format_block(raw: Optional[Dict[str, Any]]) -> Optional[AttributeDict]:
+    """Convert the quantity fields of a raw block to ints."""
+    if raw is None:
+        return None
+    block = dict(raw)
+    for key in BLOCK_QUANTITY_FIELDS:
+        if isinstance(block.get(key), str):
+            block[key] = to_int(hexstr=block[key])
+    return AttributeDict(block)
+
+
+def _unwrap(values: Tuple[Any, ...]) -> Any:
+    """Return a single output value by itself, several as a tuple."""
+    return values[0] if len(values) == 1 else values
+
+
+class RpcBatch:
+    """Collects JSON-RPC reads and sends them in one HTTP round trip.
+
+    Each ``add``-style method returns the index of its result in the list
+    returned by ``execute``. A batch is sent once and is not reusable.
+    """
+
+    def __init__(self, w3: Web3) -> None:
+        """Initialize an empty batch for the node behind ``w3``."""
+        self.w3 = w3
+        self._requests: List[Tuple[str, List[Any]]] = []
+        self._formatters: List[Callable[[Any], Any]] = []
+        self._executed = False
+
+    def __len__(self) -> int:
+        """Number of JSON-RPC calls in the batch."""
+        return len(self._requests)
+
+    def add(
+        self,
+        method: str,
+        params: List[Any],
+        formatter: Callable[[Any], Any] = lambda result: result,
+    ) -> int:
+        """Add a raw JSON-RPC call.
+
+        Args:
+            method: JSON-RPC method, e.g. ``eth_getBalance``
+            params: Method parameters, already in JSON-RPC form
+            formatter: Converts the raw result
+
+        Returns:
+            Index of the formatted result
+        """
+        assert not self._executed, "RpcBatch was already executed"
+        self._requests.append((method, params))
+        self._formatters.append(formatter)
+        return len(self._requests) - 1
+
+    def chain_id(self) -> int:
+        """Add an ``eth_chainId`` read."""
+        return self.add("eth_chainId", [], _to_quantity)
+
+    def block_number(self) -> int:
+        """Add an ``eth_blockNumber`` read."""
+        return self.add("eth_blockNumber", [], _to_quantity)
+
+    def gas_price(self) -> int:
+        """Add an ``eth_gasPrice`` read (in wei)."""
+        return self.add("eth_gasPrice", [], _to_quantity)
+
+    def get_block(self, block_identifier: str = "latest") -> int:
+        """Add a block read (without transactions)."""
+        return self.add(
+            "eth_getBlockByNumber", [block_identifier, False], _format_block
+        )
+
+    def get_transaction_count(
+        self, address: str, block_identifier: str = "pending"
+    ) -> int:
+        """Add an account nonce read."""
+        return self.add(
+            "eth_getTransactionCount",
+            [Web3.to_checksum_address(address), block_identifier],
+            _to_quantity,
+        )
+
+    def get_balance(self, address: str, block_identifier: str = "latest") -> int:
+        """Add an account balance read (in wei)."""
+        return self.add(
+            "eth_getBalance",
+            [Web3.to_checksum_address(address), block_identifier],
+            _to_quantity,
+        )
+
+    def call(
+        self,
+        to: str,
+        data: bytes,
+        block_identifier: str = "latest",
+        formatter: Callable[[bytes], Any] = lambda result: result,
+    ) -> int:
+        """Add an ``eth_call``; ``formatter`` receives the return data as bytes."""
+        return self.add(
+            "eth_call",
+            [
+                {"to": Web3.to_checksum_address(to), "data": Web3.to_hex(data)},
+                block_identifier,
+            ],
+            lambda result: formatter(bytes(HexBytes(result))),
+        )
+
+    def call_function(
+        self,
+        target: str,
+        encoder: CalldataEncoder,
+        *args: Any,
+        block_identifier: str = "latest",
+    ) -> int:
+        """Add a contract read whose result is decoded with ``encoder``.
+
+        Functions with a single output yield that value, others a tuple.
+        """
+        return self.call(
+            target,
+            encoder.encode(*args),
+            block_identifier,
+            lambda data: _unwrap(encoder.decode(data)),
+        )
+
+    def multicall(
+        self, calls: Sequence[ContractCall], block_identifier: str = "latest"
+    ) -> int:
+        """Add several contract reads as one ``eth_call`` to Multicall3.
+
+        The result is a list with one decoded value per call, in order;
+        calls made with ``allow_failure`` that reverted yield None.
+        """
+        assert calls, "At least one call is required"
+        aggregate3 = get_calldata_encoder("multicall3", "aggregate3")
+        payload = [
+            (
+                Web3.to_checksum_address(call.target),
+                call.allow_failure,
+                call.encoder.encode(*call.args),
+            )
+            for call in calls
+        ]
+
+        def decode_results(data: bytes) -> List[Any]:
+            (results,) = aggregate3.decode(data)
+            decoded = []
+            for call, (success, return_data) in zip(calls, results):
+                if not success:
+                    decoded.append(None)
+                    continue
+                decoded.append(_unwrap(call.encoder.decode(return_data)))
+            return decoded
+
+        return self.call(
+            MULTICALL3_ADDRESS,
+            aggregate3.encode(payload),
+            block_identifier,
+            decode_results,
+        )
+
+    def execute(self) -> List[Any]:
+        """Send the batch (blocking) and return the formatted results in order.
+
+        Raises:
+            RpcBatchError: If the node rejects the batch or any call in it fails
+        """
+        assert not self._executed, "RpcBatch was already executed"
+        self._executed = True
+        if not self._requests:
+            return []
+
+        responses = self.w3.provider.make_batch_request(self._requests)
+        _record_batch(len(self._requests))
+        if not isinstance(responses, list):
+            raise RpcBatchError(f"JSON-RPC batch rejected: {responses.get('error')}")
+        if len(responses) != len(self._requests):
+            raise RpcBatchError(
+                f"JSON-RPC batch returned {len(responses)} responses "
+                f"for {len(self._requests)} calls"
+            )
+
+        results = []
+        for (method, _), formatter, response in zip(
+            self._requests, self._formatters, responses
+        ):
+            if "error" in response:
+                raise RpcBatchError(f"{method} failed: {response['error']}")
+            results.append(formatter(response.get("result")))
+
+        logger.debug(f"Executed JSON-RPC batch (calls={len(self._requests)})")
+        return results
+
+
+_stats_lock = threading.Lock()
+_stats = {"batches": 0, "calls": 0}
+
+
+def _record_batch(calls: int) -> None:
+    with _stats_lock:
+        _stats["batches"] += 1
+        _stats["calls"] += calls
+
+
+def get_rpc_batch_metrics() -> Dict[str, int]:
+    """Return how many batches were sent and how many calls they carried."""
+    with _stats_lock:
+        return dict(_stats)
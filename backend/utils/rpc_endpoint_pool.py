@@ -0,0 +1,445 @@
+"""Latency-scored RPC endpoint selection with failover and hedged reads.
+
+A chain can list extra RPC URLs in ``RPC_FALLBACK_URLS`` next to its primary
+one. Every request made through a chain's Web3 instance then goes through a
+``FailoverHTTPProvider``, which:
+
+- scores each endpoint continuously from an exponentially weighted moving
+  average of its latency and error rate, and sends requests to the fastest
+  healthy one;
+- fails over to the next endpoint when a request raises (connection errors,
+  timeouts, HTTP 429/5xx), and puts an endpoint that keeps failing or was
+  rate limited into a cooldown;
+- hedges reads: if the chosen endpoint has not answered a read-only call
+  within ``RPC_HEDGE_DELAY_MS``, the same call is sent to the runner-up and
+  whichever answers first wins.
+
+Writes such as ``eth_sendRawTransaction`` are never hedged, only failed over.
+Nor are reads of pending state (nonces, gas estimates, ``"pending"`` block
+tags), which differ between nodes whose mempools have not caught up. For
+``WRITE_PIN_SECONDS`` after a write, every request goes to the endpoint that
+accepted it first, so the follow-up nonce and receipt reads see the write.
+Chains with a single URL keep using a plain ``HTTPProvider``. To try it
+locally, run two anvil instances and set::
+
+    BASE_RPC_URL=http://127.0.0.1:8545
+    RPC_FALLBACK_URLS='{"base": ["http://127.0.0.1:8546"]}'
+"""
+
+import json
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from web3 import HTTPProvider
+from web3.providers.base import JSONBaseProvider
+from web3.types import RPCEndpoint, RPCResponse
+
+from config import settings
+from logging_config import setup_pearl_logger
+from utils.rpc_rate_limiter import get_rpc_rate_limiter
+
+# Constants
+REQUEST_TIMEOUT_SECONDS = 15
+LATENCY_EWMA_ALPHA = 0.2
+ERROR_RATE_EWMA_ALPHA = 0.2
+# An endpoint whose every call fails scores as this many times slower
+ERROR_PENALTY_FACTOR = 10.0
+# Assumed latency of an endpoint that has not answered yet
+UNMEASURED_LATENCY_SECONDS = 0.5
+FAILURES_BEFORE_COOLDOWN = 2
+MAX_COOLDOWN_SECONDS = 300.0
+HEDGE_WORKERS = 8
+# How long requests stick to the endpoint that accepted the last write
+WRITE_PIN_SECONDS = 30.0
+
+# Methods that submit transactions; never hedged, and they pin later reads
+WRITE_METHODS = frozenset({"eth_sendRawTransaction", "eth_sendTransaction"})
+
+# Read-only methods that may be sent to two endpoints at once, unless they
+# read the "pending" block
+HEDGEABLE_METHODS = frozenset(
+    {
+        "eth_blockNumber",
+        "eth_call",
+        "eth_chainId",
+        "eth_feeHistory",
+        "eth_gasPrice",
+        "eth_getBalance",
+        "eth_getBlockByHash",
+        "eth_getBlockByNumber",
+        "eth_getCode",
+        "eth_getLogs",
+        "eth_getStorageAt",
+        "eth_getTransactionByHash",
+        "eth_getTransactionReceipt",
+        "eth_maxPriorityFeePerGas",
+        "net_version",
+        "web3_clientVersion",
+    }
+)
+
+logger = setup_pearl_logger(__name__)
+
+_hedge_executor = ThreadPoolExecutor(
+    max_workers=HEDGE_WORKERS, thread_name_prefix="rpc-hedge"
+)
+
+
+@dataclass
+class EndpointStats:
+    """Running health and latency statistics of one RPC endpoint."""
+
+    url: str
+    latency_ewma: Optional[float] = None
+    error_rate: float = 0.0
+    consecutive_failures: int = 0
+    cooldown_until: float = 0.0
+    requests: int = 0
+    failures: int = 0
+    hedges: int = 0
+    hedges_won: int = 0
+
+    def score(self) -> float:
+        """Expected cost of a call in seconds; lower is better."""
+        latency = (
+            self.latency_ewma
+            if self.latency_ewma is not None
+            else UNMEASURED_LATENCY_SECONDS
+        )
+        return latency * (1.0 + ERROR_PENALTY_FACTOR * self.error_rate)
+
+
+class RpcEndpointPool:
+    """Scores the RPC endpoints of one chain and ranks them for each request."""
+
+    def __init__(
+        self,
+        chain: str,
+        urls: List[str],
+        hedge_delay_seconds: Optional[float] = None,
+        cooldown_seconds: Optional[float] = None,
+    ) -> None:
+        """Initialize the pool.
+
+        Args:
+            chain: Chain the endpoints serve
+            urls: RPC URLs, primary first; ties in score go to earlier URLs
+            hedge_delay_seconds: Wait before hedging a read (0 disables
+                hedging; defaults to ``settings.rpc_hedge_delay_ms``)
+            cooldown_seconds: First cooldown of a failing endpoint; doubles
+                per repeat (defaults to ``settings.rpc_endpoint_cooldown_seconds``)
+        """
+        assert urls, "At least one RPC URL is required"
+
+        self.chain = chain
+        self.urls = list(dict.fromkeys(urls))
+        self.hedge_delay_seconds = (
+            hedge_delay_seconds
+            if hedge_delay_seconds is not None
+            else settings.rpc_hedge_delay_ms / 1000.0
+        )
+        self.cooldown_seconds = (
+            cooldown_seconds
+            if cooldown_seconds is not None
+            else settings.rpc_endpoint_cooldown_seconds
+        )
+        assert self.hedge_delay_seconds >= 0, "hedge_delay_seconds must be >= 0"
+        assert self.cooldown_seconds > 0, "cooldown_seconds must be positive"
+
+        self._stats = {url: EndpointStats(url) for url in self.urls}
+        self._pinned_url: Optional[str] = None
+        self._pinned_until = 0.0
+        self._lock = threading.Lock()
+
+    def ranked(self) -> List[str]:
+        """Return the URLs in the order requests should try them.
+
+        Healthy endpoints come first, fastest first. Endpoints in cooldown, or
+        paused by the rate limiter after a 429, follow as a last resort,
+        soonest available first. An endpoint pinned by a recent write goes
+        before all of them.
+        """
+        now = time.monotonic()
+        rate_limiter = get_rpc_rate_limiter()
+        with self._lock:
+            stats = [self._stats[url] for url in self.urls]
+            healthy = [
+                s
+                for s in stats
+                if s.cooldown_until <= now and not rate_limiter.is_paused(s.url)
+            ]
+            resting = [s for s in stats if s not in healthy]
+            healthy.sort(key=lambda s: (s.score(), self.urls.index(s.url)))
+            resting.sort(key=lambda s: s.cooldown_until)
+            urls = [s.url for s in healthy + resting]
+            if self._pinned_until > now and self._pinned_url in urls:
+                urls.remove(self._pinned_url)
+                urls.insert(0, self._pinned_url)
+            return urls
+
+    def pin(self, url: str) -> None:
+        """Send requests to ``url`` first for the next ``WRITE_PIN_SECONDS``."""
+        with self._lock:
+            self._pinned_url = url
+            self._pinned_until = time.monotonic() + WRITE_PIN_SECONDS
+
+    def is_pinned(self) -> bool:
+        """Whether a recent write pins requests to one endpoint."""
+        with self._lock:
+            return self._pinned_until > time.monotonic()
+
+    def record_success(self, url: str, latency: float) -> None:
+        """Fold a successful call's latency into the endpoint's score."""
+        with self._lock:
+            stats = self._stats[url]
+            stats.requests += 1
+            stats.latency_ewma = (
+                latency
+                if stats.latency_ewma is None
+                else LATENCY_EWMA_ALPHA * latency
+                + (1 - LATENCY_EWMA_ALPHA) * stats.latency_ewma
+            )
+            stats.error_rate *= 1 - ERROR_RATE_EWMA_ALPHA
+            stats.consecutive_failures = 0
+            stats.cooldown_until = 0.0
+        get_rpc_rate_limiter().report_success(url)
+
+    def record_failure(self, url: str, error: BaseException) -> None:
+        """Count a failed call and start a cooldown if the endpoint keeps failing."""
+        rate_limited = get_rpc_rate_limiter().observe_error(url, error)
+        with self._lock:
+            stats = self._stats[url]
+            stats.requests += 1
+            stats.failures += 1
+            stats.error_rate = (
+                ERROR_RATE_EWMA_ALPHA + (1 - ERROR_RATE_EWMA_ALPHA) * stats.error_rate
+            )
+            stats.consecutive_failures += 1
+            cooldown = 0.0
+            if rate_limited or stats.consecutive_failures >= FAILURES_BEFORE_COOLDOWN:
+                repeats = max(0, stats.consecutive_failures - FAILURES_BEFORE_COOLDOWN)
+                cooldown = min(self.cooldown_seconds * 2**repeats, MAX_COOLDOWN_SECONDS)
+                stats.cooldown_until = time.monotonic() + cooldown
+
+        logger.warning(
+            f"RPC endpoint call failed (chain={self.chain}, url={url}, "
+            f"cooldown_seconds={cooldown:.0f}, error={str(error)})"
+        )
+
+    def record_hedge(self, url: str, won: bool) -> None:
+        """Count a hedged read sent to ``url`` and whether it answered first."""
+        with self._lock:
+            stats = self._stats[url]
+            stats.hedges += 1
+            stats.hedges_won += int(won)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Return latency, error rate, cooldown and hedge counters per URL."""
+        now = time.monotonic()
+        with self._lock:
+            return {
+                s.url: {
+                    "latency_ms": round(s.latency_ewma * 1000, 1)
+                    if s.latency_ewma is not None
+                    else None,
+                    "error_rate": round(s.error_rate, 3),
+                    "cooldown_seconds": round(max(s.cooldown_until - now, 0.0), 1),
+                    "requests": s.requests,
+                    "failures": s.failures,
+                    "hedges": s.hedges,
+                    "hedges_won": s.hedges_won,
+                }
+                for s in self._stats.values()
+            }
+
+
+class FailoverHTTPProvider(JSONBaseProvider):
+    """Web3 provider that spreads requests over an RpcEndpointPool."""
+
+    def __init__(
+        self,
+        pool: RpcEndpointPool,
+        providers: Optional[Dict[str, JSONBaseProvider]] = None,
+    ) -> None:
+        """Create one HTTP provider per pool URL.
+
+        Args:
+            pool: Endpoint pool that ranks the URLs
+            providers: Providers by URL, replacing the default HTTP ones
+        """
+        super().__init__()
+        self.pool = pool
+        self.providers = providers or {
+            url: HTTPProvider(url, request_kwargs={"timeout": REQUEST_TIMEOUT_SECONDS})
+            for url in pool.urls
+        }
+
+    def make_request(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        """Send a request to the best endpoint, hedging reads and failing over."""
+        ranked = self.pool.ranked()
+
+        def send(provider: JSONBaseProvider) -> RPCResponse:
+            return provider.make_request(method, params)
+
+        if method in WRITE_METHODS:
+            return self._failover(ranked, send, pin=True)
+        if (
+            _is_hedgeable(method, params)
+            and self.pool.hedge_delay_seconds > 0
+            and len(ranked) > 1
+            and not self.pool.is_pinned()
+        ):
+            return self._hedged(ranked, send)
+        return self._failover(ranked, send)
+
+    def make_batch_request(self, batch_requests: List[Any]) -> Any:
+        """Send a whole JSON-RPC batch to one endpoint, failing over on error."""
+        return self._failover(
+            self.pool.ranked(),
+            lambda provider: provider.make_batch_request(batch_requests),
+        )
+
+    def is_connected(self, show_traceback: bool = False) -> bool:
+        """Whether any endpoint of the pool is reachable."""
+        return any(
+            self.providers[url].is_connected(show_traceback)
+            for url in self.pool.ranked()
+        )
+
+    def _send(self, url: str, send: Callable[[JSONBaseProvider], Any]) -> Any:
+        """Call one endpoint and record the outcome in the pool."""
+        started = time.monotonic()
+        try:
+            response = send(self.providers[url])
+        except Exception as e:
+            self.pool.record_failure(url, e)
+            raise
+        self.pool.record_success(url, time.monotonic() - started)
+        return response
+
+    def _failover(
+        self,
+        ranked: List[str],
+        send: Callable[[JSONBaseProvider], Any],
+        pin: bool = False,
+    ) -> Any:
+        """Try the endpoints in order until one answers.
+
+        Args:
+            ranked: URLs to try, in order
+            send: Sends the request to one provider
+            pin: Pin later requests to the endpoint that answers
+        """
+        last_error: Optional[BaseException] = None
+        for url in ranked:
+            try:
+                response = self._send(url, send)
+            except Exception as e:
+                last_error = e
+                continue
+            if pin:
+                self.pool.pin(url)
+            return response
+        assert last_error is not None
+        raise last_error
+
+    def _hedged(
+        self, ranked: List[str], send: Callable[[JSONBaseProvider], Any]
+    ) -> Any:
+        """Send a read to the best endpoint and to the runner-up if it is slow."""
+        primary, backup = ranked[0], ranked[1]
+        first = _hedge_executor.submit(self._send, primary, send)
+        done, _ = wait([first], timeout=self.pool.hedge_delay_seconds)
+        if done:
+            if first.exception() is None:
+                return first.result()
+            return self._failover(ranked[1:], send)
+
+        second = _hedge_executor.submit(self._send, backup, send)
+        pending = {first, second}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    self.pool.record_hedge(backup, won=future is second)
+                    return future.result()
+
+        self.pool.record_hedge(backup, won=False)
+        if len(ranked) > 2:
+            return self._failover(ranked[2:], send)
+        raise _first_error(first, second)
+
+
+def _is_hedgeable(method: str, params: Any) -> bool:
+    """Whether a call is a read whose answer does not depend on the mempool."""
+    if method not in HEDGEABLE_METHODS:
+        return False
+    return not (isinstance(params, (list, tuple)) and "pending" in params)
+
+
+def _first_error(*futures: Future) -> BaseException:
+    """Return the exception of the first failed future."""
+    error = next(f.exception() for f in futures if f.exception() is not None)
+    assert error is not None
+    return error
+
+
+_pools: Dict[str, RpcEndpointPool] = {}
+_pools_lock = threading.Lock()
+
+
+def fallback_urls(chain: str) -> List[str]:
+    """Extra RPC URLs configured for a chain in ``RPC_FALLBACK_URLS``."""
+    urls = json.loads(settings.rpc_fallback_urls or "{}").get(chain, [])
+    assert isinstance(urls, list), "RPC_FALLBACK_URLS must map chains to URL lists"
+    return urls
+
+
+def get_rpc_endpoint_pool(chain: str, primary_url: str) -> RpcEndpointPool:
+    """Return the process-wide endpoint pool for a chain and primary URL."""
+    key = f"{chain}|{primary_url}"
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = RpcEndpointPool(chain, [primary_url, *fallback_urls(chain)])
+            _pools[key] = pool
+        return pool
+
+
+def build_provider(chain: str, primary_url: str) -> JSONBaseProvider:
+    """Build the Web3 provider for a chain, failing over if it has several URLs."""
+    if not fallback_urls(chain):
+        return HTTPProvider(primary_url)
+    return FailoverHTTPProvider(get_rpc_endpoint_pool(chain, primary_url))
+
+
+def use_failover(client: Any, chain: str, primary_url: str) -> Any:
+    """Route an EthereumClient's Web3 instances through the chain's pool.
+
+    The few raw JSON-RPC posts safe-eth-py makes on its own HTTP session
+    (batched tracing and bulk reads) still go to the primary URL.
+
+    Returns:
+        The same client, for use in registry factories
+    """
+    if fallback_urls(chain):
+        pool = get_rpc_endpoint_pool(chain, primary_url)
+        client.w3.provider = FailoverHTTPProvider(pool)
+        client.slow_w3.provider = FailoverHTTPProvider(pool)
+    return client
+
+
+def get_rpc_endpoint_metrics() -> Dict[str, Any]:
+    """Return per-endpoint statistics of every chain with several URLs."""
+    with _pools_lock:
+        pools = list(_pools.values())
+    return {pool.chain: pool.get_metrics() for pool in pools}
+
+
+def clear_rpc_endpoint_pools() -> None:
+    """Forget all endpoint pools and their statistics."""
+    with _pools_lock:
+        _pools.clear()
@@ -0,0 +1,265 @@
+"""Per-endpoint token-bucket rate limiting for RPC calls.
+
+Each RPC URL gets its own bucket. Rates are configured by URL substring in
+``RPC_RATE_LIMITS`` (requests per second, JSON); URLs that match no entry are
+not limited. A bucket holds up to ``RPC_RATE_LIMIT_BURST`` tokens, so short
+bursts pass without delay and sustained traffic is spread out at the
+configured rate.
+
+When an endpoint answers with HTTP 429 the bucket is drained and paused for
+the server's Retry-After, or for an exponentially growing backoff when none is
+given. The limiter is shared process-wide and is safe to use from the event
+loop (``acquire``) and from chain I/O threads (``acquire_blocking``).
+"""
+
+import asyncio
+import json
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from config import settings
+from logging_config import setup_pearl_logger
+
+# Constants
+MAX_RATE_LIMIT_BACKOFF_SECONDS = 60.0
+
+logger = setup_pearl_logger(__name__)
+
+
+class TokenBucket:
+    """Token bucket for a single RPC endpoint.
+
+    Callers reserve a token and wait for the returned delay. The token count
+    goes negative while callers are queued, so concurrent callers are spaced
+    out instead of all waking at once.
+    """
+
+    def __init__(self, rate: float, burst: int) -> None:
+        """Initialize a full bucket.
+
+        Args:
+            rate: Tokens added per second
+            burst: Maximum tokens the bucket holds
+        """
+        assert rate > 0, "rate must be positive"
+        assert burst >= 1, "burst must be at least 1"
+
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated_at = time.monotonic()
+        self.paused_until = 0.0
+        self.consecutive_rate_limits = 0
+
+    def _refill(self, now: float) -> None:
+        """Add the tokens earned since the last update."""
+        self.tokens = min(
+            float(self.burst), self.tokens + (now - self.updated_at) * self.rate
+        )
+        self.updated_at = now
+
+    def reserve(self, now: float) -> float:
+        """Take a token and return how long the caller must wait before using it."""
+        self._refill(now)
+        self.tokens -= 1
+        wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        return max(wait, self.paused_until - now)
+
+    def try_take(self, now: float) -> bool:
+        """Take a token only if one is available right now."""
+        self._refill(now)
+        if self.tokens < 1 or self.paused_until > now:
+            return False
+        self.tokens -= 1
+        return True
+
+    def pause(self, now: float, seconds: float) -> None:
+        """Drain the bucket and stop handing out tokens for ``seconds``."""
+        self._refill(now)
+        self.tokens = min(self.tokens, 0.0)
+        self.paused_until = max(self.paused_until, now + seconds)
+
+
+class RpcRateLimiter:
+    """Shared registry of token buckets keyed by RPC URL."""
+
+    def __init__(
+        self,
+        limits: Optional[Dict[str, float]] = None,
+        burst: Optional[int] = None,
+        backoff_seconds: Optional[float] = None,
+    ) -> None:
+        """Initialize the limiter.
+
+        Args:
+            limits: Requests per second by URL substring (defaults to
+                ``settings.rpc_rate_limits``)
+            burst: Bucket capacity (defaults to ``settings.rpc_rate_limit_burst``)
+            backoff_seconds: First pause after a 429 without Retry-After
+        """
+        self.limits = (
+            limits if limits is not None else json.loads(settings.rpc_rate_limits)
+        )
+        self.burst = burst or settings.rpc_rate_limit_burst
+        self.backoff_seconds = (
+            backoff_seconds
+            if backoff_seconds is not None
+            else settings.rpc_rate_limit_backoff_seconds
+        )
+
+        assert isinstance(self.limits, dict), "limits must map URL substrings to rates"
+        assert self.burst >= 1, "burst must be at least 1"
+
+        self._buckets: Dict[str, Optional[TokenBucket]] = {}
+        self._stats: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, url: str) -> Optional[TokenBucket]:
+        """Return the bucket for a URL, or None if the URL is not limited."""
+        if url not in self._buckets:
+            rate = next(
+                (float(r) for pattern, r in self.limits.items() if pattern in url),
+                None,
+            )
+            self._buckets[url] = TokenBucket(rate, self.burst) if rate else None
+            self._stats[url] = {"throttled": 0, "throttled_seconds": 0.0, "429s": 0}
+        return self._buckets[url]
+
+    def reserve(self, url: str) -> float:
+        """Take a token for a call to ``url`` and return the required delay."""
+        with self._lock:
+            bucket = self._bucket(url)
+            if bucket is None:
+                return 0.0
+            wait = bucket.reserve(time.monotonic())
+            if wait > 0:
+                self._stats[url]["throttled"] += 1
+                self._stats[url]["throttled_seconds"] += wait
+            return wait
+
+    async def acquire(self, url: str) -> None:
+        """Wait on the event loop until a call to ``url`` may be made."""
+        wait = self.reserve(url)
+        if wait > 0:
+            logger.debug(f"Throttling RPC call (url={url}, wait_seconds={wait:.2f})")
+            await asyncio.sleep(wait)
+
+    def acquire_blocking(self, url: str) -> None:
+        """Block the current thread until a call to ``url`` may be made.
+
+        Only call this from chain I/O threads, never from the event loop.
+        """
+        wait = self.reserve(url)
+        if wait > 0:
+            logger.debug(f"Throttling RPC call (url={url}, wait_seconds={wait:.2f})")
+            time.sleep(wait)
+
+    def try_acquire(self, url: str) -> bool:
+        """Take a token for ``url`` without waiting; False if none is available."""
+        with self._lock:
+            bucket = self._bucket(url)
+            return bucket is None or bucket.try_take(time.monotonic())
+
+    def is_paused(self, url: str) -> bool:
+        """Whether ``url`` is paused after answering HTTP 429."""
+        with self._lock:
+            bucket = self._buckets.get(url)
+            return bucket is not None and bucket.paused_until > time.monotonic()
+
+    def report_rate_limited(
+        self, url: str, retry_after: Optional[float] = None
+    ) -> None:
+        """Pause an endpoint after it answered HTTP 429.
+
+        Args:
+            url: RPC URL that was rate limited
+            retry_after: Seconds from the Retry-After header, if present
+        """
+        with self._lock:
+            bucket = self._bucket(url)
+            self._stats[url]["429s"] += 1
+            if bucket is None:
+                # Unconfigured endpoints get a bucket once they push back
+                bucket = TokenBucket(1.0, self.burst)
+                self._buckets[url] = bucket
+            bucket.consecutive_rate_limits += 1
+            pause = retry_after or min(
+                self.backoff_seconds * 2 ** (bucket.consecutive_rate_limits - 1),
+                MAX_RATE_LIMIT_BACKOFF_SECONDS,
+            )
+            bucket.pause(time.monotonic(), pause)
+
+        logger.warning(
+            f"RPC endpoint rate limited (url={url}, pause_seconds={pause:.1f}, "
+            f"consecutive={bucket.consecutive_rate_limits})"
+        )
+
+    def report_success(self, url: str) -> None:
+        """Reset the 429 backoff for an endpoint after a successful call."""
+        with self._lock:
+            bucket = self._buckets.get(url)
+            if bucket is not None:
+                bucket.consecutive_rate_limits = 0
+
+    def observe_error(self, url: str, error: BaseException) -> bool:
+        """Report ``error`` as rate limiting if it is an HTTP 429.
+
+        Returns:
+            True if the error was a rate limit response
+        """
+        if not is_rate_limit_error(error):
+            return False
+        self.report_rate_limited(url, _retry_after(error))
+        return True
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Return per-endpoint rate, pause and throttling counters."""
+        now = time.monotonic()
+        metrics: Dict[str, Any] = {}
+        with self._lock:
+            for url, stats in self._stats.items():
+                bucket = self._buckets.get(url)
+                metrics[url] = {
+                    "rate_per_second": bucket.rate if bucket else None,
+                    "burst": bucket.burst if bucket else None,
+                    "paused_seconds": round(max(bucket.paused_until - now, 0.0), 1)
+                    if bucket
+                    else 0.0,
+                    "throttled": int(stats["throttled"]),
+                    "throttled_seconds": round(stats["throttled_seconds"], 1),
+                    "rate_limited": int(stats["429s"]),
+                }
+        return metrics
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """Whether an exception from web3, requests or safe-eth-py is an HTTP 429."""
+    response = getattr(error, "response", None)
+    if getattr(response, "status_code", None) == 429:
+        return True
+    message = str(error)
+    return "429" in message and "Too Many Requests" in message
+
+
+def _retry_after(error: BaseException) -> Optional[float]:
+    """Read the Retry-After header (in seconds) from an HTTP error, if any."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
+
+
+_rate_limiter: Optional[RpcRateLimiter] = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rpc_rate_limiter() -> RpcRateLimiter:
+    """Return the process-wide RPC rate limiter."""
+    global _rate_limiter
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            _rate_limiter = RpcRateLimiter()
+        return _rate_limiter
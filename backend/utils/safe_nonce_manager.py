@@ -0,0 +1,190 @@
+"""Local nonce allocation for pipelined Safe transactions.
+
+Reading the Safe nonce from chain for every transaction means the next
+transaction can only be built once the previous one is mined. The nonce
+manager hands out Safe nonces locally per (chain, Safe) and tracks which
+ones are in flight, so several Safe transactions can be proposed and
+broadcast back to back while their receipts are awaited concurrently.
+
+The chain stays the source of truth: the nonce is read from chain whenever
+nothing of ours is in flight, and after a transaction reverts or its
+outcome is unknown. Nonces reserved but never broadcast are handed back.
+While other transactions are still in flight, a nonce that is given back or
+fails is not reused; the chain is re-read once they have all settled, so a
+nonce is never handed out twice.
+"""
+
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from logging_config import setup_pearl_logger
+
+logger = setup_pearl_logger(__name__)
+
+
+@dataclass
+class NonceReservation:
+    """A Safe nonce handed out for one transaction."""
+
+    chain: str
+    safe_address: str
+    nonce: int
+    # True when an earlier nonce of this Safe is still unconfirmed, so the
+    # transaction cannot be simulated or gas-estimated against chain state
+    pipelined: bool
+
+
+@dataclass
+class _SafeNonceState:
+    next_nonce: Optional[int] = None
+    # Safe nonce -> broadcast transaction hash (None until broadcast)
+    in_flight: Dict[int, Optional[str]] = field(default_factory=dict)
+    send_lock: threading.Lock = field(default_factory=threading.Lock)
+    resyncs: int = 0
+
+
+class SafeNonceManager:
+    """Hands out Safe nonces locally and tracks in-flight Safe transactions."""
+
+    def __init__(self) -> None:
+        """Initialize without any tracked Safes."""
+        self._states: Dict[Tuple[str, str], _SafeNonceState] = {}
+        self._lock = threading.Lock()
+
+    def _state(self, chain: str, safe_address: str) -> _SafeNonceState:
+        with self._lock:
+            return self._states.setdefault(
+                (chain, safe_address.lower()), _SafeNonceState()
+            )
+
+    @contextmanager
+    def reserve(
+        self, chain: str, safe_address: str, fetch_nonce: Callable[[], int]
+    ) -> Iterator[NonceReservation]:
+        """Reserve the next nonce of a Safe while holding its send lock.
+
+        Build, sign, propose and broadcast inside the block, so transactions
+        (and the sender account's own nonces) reach the node in Safe nonce
+        order. Receipts should be awaited after leaving the block. If the
+        block exits without ``mark_sent`` being called, or raises, the nonce
+        is given back.
+
+        Args:
+            chain: Chain the Safe lives on
+            safe_address: Safe address
+            fetch_nonce: Reads the current Safe nonce from chain (blocking)
+
+        Yields:
+            The reservation for this transaction
+        """
+        state = self._state(chain, safe_address)
+        with state.send_lock:
+            with self._lock:
+                needs_sync = state.next_nonce is None or not state.in_flight
+            if needs_sync:
+                chain_nonce = fetch_nonce()
+                with self._lock:
+                    # Never go below a nonce that is still in flight
+                    state.next_nonce = max(
+                        chain_nonce, max(state.in_flight, default=-1) + 1
+                    )
+
+            with self._lock:
+                assert state.next_nonce is not None
+                nonce = state.next_nonce
+                reservation = NonceReservation(
+                    chain=chain,
+                    safe_address=safe_address,
+                    nonce=nonce,
+                    pipelined=any(n < nonce for n in state.in_flight),
+                )
+                state.next_nonce = nonce + 1
+                state.in_flight[nonce] = None
+
+            try:
+                yield reservation
+            finally:
+                with self._lock:
+                    if state.in_flight.get(nonce) is None:
+                        self._give_back(state, nonce)
+
+    def _give_back(self, state: _SafeNonceState, nonce: int) -> None:
+        """Return a nonce that was reserved but not broadcast (lock held)."""
+        state.in_flight.pop(nonce, None)
+        if state.next_nonce == nonce + 1:
+            state.next_nonce = nonce
+        else:
+            # Later nonces were handed out meanwhile; re-read from chain
+            self._schedule_resync(state)
+
+    @staticmethod
+    def _schedule_resync(state: _SafeNonceState) -> None:
+        """Re-read the nonce from chain once nothing is in flight (lock held).
+
+        Until then, reservations continue above the highest in-flight nonce
+        so that none of them is handed out again.
+        """
+        state.resyncs += 1
+        if state.in_flight:
+            state.next_nonce = max(state.in_flight) + 1
+        else:
+            state.next_nonce = None
+
+    def mark_sent(self, reservation: NonceReservation, tx_hash: str) -> None:
+        """Record that the transaction for a reserved nonce was broadcast."""
+        state = self._state(reservation.chain, reservation.safe_address)
+        with self._lock:
+            state.in_flight[reservation.nonce] = tx_hash
+
+    def confirm(self, reservation: NonceReservation, success: bool) -> None:
+        """Settle an in-flight nonce once its receipt is known.
+
+        Args:
+            reservation: Reservation of the broadcast transaction
+            success: False if the transaction reverted or its outcome is
+                unknown; the Safe nonce is then re-read from chain
+        """
+        state = self._state(reservation.chain, reservation.safe_address)
+        with self._lock:
+            state.in_flight.pop(reservation.nonce, None)
+            if not success:
+                self._schedule_resync(state)
+
+        if not success:
+            logger.warning(
+                f"Resyncing Safe nonce (chain={reservation.chain}, "
+                f"safe_address={reservation.safe_address}, nonce={reservation.nonce})"
+            )
+
+    def resync(self, chain: str, safe_address: str) -> None:
+        """Re-read the Safe nonce from chain once nothing is in flight."""
+        state = self._state(chain, safe_address)
+        with self._lock:
+            self._schedule_resync(state)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Return next nonce, in-flight nonces and resync count per Safe."""
+        with self._lock:
+            return {
+                f"{chain}:{safe_address}": {
+                    "next_nonce": state.next_nonce,
+                    "in_flight": sorted(state.in_flight),
+                    "resyncs": state.resyncs,
+                }
+                for (chain, safe_address), state in self._states.items()
+            }
+
+    def clear(self) -> None:
+        """Forget all tracked Safes."""
+        with self._lock:
+            self._states.clear()
+
+
+_nonce_manager = SafeNonceManager()
+
+
+def get_safe_nonce_manager() -> SafeNonceManager:
+    """Return the process-wide Safe nonce manager."""
+    return _nonce_manager
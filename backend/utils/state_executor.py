@@ -0,0 +1,66 @@
+"""Dedicated thread pool for state file I/O.
+
+StateManager reads, writes, backs up and rotates state files with blocking
+file system calls. Coroutines hand that work to ``run_in_state_executor`` so
+request handlers keep running while the agent checkpoints. The pool is kept
+separate from the chain I/O pool so that slow RPC endpoints cannot delay
+checkpoints, and checkpoints cannot hold threads that chain calls wait on.
+"""
+
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+from config import settings
+
+# Constants
+STATE_EXECUTOR_THREAD_PREFIX = "state-io"
+
+T = TypeVar("T")
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_state_executor() -> ThreadPoolExecutor:
+    """Return the shared state I/O thread pool, creating it on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.state_executor_max_workers,
+                thread_name_prefix=STATE_EXECUTOR_THREAD_PREFIX,
+            )
+        return _executor
+
+
+async def run_in_state_executor(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run blocking file I/O in the state I/O thread pool.
+
+    The caller's context variables are propagated so that log spans stay
+    attached to the work.
+
+    Args:
+        func: Blocking callable to run
+        *args: Positional arguments for ``func``
+        **kwargs: Keyword arguments for ``func``
+
+    Returns:
+        The return value of ``func``
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    call = functools.partial(context.run, func, *args, **kwargs)
+    return await loop.run_in_executor(get_state_executor(), call)
+
+
+def shutdown_state_executor(wait: bool = True) -> None:
+    """Shut down the state I/O thread pool; it is recreated on next use."""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=wait)
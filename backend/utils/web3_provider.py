@@ -2,19 +2,17 @@
 
 from web3 import Web3
 from config import settings
+from utils.chain_client_registry import CLIENT_WEB3, get_chain_client_registry
+from utils.rpc_batch import RpcBatch
+from utils.rpc_endpoint_pool import build_provider
+from utils.rpc_rate_limiter import get_rpc_rate_limiter
 import logging
 
 logger = logging.getLogger(__name__)
 
 
-def get_w3(chain: str = "base") -> Web3:
-    """Get Web3 instance for a specific chain.
-
-    Args:
-        chain: The chain name (e.g., 'base', 'ethereum')
-
-    Returns:
-        Web3 instance connected to the chain
+def _rpc_url(chain: str) -> str:
+    """Resolve the RPC endpoint for a chain.
 
     Raises:
         ValueError: If no RPC endpoint configured for chain
@@ -29,11 +27,53 @@ def get_w3(chain: str = "base") -> Web3:
     rpc_url = rpc_endpoints.get(chain)
     if not rpc_url:
         raise ValueError(f"No RPC endpoint configured for chain: {chain}")
+    return rpc_url
+
 
-    w3 = Web3(Web3.HTTPProvider(rpc_url))
+def get_w3(chain: str = "base") -> Web3:
+    """Get Web3 instance for a specific chain.
+
+    The instance comes from the shared chain client registry, so its HTTP
+    session is reused across calls and with SafeService.
+
+    Args:
+        chain: The chain name (e.g., 'base', 'ethereum')
+
+    Returns:
+        Web3 instance connected to the chain
+
+    Raises:
+        ValueError: If no RPC endpoint configured for chain
+    """
+    rpc_url = _rpc_url(chain)
+
+    # Blocks the calling thread; callers run in the chain I/O executor
+    get_rpc_rate_limiter().acquire_blocking(rpc_url)
+
+    return get_chain_client_registry().get(
+        CLIENT_WEB3, rpc_url, lambda: Web3(build_provider(chain, rpc_url))
+    )
+
+
+def rpc_batch(chain: str = "base") -> RpcBatch:
+    """Start a JSON-RPC batch on a chain's shared Web3 instance.
+
+    The whole batch is one HTTP request, so it takes a single rate limiter
+    token. Blocks like ``get_w3``; call ``execute`` from the same thread.
+
+    Args:
+        chain: The chain name (e.g., 'base', 'ethereum')
+
+    Returns:
+        An empty RpcBatch
+    """
+    return RpcBatch(get_w3(chain))
 
-    if not w3.is_connected():
-        logger.warning(f"Web3 provider for {chain} not connected, retrying...")
-        # Provider will retry on next call
 
-    return w3
+def invalidate_w3(chain: str = "base") -> None:
+    """Drop the cached Web3 instance for a chain after a connection failure."""
+    rpc_url = _rpc_url(chain)
+    if get_chain_client_registry().invalidate(rpc_url):
+        logger.warning(
+            f"Web3 provider for {chain} invalidated, reconnecting on next call"
+        )
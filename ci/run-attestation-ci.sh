@@ -166,7 +166,7 @@ echo ""
 export PYTHONPATH="$PROJECT_ROOT/backend:$PYTHONPATH"
 
 # Make script executable
-chmod +x ci/test_attestation_tracker_ci.py
+chmod +x ci/test_attestation_tracker_ci.py ci/test_batch_attestation_ci.py
 
 # Run the test
 if [ "$VERBOSE" = true ]; then
@@ -175,6 +175,10 @@ else
     ./ci/test_attestation_tracker_ci.py || TEST_RESULT=$?
 fi
 
+if [ -z "$TEST_RESULT" ]; then
+    ./ci/test_batch_attestation_ci.py || TEST_RESULT=$?
+fi
+
 echo ""
 echo "=================================================="
 echo "Test Results"
@@ -0,0 +1,320 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# requires-python = ">=3.10"
+# dependencies = [
+#     "web3>=7.12.0",
+#     "eth-account>=0.13.7",
+#     "pydantic>=2.10.0",
+#     "pydantic-settings>=2.6.0",
+#     "pydantic-ai",
+#     "colorama==0.4.6",
+#     "httpx>=0.28.0",
+#     "safe-eth-py>=7.7.0",
+#     "requests>=2.32.4",
+#     "python-dotenv>=1.0.0",
+# ]
+# ///
+"""
+CI Test for Batched EAS Attestations through a Safe MultiSend
+=============================================================
+This script tests SafeService's batch attestation mode end to end:
+1. Creates a 1/1 Safe owned by the test account (Safe v1.3.0 contracts)
+2. Builds N attestByDelegation calls into one MultiSendCallOnly payload
+   using the backend SafeService
+3. Executes the payload from the Safe with DELEGATECALL in one transaction
+4. Maps the receipt's Attested events back to the attestations and checks
+   each UID against the EAS contract
+
+The Safe singleton, proxy factory, fallback handler and MultiSendCallOnly
+addresses used here are the canonical v1.3.0 deployments, which are present
+on Base and in anvil-dump.json.
+
+Prerequisites:
+- Anvil running with Base fork: anvil --fork-url https://mainnet.base.org --auto-impersonate
+
+Exit codes:
+- 0: All tests passed
+- 1: Test failure
+- 2: Setup/connection error
+"""
+
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+from web3 import Web3
+from eth_account import Account
+from colorama import init, Fore, Style
+
+# Add parent directory to path to import from backend
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+from models import EASAttestationData
+
+# Initialize colorama for colored output
+init(autoreset=True)
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+RPC_URL = os.getenv("RPC_URL", "http://localhost:8545")
+
+# Contract addresses on Base
+EIP712_PROXY = os.getenv(
+    "EAS_CONTRACT_ADDRESS", "0xF095fE4b23958b08D38e52d5d5674bBF0C03cbF6"
+)
+EAS_ADDRESS = "0x4200000000000000000000000000000000000021"
+SCHEMA_UID = os.getenv(
+    "EAS_SCHEMA_UID",
+    "0xc93c2cd5d2027a300cc7ca3d22b36b5581353f6dabab6e14eb41daf76d5b0eb4",
+)
+
+# Safe v1.3.0 deployments
+SAFE_SINGLETON = "0xd9Db270c1B5E3Bd161E8c8503c55cEABeE709552"
+SAFE_PROXY_FACTORY = "0xa6B71E26C5e0845f74c812102Ca7114b6a896AB2"
+SAFE_FALLBACK_HANDLER = "0xf48f2B2d2a534e402487b3ee7C18c33Aec0Fe5e4"
+
+# Test account (Anvil default)
+PRIVATE_KEY = os.getenv(
+    "PRIVATE_KEY", "0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80"
+)
+
+BATCH_SIZE = int(os.getenv("BATCH_SIZE", "3"))
+
+# =============================================================================
+# HELPER FUNCTIONS
+# =============================================================================
+
+
+def print_header(text: str):
+    """Print a formatted section header."""
+    print(f"\n{Fore.CYAN}{'=' * 80}")
+    print(f"{Fore.CYAN}{text}")
+    print(f"{Fore.CYAN}{'=' * 80}{Style.RESET_ALL}")
+
+
+def print_success(text: str):
+    """Print success message in green."""
+    print(f"{Fore.GREEN}✅ {text}{Style.RESET_ALL}")
+
+
+def print_error(text: str):
+    """Print error message in red."""
+    print(f"{Fore.RED}❌ {text}{Style.RESET_ALL}")
+
+
+def print_info(text: str):
+    """Print info message in yellow."""
+    print(f"{Fore.YELLOW}ℹ️  {text}{Style.RESET_ALL}")
+
+
+def print_detail(label: str, value: str):
+    """Print a detail line."""
+    print(f"   {Fore.WHITE}{label}: {Fore.CYAN}{value}{Style.RESET_ALL}")
+
+
+def build_attestations(agent: str) -> List[EASAttestationData]:
+    """Build BATCH_SIZE distinct attestations."""
+    now = int(time.time())
+    return [
+        EASAttestationData(
+            agent=agent,
+            space_id="batch-test.eth",
+            proposal_id=f"0xbatch{now:x}{i}",
+            vote_choice=1 + i % 3,
+            snapshot_sig="0x" + f"{i:x}" * 64,
+            timestamp=now,
+            run_id=f"ci_batch_{now}",
+            confidence=90,
+            retry_count=0,
+        )
+        for i in range(BATCH_SIZE)
+    ]
+
+
+# =============================================================================
+# SAFE SETUP
+# =============================================================================
+
+
+def create_test_safe(account) -> str:
+    """Create a 1/1 Safe owned by the test account."""
+    print_header("STEP 1: Create 1/1 Safe")
+
+    from safe_eth.eth import EthereumClient
+    from safe_eth.safe import Safe
+
+    ethereum_client = EthereumClient(RPC_URL)
+    tx_sent = Safe.create(
+        ethereum_client,
+        account,
+        SAFE_SINGLETON,
+        [account.address],
+        1,
+        fallback_handler=SAFE_FALLBACK_HANDLER,
+        proxy_factory_address=SAFE_PROXY_FACTORY,
+    )
+    ethereum_client.get_transaction_receipt(tx_sent.tx_hash, timeout=60)
+
+    print_success(f"Safe created at: {tx_sent.contract_address}")
+    print_detail("Owner", account.address)
+    return tx_sent.contract_address
+
+
+# =============================================================================
+# BATCH ATTESTATION TEST
+# =============================================================================
+
+
+def test_batch_attestation(w3: Web3, account, safe_address: str) -> bool:
+    """Execute a batch of attestations through the Safe and verify each UID."""
+    print_header(f"STEP 2: Batch {BATCH_SIZE} attestations into one MultiSend")
+
+    # Write private key to file for SafeService
+    with open("ethereum_private_key.txt", "w") as f:
+        f.write(PRIVATE_KEY)
+
+    try:
+        # Import SafeService and settings AFTER the key file exists
+        from config import settings
+        from safe_eth.eth import EthereumClient
+        from safe_eth.safe import Safe
+        from services.safe_service import DEFAULT_SAFE_TX_GAS, SafeService
+        from utils.abi_loader import load_abi
+
+        # Attest through the EIP712Proxy directly
+        settings.attestation_tracker_address = None
+        settings.eas_contract_address = EIP712_PROXY
+        settings.eas_schema_uid = SCHEMA_UID
+        settings.base_safe_address = safe_address
+        settings.safe_contract_addresses = json.dumps({"base": safe_address})
+        settings.attestation_chain = "base"
+        settings.base_rpc_url = RPC_URL
+
+        safe_service = SafeService()
+        print_success("SafeService initialized successfully")
+
+        attestations = build_attestations(account.address)
+        batch_tx = safe_service.build_eas_attestation_batch_tx(attestations)
+        print_success(f"Built MultiSend payload ({len(batch_tx['data'])} bytes)")
+        print_detail("MultiSend", batch_tx["to"])
+        print_detail(
+            "Operation", "DELEGATECALL" if batch_tx["operation"] == 1 else "CALL"
+        )
+
+        # Sign and execute the Safe transaction the same way SafeService does,
+        # without proposing it to the Safe Transaction Service
+        safe = Safe(Web3.to_checksum_address(safe_address), EthereumClient(RPC_URL))
+        safe_tx = safe.build_multisig_tx(
+            to=batch_tx["to"],
+            value=0,
+            data=batch_tx["data"],
+            operation=batch_tx["operation"],
+            safe_tx_gas=DEFAULT_SAFE_TX_GAS * len(attestations),
+        )
+        safe_tx.sign(PRIVATE_KEY)
+        safe_tx.call()
+        print_success("Safe transaction simulation succeeded")
+
+        tx_hash, _ = safe_tx.execute(PRIVATE_KEY)
+        receipt = w3.eth.wait_for_transaction_receipt(tx_hash)
+        if receipt.status != 1:
+            print_error("Safe transaction reverted")
+            return False
+        print_success(f"One transaction executed (tx: {tx_hash.hex()[:20]}...)")
+        print_detail("Gas used", str(receipt.gasUsed))
+
+        # Map receipt events back to the attestations
+        uids = SafeService.extract_attestation_uids(receipt.logs)
+        if len(uids) != len(attestations):
+            print_error(
+                f"Expected {len(attestations)} Attested events, found {len(uids)}"
+            )
+            return False
+        print_success(f"Found {len(uids)} Attested events")
+
+        eas = w3.eth.contract(address=EAS_ADDRESS, abi=load_abi("eas"))
+        all_passed = True
+        for attestation, uid in zip(attestations, uids):
+            onchain = eas.functions.getAttestation(uid).call()
+            encoded = safe_service._encode_attestation_data(attestation)
+            # Attestation struct: (uid, schema, time, expirationTime,
+            # revocationTime, refUID, recipient, attester, revocable, data)
+            if bytes(onchain[9]) == encoded and onchain[7] == account.address:
+                print_success(f"{attestation.proposal_id} -> {uid[:18]}...")
+            else:
+                print_error(f"UID {uid} does not match {attestation.proposal_id}")
+                all_passed = False
+
+        return all_passed
+
+    except Exception as e:
+        print_error(f"Batch attestation test failed: {str(e)}")
+        import traceback
+
+        traceback.print_exc()
+        return False
+    finally:
+        # Clean up
+        if os.path.exists("ethereum_private_key.txt"):
+            os.remove("ethereum_private_key.txt")
+
+
+# =============================================================================
+# MAIN EXECUTION
+# =============================================================================
+
+
+def main():
+    """Main test execution."""
+    print_header("BATCHED ATTESTATION CI TEST")
+
+    print_info(f"Connecting to network at {RPC_URL}...")
+    w3 = Web3(Web3.HTTPProvider(RPC_URL))
+    if not w3.is_connected():
+        print_error("Failed to connect to Anvil")
+        print_info(
+            "Start Anvil with: anvil --fork-url https://mainnet.base.org --auto-impersonate"
+        )
+        sys.exit(2)
+    print_success(f"Connected to chain ID: {w3.eth.chain_id}")
+
+    account = Account.from_key(PRIVATE_KEY)
+    w3.provider.make_request(
+        "hardhat_setBalance", [account.address, hex(Web3.to_wei(10, "ether"))]
+    )
+    print_detail("Test account", account.address)
+
+    for name, address in [
+        ("EIP712Proxy", EIP712_PROXY),
+        ("Safe singleton", SAFE_SINGLETON),
+        ("MultiSendCallOnly", "0x40A2aCCbd92BCA938b02010E17A5b8929b49130D"),
+    ]:
+        if w3.eth.get_code(Web3.to_checksum_address(address)) == b"":
+            print_error(f"No {name} contract found at {address}")
+            print_error("Make sure you're running on a forked Base mainnet")
+            sys.exit(2)
+
+    try:
+        safe_address = create_test_safe(account)
+        success = test_batch_attestation(w3, account, safe_address)
+    except Exception as e:
+        print_error(f"Unexpected error: {str(e)}")
+        import traceback
+
+        traceback.print_exc()
+        sys.exit(1)
+
+    print_header("TEST SUMMARY")
+    if success:
+        print_success("ALL TESTS PASSED!")
+        sys.exit(0)
+    print_error("SOME TESTS FAILED")
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
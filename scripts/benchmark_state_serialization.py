@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for serializing StateManager records.
+
+Compares CPU time and stored bytes per save and per load for:
+
+- legacy: what StateManager used to do; the data is serialized with sorted
+  keys to checksum it, then the record is serialized again with indent=2,
+  and a load parses the record and re-serializes the data to verify it
+- record: one canonical serialization of the data, hashed and stored as-is
+  in a single-line record, and verified on load by hashing the raw bytes
+
+The sample state is shaped like an agent checkpoint. No files are written, so
+disk speed does not affect the results.
+
+Usage:
+    cd backend && uv run python ../scripts/benchmark_state_serialization.py
+    cd backend && uv run python ../scripts/benchmark_state_serialization.py \\
+        --votes 200 --iterations 2000
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+# Add backend to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from services.state_storage import (
+    calculate_checksum,
+    decode_record,
+    encode_record,
+    verify_checksum,
+)
+
+
+def sample_state(votes: int) -> Dict[str, Any]:
+    """A record holding an agent checkpoint with ``votes`` votes."""
+    return {
+        "version": "1.0.0",
+        "timestamp": "2025-01-01T00:00:00+00:00",
+        "data": {
+            "run_id": "run_0123456789",
+            "space_id": "arbitrumfoundation.eth",
+            "proposals_evaluated": votes,
+            "runtime_seconds": 42.5,
+            "errors": [],
+            "votes_cast": [
+                {
+                    "proposal_id": f"0x{i:064x}",
+                    "vote": "FOR" if i % 3 else "AGAINST",
+                    "confidence": 0.5 + (i % 50) / 100,
+                    "risk_level": "MEDIUM",
+                    "reasoning": f"Proposal {i} aligns with the treasury policy. " * 4,
+                    "key_factors": ["budget", "security", "community"],
+                }
+                for i in range(votes)
+            ],
+        },
+    }
+
+
+def legacy_save(state_data: Dict[str, Any]) -> bytes:
+    state_data["checksum"] = calculate_checksum(state_data["data"])
+    return json.dumps(state_data, indent=2).encode()
+
+
+def legacy_load(raw: bytes) -> Dict[str, Any]:
+    state_data = json.loads(raw)
+    verify_checksum(state_data, "benchmark")
+    return state_data
+
+
+def cpu_us_per_call(func: Callable[[], Any], iterations: int) -> float:
+    start = time.process_time()
+    for _ in range(iterations):
+        func()
+    return (time.process_time() - start) / iterations * 1e6
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--votes", type=int, default=50)
+    parser.add_argument("--iterations", type=int, default=5000)
+    args = parser.parse_args()
+
+    formats = {
+        "legacy": (legacy_save, legacy_load),
+        "record": (encode_record, lambda raw: decode_record(raw, "benchmark")),
+    }
+
+    state = sample_state(args.votes)
+    print(f"{args.votes} votes, {args.iterations} iterations\n")
+    print(f"{'format':<10}{'bytes':>10}{'save us':>12}{'load us':>12}")
+
+    baseline = None
+    for name, (save, load) in formats.items():
+        raw = save(dict(state))
+        assert load(raw)["data"] == state["data"]
+
+        save_us = cpu_us_per_call(lambda save=save: save(dict(state)), args.iterations)
+        load_us = cpu_us_per_call(lambda load=load, raw=raw: load(raw), args.iterations)
+        print(f"{name:<10}{len(raw):>10}{save_us:>12.1f}{load_us:>12.1f}")
+
+        if baseline is None:
+            baseline = (len(raw), save_us, load_us)
+        else:
+            print(
+                f"{'':<10}{len(raw) / baseline[0]:>9.2f}x"
+                f"{save_us / baseline[1]:>11.2f}x{load_us / baseline[2]:>11.2f}x"
+            )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
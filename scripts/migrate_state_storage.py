@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Copy StateManager state between storage engines.
+
+Copies the current version of every state from one engine to the other in the
+same store directory. Checksums are verified on the way; backups are not
+copied. Stop the agent first, then set STATE_STORAGE_ENGINE to the target
+engine before starting it again.
+
+Usage:
+    cd backend && uv run python ../scripts/migrate_state_storage.py --to sqlite
+    cd backend && uv run python ../scripts/migrate_state_storage.py \\
+        --from sqlite --to json --store-path /app/.quorum_ai/state
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+# Add backend to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from services.state_storage import (
+    STORAGE_ENGINE_JSON,
+    STORAGE_ENGINE_SQLITE,
+    STORAGE_ENGINES,
+    create_storage_engine,
+    migrate_storage,
+)
+
+DEFAULT_STORE_PATH = "/app/.quorum_ai/state"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--from",
+        dest="source",
+        choices=STORAGE_ENGINES,
+        default=STORAGE_ENGINE_JSON,
+        help="engine to copy from (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--to",
+        dest="target",
+        choices=STORAGE_ENGINES,
+        default=STORAGE_ENGINE_SQLITE,
+        help="engine to copy to (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--store-path",
+        type=Path,
+        default=Path(os.environ.get("STORE_PATH", DEFAULT_STORE_PATH)),
+        help="state directory (default: $STORE_PATH or %(default)s)",
+    )
+    args = parser.parse_args()
+
+    if args.source == args.target:
+        parser.error("--from and --to must name different engines")
+
+    source = create_storage_engine(args.source, args.store_path)
+    target = create_storage_engine(args.target, args.store_path)
+    try:
+        copied = migrate_storage(source, target)
+    finally:
+        source.close()
+        target.close()
+
+    print(f"Copied {copied} states from {args.source} to {args.target}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+#!/usr/bin/env -S uv run --quiet --script
+# /// script
+# requires-python = ">=3.11"
+# dependencies = [
+#     "httpx>=0.25.0",
+# ]
+# ///
+"""
+Send Snapshot hub webhook events to a local Quorum AI backend.
+
+Useful for exercising /webhooks/snapshot without a public endpoint. Events are
+signed with SNAPSHOT_WEBHOOK_SECRET the same way the backend verifies them.
+
+Usage:
+    SNAPSHOT_WEBHOOK_SECRET=secret ./scripts/send_snapshot_webhook.py \\
+        --space compound.eth --proposal 0xabc --event proposal/created
+
+    # Simulate a burst that the backend should collapse into one run
+    SNAPSHOT_WEBHOOK_SECRET=secret ./scripts/send_snapshot_webhook.py \\
+        --space compound.eth --proposal 0xabc --proposal 0xdef --repeat 3
+"""
+
+import argparse
+import hashlib
+import hmac
+import json
+import os
+import sys
+import time
+
+import httpx
+
+DEFAULT_URL = "http://localhost:8716/webhooks/snapshot"
+
+
+def build_event(event: str, space: str, proposal_id: str, expire: int) -> dict:
+    """Build a webhook payload in the format sent by the Snapshot hub."""
+    return {
+        "id": f"proposal/{proposal_id}",
+        "event": event,
+        "space": space,
+        "expire": expire,
+    }
+
+
+def send_event(
+    client: httpx.Client, url: str, payload: dict, secret: str, use_hmac: bool
+) -> httpx.Response:
+    """Send a single event, authenticated with the shared secret or an HMAC."""
+    body = json.dumps(payload).encode()
+    headers = {"Content-Type": "application/json"}
+    if use_hmac:
+        signature = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+        headers["X-Signature"] = f"sha256={signature}"
+    else:
+        headers["Authentication"] = secret
+    return client.post(url, content=body, headers=headers)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default=DEFAULT_URL)
+    parser.add_argument("--space", required=True)
+    parser.add_argument("--proposal", action="append", required=True)
+    parser.add_argument("--event", default="proposal/created")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--expire", type=int, default=int(time.time()) + 86400)
+    parser.add_argument(
+        "--shared-secret",
+        action="store_true",
+        help="Send the secret in the Authentication header instead of an HMAC",
+    )
+    args = parser.parse_args()
+
+    secret = os.environ.get("SNAPSHOT_WEBHOOK_SECRET")
+    if not secret:
+        print("SNAPSHOT_WEBHOOK_SECRET must be set", file=sys.stderr)
+        return 1
+
+    with httpx.Client(timeout=10.0) as client:
+        for _ in range(args.repeat):
+            for proposal_id in args.proposal:
+                payload = build_event(args.event, args.space, proposal_id, args.expire)
+                response = send_event(
+                    client, args.url, payload, secret, not args.shared_secret
+                )
+                print(
+                    f"{args.event} {proposal_id}: {response.status_code} {response.text}"
+                )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())